@@ -1,8 +1,9 @@
 import os
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -33,6 +34,33 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def capture_sql(db_session):
+    """`with capture_sql() as statements:` records the SQL `db_session`'s engine runs in the block.
+
+    `prefixes` keeps only statements starting with one of them (e.g. "SELECT");
+    `with_parameters=True` records `(statement, parameters)` pairs instead.
+    """
+
+    @contextmanager
+    def capture(prefixes: tuple[str, ...] | str = (), with_parameters: bool = False):
+        statements: list = []
+        bind = db_session.get_bind()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if prefixes and not statement.lstrip().upper().startswith(prefixes):
+                return
+            statements.append((statement, parameters) if with_parameters else statement)
+
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+    return capture
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     def override_get_db():
@@ -2,6 +2,7 @@
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
 
 from config import settings
 
@@ -28,3 +29,10 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+def supports_parallel_sessions(bind) -> bool:
+    # Single-connection pools (in-memory SQLite) cannot serve concurrent sessions.
+    if isinstance(bind.pool, (StaticPool, SingletonThreadPool)):
+        return False
+    return not (bind.url.get_backend_name() == "sqlite" and bind.url.database in (None, "", ":memory:"))
@@ -7,7 +7,7 @@ import re
 import secrets
 from datetime import datetime, timedelta, timezone
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
@@ -28,6 +28,7 @@ PASSWORD_RESET_TOKEN_EXPIRE_MINUTES = int(
 )
 MAX_LOGIN_FAILURES = int(os.environ.get("VON_MAX_LOGIN_FAILURES", "5"))
 LOCK_DURATION_MINUTES = int(os.environ.get("VON_LOCK_DURATION_MINUTES", "30"))
+STREAM_TOKEN_EXPIRE_SECONDS = int(os.environ.get("VON_STREAM_TOKEN_EXPIRE_SECONDS", "60"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto") if CryptContext is not None else None
 security = HTTPBearer(auto_error=False)
@@ -158,6 +159,11 @@ def create_password_reset_token(
     return _create_typed_token(user_id, "password_reset", expire)
 
 
+def create_stream_token(user_id: int) -> str:
+    expire = _utc_now() + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    return _create_typed_token(user_id, "stream", expire)
+
+
 def decode_token(token: str, expected_type: str) -> dict:
     try:
         payload = _jwt_decode(token)
@@ -219,7 +225,11 @@ def clear_login_failures(user: User) -> None:
 
 
 def get_user_from_access_token(token: str, db: Session) -> User:
-    payload = decode_token(token, expected_type="access")
+    return _get_user_from_token(token, db, expected_type="access")
+
+
+def _get_user_from_token(token: str, db: Session, expected_type: str) -> User:
+    payload = decode_token(token, expected_type=expected_type)
     try:
         user_id = int(payload.get("sub"))
     except (TypeError, ValueError) as exc:
@@ -265,6 +275,7 @@ def _ensure_dev_auth_user(db: Session) -> User:
 
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     db: Session = Depends(get_db),
 ) -> User:
@@ -272,7 +283,19 @@ def get_current_user(
         return _ensure_dev_auth_user(db)
     if not credentials:
         raise HTTPException(status_code=401, detail="인증이 필요합니다.")
-    return get_user_from_access_token(credentials.credentials, db)
+    user = get_user_from_access_token(credentials.credentials, db)
+    # Shared with AuditLogMiddleware through the request scope.
+    request.state.auth_user_id = user.id
+    return user
+
+
+def get_stream_user(token: str | None, db: Session) -> User:
+    """Resolve the user of a `?token=` stream URL; browsers' EventSource cannot send a Bearer header."""
+    if _auth_disabled():
+        return _ensure_dev_auth_user(db)
+    if not token:
+        raise HTTPException(status_code=401, detail="인증이 필요합니다.")
+    return _get_user_from_token(token, db, expected_type="stream")
 
 
 def require_master(user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Sequence
+
+from fastapi import HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query as OrmQuery
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int | None = None
+    cursor: str | None = None
+    fields: tuple[str, ...] | None = None
+    include_total: bool = False
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+
+def page_params(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None, description="Comma-separated response fields"),
+    include_total: bool = Query(default=False),
+) -> PageParams:
+    """Opt-in paging: without `limit`/`cursor` list endpoints keep returning every row."""
+    selected = None
+    if fields:
+        selected = tuple(dict.fromkeys(["id", *(name.strip() for name in fields.split(",") if name.strip())]))
+    return PageParams(limit=limit, cursor=cursor, fields=selected, include_total=include_total)
+
+
+@dataclass
+class Page:
+    rows: list[Any]
+    next_cursor: str | None
+    # Plain dicts of the requested columns instead of ORM rows.
+    projected: bool
+    _count: Callable[[], int]
+
+    def total(self) -> int:
+        return self._count()
+
+
+def keyset_page(
+    query: OrmQuery,
+    params: PageParams,
+    *,
+    sort_column,
+    id_column,
+    descending: bool = False,
+    allowed_fields: Iterable[str] | None = None,
+    options: Sequence[Any] = (),
+    select_columns: bool = True,
+) -> Page:
+    """Order `query` by (`sort_column` nulls last, `id_column`) and cut one keyset page.
+
+    When every requested field is a column of the queried entity, only those columns
+    are selected and `Page.rows` holds dicts; pass `select_columns=False` when rows
+    must always be loaded whole. `options` only apply when full entities are loaded.
+    """
+    _check_fields(params, allowed_fields)
+    count_query = query.order_by(None)
+
+    if params.cursor:
+        sort_value, last_id = _decode_cursor(params.cursor)
+        query = query.filter(_after(sort_column, id_column, sort_value, last_id, descending))
+
+    columns = _projected_columns(query, params.fields) if select_columns else None
+    if columns is not None:
+        query = query.with_entities(*columns, sort_column.label("_sort_key"), id_column.label("_row_id"))
+    elif options:
+        query = query.options(*options)
+
+    if descending:
+        query = query.order_by(sort_column.desc().nullslast(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc().nullslast(), id_column.asc())
+    if params.limit is not None:
+        query = query.limit(params.limit + 1)
+    rows = query.all()
+
+    next_cursor = None
+    if params.limit is not None and len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        if columns is not None:
+            next_cursor = _encode_cursor(last._sort_key, last._row_id)
+        else:
+            next_cursor = _encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    if columns is not None:
+        rows = [{name: row._mapping[name] for name in params.fields} for row in rows]
+    return Page(rows=rows, next_cursor=next_cursor, projected=columns is not None, _count=count_query.count)
+
+
+def page_headers(params: PageParams, page: Page) -> dict[str, str]:
+    """Next-cursor header, plus the total count only when the client asked for it."""
+    headers: dict[str, str] = {}
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if params.include_total:
+        headers[TOTAL_COUNT_HEADER] = str(page.total())
+    return headers
+
+
+def page_response(response: Response, params: PageParams, page: Page, items: list[Any]):
+    """Set paging headers and trim `items` to `params.fields` when a projection was requested."""
+    headers = page_headers(params, page)
+    if params.fields:
+        payload = jsonable_encoder(items)
+        return JSONResponse(
+            content=[{name: row.get(name) for name in params.fields} for row in payload],
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return items
+
+
+def _check_fields(params: PageParams, allowed_fields: Iterable[str] | None) -> None:
+    if not params.fields or allowed_fields is None:
+        return
+    unknown = sorted(set(params.fields) - set(allowed_fields))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+
+def _projected_columns(query: OrmQuery, fields: tuple[str, ...] | None) -> list[Any] | None:
+    if not fields:
+        return None
+    entity = query.column_descriptions[0].get("entity")
+    if entity is None:
+        return None
+    table_columns = entity.__table__.columns
+    if not all(name in table_columns for name in fields):
+        return None
+    return [table_columns[name].label(name) for name in fields]
+
+
+def _after(sort_column, id_column, sort_value: Any, last_id: int, descending: bool):
+    """Rows strictly after (sort_value, last_id) in (sort nulls last, id) order."""
+    same_id = id_column < last_id if descending else id_column > last_id
+    if sort_value is None:
+        return and_(sort_column.is_(None), same_id)
+    beyond = sort_column < sort_value if descending else sort_column > sort_value
+    return or_(beyond, and_(sort_column == sort_value, same_id), sort_column.is_(None))
+
+
+def _encode_cursor(sort_value: Any, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        key = ["datetime", sort_value.isoformat()]
+    elif isinstance(sort_value, date):
+        key = ["date", sort_value.isoformat()]
+    elif isinstance(sort_value, Decimal):
+        key = ["decimal", str(sort_value)]
+    else:
+        key = [None, sort_value]
+    raw = json.dumps({"k": key, "i": row_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode((cursor + "=" * (-len(cursor) % 4)).encode("ascii"))
+        payload = json.loads(raw)
+        kind, value = payload["k"]
+        row_id = int(payload["i"])
+        if value is not None and kind == "datetime":
+            value = datetime.fromisoformat(value)
+        elif value is not None and kind == "date":
+            value = date.fromisoformat(value)
+        elif value is not None and kind == "decimal":
+            value = Decimal(value)
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    return value, row_id
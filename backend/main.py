@@ -17,6 +17,7 @@ load_dotenv()
 from config import settings
 from database import Base, SessionLocal, engine
 from dependencies.auth import get_current_user
+from dependencies.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 from middleware.audit_log import AuditLogMiddleware
 from models import *  # noqa: F401,F403 - import all models for metadata
 from routers import (
@@ -82,10 +83,12 @@ from routers import (
 from seed.seed_accounts import seed_accounts
 from scripts.seed_data import seed_all
 from seeds.compliance_rules import seed_default_compliance_rules
+from services.audit_log_writer import get_audit_log_writer
 from services.scheduler import get_scheduler_service
 
 logger = logging.getLogger(__name__)
 scheduler_service = get_scheduler_service()
+audit_log_writer = get_audit_log_writer()
 # SQLite startup compatibility patches were migrated to Alembic revision e58a1b2c3d4f.
 
 
@@ -118,11 +121,13 @@ async def lifespan(app: FastAPI):
         finally:
             db.close()
 
+    audit_log_writer.start()
     scheduler_service.start()
     try:
         yield
     finally:
         scheduler_service.stop()
+        audit_log_writer.stop()
 
 
 app = FastAPI(title="VC ERP API", version="0.2.0", lifespan=lifespan)
@@ -133,6 +138,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 app.add_middleware(AuditLogMiddleware)
 
@@ -196,6 +202,7 @@ include_protected_router(lp_reports.router)
 include_protected_router(excel_export.router)
 include_protected_router(excel_import.router)
 include_protected_router(notifications.router)
+app.include_router(notifications.stream_router)
 include_protected_router(admin.router)
 include_protected_router(compliance.router)
 include_protected_router(vics_reports.router)
@@ -232,3 +239,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/api/health/audit-log", dependencies=[Depends(get_current_user)])
+def audit_log_health():
+    return audit_log_writer.get_status()
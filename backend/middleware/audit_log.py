@@ -8,9 +8,8 @@ from typing import Any
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from database import SessionLocal
 from dependencies.auth import decode_token
-from models.audit_log import AuditLog
+from services.audit_log_writer import get_audit_log_writer
 
 
 class AuditLogMiddleware(BaseHTTPMiddleware):
@@ -25,15 +24,21 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
     }
 
     async def dispatch(self, request: Request, call_next):  # type: ignore[override]
+        if request.method not in self._MUTATING_METHODS or not request.url.path.startswith("/api"):
+            return await call_next(request)
+
         request_body = await self._read_body(request)
         response = await call_next(request)
 
-        if request.method in self._MUTATING_METHODS and 200 <= response.status_code < 300:
-            await self._log_action(request, response, request_body)
+        if 200 <= response.status_code < 300:
+            self._log_action(request, response, request_body)
 
         return response
 
     async def _read_body(self, request: Request) -> str | None:
+        # Uploads would be truncated to 500 chars of binary anyway; skip buffering them.
+        if (request.headers.get("content-type") or "").startswith("multipart/"):
+            return None
         try:
             body = await request.body()
             if not body:
@@ -47,34 +52,29 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
         except Exception:
             return None
 
-    async def _log_action(self, request: Request, response: Response, body_text: str | None) -> None:
-        if not request.url.path.startswith("/api"):
-            return
-
+    def _log_action(self, request: Request, response: Response, body_text: str | None) -> None:
         user_id = self._extract_user_id(request)
         target_type, target_id = self._extract_target(request.url.path)
         detail = self._build_detail(body_text, response.status_code)
 
-        db = SessionLocal()
-        try:
-            db.add(
-                AuditLog(
-                    user_id=user_id,
-                    action=self._ACTION_MAP.get(request.method, request.method.lower()),
-                    target_type=target_type,
-                    target_id=target_id,
-                    detail=detail,
-                    ip_address=request.client.host if request.client else None,
-                    user_agent=request.headers.get("user-agent"),
-                )
-            )
-            db.commit()
-        except Exception:
-            db.rollback()
-        finally:
-            db.close()
+        get_audit_log_writer().submit(
+            {
+                "user_id": user_id,
+                "action": self._ACTION_MAP.get(request.method, request.method.lower()),
+                "target_type": target_type,
+                "target_id": target_id,
+                "detail": detail,
+                "ip_address": request.client.host if request.client else None,
+                "user_agent": request.headers.get("user-agent"),
+            }
+        )
 
     def _extract_user_id(self, request: Request) -> int | None:
+        # get_current_user records the authenticated id; only decode for routes that skip it.
+        user_id = getattr(request.state, "auth_user_id", None)
+        if user_id is not None:
+            return user_id
+
         auth_header = request.headers.get("authorization") or ""
         if not auth_header.lower().startswith("bearer "):
             return None
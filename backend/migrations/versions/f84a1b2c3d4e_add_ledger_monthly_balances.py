@@ -0,0 +1,138 @@
+"""add ledger monthly balances
+
+Revision ID: f84a1b2c3d4e
+Revises: f83a1b2c3d4e
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f84a1b2c3d4e"
+down_revision: Union[str, Sequence[str], None] = "f83a1b2c3d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(inspector: sa.Inspector, table_name: str) -> bool:
+    return table_name in inspector.get_table_names()
+
+
+def _has_index(inspector: sa.Inspector, table_name: str, index_name: str) -> bool:
+    if not _has_table(inspector, table_name):
+        return False
+    return any(idx.get("name") == index_name for idx in inspector.get_indexes(table_name))
+
+
+def _backfill(bind) -> None:
+    journal_entries = sa.table(
+        "journal_entries",
+        sa.column("id", sa.Integer()),
+        sa.column("fund_id", sa.Integer()),
+        sa.column("entry_date", sa.Date()),
+        sa.column("status", sa.String()),
+    )
+    journal_entry_lines = sa.table(
+        "journal_entry_lines",
+        sa.column("journal_entry_id", sa.Integer()),
+        sa.column("account_id", sa.Integer()),
+        sa.column("debit", sa.Numeric()),
+        sa.column("credit", sa.Numeric()),
+    )
+    balances = sa.table(
+        "ledger_monthly_balances",
+        sa.column("fund_id", sa.Integer()),
+        sa.column("account_id", sa.Integer()),
+        sa.column("month_start", sa.Date()),
+        sa.column("status", sa.String()),
+        sa.column("debit", sa.Numeric()),
+        sa.column("credit", sa.Numeric()),
+    )
+    statement = (
+        sa.select(
+            journal_entries.c.fund_id,
+            journal_entry_lines.c.account_id,
+            journal_entries.c.entry_date,
+            journal_entries.c.status,
+            sa.func.coalesce(sa.func.sum(journal_entry_lines.c.debit), 0),
+            sa.func.coalesce(sa.func.sum(journal_entry_lines.c.credit), 0),
+        )
+        .select_from(
+            journal_entry_lines.join(journal_entries, journal_entries.c.id == journal_entry_lines.c.journal_entry_id)
+        )
+        .group_by(
+            journal_entries.c.fund_id,
+            journal_entry_lines.c.account_id,
+            journal_entries.c.entry_date,
+            journal_entries.c.status,
+        )
+    )
+    buckets = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for fund_id, account_id, entry_date, status, debit, credit in bind.execute(statement):
+        if entry_date is None:
+            continue
+        bucket = buckets[(fund_id, account_id, entry_date.replace(day=1), status or "")]
+        bucket[0] += Decimal(str(debit or 0))
+        bucket[1] += Decimal(str(credit or 0))
+
+    rows = [
+        {
+            "fund_id": fund_id,
+            "account_id": account_id,
+            "month_start": month_start,
+            "status": status,
+            "debit": debit,
+            "credit": credit,
+        }
+        for (fund_id, account_id, month_start, status), (debit, credit) in buckets.items()
+        if debit or credit
+    ]
+    if rows:
+        op.bulk_insert(balances, rows)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not _has_table(inspector, "ledger_monthly_balances"):
+        op.create_table(
+            "ledger_monthly_balances",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("fund_id", sa.Integer(), sa.ForeignKey("funds.id"), nullable=False),
+            sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id"), nullable=False),
+            sa.Column("month_start", sa.Date(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False, server_default=""),
+            sa.Column("debit", sa.Numeric(), nullable=False, server_default="0"),
+            sa.Column("credit", sa.Numeric(), nullable=False, server_default="0"),
+            sa.UniqueConstraint(
+                "fund_id",
+                "account_id",
+                "month_start",
+                "status",
+                name="uq_ledger_monthly_balances_key",
+            ),
+        )
+        if _has_table(inspector, "journal_entries") and _has_table(inspector, "journal_entry_lines"):
+            _backfill(bind)
+
+    inspector = sa.inspect(bind)
+    if not _has_index(inspector, "ledger_monthly_balances", "ix_ledger_monthly_balances_id"):
+        op.create_index("ix_ledger_monthly_balances_id", "ledger_monthly_balances", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "ledger_monthly_balances"):
+        if _has_index(inspector, "ledger_monthly_balances", "ix_ledger_monthly_balances_id"):
+            op.drop_index("ix_ledger_monthly_balances_id", table_name="ledger_monthly_balances")
+        op.drop_table("ledger_monthly_balances")
@@ -0,0 +1,57 @@
+"""add hot filter composite indexes
+
+Revision ID: f85a1b2c3d4e
+Revises: f84a1b2c3d4e
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f85a1b2c3d4e"
+down_revision: Union[str, Sequence[str], None] = "f84a1b2c3d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES: tuple[tuple[str, str, list[str]], ...] = (
+    ("ix_tasks_status_deadline", "tasks", ["status", "deadline"]),
+    ("ix_notifications_user_read_created", "notifications", ["user_id", "is_read", "created_at"]),
+    ("ix_valuations_investment_as_of", "valuations", ["investment_id", "as_of_date"]),
+    ("ix_valuations_fund_investment_as_of", "valuations", ["fund_id", "investment_id", "as_of_date"]),
+    ("ix_journal_entries_fund_date_status", "journal_entries", ["fund_id", "entry_date", "status"]),
+    ("ix_journal_entry_lines_account_id", "journal_entry_lines", ["account_id"]),
+    ("ix_journal_entry_lines_journal_entry_id", "journal_entry_lines", ["journal_entry_id"]),
+    ("ix_capital_call_items_call_paid_date", "capital_call_items", ["capital_call_id", "paid", "paid_date"]),
+    ("ix_compliance_obligations_status_due_date", "compliance_obligations", ["status", "due_date"]),
+)
+
+
+def _has_table(inspector: sa.Inspector, table_name: str) -> bool:
+    return table_name in inspector.get_table_names()
+
+
+def _has_index(inspector: sa.Inspector, table_name: str, index_name: str) -> bool:
+    if not _has_table(inspector, table_name):
+        return False
+    return any(idx.get("name") == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for index_name, table_name, columns in INDEXES:
+        if _has_table(inspector, table_name) and not _has_index(inspector, table_name, index_name):
+            op.create_index(index_name, table_name, columns, unique=False)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for index_name, table_name, _ in reversed(INDEXES):
+        if _has_index(inspector, table_name, index_name):
+            op.drop_index(index_name, table_name=table_name)
@@ -19,7 +19,7 @@ from .valuation import Valuation
 from .biz_report import BizReport, BizReportTemplate, BizReportRequest, BizReportAnomaly
 from .regular_report import RegularReport
 from .pre_report_check import PreReportCheck
-from .accounting import Account, JournalEntry, JournalEntryLine
+from .accounting import Account, JournalEntry, JournalEntryLine, LedgerMonthlyBalance
 from .bank_transaction import BankTransaction
 from .auto_mapping_rule import AutoMappingRule
 from .provisional_fs import ProvisionalFS
@@ -121,7 +121,7 @@ __all__ = [
     "BizReport", "BizReportTemplate", "BizReportRequest", "BizReportAnomaly",
     "RegularReport",
     "PreReportCheck",
-    "Account", "JournalEntry", "JournalEntryLine",
+    "Account", "JournalEntry", "JournalEntryLine", "LedgerMonthlyBalance",
     "BankTransaction", "AutoMappingRule", "ProvisionalFS",
     "VoteRecord",
     "CapitalCall", "CapitalCallItem", "CapitalCallDetail",
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -22,6 +22,7 @@ class Account(Base):
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
+    __table_args__ = (Index("ix_journal_entries_fund_date_status", "fund_id", "entry_date", "status"),)
 
     id = Column(Integer, primary_key=True, index=True)
     fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False)
@@ -38,6 +39,10 @@ class JournalEntry(Base):
 
 class JournalEntryLine(Base):
     __tablename__ = "journal_entry_lines"
+    __table_args__ = (
+        Index("ix_journal_entry_lines_account_id", "account_id"),
+        Index("ix_journal_entry_lines_journal_entry_id", "journal_entry_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     journal_entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=False)
@@ -47,3 +52,26 @@ class JournalEntryLine(Base):
     memo = Column(String, nullable=True)
 
     journal_entry = relationship("JournalEntry", back_populates="lines")
+
+
+class LedgerMonthlyBalance(Base):
+    """Per fund/account/month/status debit and credit movement, maintained from journal lines."""
+
+    __tablename__ = "ledger_monthly_balances"
+    __table_args__ = (
+        UniqueConstraint(
+            "fund_id",
+            "account_id",
+            "month_start",
+            "status",
+            name="uq_ledger_monthly_balances_key",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    fund_id = Column(Integer, ForeignKey("funds.id"), nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    month_start = Column(Date, nullable=False)
+    status = Column(String, nullable=False, default="")
+    debit = Column(Numeric, nullable=False, default=0)
+    credit = Column(Numeric, nullable=False, default=0)
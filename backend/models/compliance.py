@@ -7,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -53,6 +54,7 @@ class ComplianceObligation(Base):
             "investment_id",
             name="uq_compliance_obligations_period",
         ),
+        Index("ix_compliance_obligations_status_due_date", "status", "due_date"),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -30,6 +30,7 @@ class CapitalCall(Base):
 
 class CapitalCallItem(Base):
     __tablename__ = "capital_call_items"
+    __table_args__ = (Index("ix_capital_call_items_call_paid_date", "capital_call_id", "paid", "paid_date"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     capital_call_id = Column(Integer, ForeignKey("capital_calls.id"), nullable=False)
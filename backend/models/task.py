@@ -1,9 +1,10 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, func
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Index, func
 from database import Base
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_status_deadline", "status", "deadline"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String, nullable=False)
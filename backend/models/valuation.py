@@ -6,6 +6,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -18,6 +19,10 @@ from database import Base
 
 class Valuation(Base):
     __tablename__ = "valuations"
+    __table_args__ = (
+        Index("ix_valuations_investment_as_of", "investment_id", "as_of_date"),
+        Index("ix_valuations_fund_investment_as_of", "fund_id", "investment_id", "as_of_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     investment_id = Column(Integer, ForeignKey("investments.id"), nullable=False)
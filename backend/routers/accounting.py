@@ -1,11 +1,11 @@
 from datetime import date, datetime
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session, selectinload
 
 from database import get_db
+from dependencies.pagination import PageParams, keyset_page, page_params, page_response
 from models.accounting import Account, JournalEntry, JournalEntryLine
 from models.fund import Fund
 from schemas.accounting import (
@@ -15,6 +15,7 @@ from schemas.accounting import (
     JournalEntryUpdate,
     TrialBalanceItem,
 )
+from services.ledger_aggregation import LedgerTotals, account_ledger_totals, post_monthly_balances
 
 router = APIRouter(tags=["accounting"])
 
@@ -70,6 +71,21 @@ def _serialize_entry(entry: JournalEntry, db: Session) -> dict:
     }
 
 
+JOURNAL_ENTRY_FIELDS = (
+    "id",
+    "fund_id",
+    "entry_date",
+    "entry_type",
+    "description",
+    "status",
+    "source_type",
+    "source_id",
+    "created_at",
+    "fund_name",
+    "lines",
+)
+
+
 def _validate_lines(db: Session, lines: list[dict]) -> None:
     if not lines:
         raise HTTPException(status_code=400, detail="전표 라인이 필요합니다")
@@ -142,10 +158,12 @@ def delete_account(account_id: int, db: Session = Depends(get_db)):
 
 @router.get("/api/journal-entries")
 def list_journal_entries(
+    response: Response,
     fund_id: int | None = None,
     entry_date_from: date | None = None,
     entry_date_to: date | None = None,
     status: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(JournalEntry)
@@ -157,8 +175,18 @@ def list_journal_entries(
         query = query.filter(JournalEntry.entry_date <= entry_date_to)
     if status:
         query = query.filter(JournalEntry.status == status)
-    entries = query.order_by(JournalEntry.entry_date.desc(), JournalEntry.id.desc()).all()
-    return [_serialize_entry(entry, db) for entry in entries]
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=JournalEntry.entry_date,
+        id_column=JournalEntry.id,
+        descending=True,
+        allowed_fields=JOURNAL_ENTRY_FIELDS,
+        options=[selectinload(JournalEntry.lines)],
+    )
+    if listing.projected:
+        return page_response(response, page, listing, listing.rows)
+    return page_response(response, page, listing, [_serialize_entry(entry, db) for entry in listing.rows])
 
 
 @router.get("/api/journal-entries/{entry_id}")
@@ -190,6 +218,7 @@ def create_journal_entry(data: JournalEntryCreate, db: Session = Depends(get_db)
             memo=line.get("memo"),
         ))
 
+    post_monthly_balances(db, entry)
     db.commit()
     db.refresh(entry)
     return _serialize_entry(entry, db)
@@ -209,6 +238,9 @@ def update_journal_entry(entry_id: int, data: JournalEntryUpdate, db: Session =
 
     if lines is not None:
         _validate_lines(db, lines)
+
+    post_monthly_balances(db, entry, sign=-1)
+    if lines is not None:
         for old_line in list(entry.lines):
             db.delete(old_line)
         db.flush()
@@ -223,6 +255,7 @@ def update_journal_entry(entry_id: int, data: JournalEntryUpdate, db: Session =
 
     for key, value in payload.items():
         setattr(entry, key, value)
+    post_monthly_balances(db, entry)
 
     db.commit()
     db.refresh(entry)
@@ -234,6 +267,7 @@ def delete_journal_entry(entry_id: int, db: Session = Depends(get_db)):
     entry = db.get(JournalEntry, entry_id)
     if not entry:
         raise HTTPException(status_code=404, detail="전표를 찾을 수 없습니다")
+    post_monthly_balances(db, entry, sign=-1)
     db.delete(entry)
     db.commit()
     return {"ok": True}
@@ -255,30 +289,13 @@ def trial_balance(
         .all()
     )
 
+    totals = account_ledger_totals(db, fund_id, as_of)
+
     items: list[TrialBalanceItem] = []
     for account in accounts:
-        debit_total = (
-            db.query(func.coalesce(func.sum(JournalEntryLine.debit), 0))
-            .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
-            .filter(
-                JournalEntryLine.account_id == account.id,
-                JournalEntry.fund_id == fund_id,
-                JournalEntry.entry_date <= as_of,
-            )
-            .scalar()
-        )
-        credit_total = (
-            db.query(func.coalesce(func.sum(JournalEntryLine.credit), 0))
-            .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
-            .filter(
-                JournalEntryLine.account_id == account.id,
-                JournalEntry.fund_id == fund_id,
-                JournalEntry.entry_date <= as_of,
-            )
-            .scalar()
-        )
-        debit_value = _to_float(debit_total)
-        credit_value = _to_float(credit_total)
+        account_totals = totals.get(account.id) or LedgerTotals()
+        debit_value = account_totals.debit_total
+        credit_value = account_totals.credit_total
         if account.normal_side == "대변":
             balance = credit_value - debit_value
         else:
@@ -14,7 +14,6 @@ from models.user import User
 from schemas.analytics import (
     AnalyticsBatchQueryRequest,
     AnalyticsBatchQueryResponse,
-    AnalyticsBatchQueryResult,
     AnalyticsCatalogResponse,
     AnalyticsExportRequest,
     AnalyticsQueryRequest,
@@ -23,6 +22,7 @@ from schemas.analytics import (
     AnalyticsSavedViewResponse,
     AnalyticsSavedViewUpdate,
 )
+from services.analytics.batch_planner import run_query_batch
 from services.analytics.catalog import build_catalog_response, get_subject_definition
 from services.analytics.export_service import export_query_to_xlsx
 from services.analytics.query_service import run_query
@@ -61,17 +61,7 @@ def query_analytics_batch(payload: AnalyticsBatchQueryRequest, db: Session = Dep
     if len(payload.items) > 12:
         raise HTTPException(status_code=400, detail="배치 질의는 최대 12개까지 허용됩니다.")
 
-    results: list[AnalyticsBatchQueryResult] = []
-    for item in payload.items:
-        try:
-            results.append(AnalyticsBatchQueryResult(key=item.key, response=run_query(db, item.query)))
-        except HTTPException as exc:
-            detail = exc.detail if isinstance(exc.detail, str) else "배치 질의 처리 중 오류가 발생했습니다."
-            results.append(AnalyticsBatchQueryResult(key=item.key, error=detail))
-        except Exception:
-            results.append(AnalyticsBatchQueryResult(key=item.key, error="배치 질의 처리 중 오류가 발생했습니다."))
-
-    return AnalyticsBatchQueryResponse(results=results)
+    return AnalyticsBatchQueryResponse(results=run_query_batch(db, payload.items))
 
 
 @router.get("/views", response_model=list[AnalyticsSavedViewResponse])
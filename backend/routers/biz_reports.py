@@ -20,7 +20,6 @@ from models.fund import Fund
 from models.investment import Investment, PortfolioCompany
 from models.phase3 import Distribution
 from models.transaction import Transaction
-from models.valuation import Valuation
 from schemas.biz_report import (
     BizReportAnomalyResponse,
     BizReportCommentDiffResponse,
@@ -40,6 +39,7 @@ from services.generated_document_service import generate_and_store_document
 from services.biz_report_anomaly import detect_biz_report_anomalies
 from services.erp_backbone import backbone_enabled, maybe_emit_mutation, record_snapshot, sync_biz_report_request_document_registry, sync_investment_graph
 from services.biz_report_valuation_sync import suggest_valuation_updates
+from services.latest_valuation import latest_nav
 
 router = APIRouter(tags=["biz-reports"])
 
@@ -193,17 +193,7 @@ def _report_quarter(report: BizReport) -> int:
 
 
 def _latest_nav(db: Session, fund_id: int) -> float:
-    rows = (
-        db.query(Valuation)
-        .filter(Valuation.fund_id == fund_id)
-        .order_by(Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    latest_by_investment: dict[int, Valuation] = {}
-    for row in rows:
-        if row.investment_id not in latest_by_investment:
-            latest_by_investment[row.investment_id] = row
-    return float(sum(float(row.total_fair_value or row.value or 0) for row in latest_by_investment.values()))
+    return latest_nav(db, fund_id)
 
 
 def _transaction_summary(db: Session, fund_id: int) -> tuple[float, float]:
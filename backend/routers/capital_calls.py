@@ -2,11 +2,12 @@ from datetime import date, datetime
 import re
 from collections import defaultdict
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from database import get_db
+from dependencies.pagination import PageParams, keyset_page, page_params, page_response
 from models.fund import Fund, LP
 from models.lp_contribution import LPContribution
 from models.phase3 import CapitalCall, CapitalCallDetail, CapitalCallItem
@@ -529,8 +530,10 @@ def _assert_capital_call_deletable(db: Session, call: CapitalCall) -> None:
 
 @router.get("/api/capital-calls", response_model=list[CapitalCallListItem])
 def list_capital_calls(
+    response: Response,
     fund_id: int | None = None,
     call_type: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(CapitalCall)
@@ -538,9 +541,18 @@ def list_capital_calls(
         query = query.filter(CapitalCall.fund_id == fund_id)
     if call_type:
         query = query.filter(CapitalCall.call_type == call_type)
-    rows = query.order_by(CapitalCall.call_date.desc(), CapitalCall.id.desc()).all()
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=CapitalCall.call_date,
+        id_column=CapitalCall.id,
+        descending=True,
+        allowed_fields=CapitalCallListItem.model_fields,
+    )
+    if listing.projected:
+        return page_response(response, page, listing, listing.rows)
     result: list[CapitalCallListItem] = []
-    for row in rows:
+    for row in listing.rows:
         fund = db.get(Fund, row.fund_id)
         result.append(
             CapitalCallListItem(
@@ -551,7 +563,7 @@ def list_capital_calls(
                 )
             )
         )
-    return result
+    return page_response(response, page, listing, result)
 
 
 @router.post("/api/capital-calls/batch", response_model=CapitalCallResponse, status_code=201)
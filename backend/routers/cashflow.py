@@ -6,43 +6,92 @@ from sqlalchemy.orm import Session
 
 from database import get_db
 from models.fund import Fund
-from services.cashflow_projection import project_cashflow
+from services.cashflow_projection import (
+    BASE_SCENARIO,
+    MAX_HORIZON_MONTHS,
+    CashflowScenario,
+    load_cashflow_book,
+    project_cashflow,
+)
 
 router = APIRouter(tags=["cashflow"])
 
 
+def _scenario(
+    call_pacing: float = Query(default=1.0, ge=0, le=3),
+    call_delay_months: int = Query(default=0, ge=0, le=MAX_HORIZON_MONTHS),
+    exit_delay_months: int = Query(default=0, ge=0, le=MAX_HORIZON_MONTHS),
+    exit_haircut: float = Query(default=0, ge=0, le=1),
+    operating_cost: float = Query(default=0, ge=0),
+) -> CashflowScenario:
+    return CashflowScenario(
+        call_pacing=call_pacing,
+        call_delay_months=call_delay_months,
+        exit_delay_months=exit_delay_months,
+        exit_haircut=exit_haircut,
+        operating_cost_monthly=operating_cost,
+    )
+
+
+def _active_fund_ids(db: Session, gp_entity_id: int | None = None) -> list[int]:
+    query = db.query(Fund.id).filter(func.lower(func.coalesce(Fund.status, "")) == "active")
+    if gp_entity_id is not None:
+        query = query.filter(Fund.gp_entity_id == gp_entity_id)
+    return [fund_id for (fund_id,) in query.order_by(Fund.id.asc()).all()]
+
+
 @router.get("/api/funds/{fund_id}/cashflow")
 async def get_fund_cashflow(
     fund_id: int,
-    months_ahead: int = Query(default=12, ge=1, le=24),
-    operating_cost: float = Query(default=0, ge=0),
+    months_ahead: int = Query(default=12, ge=1, le=MAX_HORIZON_MONTHS),
+    scenario: CashflowScenario = Depends(_scenario),
     db: Session = Depends(get_db),
 ):
-    return await project_cashflow(db, fund_id, months_ahead, operating_cost)
+    return await project_cashflow(db, fund_id, months_ahead, scenario=scenario)
 
 
 @router.get("/api/cashflow/all")
 async def get_all_funds_cashflow(
-    months_ahead: int = Query(default=6, ge=1, le=24),
+    months_ahead: int = Query(default=6, ge=1, le=MAX_HORIZON_MONTHS),
     db: Session = Depends(get_db),
 ):
-    funds = (
-        db.query(Fund)
-        .filter(func.lower(func.coalesce(Fund.status, "")) == "active")
-        .order_by(Fund.id.asc())
-        .all()
-    )
-
+    book = load_cashflow_book(db, _active_fund_ids(db), months_ahead)
     results: list[dict] = []
-    for fund in funds:
-        projection = await project_cashflow(db, fund.id, months_ahead)
+    for fund_id, projection in book.summarize().items():
         first_month = projection["monthly_summary"][0] if projection.get("monthly_summary") else None
         results.append(
             {
-                "fund_id": fund.id,
-                "fund_name": fund.name,
+                "fund_id": fund_id,
+                "fund_name": book.funds[fund_id],
                 "current_balance": projection.get("current_balance", 0),
                 "next_month_net": first_month.get("net", 0) if first_month else 0,
             }
         )
     return results
+
+
+@router.get("/api/cashflow/consolidated")
+async def get_consolidated_cashflow(
+    months_ahead: int = Query(default=MAX_HORIZON_MONTHS, ge=1, le=MAX_HORIZON_MONTHS),
+    fund_ids: list[int] | None = Query(default=None),
+    gp_entity_id: int | None = Query(default=None),
+    scenario: CashflowScenario = Depends(_scenario),
+    db: Session = Depends(get_db),
+):
+    if fund_ids is None:
+        fund_ids = _active_fund_ids(db, gp_entity_id)
+    book = load_cashflow_book(db, fund_ids, months_ahead)
+    by_fund = book.summarize(scenario)
+    result = {
+        "months_ahead": book.horizon,
+        "scenario": scenario.as_dict(),
+        **book.consolidate(scenario),
+        "funds": [
+            {"fund_id": fund_id, "fund_name": book.funds[fund_id], **projection}
+            for fund_id, projection in by_fund.items()
+        ],
+    }
+    if scenario != BASE_SCENARIO:
+        # Same loaded book, so the comparison costs no extra queries.
+        result["baseline"] = book.consolidate(BASE_SCENARIO)
+    return result
@@ -40,7 +40,7 @@ from services.compliance_orchestrator import ComplianceOrchestrator
 from services.compliance_rule_engine import ComplianceRuleEngine
 from services.legal_rag import LegalRAGService, MonthlyTokenLimitExceededError
 from services.law_amendment_monitor import LawAmendmentMonitor
-from services.periodic_compliance_scanner import PeriodicComplianceScanner
+from services.periodic_compliance_scanner import PeriodicComplianceScanner, get_scan_progress
 from services.document_service import build_variables_for_fund, generate_document_for_template
 from services.erp_backbone import backbone_enabled, maybe_emit_mutation, record_snapshot, sync_compliance_document_registry, sync_compliance_obligation_graph, sync_task_graph
 from services.lp_types import is_special_lp_type
@@ -1536,6 +1536,11 @@ async def trigger_manual_scan(
     )
 
 
+@router.get("/api/compliance/scan/progress")
+def get_compliance_scan_progress():
+    return get_scan_progress()
+
+
 @router.post("/api/compliance/generate-periodic")
 def generate_periodic_obligations(body: GeneratePeriodicBody, db: Session = Depends(get_db)):
     engine = ComplianceEngine(db)
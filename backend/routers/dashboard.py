@@ -17,7 +17,6 @@ from models.investment_review import InvestmentReview
 from models.phase3 import CapitalCallDetail, CapitalCallItem
 from models.regular_report import RegularReport
 from models.task import Task
-from models.valuation import Valuation
 from models.workflow_instance import WorkflowInstance
 from schemas.dashboard import (
     DashboardBaseResponse,
@@ -33,7 +32,7 @@ from schemas.dashboard import (
 )
 from schemas.task import TaskResponse
 from services.health_score import build_dashboard_health
-from services.workflow_service import reconcile_workflow_instance_state
+from services.latest_valuation import latest_nav_by_fund
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
@@ -372,24 +371,6 @@ def _task_response(
     return TaskResponse(**payload)
 
 
-def _sync_workflow_state(db: Session) -> None:
-    sync_targets = (
-        db.query(WorkflowInstance)
-        .filter(WorkflowInstance.status.in_(["active", "completed"]))
-        .all()
-    )
-    needs_commit = False
-    for instance in sync_targets:
-        if reconcile_workflow_instance_state(db, instance):
-            needs_commit = True
-    if needs_commit:
-        try:
-            db.commit()
-        except Exception:
-            db.rollback()
-            raise
-
-
 def _dashboard_base_payload(db: Session, today: date) -> dict:
     tomorrow = today + timedelta(days=1)
     current_year_month = today.strftime("%Y-%m")
@@ -408,8 +389,6 @@ def _dashboard_base_payload(db: Session, today: date) -> dict:
             upcoming_year += 1
         upcoming_end = date(upcoming_year, upcoming_month, 28)
 
-    _sync_workflow_state(db)
-
     try:
         investment_review_active_count = int(
             db.query(func.count(InvestmentReview.id))
@@ -422,19 +401,7 @@ def _dashboard_base_payload(db: Session, today: date) -> dict:
 
     total_nav = 0.0
     try:
-        valuation_rows = (
-            db.query(Valuation)
-            .order_by(Valuation.as_of_date.desc(), Valuation.id.desc())
-            .all()
-        )
-        latest_by_investment: dict[int, Valuation] = {}
-        for row in valuation_rows:
-            if row.investment_id not in latest_by_investment:
-                latest_by_investment[row.investment_id] = row
-        total_nav = sum(
-            float(row.total_fair_value or row.value or 0)
-            for row in latest_by_investment.values()
-        )
+        total_nav = sum(latest_nav_by_fund(db).values())
     except Exception:
         total_nav = 0.0
 
@@ -1020,7 +987,6 @@ def get_dashboard_base(db: Session = Depends(get_db)):
 
 @router.get("/workflows", response_model=DashboardWorkflowsResponse)
 def get_dashboard_workflows(db: Session = Depends(get_db)):
-    _sync_workflow_state(db)
     return _dashboard_workflows_payload(db)
 
 
@@ -1214,19 +1180,7 @@ def _build_funds_snapshot_payload(db: Session, today: date) -> dict:
         if fund_id is not None
     }
 
-    latest_valuations = (
-        db.query(Valuation)
-        .order_by(Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    latest_by_investment: dict[int, Valuation] = {}
-    for row in latest_valuations:
-        if row.investment_id not in latest_by_investment:
-            latest_by_investment[row.investment_id] = row
-
-    nav_by_fund: dict[int, float] = {}
-    for row in latest_by_investment.values():
-        nav_by_fund[row.fund_id] = nav_by_fund.get(row.fund_id, 0.0) + float(row.total_fair_value or row.value or 0)
+    nav_by_fund = latest_nav_by_fund(db)
 
     compliance_rows = (
         db.query(
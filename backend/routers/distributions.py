@@ -1,9 +1,10 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from database import get_db
+from dependencies.pagination import PageParams, keyset_page, page_params, page_response
 from models.fund import Fund, LP
 from models.phase3 import Distribution, DistributionDetail, DistributionItem
 from schemas.phase3 import (
@@ -44,8 +45,10 @@ def _serialize_distribution_detail(row: DistributionDetail, db: Session) -> Dist
 
 @router.get("/api/distributions", response_model=list[DistributionListItem])
 def list_distributions(
+    response: Response,
     fund_id: int | None = None,
     dist_type: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(Distribution)
@@ -53,9 +56,18 @@ def list_distributions(
         query = query.filter(Distribution.fund_id == fund_id)
     if dist_type:
         query = query.filter(Distribution.dist_type == dist_type)
-    rows = query.order_by(Distribution.dist_date.desc(), Distribution.id.desc()).all()
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=Distribution.dist_date,
+        id_column=Distribution.id,
+        descending=True,
+        allowed_fields=DistributionListItem.model_fields,
+    )
+    if listing.projected:
+        return page_response(response, page, listing, listing.rows)
     result: list[DistributionListItem] = []
-    for row in rows:
+    for row in listing.rows:
         fund = db.get(Fund, row.fund_id)
         result.append(
             DistributionListItem(
@@ -71,7 +83,7 @@ def list_distributions(
                 fund_name=fund.name if fund else "",
             )
         )
-    return result
+    return page_response(response, page, listing, result)
 
 
 @router.get("/api/distributions/{distribution_id}", response_model=DistributionResponse)
@@ -1,10 +1,11 @@
 from datetime import date
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from database import get_db
+from dependencies.pagination import PageParams, keyset_page, page_params, page_response
 from models.fund import Fund
 from models.investment import Investment, PortfolioCompany
 from models.phase3 import Distribution, DistributionDetail, ExitCommittee, ExitCommitteeFund, ExitTrade
@@ -421,11 +422,13 @@ def delete_exit_committee_fund(committee_id: int, item_id: int, db: Session = De
 
 @router.get("/api/exit-trades", response_model=list[ExitTradeListItem])
 def list_exit_trades(
+    response: Response,
     fund_id: int | None = None,
     company_id: int | None = None,
     investment_id: int | None = None,
     exit_committee_id: int | None = None,
     exit_type: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(ExitTrade)
@@ -439,10 +442,19 @@ def list_exit_trades(
         query = query.filter(ExitTrade.exit_committee_id == exit_committee_id)
     if exit_type:
         query = query.filter(ExitTrade.exit_type == exit_type)
-    rows = query.order_by(ExitTrade.trade_date.desc(), ExitTrade.id.desc()).all()
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=ExitTrade.trade_date,
+        id_column=ExitTrade.id,
+        descending=True,
+        allowed_fields=ExitTradeListItem.model_fields,
+    )
+    if listing.projected:
+        return page_response(response, page, listing, listing.rows)
 
     result: list[ExitTradeListItem] = []
-    for row in rows:
+    for row in listing.rows:
         fund = db.get(Fund, row.fund_id)
         company = db.get(PortfolioCompany, row.company_id)
         result.append(
@@ -470,7 +482,7 @@ def list_exit_trades(
                 company_name=company.name if company else "",
             )
         )
-    return result
+    return page_response(response, page, listing, result)
 
 
 @router.get("/api/exit-trades/{trade_id}", response_model=ExitTradeResponse)
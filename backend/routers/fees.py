@@ -12,7 +12,6 @@ from models.fee import FeeConfig, ManagementFee, PerformanceFeeSimulation
 from models.fund import Fund, LP
 from models.investment import Investment
 from models.phase3 import Distribution
-from models.valuation import Valuation
 from schemas.fee import (
     FeeConfigInput,
     FeeConfigResponse,
@@ -24,6 +23,7 @@ from schemas.fee import (
     PerformanceFeeSimulationUpdate,
     WaterfallResponse,
 )
+from services.latest_valuation import latest_nav
 
 router = APIRouter(tags=["fees"])
 
@@ -56,17 +56,7 @@ def _decimal_to_percent(value: float | None) -> float | None:
 
 
 def _latest_nav(db: Session, fund_id: int) -> float:
-    rows = (
-        db.query(Valuation)
-        .filter(Valuation.fund_id == fund_id)
-        .order_by(Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    latest_by_investment: dict[int, Valuation] = {}
-    for row in rows:
-        if row.investment_id not in latest_by_investment:
-            latest_by_investment[row.investment_id] = row
-    return float(sum(_to_float(row.total_fair_value) or _to_float(row.value) for row in latest_by_investment.values()))
+    return latest_nav(db, fund_id)
 
 
 def _total_invested(db: Session, fund_id: int) -> float:
@@ -1560,43 +1560,81 @@ def calculate_paid_in_as_of(
     reference_date: date,
     fallback_gp_commitment: float | None = None,
 ) -> tuple[float, float]:
-    lps = db.query(LP).filter(LP.fund_id == fund_id).all()
-    gp_lp_ids = {
-        lp.id
-        for lp in lps
-        if is_gp_lp_type(lp.type)
-    }
+    return calculate_paid_in_as_of_bulk(
+        db,
+        [fund_id],
+        reference_date,
+        fallback_gp_commitments={fund_id: fallback_gp_commitment},
+    )[fund_id]
 
-    has_call_items = (
-        db.query(CapitalCallItem.id)
-        .join(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id)
-        .filter(CapitalCall.fund_id == fund_id)
-        .first()
-    )
 
-    if has_call_items is None:
-        total_paid_in = sum(float(lp.paid_in or 0) for lp in lps)
-        gp_paid_in = sum(float(lp.paid_in or 0) for lp in lps if lp.id in gp_lp_ids)
-        if not gp_lp_ids and fallback_gp_commitment is not None:
-            gp_paid_in = float(fallback_gp_commitment or 0)
-        return round(total_paid_in, 2), round(gp_paid_in, 2)
+def calculate_paid_in_as_of_bulk(
+    db: Session,
+    fund_ids: list[int],
+    reference_date: date,
+    fallback_gp_commitments: dict[int, float | None] | None = None,
+) -> dict[int, tuple[float, float]]:
+    # Funds with capital call items count paid items up to reference_date;
+    # funds without any fall back to the LP-level paid_in amounts.
+    if not fund_ids:
+        return {}
+    fallback_gp_commitments = fallback_gp_commitments or {}
+
+    lps_by_fund: dict[int, list] = {fund_id: [] for fund_id in fund_ids}
+    for lp in (
+        db.query(LP.id, LP.fund_id, LP.type, LP.paid_in)
+        .filter(LP.fund_id.in_(fund_ids))
+        .order_by(LP.id.asc())
+        .all()
+    ):
+        lps_by_fund[int(lp.fund_id)].append(lp)
 
-    paid_items = (
-        db.query(CapitalCallItem.lp_id, CapitalCallItem.amount)
-        .join(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id)
-        .filter(
-            CapitalCall.fund_id == fund_id,
-            CapitalCallItem.paid == 1,
-            CapitalCallItem.paid_date.isnot(None),
-            CapitalCallItem.paid_date <= reference_date,
+    call_rows = (
+        db.query(
+            CapitalCall.fund_id.label("fund_id"),
+            CapitalCallItem.lp_id.label("lp_id"),
+            func.count(CapitalCallItem.id).label("item_count"),
+            func.coalesce(
+                func.sum(
+                    case(
+                        (
+                            (CapitalCallItem.paid == 1)
+                            & CapitalCallItem.paid_date.isnot(None)
+                            & (CapitalCallItem.paid_date <= reference_date),
+                            CapitalCallItem.amount,
+                        ),
+                        else_=0,
+                    )
+                ),
+                0,
+            ).label("paid_amount"),
         )
+        .join(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id)
+        .filter(CapitalCall.fund_id.in_(fund_ids))
+        .group_by(CapitalCall.fund_id, CapitalCallItem.lp_id)
         .all()
     )
-    total_paid_in = sum(float(item.amount or 0) for item in paid_items)
-    gp_paid_in = sum(float(item.amount or 0) for item in paid_items if item.lp_id in gp_lp_ids)
-    if not gp_lp_ids and fallback_gp_commitment is not None:
-        gp_paid_in = float(fallback_gp_commitment or 0)
-    return round(total_paid_in, 2), round(gp_paid_in, 2)
+    paid_by_fund_lp: dict[int, dict[int | None, float]] = {}
+    for row in call_rows:
+        if int(row.item_count or 0) > 0:
+            paid_by_fund_lp.setdefault(int(row.fund_id), {})[row.lp_id] = float(row.paid_amount or 0)
+
+    result: dict[int, tuple[float, float]] = {}
+    for fund_id in fund_ids:
+        lps = lps_by_fund.get(fund_id, [])
+        gp_lp_ids = {lp.id for lp in lps if is_gp_lp_type(lp.type)}
+        paid_by_lp = paid_by_fund_lp.get(fund_id)
+        if paid_by_lp is None:
+            total_paid_in = sum(float(lp.paid_in or 0) for lp in lps)
+            gp_paid_in = sum(float(lp.paid_in or 0) for lp in lps if lp.id in gp_lp_ids)
+        else:
+            total_paid_in = sum(paid_by_lp.values())
+            gp_paid_in = sum(amount for lp_id, amount in paid_by_lp.items() if lp_id in gp_lp_ids)
+        fallback_gp_commitment = fallback_gp_commitments.get(fund_id)
+        if not gp_lp_ids and fallback_gp_commitment is not None:
+            gp_paid_in = float(fallback_gp_commitment or 0)
+        result[fund_id] = (round(total_paid_in, 2), round(gp_paid_in, 2))
+    return result
 
 
 def calculate_lp_paid_in_from_calls(db: Session, fund_id: int, lp_id: int) -> tuple[bool, int]:
@@ -1937,15 +1975,17 @@ def build_fund_overview(
         "pending_task_count": 0,
     }
 
+    paid_in_by_fund = calculate_paid_in_as_of_bulk(
+        db,
+        fund_ids,
+        ref_date,
+        fallback_gp_commitments={fund.id: fund.gp_commitment for fund in funds},
+    )
+
     items: list[FundOverviewItem] = []
     for index, fund in enumerate(funds, start=1):
         agg = investment_by_fund.get(fund.id, {})
-        total_paid_in, gp_paid_in = calculate_paid_in_as_of(
-            db,
-            fund.id,
-            ref_date,
-            fallback_gp_commitment=fund.gp_commitment,
-        )
+        total_paid_in, gp_paid_in = paid_in_by_fund[fund.id]
         total_invested = float(agg.get("total_invested", 0.0))
         investment_assets = float(agg.get("investment_assets", total_invested))
         company_count = int(agg.get("company_count", 0))
@@ -15,6 +15,7 @@ from models.investment import Investment
 from services.compliance_orchestrator import ComplianceOrchestrator
 from services.document_ingestion import DocumentIngestionService
 from services.erp_backbone import backbone_enabled, sync_compliance_document_registry
+from services.lexical_index import mark_lexical_documents
 from services.vector_db import VectorDBService
 
 router = APIRouter(tags=["legal_documents"])
@@ -375,6 +376,7 @@ def delete_legal_document(document_id: int, db: Session = Depends(get_db)):
         .filter(ComplianceDocumentChunk.document_id == row.id)
         .delete(synchronize_session=False)
     )
+    mark_lexical_documents(db, [row.id])
     db.delete(row)
     db.commit()
     return {"deleted": True, "id": document_id}
@@ -1,6 +1,6 @@
 ﻿from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from uuid import uuid4
 
@@ -11,7 +11,9 @@ from database import get_db
 from dependencies.auth import get_current_user
 from models.attachment import Attachment
 from models.document_generation import DocumentGeneration
+from models.fund import Fund
 from models.user import User
+from services.lp_capital_account import get_lp_capital_accounts
 from services.lp_report_service import collect_lp_report_data, generate_lp_report_docx
 
 router = APIRouter(tags=["lp_reports"])
@@ -34,6 +36,22 @@ async def preview_lp_report_data(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
+@router.get("/api/funds/{fund_id}/lp-capital-accounts")
+def get_fund_lp_capital_accounts(
+    fund_id: int,
+    as_of_date: date | None = None,
+    db: Session = Depends(get_db),
+):
+    if not db.get(Fund, fund_id):
+        raise HTTPException(status_code=404, detail="Fund not found")
+    as_of = as_of_date or date.today()
+    return {
+        "fund_id": fund_id,
+        "as_of_date": as_of.isoformat(),
+        "accounts": [account.as_dict() for account in get_lp_capital_accounts(db, fund_id, as_of)],
+    }
+
+
 @router.post("/api/funds/{fund_id}/lp-report/generate")
 async def generate_lp_report(
     fund_id: int,
@@ -1,22 +1,40 @@
 ﻿from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from database import get_db
-from dependencies.auth import get_current_user
-from models.notification import Notification
+from database import SessionLocal, get_db
+from dependencies.auth import (
+    STREAM_TOKEN_EXPIRE_SECONDS,
+    create_stream_token,
+    get_current_user,
+    get_stream_user,
+)
 from models.user import User
+from services.notification_hub import get_notification_hub
 from services.notification_service import (
     create_notification,
     get_notifications,
     get_unread_count,
     mark_all_as_read,
     mark_as_read,
+    serialize_notification,
 )
 
 router = APIRouter(tags=["notifications"])
+# Mounted without the Bearer dependency: EventSource authenticates with a `?token=` stream token.
+stream_router = APIRouter(tags=["notifications"])
+
+STREAM_KEEPALIVE_SECONDS = 25
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
 
 
 class NotificationCreateBody(BaseModel):
@@ -32,25 +50,6 @@ class NotificationCreateBody(BaseModel):
     action_payload: dict | None = None
 
 
-def _serialize(row: Notification) -> dict:
-    return {
-        "id": row.id,
-        "user_id": row.user_id,
-        "category": row.category,
-        "severity": row.severity,
-        "title": row.title,
-        "message": row.message,
-        "target_type": row.target_type,
-        "target_id": row.target_id,
-        "action_type": row.action_type,
-        "action_url": row.action_url,
-        "action_payload": row.action_payload,
-        "is_read": bool(row.is_read),
-        "read_at": row.read_at.isoformat() if row.read_at else None,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-    }
-
-
 @router.post("/api/notifications")
 async def create_notification_api(
     body: NotificationCreateBody,
@@ -71,7 +70,7 @@ async def create_notification_api(
         action_url=body.action_url,
         action_payload=body.action_payload,
     )
-    return _serialize(row)
+    return serialize_notification(row)
 
 
 @router.get("/api/notifications")
@@ -93,7 +92,7 @@ async def list_notifications(
     )
     unread_count = await get_unread_count(db, current_user.id)
     return {
-        "notifications": [_serialize(row) for row in rows],
+        "notifications": [serialize_notification(row) for row in rows],
         "unread_count": unread_count,
     }
 
@@ -106,6 +105,53 @@ async def unread_count(
     return {"count": await get_unread_count(db, current_user.id)}
 
 
+@router.post("/api/notifications/stream-token")
+def issue_stream_token(current_user: User = Depends(get_current_user)):
+    return {"token": create_stream_token(current_user.id), "expires_in": STREAM_TOKEN_EXPIRE_SECONDS}
+
+
+@stream_router.get("/api/notifications/stream")
+async def stream_notifications(request: Request, token: str | None = None):
+    """Server-sent events: `notification` for new rows and `unread_count` on every change.
+
+    The user and initial count are read in a session that is closed before streaming
+    starts, so an open tab does not hold a pooled connection for its whole lifetime.
+    """
+    hub = get_notification_hub()
+    db = SessionLocal()
+    try:
+        current_user = get_stream_user(token, db)
+        request.state.auth_user_id = current_user.id
+        subscription = hub.subscribe(current_user.id)
+        try:
+            # Read after subscribing so no change can slip between the count and the stream.
+            initial_count = await get_unread_count(db, current_user.id)
+        except Exception:
+            hub.unsubscribe(subscription)
+            raise
+    finally:
+        db.close()
+
+    async def events():
+        try:
+            yield _sse("unread_count", {"count": initial_count})
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(message["event"], message["data"])
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/api/notifications/{notification_id}/read")
 async def read_notification(
     notification_id: int,
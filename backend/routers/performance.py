@@ -2,7 +2,7 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -10,7 +10,7 @@ from database import get_db
 from models.fund import Fund
 from models.investment import Investment
 from schemas.phase3 import FundPerformanceResponse
-from services.performance_calculator import calculate_fund_performance
+from services.performance_calculator import calculate_fund_performance, calculate_funds_performance
 
 router = APIRouter(tags=["performance"])
 
@@ -57,20 +57,24 @@ async def get_fund_performance(
 
 
 @router.get("/api/performance/all")
-async def get_all_funds_performance(db: Session = Depends(get_db)):
-    funds = (
-        db.query(Fund)
-        .filter(func.lower(func.coalesce(Fund.status, "")) == "active")
-        .order_by(Fund.id.asc())
-        .all()
-    )
+async def get_all_funds_performance(
+    as_of_date: date | None = None,
+    fund_ids: list[int] | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    query = db.query(Fund).order_by(Fund.id.asc())
+    if fund_ids:
+        query = query.filter(Fund.id.in_(fund_ids))
+    else:
+        query = query.filter(func.lower(func.coalesce(Fund.status, "")) == "active")
+    funds = query.all()
 
-    result: list[dict] = []
-    for fund in funds:
-        perf = await calculate_fund_performance(db, fund.id)
-        result.append({
+    performance = calculate_funds_performance(db, [fund.id for fund in funds], as_of_date=as_of_date)
+    return [
+        {
             "fund_id": fund.id,
             "fund_name": fund.name,
-            **perf,
-        })
-    return result
+            **performance[fund.id],
+        }
+        for fund in funds
+    ]
@@ -24,8 +24,8 @@ from services.auto_journal import AutoJournalService
 from services.bank_statement_parser import BankStatementParser
 from services.fs_excel_exporter import FSExcelExporter
 from services.provisional_fs_service import ProvisionalFSService
-from seeds.default_mapping_rules import seed_default_mapping_rules
-from seeds.fund_accounts import ensure_fund_standard_accounts
+from seeds.default_mapping_rules import DEFAULT_MAPPING_RULES, seed_default_mapping_rules
+from seeds.fund_accounts import FUND_STANDARD_ACCOUNTS, ensure_fund_standard_accounts
 
 router = APIRouter(tags=["provisional_fs"])
 
@@ -70,6 +70,11 @@ class GenerateFSRequest(BaseModel):
     year_month: str
 
 
+class GenerateAllFSRequest(BaseModel):
+    year_month: str
+    fund_ids: list[int] | None = None
+
+
 def _to_float(value) -> float:
     if value is None:
         return 0.0
@@ -167,6 +172,36 @@ def _ensure_baseline(fund_id: int, db: Session) -> None:
     seed_default_mapping_rules(db, fund_id)
 
 
+def _funds_missing_baseline(fund_ids: list[int], db: Session) -> list[int]:
+    """Funds lacking a standard account or default mapping rule, found with one query each."""
+    if not fund_ids:
+        return []
+    standard_codes = {item["code"] for item in FUND_STANDARD_ACCOUNTS}
+    account_counts = dict(
+        db.query(Account.fund_id, func.count(func.distinct(Account.code)))
+        .filter(Account.fund_id.in_(fund_ids), Account.code.in_(standard_codes))
+        .group_by(Account.fund_id)
+        .all()
+    )
+    default_rules = {(item["keyword"], item["direction"]) for item in DEFAULT_MAPPING_RULES}
+    seeded_rules: dict[int, set[tuple[str, str]]] = {}
+    for fund_id, keyword, direction in (
+        db.query(AutoMappingRule.fund_id, AutoMappingRule.keyword, AutoMappingRule.direction)
+        .filter(
+            AutoMappingRule.fund_id.in_(fund_ids),
+            AutoMappingRule.keyword.in_({keyword for keyword, _ in default_rules}),
+        )
+        .all()
+    ):
+        seeded_rules.setdefault(fund_id, set()).add((keyword, direction))
+    return [
+        fund_id
+        for fund_id in fund_ids
+        if account_counts.get(fund_id, 0) < len(standard_codes)
+        or not default_rules <= seeded_rules.get(fund_id, set())
+    ]
+
+
 def _save_bank_transactions(
     rows: list[dict],
     fund_id: int,
@@ -442,6 +477,30 @@ def generate_provisional_fs(
     return _serialize_fs(fs)
 
 
+@router.post("/api/provisional-fs/generate")
+def generate_provisional_fs_all(
+    data: GenerateAllFSRequest,
+    db: Session = Depends(get_db),
+):
+    fund_query = db.query(Fund.id).order_by(Fund.id.asc())
+    if data.fund_ids is not None:
+        fund_query = fund_query.filter(Fund.id.in_(data.fund_ids))
+    fund_ids = [row.id for row in fund_query.all()]
+    if data.fund_ids is not None and len(fund_ids) != len(set(data.fund_ids)):
+        raise HTTPException(status_code=404, detail="Fund not found")
+
+    for fund_id in _funds_missing_baseline(fund_ids, db):
+        _ensure_baseline(fund_id, db)
+
+    service = ProvisionalFSService()
+    try:
+        statements = service.generate_many(fund_ids, data.year_month, db)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return [_serialize_fs(fs) for fs in statements]
+
+
 @router.get("/api/funds/{fund_id}/provisional-fs")
 def get_provisional_fs(
     fund_id: int,
@@ -1,14 +1,16 @@
 import re
-from datetime import date, datetime, timedelta
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy import extract, func
+from sqlalchemy import case, extract, func, or_, select
 from sqlalchemy.orm import Session
 
 from database import get_db
 from dependencies.auth import get_current_user
+from dependencies.pagination import PageParams, keyset_page, page_headers, page_params, page_response
 from models.attachment import Attachment
 from models.calendar_event import CalendarEvent
 from models.fund import Fund
@@ -121,6 +123,7 @@ def _resolve_task_links(
 
 
 def _build_task_lookup_context(db: Session, tasks: list[Task]) -> dict[str, dict[int, object]]:
+    """Prefetch every name `_to_task_response` needs: one query per entity type, none per task."""
     task_ids = {row.id for row in tasks if row.id is not None}
     investment_ids = {row.investment_id for row in tasks if row.investment_id is not None}
     workflow_instance_ids = {row.workflow_instance_id for row in tasks if row.workflow_instance_id is not None}
@@ -128,32 +131,51 @@ def _build_task_lookup_context(db: Session, tasks: list[Task]) -> dict[str, dict
     gp_entity_ids = {row.gp_entity_id for row in tasks if row.gp_entity_id is not None}
     company_ids: set[int] = set()
 
-    investments: list[Investment] = []
+    investments = []
     if investment_ids:
-        investments = db.query(Investment).filter(Investment.id.in_(investment_ids)).all()
+        investments = (
+            db.query(Investment.id, Investment.fund_id, Investment.company_id)
+            .filter(Investment.id.in_(investment_ids))
+            .all()
+        )
         fund_ids.update(row.fund_id for row in investments if row.fund_id is not None)
         company_ids.update(row.company_id for row in investments if row.company_id is not None)
 
-    instances: list[WorkflowInstance] = []
+    instances = []
     if workflow_instance_ids:
-        instances = db.query(WorkflowInstance).filter(WorkflowInstance.id.in_(workflow_instance_ids)).all()
+        instances = (
+            db.query(
+                WorkflowInstance.id,
+                WorkflowInstance.name,
+                WorkflowInstance.fund_id,
+                WorkflowInstance.gp_entity_id,
+                WorkflowInstance.company_id,
+            )
+            .filter(WorkflowInstance.id.in_(workflow_instance_ids))
+            .all()
+        )
         fund_ids.update(row.fund_id for row in instances if row.fund_id is not None)
         gp_entity_ids.update(row.gp_entity_id for row in instances if row.gp_entity_id is not None)
         company_ids.update(row.company_id for row in instances if row.company_id is not None)
 
-    funds: list[Fund] = []
+    funds = []
     if fund_ids:
-        funds = db.query(Fund).filter(Fund.id.in_(fund_ids)).all()
+        funds = db.query(Fund.id, Fund.name).filter(Fund.id.in_(fund_ids)).all()
 
-    gp_entities: list[GPEntity] = []
+    gp_entities = []
     if gp_entity_ids:
-        gp_entities = db.query(GPEntity).filter(GPEntity.id.in_(gp_entity_ids)).all()
+        gp_entities = db.query(GPEntity.id, GPEntity.name).filter(GPEntity.id.in_(gp_entity_ids)).all()
 
-    companies: list[PortfolioCompany] = []
+    companies = []
     if company_ids:
-        companies = db.query(PortfolioCompany).filter(PortfolioCompany.id.in_(company_ids)).all()
+        companies = (
+            db.query(PortfolioCompany.id, PortfolioCompany.name)
+            .filter(PortfolioCompany.id.in_(company_ids))
+            .all()
+        )
 
-    attachment_counts: dict[int, int] = {}
+    # Tasks without attachments are recorded as 0 so no per-task count is needed later.
+    attachment_counts: dict[int, int] = dict.fromkeys(task_ids, 0)
     if task_ids:
         attachment_rows = (
             db.query(Attachment.entity_id, func.count(Attachment.id))
@@ -164,11 +186,11 @@ def _build_task_lookup_context(db: Session, tasks: list[Task]) -> dict[str, dict
             .group_by(Attachment.entity_id)
             .all()
         )
-        attachment_counts = {
-            int(task_id): int(count)
+        attachment_counts.update(
+            (int(task_id), int(count))
             for task_id, count in attachment_rows
             if task_id is not None
-        }
+        )
 
     return {
         'investments': {row.id: row for row in investments},
@@ -197,14 +219,6 @@ def _parse_time_to_minutes(value: str | None) -> int:
     return total
 
 
-def _task_date(value: datetime | date | None) -> date | None:
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value.date()
-    return value
-
-
 def _compute_stale_days(task: Task, now_dt: datetime) -> int | None:
     if task.status == 'completed':
         return None
@@ -217,107 +231,116 @@ def _compute_stale_days(task: Task, now_dt: datetime) -> int | None:
 
 def _resolve_task_work_score(db: Session, today: date) -> int:
     try:
-        from services.health_score import build_dashboard_health
+        from services.health_score import calc_task_score
     except Exception:
         return 0
     try:
-        payload = build_dashboard_health(db, today)
-        score = int((payload.get('domains') or {}).get('tasks', {}).get('score', 0))
+        score = int(calc_task_score(db, today).get('score', 0))
         return max(0, min(100, score))
     except Exception:
         return 0
 
 
-def _select_workflow_representative_task(tasks: list[Task]) -> Task | None:
-    if not tasks:
-        return None
-
-    in_progress_tasks = [task for task in tasks if task.status == 'in_progress']
-    candidates = in_progress_tasks or tasks
-
-    def sort_key(task: Task) -> tuple[int, datetime, int]:
-        step_order = task.workflow_step_order if task.workflow_step_order is not None else 10**9
-        deadline_value = task.deadline if task.deadline is not None else datetime.max
-        task_id = task.id if task.id is not None else 10**9
-        return (step_order, deadline_value, task_id)
-
-    return sorted(candidates, key=sort_key)[0]
-
-
-def _build_actionable_pending_tasks(pending_tasks: list[Task]) -> list[Task]:
-    standalone_tasks: list[Task] = []
-    workflow_task_map: dict[int, list[Task]] = {}
-
-    for task in pending_tasks:
-        workflow_instance_id = task.workflow_instance_id
-        if workflow_instance_id is None:
-            standalone_tasks.append(task)
-            continue
-        workflow_task_map.setdefault(workflow_instance_id, []).append(task)
-
-    actionable_tasks = list(standalone_tasks)
-    for workflow_tasks in workflow_task_map.values():
-        representative = _select_workflow_representative_task(workflow_tasks)
-        if representative is not None:
-            actionable_tasks.append(representative)
-
-    return actionable_tasks
+def _actionable_pending_task_rows():
+    """Open tasks with one representative per workflow instance, ranked in SQL.
+
+    The representative is the instance's first in-progress task (or first task when none
+    is in progress) by step order, deadline and id, with missing values sorted last.
+    """
+    representative_rank = func.row_number().over(
+        partition_by=Task.workflow_instance_id,
+        order_by=(
+            case((Task.status == 'in_progress', 0), else_=1),
+            Task.workflow_step_order.asc().nullslast(),
+            Task.deadline.asc().nullslast(),
+            Task.id.asc(),
+        ),
+    )
+    ranked = (
+        select(
+            Task.deadline,
+            Task.estimated_time,
+            Task.updated_at,
+            Task.created_at,
+            Task.workflow_instance_id,
+            representative_rank.label('representative_rank'),
+        )
+        .where(Task.status.in_(('pending', 'in_progress')))
+        .subquery()
+    )
+    return ranked, or_(ranked.c.workflow_instance_id.is_(None), ranked.c.representative_rank == 1)
 
 
-def _build_task_board_summary(db: Session, tasks: list[Task]) -> dict[str, int]:
+def _build_task_board_summary(db: Session) -> dict[str, int]:
+    """Board summary from grouped counts; task rows themselves are never loaded."""
     today = date.today()
     now_dt = datetime.now()
-    week_end = today + timedelta(days=7)
-
-    pending_statuses = {'pending', 'in_progress'}
-    pending_tasks = [task for task in tasks if task.status in pending_statuses]
-    actionable_pending_tasks = _build_actionable_pending_tasks(pending_tasks)
-    completed_today_tasks = [
-        task
-        for task in tasks
-        if task.status == 'completed' and _task_date(task.completed_at) == today
-    ]
+    today_start = datetime.combine(today, time.min)
+    tomorrow_start = today_start + timedelta(days=1)
+    week_end_next_start = today_start + timedelta(days=8)
+
+    ranked, is_actionable = _actionable_pending_task_rows()
+    deadline_bucket = case(
+        (ranked.c.deadline.is_(None), 'none'),
+        (ranked.c.deadline < today_start, 'overdue'),
+        (ranked.c.deadline < tomorrow_start, 'today'),
+        (ranked.c.deadline < week_end_next_start, 'this_week'),
+        else_='later',
+    )
+    is_stale = case(
+        (func.coalesce(ranked.c.updated_at, ranked.c.created_at) <= now_dt - timedelta(days=3), 1),
+        else_=0,
+    )
+    pending_rows = db.execute(
+        select(deadline_bucket, is_stale, ranked.c.estimated_time, func.count())
+        .where(is_actionable)
+        .group_by(deadline_bucket, is_stale, ranked.c.estimated_time)
+    ).all()
+
+    is_due_by_today = case((Task.deadline < tomorrow_start, 1), else_=0)
+    completed_rows = db.execute(
+        select(is_due_by_today, Task.estimated_time, func.count())
+        .where(
+            Task.status == 'completed',
+            Task.completed_at >= today_start,
+            Task.completed_at < tomorrow_start,
+        )
+        .group_by(is_due_by_today, Task.estimated_time)
+    ).all()
 
     overdue_count = 0
     today_count = 0
     this_week_count = 0
     stale_count = 0
-
-    for task in actionable_pending_tasks:
-        deadline_date = _task_date(task.deadline)
-        if deadline_date is not None:
-            if deadline_date < today:
-                overdue_count += 1
-            elif deadline_date == today:
-                today_count += 1
-            elif deadline_date <= week_end:
-                this_week_count += 1
-
-        stale_days = _compute_stale_days(task, now_dt)
-        if stale_days is not None and stale_days >= 3:
-            stale_count += 1
-
-    today_due_pending_tasks = [
-        task
-        for task in actionable_pending_tasks
-        if (deadline_date := _task_date(task.deadline)) is not None and deadline_date <= today
-    ]
-    completed_today_due_tasks = [
-        task
-        for task in completed_today_tasks
-        if (deadline_date := _task_date(task.deadline)) is not None and deadline_date <= today
-    ]
-    completed_estimated_minutes = sum(
-        _parse_time_to_minutes(task.estimated_time)
-        for task in completed_today_due_tasks
-    )
-    total_estimated_minutes = sum(
-        _parse_time_to_minutes(task.estimated_time)
-        for task in [*today_due_pending_tasks, *completed_today_due_tasks]
-    )
-
-    today_scope_count = len(today_due_pending_tasks) + len(completed_today_due_tasks)
-    progress_count_pct = int(round((len(completed_today_due_tasks) / today_scope_count) * 100)) if today_scope_count else 100
+    total_pending_count = 0
+    today_due_pending_count = 0
+    total_estimated_minutes = 0
+    for bucket, stale, estimated_time, count in pending_rows:
+        total_pending_count += count
+        if stale:
+            stale_count += count
+        if bucket == 'overdue':
+            overdue_count += count
+        elif bucket == 'today':
+            today_count += count
+        elif bucket == 'this_week':
+            this_week_count += count
+        if bucket in ('overdue', 'today'):
+            today_due_pending_count += count
+            total_estimated_minutes += _parse_time_to_minutes(estimated_time) * count
+
+    completed_today_count = 0
+    completed_today_due_count = 0
+    completed_estimated_minutes = 0
+    for due_by_today, estimated_time, count in completed_rows:
+        completed_today_count += count
+        if due_by_today:
+            completed_today_due_count += count
+            completed_estimated_minutes += _parse_time_to_minutes(estimated_time) * count
+    total_estimated_minutes += completed_estimated_minutes
+
+    today_scope_count = today_due_pending_count + completed_today_due_count
+    progress_count_pct = int(round((completed_today_due_count / today_scope_count) * 100)) if today_scope_count else 100
     if not today_scope_count:
         progress_time_pct = 100
     elif total_estimated_minutes:
@@ -329,8 +352,8 @@ def _build_task_board_summary(db: Session, tasks: list[Task]) -> dict[str, int]:
         'overdue_count': overdue_count,
         'today_count': today_count,
         'this_week_count': this_week_count,
-        'completed_today_count': len(completed_today_tasks),
-        'total_pending_count': len(actionable_pending_tasks),
+        'completed_today_count': completed_today_count,
+        'total_pending_count': total_pending_count,
         'total_estimated_minutes': total_estimated_minutes,
         'completed_estimated_minutes': completed_estimated_minutes,
         'stale_count': stale_count,
@@ -346,65 +369,52 @@ def _to_task_response(
     lookup_context: dict[str, dict[int, object]] | None = None,
 ) -> TaskResponse:
     now_dt = datetime.now()
-    context = lookup_context or {}
-    investment_by_id: dict[int, Investment] = context.get('investments', {})  # type: ignore[assignment]
-    instance_by_id: dict[int, WorkflowInstance] = context.get('instances', {})  # type: ignore[assignment]
-    fund_by_id: dict[int, Fund] = context.get('funds', {})  # type: ignore[assignment]
-    gp_entity_by_id: dict[int, GPEntity] = context.get('gp_entities', {})  # type: ignore[assignment]
-    company_by_id: dict[int, PortfolioCompany] = context.get('companies', {})  # type: ignore[assignment]
-    attachment_count_by_task: dict[int, int] = context.get('attachment_counts', {})  # type: ignore[assignment]
+    context = lookup_context if lookup_context is not None else _build_task_lookup_context(db, [task])
+    investment_by_id = context['investments']
+    instance_by_id = context['instances']
+    fund_by_id = context['funds']
+    gp_entity_by_id = context['gp_entities']
+    company_by_id = context['companies']
+    attachment_count_by_task = context['attachment_counts']
 
     payload = TaskResponse.model_validate(task).model_dump()
 
-    investment = None
-    if task.investment_id:
-        investment = investment_by_id.get(task.investment_id) or db.get(Investment, task.investment_id)
+    investment = investment_by_id.get(task.investment_id) if task.investment_id else None
 
     fund_id = task.fund_id or (investment.fund_id if investment else None)
     gp_entity_id = task.gp_entity_id
 
     fund_name = None
     if fund_id:
-        fund = fund_by_id.get(fund_id) or db.get(Fund, fund_id)
+        fund = fund_by_id.get(fund_id)
         fund_name = fund.name if fund else None
 
     gp_entity_name = None
     if gp_entity_id:
-        gp_entity = gp_entity_by_id.get(gp_entity_id) or db.get(GPEntity, gp_entity_id)
+        gp_entity = gp_entity_by_id.get(gp_entity_id)
         gp_entity_name = gp_entity.name if gp_entity else None
 
     company_name = None
     if investment:
-        company = company_by_id.get(investment.company_id) or db.get(PortfolioCompany, investment.company_id)
+        company = company_by_id.get(investment.company_id)
         company_name = company.name if company else None
 
-    workflow_instance = None
-    if task.workflow_instance_id:
-        workflow_instance = (
-            instance_by_id.get(task.workflow_instance_id)
-            or db.get(WorkflowInstance, task.workflow_instance_id)
-        )
+    workflow_instance = instance_by_id.get(task.workflow_instance_id) if task.workflow_instance_id else None
 
     if (not fund_name or not company_name or not gp_entity_name) and workflow_instance:
         instance = workflow_instance
         if not fund_name and instance.fund_id:
-            wf_fund = fund_by_id.get(instance.fund_id) or db.get(Fund, instance.fund_id)
+            wf_fund = fund_by_id.get(instance.fund_id)
             fund_name = wf_fund.name if wf_fund else None
             if fund_id is None:
                 fund_id = instance.fund_id
         if not gp_entity_name and instance.gp_entity_id:
-            gp_entity = (
-                gp_entity_by_id.get(instance.gp_entity_id)
-                or db.get(GPEntity, instance.gp_entity_id)
-            )
+            gp_entity = gp_entity_by_id.get(instance.gp_entity_id)
             gp_entity_name = gp_entity.name if gp_entity else None
             if gp_entity_id is None:
                 gp_entity_id = instance.gp_entity_id
         if not company_name and instance.company_id:
-            wf_company = (
-                company_by_id.get(instance.company_id)
-                or db.get(PortfolioCompany, instance.company_id)
-            )
+            wf_company = company_by_id.get(instance.company_id)
             company_name = wf_company.name if wf_company else None
 
     payload['fund_id'] = fund_id
@@ -414,19 +424,7 @@ def _to_task_response(
     payload['company_name'] = company_name
     payload['workflow_name'] = workflow_instance.name if workflow_instance else None
     payload['stale_days'] = _compute_stale_days(task, now_dt)
-    payload['attachment_count'] = int(
-        attachment_count_by_task.get(task.id)
-        if task.id in attachment_count_by_task
-        else (
-            db.query(func.count(Attachment.id))
-            .filter(
-                Attachment.entity_type == 'task',
-                Attachment.entity_id == task.id,
-            )
-            .scalar()
-            or 0
-        )
-    )
+    payload['attachment_count'] = int(attachment_count_by_task.get(task.id, 0))
     return TaskResponse(**payload)
 
 
@@ -555,13 +553,14 @@ def _sync_workflow_on_task_undo(db: Session, task: Task) -> None:
 
 @router.get('/board', response_model=TaskBoardResponse)
 def get_task_board(
+    response: Response,
     status: str = 'pending',
     year: int | None = None,
     month: int | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
-    summary_source_tasks = db.query(Task).all()
-    summary = _build_task_board_summary(db, summary_source_tasks)
+    summary = _build_task_board_summary(db)
 
     query = db.query(Task)
     if status != 'all':
@@ -576,13 +575,16 @@ def get_task_board(
         if month:
             query = query.filter(extract('month', Task.completed_at) == month)
 
-    tasks = query.order_by(Task.deadline.asc().nullslast(), Task.created_at.asc()).all()
+    # Field projection does not apply to the grouped board payload.
+    listing = keyset_page(query, replace(page, fields=None), sort_column=Task.deadline, id_column=Task.id)
+    tasks = listing.rows
     lookup_context = _build_task_lookup_context(db, tasks)
 
     board: dict[str, list[TaskResponse]] = {'Q1': [], 'Q2': [], 'Q3': [], 'Q4': []}
     for task in tasks:
         if task.quadrant in board:
             board[task.quadrant].append(_to_task_response(db, task, lookup_context))
+    response.headers.update(page_headers(page, listing))
     return {
         'summary': summary,
         **board,
@@ -591,11 +593,13 @@ def get_task_board(
 
 @router.get('', response_model=list[TaskResponse])
 def list_tasks(
+    response: Response,
     quadrant: str | None = None,
     status: str | None = None,
     fund_id: int | None = None,
     gp_entity_id: int | None = None,
     category: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(Task)
@@ -610,9 +614,18 @@ def list_tasks(
     if category:
         query = query.filter(Task.category == category)
 
-    rows = query.order_by(Task.deadline.asc().nullslast(), Task.created_at.asc()).all()
-    lookup_context = _build_task_lookup_context(db, rows)
-    return [_to_task_response(db, row, lookup_context) for row in rows]
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=Task.deadline,
+        id_column=Task.id,
+        allowed_fields=TaskResponse.model_fields,
+    )
+    if listing.projected:
+        return page_response(response, page, listing, listing.rows)
+    lookup_context = _build_task_lookup_context(db, listing.rows)
+    items = [_to_task_response(db, row, lookup_context) for row in listing.rows]
+    return page_response(response, page, listing, items)
 
 
 @router.get('/{task_id}', response_model=TaskResponse)
@@ -3,10 +3,11 @@ from __future__ import annotations
 from collections import defaultdict
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from database import get_db
+from dependencies.pagination import PageParams, keyset_page, page_params, page_response
 from models.fund import Fund
 from models.investment import Investment, PortfolioCompany
 from models.valuation import Valuation
@@ -21,6 +22,7 @@ from schemas.valuation import (
     ValuationResponse,
     ValuationUpdate,
 )
+from services.latest_valuation import latest_valuations
 
 router = APIRouter(tags=["valuations"])
 
@@ -151,7 +153,10 @@ def _list_valuations(
     fund_id: int | None = None,
     company_id: int | None = None,
     method: str | None = None,
-) -> list[ValuationListItem]:
+    page: PageParams | None = None,
+    response: Response | None = None,
+):
+    page = page or PageParams()
     query = db.query(Valuation)
     if investment_id:
         query = query.filter(Valuation.investment_id == investment_id)
@@ -164,8 +169,18 @@ def _list_valuations(
             (Valuation.method == method) | (Valuation.valuation_method == method)
         )
 
-    rows = query.order_by(Valuation.as_of_date.desc(), Valuation.id.desc()).all()
-    return [_row_to_list_item(db, row) for row in rows]
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=Valuation.as_of_date,
+        id_column=Valuation.id,
+        descending=True,
+        allowed_fields=ValuationListItem.model_fields,
+    )
+    items = listing.rows if listing.projected else [_row_to_list_item(db, row) for row in listing.rows]
+    if response is None:
+        return items
+    return page_response(response, page, listing, items)
 
 
 @router.get("/api/valuations/nav-summary", response_model=list[ValuationNavSummaryItem])
@@ -284,15 +299,7 @@ def get_valuation_dashboard(
     fund_id: int | None = None,
     db: Session = Depends(get_db),
 ):
-    query = db.query(Valuation)
-    if fund_id:
-        query = query.filter(Valuation.fund_id == fund_id)
-
-    rows = query.order_by(Valuation.as_of_date.desc(), Valuation.id.desc()).all()
-    latest_by_investment: dict[int, Valuation] = {}
-    for row in rows:
-        if row.investment_id not in latest_by_investment:
-            latest_by_investment[row.investment_id] = row
+    latest_by_investment = latest_valuations(db, fund_ids=[fund_id] if fund_id else None)
 
     items: list[ValuationDashboardItem] = []
     total_nav = 0.0
@@ -336,10 +343,12 @@ def get_valuation_dashboard(
 
 @router.get("/api/valuations", response_model=list[ValuationListItem])
 def list_valuations(
+    response: Response,
     investment_id: int | None = None,
     fund_id: int | None = None,
     company_id: int | None = None,
     method: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     return _list_valuations(
@@ -348,6 +357,8 @@ def list_valuations(
         fund_id=fund_id,
         company_id=company_id,
         method=method,
+        page=page,
+        response=response,
     )
 
 
@@ -2,7 +2,7 @@
 from urllib.parse import unquote
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 
 import json
 
@@ -10,10 +10,11 @@ import re
 from datetime import date, datetime, time
 
 from sqlalchemy import func
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
 
 from database import get_db
 from dependencies.auth import get_current_user
+from dependencies.pagination import PageParams, keyset_page, page_params, page_response
 from models.fund import Fund, LP, LPTransfer
 from models.gp_entity import GPEntity
 from models.investment import Investment, PortfolioCompany
@@ -55,9 +56,10 @@ from schemas.workflow import (
     WorkflowStepLPPaidInInput,
 )
 from services.workflow_service import (
+    WORKFLOW_INSTANCE_GRAPH_OPTIONS,
     calculate_step_date,
     instantiate_workflow,
-    reconcile_workflow_instance_state,
+    load_workflow_instance_graph,
 )
 from services.phase32_defaults import ensure_phase32_defaults
 from services.lp_transfer_service import apply_transfer_by_workflow_instance_id
@@ -1019,7 +1021,7 @@ def instantiate(
             auto_commit=False,
         )
         db.commit()
-        db.refresh(instance)
+        instance = load_workflow_instance_graph(db, instance.id)
         return _build_instance_response(instance, db)
     except Exception:
         db.rollback()
@@ -1030,22 +1032,16 @@ def instantiate(
 @router.get("/api/workflow-instances", response_model=list[WorkflowInstanceResponse])
 
 def list_instances(
+    response: Response,
     status: str = "active",
     investment_id: int | None = None,
     company_id: int | None = None,
     fund_id: int | None = None,
     gp_entity_id: int | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
-    query = db.query(WorkflowInstance).options(
-        selectinload(WorkflowInstance.workflow),
-        selectinload(WorkflowInstance.investment).selectinload(Investment.company),
-        selectinload(WorkflowInstance.company),
-        selectinload(WorkflowInstance.fund),
-        selectinload(WorkflowInstance.gp_entity),
-        selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.step),
-        selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.step_documents),
-    )
+    query = db.query(WorkflowInstance)
     if investment_id is not None:
         query = query.filter(WorkflowInstance.investment_id == investment_id)
     if company_id is not None:
@@ -1055,53 +1051,36 @@ def list_instances(
     if gp_entity_id is not None:
         query = query.filter(WorkflowInstance.gp_entity_id == gp_entity_id)
 
-    instances = query.order_by(WorkflowInstance.created_at.desc()).all()
-
-    needs_commit = False
-    for instance in instances:
-        if reconcile_workflow_instance_state(db, instance):
-            needs_commit = True
-
-    if needs_commit:
-        try:
-            db.commit()
-        except Exception:
-            db.rollback()
-            raise
-
     if status != "all":
-        instances = [instance for instance in instances if instance.status == status]
+        query = query.filter(WorkflowInstance.status == status)
+
+    # Responses are built from loaded relationships, so fields are trimmed rather than selected.
+    listing = keyset_page(
+        query,
+        page,
+        sort_column=WorkflowInstance.created_at,
+        id_column=WorkflowInstance.id,
+        descending=True,
+        allowed_fields=WorkflowInstanceResponse.model_fields,
+        select_columns=False,
+        options=WORKFLOW_INSTANCE_GRAPH_OPTIONS,
+    )
+    instances = listing.rows
 
     lookup_context = _build_instance_lookup_context(instances, db)
-    return [_build_instance_response(i, db, lookup_context=lookup_context) for i in instances]
+    return page_response(
+        response,
+        page,
+        listing,
+        [_build_instance_response(i, db, lookup_context=lookup_context) for i in instances],
+    )
 
 @router.get("/api/workflow-instances/{instance_id}", response_model=WorkflowInstanceResponse)
 def get_instance(instance_id: int, db: Session = Depends(get_db)):
-    instance = (
-        db.query(WorkflowInstance)
-        .options(
-            selectinload(WorkflowInstance.workflow),
-            selectinload(WorkflowInstance.investment).selectinload(Investment.company),
-            selectinload(WorkflowInstance.company),
-            selectinload(WorkflowInstance.fund),
-            selectinload(WorkflowInstance.gp_entity),
-            selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.step),
-            selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.step_documents),
-        )
-        .filter(WorkflowInstance.id == instance_id)
-        .first()
-    )
+    instance = load_workflow_instance_graph(db, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="인스턴스를 찾을 수 없습니다")
-    if reconcile_workflow_instance_state(db, instance):
-        try:
-            db.commit()
-        except Exception:
-            db.rollback()
-            raise
-        db.refresh(instance)
-    lookup_context = _build_instance_lookup_context([instance], db)
-    return _build_instance_response(instance, db, lookup_context=lookup_context)
+    return _build_instance_response(instance, db)
 
 @router.put("/api/workflow-instances/{instance_id}", response_model=WorkflowInstanceResponse)
 def update_instance(
@@ -1109,7 +1088,7 @@ def update_instance(
     data: WorkflowInstanceUpdateRequest,
     db: Session = Depends(get_db),
 ):
-    instance = db.get(WorkflowInstance, instance_id)
+    instance = load_workflow_instance_graph(db, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="인스턴스를 찾을 수 없습니다")
     if instance.status != "active":
@@ -1164,7 +1143,7 @@ def update_instance(
     except Exception:
         db.rollback()
         raise
-    db.refresh(instance)
+    instance = load_workflow_instance_graph(db, instance.id)
 
     return _build_instance_response(instance, db)
 
@@ -1175,7 +1154,7 @@ def swap_instance_template(
     data: WorkflowInstanceSwapTemplateRequest,
     db: Session = Depends(get_db),
 ):
-    instance = db.get(WorkflowInstance, instance_id)
+    instance = load_workflow_instance_graph(db, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="인스턴스를 찾을 수 없습니다")
     if instance.status != "active":
@@ -1311,7 +1290,7 @@ def swap_instance_template(
     except Exception:
         db.rollback()
         raise
-    db.refresh(instance)
+    instance = load_workflow_instance_graph(db, instance.id)
 
     return _build_instance_response(instance, db)
 
@@ -1719,7 +1698,7 @@ async def complete_step(
     if not si or si.instance_id != instance_id:
         raise HTTPException(status_code=404, detail="단계 인스턴스를 찾을 수 없습니다")
 
-    instance = db.get(WorkflowInstance, instance_id)
+    instance = load_workflow_instance_graph(db, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="인스턴스를 찾을 수 없습니다")
     if instance.status != "active":
@@ -1871,7 +1850,7 @@ async def complete_step(
     except Exception:
         db.rollback()
         raise
-    db.refresh(instance)
+    instance = load_workflow_instance_graph(db, instance.id)
 
     try:
         await create_notification(
@@ -1897,7 +1876,7 @@ def undo_step_completion(
     step_instance_id: int,
     db: Session = Depends(get_db),
 ):
-    instance = db.get(WorkflowInstance, instance_id)
+    instance = load_workflow_instance_graph(db, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="인스턴스를 찾을 수 없습니다")
 
@@ -1981,12 +1960,12 @@ def undo_step_completion(
     except Exception:
         db.rollback()
         raise
-    db.refresh(instance)
+    instance = load_workflow_instance_graph(db, instance.id)
     return _build_instance_response(instance, db)
 
 @router.delete("/api/workflow-instances/{instance_id}", status_code=204)
 def delete_instance(instance_id: int, db: Session = Depends(get_db)):
-    instance = db.get(WorkflowInstance, instance_id)
+    instance = load_workflow_instance_graph(db, instance_id)
     if not instance:
         raise HTTPException(status_code=404, detail="인스턴스를 찾을 수 없습니다")
     if (instance.status or "").strip().lower() != "active":
@@ -2049,7 +2028,7 @@ def delete_instance(instance_id: int, db: Session = Depends(get_db)):
 
 @router.patch("/api/workflow-instances/{instance_id}/cancel")
 def cancel_instance(instance_id: int, db: Session = Depends(get_db)):
-    instance = db.get(WorkflowInstance, instance_id)
+    instance = load_workflow_instance_graph(db, instance_id)
 
     if not instance:
 
@@ -2073,7 +2052,7 @@ def cancel_instance(instance_id: int, db: Session = Depends(get_db)):
         db.rollback()
         raise
 
-    db.refresh(instance)
+    instance = load_workflow_instance_graph(db, instance.id)
 
     return _build_instance_response(instance, db)
 
@@ -2081,35 +2060,16 @@ def _build_instance_lookup_context(
     instances: list[WorkflowInstance],
     db: Session,
 ) -> dict[str, dict[int, object]]:
-    investment_ids = {row.investment_id for row in instances if row.investment_id is not None}
-    company_ids = {row.company_id for row in instances if row.company_id is not None}
-    fund_ids = {row.fund_id for row in instances if row.fund_id is not None}
-    gp_entity_ids = {row.gp_entity_id for row in instances if row.gp_entity_id is not None}
-
-    investments: list[Investment] = []
-    if investment_ids:
-        investments = db.query(Investment).filter(Investment.id.in_(investment_ids)).all()
-        company_ids.update(row.company_id for row in investments if row.company_id is not None)
-        fund_ids.update(row.fund_id for row in investments if row.fund_id is not None)
-
-    companies: list[PortfolioCompany] = []
-    if company_ids:
-        companies = db.query(PortfolioCompany).filter(PortfolioCompany.id.in_(company_ids)).all()
-
+    """Funds reached only through an instance's investment; other links come from the graph."""
+    fund_ids = {
+        instance.investment.fund_id
+        for instance in instances
+        if instance.fund is None and instance.investment is not None and instance.investment.fund_id is not None
+    }
     funds: list[Fund] = []
     if fund_ids:
         funds = db.query(Fund).filter(Fund.id.in_(fund_ids)).all()
-
-    gp_entities: list[GPEntity] = []
-    if gp_entity_ids:
-        gp_entities = db.query(GPEntity).filter(GPEntity.id.in_(gp_entity_ids)).all()
-
-    return {
-        "investments": {row.id: row for row in investments},
-        "companies": {row.id: row for row in companies},
-        "funds": {row.id: row for row in funds},
-        "gp_entities": {row.id: row for row in gp_entities},
-    }
+    return {"funds": {row.id: row for row in funds}}
 
 
 def _build_instance_response(
@@ -2175,46 +2135,29 @@ def _build_instance_response(
 
         ))
 
-    context = lookup_context or {}
-    investment_by_id: dict[int, Investment] = context.get("investments", {})  # type: ignore[assignment]
-    company_by_id: dict[int, PortfolioCompany] = context.get("companies", {})  # type: ignore[assignment]
-    fund_by_id: dict[int, Fund] = context.get("funds", {})  # type: ignore[assignment]
-    gp_entity_by_id: dict[int, GPEntity] = context.get("gp_entities", {})  # type: ignore[assignment]
+    context = lookup_context if lookup_context is not None else _build_instance_lookup_context([instance], db)
+    fund_by_id: dict[int, Fund] = context["funds"]  # type: ignore[assignment]
 
     investment_name = None
     company_name = None
     fund_name = None
     gp_entity_name = None
 
-    investment: Investment | None = None
-    if instance.investment_id is not None:
-        investment = investment_by_id.get(instance.investment_id) or instance.investment
-        if investment is None:
-            investment = db.get(Investment, instance.investment_id)
+    investment: Investment | None = instance.investment
 
     company: PortfolioCompany | None = instance.company
-    if company is None and investment and investment.company_id is not None:
-        company = (
-            company_by_id.get(investment.company_id)
-            or getattr(investment, "company", None)
-            or db.get(PortfolioCompany, investment.company_id)
-        )
-    if company is None and instance.company_id is not None:
-        company = company_by_id.get(instance.company_id) or db.get(PortfolioCompany, instance.company_id)
+    if company is None and investment is not None:
+        company = investment.company
     if company:
         company_name = company.name
 
     fund: Fund | None = instance.fund
     if fund is None and investment and investment.fund_id is not None:
-        fund = fund_by_id.get(investment.fund_id) or db.get(Fund, investment.fund_id)
-    if fund is None and instance.fund_id is not None:
-        fund = fund_by_id.get(instance.fund_id) or db.get(Fund, instance.fund_id)
+        fund = fund_by_id.get(investment.fund_id)
     if fund:
         fund_name = fund.name
 
     gp_entity: GPEntity | None = instance.gp_entity
-    if gp_entity is None and instance.gp_entity_id is not None:
-        gp_entity = gp_entity_by_id.get(instance.gp_entity_id) or db.get(GPEntity, instance.gp_entity_id)
     if gp_entity:
         gp_entity_name = gp_entity.name
 
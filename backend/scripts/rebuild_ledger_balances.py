@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+
+from database import SessionLocal
+from services.ledger_aggregation import rebuild_monthly_balances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute materialized monthly ledger balances.")
+    parser.add_argument("--fund-id", type=int, action="append", dest="fund_ids", help="limit to a fund (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = rebuild_monthly_balances(db, args.fund_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print("Ledger monthly balances rebuilt")
+    print(f"rows: {written}")
+
+
+if __name__ == "__main__":
+    main()
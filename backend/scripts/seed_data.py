@@ -37,6 +37,7 @@ from models.workflow import Workflow, WorkflowDocument, WorkflowStep, WorkflowWa
 from models.workflow_instance import WorkflowInstance
 from seed.seed_accounts import seed_accounts
 from seeds.document_templates import seed_document_templates
+from services.ledger_aggregation import post_monthly_balances
 from services.workflow_service import instantiate_workflow
 
 KRW_UNIT_SCALE = 1_000_000
@@ -231,6 +232,7 @@ def reset_seed_data_if_requested(db: Session) -> None:
         "exit_committee_funds",
         "exit_trades",
         "exit_committees",
+        "ledger_monthly_balances",
         "journal_entry_lines",
         "journal_entries",
         "accounts",
@@ -1471,6 +1473,7 @@ def seed_journal_entries(db: Session, funds: list[Fund]) -> list[JournalEntry]:
         JournalEntryLine(journal_entry_id=entry1.id, account_id=equity_invest.id, debit=3000, credit=0, memo="루스바이오 투자"),
         JournalEntryLine(journal_entry_id=entry1.id, account_id=cash.id, debit=0, credit=3000, memo="현금 지출"),
     ])
+    post_monthly_balances(db, entry1)
 
     entry2 = JournalEntry(fund_id=fund.id, entry_date=d("2025-09-01"), entry_type="배당수익", description="루스바이오 배당 수령", status="결재완료")
     db.add(entry2)
@@ -1479,6 +1482,7 @@ def seed_journal_entries(db: Session, funds: list[Fund]) -> list[JournalEntry]:
         JournalEntryLine(journal_entry_id=entry2.id, account_id=cash.id, debit=200, credit=0, memo="배당금 입금"),
         JournalEntryLine(journal_entry_id=entry2.id, account_id=gain.id, debit=0, credit=200, memo="투자수익 인식"),
     ])
+    post_monthly_balances(db, entry2)
 
     db.commit()
     print("[seed] journal entries: created (2 rows)")
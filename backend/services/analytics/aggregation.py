@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException
+
+from services.analytics.common import to_number
+from services.analytics.snapshot_cache import DictionaryColumn, NumberColumn, SubjectSnapshot
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional at runtime
+    np = None  # type: ignore
+
+NUMPY_MIN_ROWS = 20_000
+_NUMPY_AGGREGATES = {"sum", "avg", "min", "max", "count"}
+
+
+@dataclass(frozen=True)
+class AggregationPlan:
+    group_keys: tuple[str, ...]
+    # (field key, aggregate) pairs, in output order.
+    measures: tuple[tuple[str, str], ...]
+
+
+@dataclass
+class AggregatedGroup:
+    first_index: int
+    values: list[Any]
+
+
+class _SumState:
+    __slots__ = ("total", "count")
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        self.total += to_number(value)
+        self.count += 1
+
+
+class _MinMaxState:
+    __slots__ = ("value", "pick")
+
+    def __init__(self, pick) -> None:
+        self.value: float | None = None
+        self.pick = pick
+
+    def add(self, value: Any) -> None:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        number = to_number(value)
+        self.value = number if self.value is None else self.pick(self.value, number)
+
+
+class _CountState:
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        if value is not None:
+            self.count += 1
+
+
+class _DistinctState:
+    __slots__ = ("seen",)
+
+    def __init__(self) -> None:
+        self.seen: set[Any] = set()
+
+    def add(self, value: Any) -> None:
+        if value is not None:
+            self.seen.add(value)
+
+
+def new_state(aggregate: str):
+    if aggregate in {"sum", "avg"}:
+        return _SumState()
+    if aggregate == "min":
+        return _MinMaxState(min)
+    if aggregate == "max":
+        return _MinMaxState(max)
+    if aggregate == "count":
+        return _CountState()
+    if aggregate == "distinct_count":
+        return _DistinctState()
+    raise HTTPException(status_code=400, detail=f"지원하지 않는 집계입니다: {aggregate}")
+
+
+def finalize_state(state, aggregate: str) -> Any:
+    if aggregate == "count":
+        return state.count
+    if aggregate == "distinct_count":
+        return len(state.seen)
+    if aggregate in {"min", "max"}:
+        return 0 if state.value is None else state.value
+    if not state.count:
+        return 0
+    if aggregate == "sum":
+        return round(state.total, 4)
+    return round(state.total / state.count, 4)
+
+
+def aggregate_plans(
+    snapshot: SubjectSnapshot,
+    selection: list[int],
+    plans: list[AggregationPlan],
+) -> dict[AggregationPlan, list[AggregatedGroup]]:
+    results: dict[AggregationPlan, list[AggregatedGroup]] = {}
+    streaming: list[AggregationPlan] = []
+    for plan in dict.fromkeys(plans):
+        if _can_use_numpy(snapshot, selection, plan):
+            results[plan] = _aggregate_with_numpy(snapshot, selection, plan)
+        else:
+            streaming.append(plan)
+    if streaming:
+        results.update(_aggregate_streaming(snapshot, selection, streaming))
+    return results
+
+
+def _aggregate_streaming(
+    snapshot: SubjectSnapshot,
+    selection: list[int],
+    plans: list[AggregationPlan],
+) -> dict[AggregationPlan, list[AggregatedGroup]]:
+    # A single pass over the selection updates per-group accumulators for every plan.
+    work = []
+    for plan in plans:
+        key_readers = [_group_token_reader(snapshot.column(key)) for key in plan.group_keys]
+        measure_readers = [snapshot.column(field_key).value for field_key, _ in plan.measures]
+        aggregates = [aggregate for _, aggregate in plan.measures]
+        work.append((key_readers, measure_readers, aggregates, {}))
+
+    for index in selection:
+        for key_readers, measure_readers, aggregates, groups in work:
+            token = tuple(reader(index) for reader in key_readers)
+            entry = groups.get(token)
+            if entry is None:
+                entry = (index, [new_state(aggregate) for aggregate in aggregates])
+                groups[token] = entry
+            for state, reader in zip(entry[1], measure_readers):
+                state.add(reader(index))
+
+    results = {}
+    for plan, (_, _, aggregates, groups) in zip(plans, work):
+        results[plan] = [
+            AggregatedGroup(
+                first_index=first_index,
+                values=[finalize_state(state, aggregate) for state, aggregate in zip(states, aggregates)],
+            )
+            for first_index, states in groups.values()
+        ]
+    return results
+
+
+def _group_token_reader(column):
+    if isinstance(column, DictionaryColumn):
+        return column.codes.__getitem__
+    return column.value
+
+
+def _can_use_numpy(snapshot: SubjectSnapshot, selection: list[int], plan: AggregationPlan) -> bool:
+    if np is None or len(selection) < NUMPY_MIN_ROWS:
+        return False
+    if any(not isinstance(snapshot.columns.get(key), (DictionaryColumn, NumberColumn)) for key in plan.group_keys):
+        return False
+    for field_key, aggregate in plan.measures:
+        if aggregate not in _NUMPY_AGGREGATES or not isinstance(snapshot.columns.get(field_key), NumberColumn):
+            return False
+    return True
+
+
+def _aggregate_with_numpy(snapshot: SubjectSnapshot, selection: list[int], plan: AggregationPlan) -> list[AggregatedGroup]:
+    rows = np.asarray(selection, dtype=np.int64)
+    if plan.group_keys:
+        key_matrix = np.column_stack([_numpy_group_codes(snapshot.columns[key], rows) for key in plan.group_keys])
+        _, first_positions, inverse = np.unique(key_matrix, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+    else:
+        first_positions = np.zeros(1, dtype=np.int64)
+        inverse = np.zeros(len(rows), dtype=np.int64)
+    group_count = len(first_positions)
+    # np.unique sorts keys; restore first-appearance order to match the streaming path.
+    order = np.argsort(first_positions, kind="stable")
+
+    columns = []
+    for field_key, aggregate in plan.measures:
+        values = np.frombuffer(snapshot.columns[field_key].values, dtype=_numpy_dtype(snapshot.columns[field_key])).astype(np.float64)[rows]
+        columns.append(_numpy_kernel(values, inverse, group_count, aggregate))
+
+    return [
+        AggregatedGroup(
+            first_index=int(rows[first_positions[group]]),
+            values=[column[group] for column in columns],
+        )
+        for group in order
+    ]
+
+
+def _numpy_group_codes(column, rows):
+    if isinstance(column, DictionaryColumn):
+        return np.frombuffer(column.codes, dtype=np.dtype(f"i{column.codes.itemsize}"))[rows].astype(np.int64)
+    values = np.frombuffer(column.values, dtype=_numpy_dtype(column))[rows]
+    return np.unique(values, return_inverse=True)[1].reshape(-1)
+
+
+def _numpy_dtype(column: NumberColumn):
+    if column.values.typecode == "d":
+        return np.float64
+    return np.dtype(f"i{column.values.itemsize}")
+
+
+def _numpy_kernel(values, inverse, group_count: int, aggregate: str) -> list[Any]:
+    if aggregate == "count":
+        return [int(count) for count in np.bincount(inverse, minlength=group_count)]
+    valid = ~np.isnan(values)
+    valid_inverse = inverse[valid]
+    valid_values = values[valid]
+    counts = np.bincount(valid_inverse, minlength=group_count)
+    if aggregate in {"sum", "avg"}:
+        totals = np.bincount(valid_inverse, weights=valid_values, minlength=group_count)
+        if aggregate == "sum":
+            return [round(float(total), 4) if count else 0 for total, count in zip(totals, counts)]
+        return [round(float(total) / int(count), 4) if count else 0 for total, count in zip(totals, counts)]
+    if aggregate == "min":
+        reduced = np.full(group_count, np.inf)
+        np.minimum.at(reduced, valid_inverse, valid_values)
+    else:
+        reduced = np.full(group_count, -np.inf)
+        np.maximum.at(reduced, valid_inverse, valid_values)
+    return [float(value) if count else 0 for value, count in zip(reduced, counts)]
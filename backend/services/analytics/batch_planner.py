@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from database import supports_parallel_sessions
+from schemas.analytics import AnalyticsBatchQueryItem, AnalyticsBatchQueryResult
+from services.analytics.query_service import QueryExecutionContext, run_query
+
+MAX_BATCH_WORKERS = 4
+_BATCH_ERROR_DETAIL = "배치 질의 처리 중 오류가 발생했습니다."
+
+
+def run_query_batch(db: Session, items: list[AnalyticsBatchQueryItem]) -> list[AnalyticsBatchQueryResult]:
+    groups: dict[str, list[tuple[int, AnalyticsBatchQueryItem]]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(item.query.subject_key, []).append((index, item))
+
+    results: list[AnalyticsBatchQueryResult | None] = [None] * len(items)
+    if len(groups) > 1 and supports_parallel_sessions(db.get_bind()):
+        engine = db.get_bind()
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(groups))) as executor:
+            futures = [executor.submit(_run_subject_group_in_session, engine, group) for group in groups.values()]
+            for future in futures:
+                for index, result in future.result():
+                    results[index] = result
+    else:
+        for group in groups.values():
+            for index, result in _run_subject_group(db, group):
+                results[index] = result
+    return [result for result in results if result is not None]
+
+
+def _run_subject_group_in_session(engine, group):
+    with Session(bind=engine) as session:
+        return _run_subject_group(session, group)
+
+
+def _run_subject_group(db: Session, group) -> list[tuple[int, AnalyticsBatchQueryResult]]:
+    context = QueryExecutionContext()
+    for _, item in group:
+        context.expect_query(item.query)
+
+    results = []
+    for index, item in group:
+        try:
+            result = AnalyticsBatchQueryResult(key=item.key, response=run_query(db, item.query, context))
+        except HTTPException as exc:
+            detail = exc.detail if isinstance(exc.detail, str) else _BATCH_ERROR_DETAIL
+            result = AnalyticsBatchQueryResult(key=item.key, error=detail)
+        except Exception:
+            result = AnalyticsBatchQueryResult(key=item.key, error=_BATCH_ERROR_DETAIL)
+        results.append((index, result))
+    return results
+
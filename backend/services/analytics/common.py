@@ -99,6 +99,19 @@ def apply_date_buckets(raw_date: date | datetime | None, prefix: str) -> dict[st
     }
 
 
+def parse_date(value: Any) -> date | None:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        return None
+
+
 def ensure_list(value: Any) -> list[Any]:
     if value is None:
         return []
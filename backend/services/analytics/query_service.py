@@ -1,6 +1,6 @@
 ﻿from __future__ import annotations
 
-import math
+import json
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 from time import perf_counter
@@ -17,27 +17,88 @@ from schemas.analytics import (
     AnalyticsValueSpec,
 )
 from services.analytics.catalog import get_subject_definition
-from services.analytics.common import distinct_count, ensure_list, to_iso, to_number
-
-
-def run_query(db: Session, payload: AnalyticsQueryRequest) -> AnalyticsQueryResponse:
+from services.analytics.aggregation import AggregatedGroup, AggregationPlan, aggregate_plans
+from services.analytics.common import ensure_list, parse_date, to_iso, to_number
+from services.analytics.snapshot_cache import DictionaryColumn, SubjectSnapshot, get_subject_snapshot
+from services.analytics.sql_pushdown import run_pivot_query, run_table_query
+
+_DATE_OPERATORS = {"on", "before", "after", "between", "relative_range"}
+
+
+class QueryExecutionContext:
+    """Shares filtered selections and aggregations between queries on the same snapshot."""
+
+    def __init__(self) -> None:
+        # Snapshots are pinned so their ids stay unique for the context's lifetime.
+        self._snapshots: dict[int, SubjectSnapshot] = {}
+        self._selections: dict[tuple[int, str], list[int]] = {}
+        self._aggregations: dict[tuple[int, str, AggregationPlan], list[AggregatedGroup]] = {}
+        self._expected_plans: dict[tuple[str, str], list[AggregationPlan]] = defaultdict(list)
+
+    def expect_query(self, payload: AnalyticsQueryRequest) -> None:
+        subject = get_subject_definition(payload.subject_key)
+        if subject is None or payload.mode != "pivot":
+            return
+        try:
+            plans = _pivot_plans(subject, payload)
+        except HTTPException:
+            return
+        self._expected_plans[(subject.key, _filter_signature(payload.filters))].extend(plans)
+
+    def selection(self, snapshot: SubjectSnapshot, filters, field_map) -> list[int]:
+        key = (id(snapshot), _filter_signature(filters))
+        self._snapshots[id(snapshot)] = snapshot
+        if key not in self._selections:
+            self._selections[key] = _apply_filters(snapshot, filters, field_map)
+        return self._selections[key]
+
+    def aggregated(self, snapshot: SubjectSnapshot, filters, field_map, plan: AggregationPlan) -> list[AggregatedGroup]:
+        signature = _filter_signature(filters)
+        key = (id(snapshot), signature, plan)
+        if key not in self._aggregations:
+            expected = self._expected_plans.get((snapshot.subject_key, signature), [])
+            pending = [
+                candidate
+                for candidate in dict.fromkeys([plan, *expected])
+                if (id(snapshot), signature, candidate) not in self._aggregations
+            ]
+            selection = self.selection(snapshot, filters, field_map)
+            for candidate, groups in aggregate_plans(snapshot, selection, pending).items():
+                self._aggregations[(id(snapshot), signature, candidate)] = groups
+        return self._aggregations[key]
+
+
+def run_query(
+    db: Session,
+    payload: AnalyticsQueryRequest,
+    context: QueryExecutionContext | None = None,
+) -> AnalyticsQueryResponse:
     started_at = perf_counter()
     subject = get_subject_definition(payload.subject_key)
     if subject is None:
         raise HTTPException(status_code=404, detail="분석 subject를 찾을 수 없습니다.")
 
+    context = context or QueryExecutionContext()
     field_map = subject.field_map
     _validate_payload(subject, payload)
 
-    base_rows = [{**row, "__row_count": 1} for row in subject.load_rows(db)]
-    filtered_rows = _apply_filters(base_rows, payload.filters, field_map)
+    _validate_filters(field_map, payload.filters)
     warnings: list[str] = []
 
     if payload.mode == "table":
         selected_fields = payload.selected_fields or subject.default_table_fields
         _validate_fields(field_map, selected_fields, kind=None)
-        sorted_rows = _apply_sorts(filtered_rows, payload.sorts)
-        limited_rows, truncated = _apply_limit(sorted_rows, payload.options.row_limit)
+        compiled = run_table_query(db, subject, payload, selected_fields)
+        if compiled is not None:
+            limited_rows, result_count = compiled
+        else:
+            snapshot = get_subject_snapshot(db, subject)
+            selection = context.selection(snapshot, payload.filters, field_map)
+            sorted_selection = _sort_selection(snapshot, selection, payload.sorts)
+            limited_selection, _ = _apply_limit(sorted_selection, payload.options.row_limit)
+            limited_rows = [snapshot.row(index, selected_fields) for index in limited_selection]
+            result_count = len(sorted_selection)
+        truncated = result_count > payload.options.row_limit
         if truncated:
             warnings.append(f"상세 행이 {payload.options.row_limit}건으로 제한되었습니다.")
         table_rows = [{field: to_iso(row.get(field)) for field in selected_fields} for row in limited_rows]
@@ -49,7 +110,7 @@ def run_query(db: Session, payload: AnalyticsQueryRequest) -> AnalyticsQueryResp
             execution_ms=int((perf_counter() - started_at) * 1000),
             truncated=truncated,
             warnings=warnings,
-            result_count=len(sorted_rows),
+            result_count=result_count,
         )
         return AnalyticsQueryResponse(
             meta=meta,
@@ -66,23 +127,23 @@ def run_query(db: Session, payload: AnalyticsQueryRequest) -> AnalyticsQueryResp
     _validate_fields(field_map, column_keys, kind="dimension")
     _validate_value_specs(field_map, value_specs)
 
-    grouped_rows = _group_rows(filtered_rows, row_keys, column_keys, value_specs)
-    grouped_rows = _apply_sorts(grouped_rows, payload.sorts)
-    if payload.options.hide_empty:
-        grouped_rows = [row for row in grouped_rows if any(row.get(key) not in (None, "") for key in [*row_keys, *column_keys])]
-    if payload.options.hide_zero:
-        value_aliases = [_measure_alias(spec) for spec in value_specs]
-        grouped_rows = [row for row in grouped_rows if any(to_number(row.get(alias)) != 0 for alias in value_aliases)]
-    total_group_count = len(grouped_rows)
-    grouped_rows, truncated = _apply_limit(grouped_rows, payload.options.row_limit)
+    compiled = run_pivot_query(db, subject, payload, row_keys, column_keys, value_specs, _measure_alias)
+    if compiled is not None:
+        grouped_rows, total_group_count, grand_totals = compiled
+    else:
+        grouped_rows, total_group_count, grand_totals = _run_pivot_in_memory(
+            get_subject_snapshot(db, subject),
+            payload,
+            field_map,
+            row_keys,
+            column_keys,
+            value_specs,
+            context,
+        )
+    truncated = total_group_count > payload.options.row_limit
     if truncated:
         warnings.append(f"피벗 결과가 {payload.options.row_limit}행으로 제한되었습니다.")
 
-    grand_totals = {
-        _measure_alias(spec): _aggregate_rows(filtered_rows, spec.key, spec.aggregate or field_map[spec.key].default_aggregate or "sum")
-        for spec in value_specs
-    }
-
     meta = AnalyticsQueryMeta(
         subject_key=subject.key,
         subject_label=subject.label,
@@ -103,6 +164,58 @@ def run_query(db: Session, payload: AnalyticsQueryRequest) -> AnalyticsQueryResp
     )
 
 
+def _run_pivot_in_memory(
+    snapshot: SubjectSnapshot,
+    payload: AnalyticsQueryRequest,
+    field_map: dict[str, Any],
+    row_keys: list[str],
+    column_keys: list[str],
+    value_specs,
+    context: QueryExecutionContext | None = None,
+) -> tuple[list[dict[str, Any]], int, dict[str, Any]]:
+    context = context or QueryExecutionContext()
+    group_keys = [*row_keys, *column_keys]
+    group_plan, totals_plan = _build_pivot_plans(field_map, group_keys, value_specs)
+    aliases = [_measure_alias(spec) for spec in value_specs]
+    grouped_rows = [
+        {**snapshot.row(group.first_index, group_keys), **dict(zip(aliases, group.values))}
+        for group in context.aggregated(snapshot, payload.filters, field_map, group_plan)
+    ]
+    grouped_rows = _apply_sorts(grouped_rows, payload.sorts)
+    if payload.options.hide_empty:
+        grouped_rows = [row for row in grouped_rows if any(row.get(key) not in (None, "") for key in [*row_keys, *column_keys])]
+    if payload.options.hide_zero:
+        value_aliases = [_measure_alias(spec) for spec in value_specs]
+        grouped_rows = [row for row in grouped_rows if any(to_number(row.get(alias)) != 0 for alias in value_aliases)]
+    total_group_count = len(grouped_rows)
+    grouped_rows, _ = _apply_limit(grouped_rows, payload.options.row_limit)
+
+    totals = context.aggregated(snapshot, payload.filters, field_map, totals_plan)
+    grand_totals = dict(zip(aliases, totals[0].values if totals else [0] * len(aliases)))
+    return grouped_rows, total_group_count, grand_totals
+
+
+def _pivot_plans(subject, payload: AnalyticsQueryRequest) -> tuple[AggregationPlan, AggregationPlan]:
+    field_map = subject.field_map
+    value_specs = list(payload.values) or [AnalyticsValueSpec(**value) for value in subject.default_values]
+    _validate_fields(field_map, payload.rows, kind="dimension")
+    _validate_fields(field_map, payload.columns, kind="dimension")
+    _validate_value_specs(field_map, value_specs)
+    return _build_pivot_plans(field_map, [*payload.rows, *payload.columns], value_specs)
+
+
+def _build_pivot_plans(field_map: dict[str, Any], group_keys: list[str], value_specs) -> tuple[AggregationPlan, AggregationPlan]:
+    group_plan = AggregationPlan(
+        group_keys=tuple(group_keys),
+        measures=tuple((spec.key, spec.aggregate or "sum") for spec in value_specs),
+    )
+    totals_plan = AggregationPlan(
+        group_keys=(),
+        measures=tuple((spec.key, spec.aggregate or field_map[spec.key].default_aggregate or "sum") for spec in value_specs),
+    )
+    return group_plan, totals_plan
+
+
 def _validate_payload(subject, payload: AnalyticsQueryRequest) -> None:
     if payload.mode == "pivot":
         if len(payload.rows) > 4:
@@ -137,14 +250,33 @@ def _validate_value_specs(field_map: dict[str, Any], specs) -> None:
             raise HTTPException(status_code=400, detail=f"{spec.key} 필드는 {aggregate} 집계를 지원하지 않습니다.")
 
 
-def _apply_filters(rows: list[dict[str, Any]], filters, field_map) -> list[dict[str, Any]]:
-    result = rows
+def _validate_filters(field_map: dict[str, Any], filters) -> None:
     for flt in filters:
-        field = field_map.get(flt.field)
-        if field is None:
+        if field_map.get(flt.field) is None:
             raise HTTPException(status_code=400, detail=f"유효하지 않은 필터 필드입니다: {flt.field}")
-        result = [row for row in result if _matches_filter(row.get(flt.field), flt.op, flt.value, flt.value_to)]
-    return result
+
+
+def _apply_filters(snapshot: SubjectSnapshot, filters, field_map) -> list[int]:
+    _validate_filters(field_map, filters)
+    selection = list(range(snapshot.size))
+    for flt in filters:
+        column = snapshot.column(flt.field)
+        if isinstance(column, DictionaryColumn):
+            # Evaluate the predicate once per distinct value, then filter by code.
+            matched = {
+                code
+                for code, value in enumerate(column.dictionary)
+                if _matches_filter(value, flt.op, flt.value, flt.value_to)
+            }
+            codes = column.codes
+            selection = [index for index in selection if codes[index] in matched]
+        else:
+            selection = [
+                index
+                for index in selection
+                if _matches_filter(column.value(index), flt.op, flt.value, flt.value_to)
+            ]
+    return selection
 
 
 def _matches_filter(raw_value: Any, op: str, value: Any, value_to: Any) -> bool:
@@ -159,6 +291,9 @@ def _matches_filter(raw_value: Any, op: str, value: Any, value_to: Any) -> bool:
 
     if isinstance(raw_value, datetime):
         left = raw_value.date()
+    elif isinstance(raw_value, str) and op in _DATE_OPERATORS:
+        # Date buckets such as `*.day` are ISO strings; compare them as dates.
+        left = parse_date(raw_value) or raw_value
     else:
         left = raw_value
 
@@ -185,19 +320,19 @@ def _matches_filter(raw_value: Any, op: str, value: Any, value_to: Any) -> bool:
         return left_num <= right_num
     if op == "between":
         if isinstance(left, date):
-            start = _parse_date(value)
-            end = _parse_date(value_to)
+            start = parse_date(value)
+            end = parse_date(value_to)
             return start is not None and end is not None and start <= left <= end
         left_num = to_number(left)
         return to_number(value) <= left_num <= to_number(value_to)
     if op == "on":
-        target = _parse_date(value)
+        target = parse_date(value)
         return target == left
     if op == "before":
-        target = _parse_date(value)
+        target = parse_date(value)
         return target is not None and isinstance(left, date) and left < target
     if op == "after":
-        target = _parse_date(value)
+        target = parse_date(value)
         return target is not None and isinstance(left, date) and left > target
     if op == "relative_range":
         if not isinstance(left, date):
@@ -218,45 +353,12 @@ def _matches_filter(raw_value: Any, op: str, value: Any, value_to: Any) -> bool:
     return True
 
 
-def _group_rows(rows: list[dict[str, Any]], row_keys: list[str], column_keys: list[str], value_specs) -> list[dict[str, Any]]:
-    grouped: dict[tuple[Any, ...], list[dict[str, Any]]] = defaultdict(list)
-    all_group_keys = [*row_keys, *column_keys]
-    for row in rows:
-        key = tuple(row.get(group_key) for group_key in all_group_keys)
-        grouped[key].append(row)
-
-    result = []
-    for key_tuple, grouped_rows in grouped.items():
-        record: dict[str, Any] = {}
-        for index, field_key in enumerate(all_group_keys):
-            record[field_key] = grouped_rows[0].get(field_key)
-        for spec in value_specs:
-            alias = _measure_alias(spec)
-            aggregate = spec.aggregate or "sum"
-            record[alias] = _aggregate_rows(grouped_rows, spec.key, aggregate)
-        result.append(record)
-    return result
-
-
-def _aggregate_rows(rows: list[dict[str, Any]], field_key: str, aggregate: str) -> Any:
-    values = [row.get(field_key) for row in rows]
-    if aggregate == "count":
-        return sum(1 for value in values if value is not None)
-    if aggregate == "distinct_count":
-        return distinct_count(values)
-
-    numeric_values = [to_number(value) for value in values if value is not None and not (isinstance(value, float) and math.isnan(value))]
-    if not numeric_values:
-        return 0
-    if aggregate == "sum":
-        return round(sum(numeric_values), 4)
-    if aggregate == "avg":
-        return round(sum(numeric_values) / len(numeric_values), 4)
-    if aggregate == "min":
-        return min(numeric_values)
-    if aggregate == "max":
-        return max(numeric_values)
-    raise HTTPException(status_code=400, detail=f"지원하지 않는 집계입니다: {aggregate}")
+def _filter_signature(filters) -> str:
+    return json.dumps(
+        [flt.model_dump(mode="json") if hasattr(flt, "model_dump") else flt for flt in filters or []],
+        sort_keys=True,
+        default=str,
+    )
 
 
 def _measure_alias(spec) -> str:
@@ -272,6 +374,14 @@ def _result_field(field, alias: str | None = None) -> AnalyticsResultField:
     )
 
 
+def _sort_selection(snapshot: SubjectSnapshot, selection: list[int], sorts) -> list[int]:
+    sorted_selection = list(selection)
+    for sort in reversed(list(sorts or [])):
+        column = snapshot.column(sort.field)
+        sorted_selection.sort(key=lambda index: _sort_key(column.value(index)), reverse=sort.direction == "desc")
+    return sorted_selection
+
+
 def _apply_sorts(rows: list[dict[str, Any]], sorts) -> list[dict[str, Any]]:
     sorted_rows = list(rows)
     for sort in reversed(list(sorts or [])):
@@ -289,21 +399,9 @@ def _sort_key(value: Any):
     return (0, 2, str(value))
 
 
-def _apply_limit(rows: list[dict[str, Any]], limit: int) -> tuple[list[dict[str, Any]], bool]:
+def _apply_limit(rows: list[Any], limit: int) -> tuple[list[Any], bool]:
     if len(rows) <= limit:
         return rows, False
     return rows[:limit], True
 
 
-def _parse_date(value: Any) -> date | None:
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, date):
-        return value
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(str(value)).date()
-    except ValueError:
-        return None
-
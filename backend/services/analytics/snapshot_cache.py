@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from array import array
+from dataclasses import dataclass, field as dc_field
+from datetime import date
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from services.analytics.subject_types import SubjectDefinition
+
+SNAPSHOT_TTL_SECONDS = 300
+_DIRTY_TABLES_KEY = "analytics_snapshot_dirty_tables"
+
+_LOCK = threading.Lock()
+# engine -> subject key -> snapshot; engines are weak keys so per-test engines do not leak.
+_SNAPSHOTS: "weakref.WeakKeyDictionary[Any, dict[str, SubjectSnapshot]]" = weakref.WeakKeyDictionary()
+_TABLE_VERSIONS: dict[str, int] = {}
+
+
+class NumberColumn:
+    """Typed array for measures whose values are all ints or all floats."""
+
+    def __init__(self, values: array):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def value(self, index: int) -> Any:
+        return self.values[index]
+
+    def values_at(self, indices: list[int]) -> list[Any]:
+        values = self.values
+        return [values[index] for index in indices]
+
+
+class DictionaryColumn:
+    """Dictionary-encoded column; `codes[i]` indexes into `dictionary`."""
+
+    def __init__(self, codes: array, dictionary: list[Any]):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def value(self, index: int) -> Any:
+        return self.dictionary[self.codes[index]]
+
+    def values_at(self, indices: list[int]) -> list[Any]:
+        codes = self.codes
+        dictionary = self.dictionary
+        return [dictionary[codes[index]] for index in indices]
+
+
+class ObjectColumn:
+    def __init__(self, values: list[Any]):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def value(self, index: int) -> Any:
+        return self.values[index]
+
+    def values_at(self, indices: list[int]) -> list[Any]:
+        values = self.values
+        return [values[index] for index in indices]
+
+
+class _MissingColumn:
+    def __init__(self, size: int):
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def value(self, index: int) -> Any:
+        return None
+
+    def values_at(self, indices: list[int]) -> list[Any]:
+        return [None] * len(indices)
+
+
+@dataclass
+class SubjectSnapshot:
+    subject_key: str
+    size: int
+    columns: dict[str, Any]
+    tables: frozenset[str]
+    table_versions: dict[str, int]
+    built_on: date
+    built_at: float = dc_field(default_factory=monotonic)
+
+    def column(self, key: str):
+        return self.columns.get(key) or _MissingColumn(self.size)
+
+    def row(self, index: int, keys: list[str]) -> dict[str, Any]:
+        return {key: self.column(key).value(index) for key in keys}
+
+    def is_current(self) -> bool:
+        if self.built_on != date.today() or monotonic() - self.built_at > SNAPSHOT_TTL_SECONDS:
+            return False
+        return all(_TABLE_VERSIONS.get(table, 0) == version for table, version in self.table_versions.items())
+
+
+def get_subject_snapshot(db: Session, subject: SubjectDefinition) -> SubjectSnapshot:
+    engine = db.get_bind()
+    with _LOCK:
+        cached = _SNAPSHOTS.get(engine, {}).get(subject.key)
+        if cached is not None and cached.is_current():
+            return cached
+
+    snapshot = build_subject_snapshot(db, subject)
+    if has_uncommitted_writes(db, snapshot.tables):
+        # Built from this session's own uncommitted rows; other sessions must not see it.
+        return snapshot
+    with _LOCK:
+        if snapshot.is_current():
+            _SNAPSHOTS.setdefault(engine, {})[subject.key] = snapshot
+    return snapshot
+
+
+def build_subject_snapshot(db: Session, subject: SubjectDefinition) -> SubjectSnapshot:
+    tables: set[str] = set()
+
+    def _track_tables(orm_execute_state) -> None:
+        for mapper in orm_execute_state.all_mappers:
+            tables.update(table.name for table in mapper.tables)
+
+    with _LOCK:
+        versions_before = dict(_TABLE_VERSIONS)
+    event.listen(db, "do_orm_execute", _track_tables)
+    try:
+        rows = subject.load_rows(db)
+    finally:
+        event.remove(db, "do_orm_execute", _track_tables)
+
+    columns = {key: _encode_column([row.get(key) for row in rows]) for key in _collect_keys(rows)}
+    columns["__row_count"] = NumberColumn(array("q", [1]) * len(rows))
+    return SubjectSnapshot(
+        subject_key=subject.key,
+        size=len(rows),
+        columns=columns,
+        tables=frozenset(tables),
+        table_versions={table: versions_before.get(table, 0) for table in tables},
+        built_on=date.today(),
+    )
+
+
+def invalidate_tables(table_names) -> None:
+    with _LOCK:
+        for table in table_names:
+            _TABLE_VERSIONS[table] = _TABLE_VERSIONS.get(table, 0) + 1
+
+
+def table_versions(table_names) -> dict[str, int]:
+    with _LOCK:
+        return {table: _TABLE_VERSIONS.get(table, 0) for table in table_names}
+
+
+def has_uncommitted_writes(session: Session, table_names) -> bool:
+    """Whether the session has flushed, uncommitted writes to any of the tables."""
+    return bool(session.info.get(_DIRTY_TABLES_KEY, set()) & set(table_names))
+
+
+def clear_snapshot_cache() -> None:
+    with _LOCK:
+        _SNAPSHOTS.clear()
+
+
+def _collect_keys(rows: list[dict[str, Any]]) -> list[str]:
+    keys: dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            keys.setdefault(key, None)
+    return list(keys)
+
+
+def _encode_column(values: list[Any]):
+    if values and all(type(value) is float for value in values):
+        return NumberColumn(array("d", values))
+    if values and all(type(value) is int for value in values):
+        try:
+            return NumberColumn(array("q", values))
+        except OverflowError:
+            return ObjectColumn(values)
+
+    dictionary: list[Any] = []
+    positions: dict[tuple[type, Any], int] = {}
+    codes = array("l")
+    try:
+        for value in values:
+            # Keep True/1/1.0 apart so the decoded value keeps its original type.
+            token = (type(value), value)
+            code = positions.get(token)
+            if code is None:
+                code = len(dictionary)
+                positions[token] = code
+                dictionary.append(value)
+            codes.append(code)
+    except TypeError:
+        return ObjectColumn(values)
+    return DictionaryColumn(codes, dictionary)
+
+
+def _instance_tables(instances) -> set[str]:
+    tables: set[str] = set()
+    for instance in instances:
+        mapper = getattr(instance, "__mapper__", None)
+        if mapper is not None:
+            tables.update(table.name for table in mapper.tables)
+    return tables
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session: Session, flush_context) -> None:
+    tables = _instance_tables([*session.new, *session.dirty, *session.deleted])
+    if not tables:
+        return
+    session.info.setdefault(_DIRTY_TABLES_KEY, set()).update(tables)
+    invalidate_tables(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tables(session: Session) -> None:
+    # Bump again on commit so snapshots rebuilt between flush and commit are discarded too.
+    tables = session.info.pop(_DIRTY_TABLES_KEY, None)
+    if tables:
+        invalidate_tables(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tables(session: Session) -> None:
+    # Snapshots built while the rolled-back writes were visible must not outlive them.
+    tables = session.info.pop(_DIRTY_TABLES_KEY, None)
+    if tables:
+        invalidate_tables(tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_statements(orm_execute_state) -> None:
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        tables = {table.name for mapper in orm_execute_state.all_mappers for table in mapper.tables}
+        orm_execute_state.session.info.setdefault(_DIRTY_TABLES_KEY, set()).update(tables)
+        invalidate_tables(tables)
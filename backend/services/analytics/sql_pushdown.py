@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import calendar
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Boolean, Integer, String, and_, case, cast, false, func, literal_column, or_, select, true
+from sqlalchemy.orm import Session
+
+from services.analytics.common import ensure_list, parse_date, to_number
+from services.analytics.subject_types import SubjectDefinition, SubjectSqlSource
+
+ROW_COUNT_EXPR_KEY = "__row_count"
+_TOTAL_COUNT_LABEL = "__total_count"
+
+
+def sql_date_buckets(column, prefix: str, dialect: str) -> dict[str, Any]:
+    if dialect == "postgresql":
+        year = cast(func.extract("year", column), Integer)
+        month = cast(func.extract("month", column), Integer)
+        day = func.to_char(column, "YYYY-MM-DD", type_=String)
+        year_month = func.to_char(column, "YYYY-MM", type_=String)
+    else:
+        year = cast(func.strftime("%Y", column), Integer)
+        month = cast(func.strftime("%m", column), Integer)
+        day = func.date(column, type_=String)
+        year_month = func.strftime("%Y-%m", column, type_=String)
+    quarter = case(
+        (month <= 3, "Q1"),
+        (month <= 6, "Q2"),
+        (month <= 9, "Q3"),
+        else_="Q4",
+    )
+    return {
+        f"{prefix}.year": year,
+        f"{prefix}.half": case((month <= 6, "H1"), else_="H2"),
+        f"{prefix}.quarter": quarter,
+        f"{prefix}.month": month,
+        f"{prefix}.day": day,
+        f"{prefix}.year_month": year_month,
+        f"{prefix}.year_quarter": cast(year, String).concat("-").concat(quarter),
+    }
+
+
+def resolve_sql_source(db: Session, subject: SubjectDefinition) -> SubjectSqlSource | None:
+    if subject.sql_source is None:
+        return None
+    source = subject.sql_source(db.get_bind().dialect.name)
+    return SubjectSqlSource(
+        from_clause=source.from_clause,
+        id_column=source.id_column,
+        fields={ROW_COUNT_EXPR_KEY: literal_column("1"), **source.fields},
+    )
+
+
+def run_table_query(
+    db: Session,
+    subject: SubjectDefinition,
+    payload,
+    selected_fields: list[str],
+) -> tuple[list[dict[str, Any]], int] | None:
+    source = resolve_sql_source(db, subject)
+    if source is None:
+        return None
+    if any(key not in source.fields for key in selected_fields):
+        return None
+    conditions = _compile_filters(source, payload.filters, subject.field_map)
+    if conditions is None:
+        return None
+    order_by = []
+    for sort in payload.sorts or []:
+        expr = source.fields.get(sort.field)
+        if expr is None:
+            return None
+        order_by.extend(_order_terms(expr, sort.direction))
+    order_by.append(source.id_column.asc())
+
+    columns = [source.fields[key].label(_column_label(index)) for index, key in enumerate(selected_fields)]
+    statement = (
+        select(*columns, func.count().over().label(_TOTAL_COUNT_LABEL))
+        .select_from(source.from_clause)
+        .where(*conditions)
+        .order_by(*order_by)
+        .limit(payload.options.row_limit)
+    )
+    rows: list[dict[str, Any]] = []
+    total_count = 0
+    for record in db.execute(statement).mappings():
+        total_count = int(record[_TOTAL_COUNT_LABEL] or 0)
+        rows.append({key: _plain_value(record[_column_label(index)]) for index, key in enumerate(selected_fields)})
+    return rows, total_count
+
+
+def run_pivot_query(
+    db: Session,
+    subject: SubjectDefinition,
+    payload,
+    row_keys: list[str],
+    column_keys: list[str],
+    value_specs,
+    measure_alias,
+) -> tuple[list[dict[str, Any]], int, dict[str, Any]] | None:
+    source = resolve_sql_source(db, subject)
+    if source is None:
+        return None
+    field_map = subject.field_map
+    group_keys = [*row_keys, *column_keys]
+    if any(key not in source.fields for key in group_keys):
+        return None
+    if any(spec.key not in source.fields for spec in value_specs):
+        return None
+    base_conditions = _compile_filters(source, payload.filters, field_map)
+    if base_conditions is None:
+        return None
+    conditions = list(base_conditions)
+
+    group_exprs = [source.fields[key] for key in group_keys]
+    group_aggregates = {}
+    total_aggregates = {}
+    for spec in value_specs:
+        group_aggregate = spec.aggregate or "sum"
+        total_aggregate = spec.aggregate or field_map[spec.key].default_aggregate or "sum"
+        group_expr = _aggregate_expr(source.fields[spec.key], group_aggregate)
+        total_expr = _aggregate_expr(source.fields[spec.key], total_aggregate)
+        if group_expr is None or total_expr is None:
+            return None
+        group_aggregates[measure_alias(spec)] = (group_aggregate, group_expr)
+        total_aggregates[measure_alias(spec)] = (total_aggregate, total_expr)
+
+    if payload.options.hide_empty:
+        conditions.append(or_(false(), *[_is_present(expr) for expr in group_exprs]))
+    having = []
+    if payload.options.hide_zero:
+        having.append(or_(false(), *[func.coalesce(expr, 0) != 0 for _, expr in group_aggregates.values()]))
+
+    anchor = func.min(source.id_column)
+    order_by = []
+    for sort in payload.sorts or []:
+        if sort.field in group_aggregates:
+            order_by.extend(_order_terms(group_aggregates[sort.field][1], sort.direction))
+        elif sort.field in group_keys:
+            order_by.extend(_order_terms(source.fields[sort.field], sort.direction))
+    order_by.append(anchor.asc())
+
+    labels = {alias: _column_label(index) for index, alias in enumerate([*group_keys, *group_aggregates.keys()])}
+    statement = (
+        select(
+            *[expr.label(labels[key]) for key, expr in zip(group_keys, group_exprs)],
+            *[expr.label(labels[alias]) for alias, (_, expr) in group_aggregates.items()],
+            func.count().over().label(_TOTAL_COUNT_LABEL),
+        )
+        .select_from(source.from_clause)
+        .where(*conditions)
+        .group_by(*group_exprs)
+        .having(*having)
+        .order_by(*order_by)
+        .limit(payload.options.row_limit)
+    )
+    grouped_rows: list[dict[str, Any]] = []
+    total_group_count = 0
+    for record in db.execute(statement).mappings():
+        total_group_count = int(record[_TOTAL_COUNT_LABEL] or 0)
+        item = {key: _plain_value(record[labels[key]]) for key in group_keys}
+        for alias, (aggregate, _) in group_aggregates.items():
+            item[alias] = _aggregate_value(record[labels[alias]], aggregate)
+        grouped_rows.append(item)
+
+    total_labels = {alias: _column_label(index) for index, alias in enumerate(total_aggregates)}
+    totals_statement = (
+        select(*[expr.label(total_labels[alias]) for alias, (_, expr) in total_aggregates.items()])
+        .select_from(source.from_clause)
+        .where(*base_conditions)
+    )
+    totals_record = db.execute(totals_statement).mappings().first() if total_aggregates else None
+    grand_totals = {
+        alias: _aggregate_value(totals_record[total_labels[alias]] if totals_record else None, aggregate)
+        for alias, (aggregate, _) in total_aggregates.items()
+    }
+    return grouped_rows, total_group_count, grand_totals
+
+
+def _column_label(index: int) -> str:
+    return f"c{index}"
+
+
+def _plain_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _aggregate_value(value: Any, aggregate: str) -> Any:
+    if value is None:
+        return 0
+    if aggregate in {"count", "distinct_count"}:
+        return int(value)
+    if aggregate in {"sum", "avg"}:
+        return round(float(value), 4)
+    return float(value)
+
+
+def _aggregate_expr(expr, aggregate: str):
+    if aggregate == "count":
+        return func.count(expr)
+    if aggregate == "distinct_count":
+        return func.count(expr.distinct())
+    if aggregate == "sum":
+        return func.sum(expr)
+    if aggregate == "avg":
+        return func.avg(expr)
+    if aggregate == "min":
+        return func.min(expr)
+    if aggregate == "max":
+        return func.max(expr)
+    return None
+
+
+def _order_terms(expr, direction: str) -> list[Any]:
+    # Python sorting puts None last for asc and first for desc; mirror that explicitly.
+    null_rank = case((expr.is_(None), 1), else_=0)
+    if direction == "desc":
+        return [null_rank.desc(), expr.desc()]
+    return [null_rank.asc(), expr.asc()]
+
+
+def _is_text(expr) -> bool:
+    return isinstance(expr.type, String)
+
+
+def _is_present(expr):
+    if _is_text(expr):
+        return and_(expr.isnot(None), expr != "")
+    return expr.isnot(None)
+
+
+def _compile_filters(source: SubjectSqlSource, filters, field_map) -> list[Any] | None:
+    conditions = []
+    for flt in filters or []:
+        field = field_map.get(flt.field)
+        expr = source.fields.get(flt.field)
+        if field is None or expr is None:
+            return None
+        condition = _compile_filter(expr, field.data_type, flt.op, flt.value, flt.value_to)
+        if condition is None:
+            return None
+        conditions.append(condition)
+    return conditions
+
+
+def _compile_filter(expr, data_type: str, op: str, value: Any, value_to: Any):
+    if op == "is_empty":
+        return or_(expr.is_(None), expr == "") if _is_text(expr) else expr.is_(None)
+    if op == "is_not_empty":
+        return _is_present(expr)
+    if op in {"is_true", "is_false"}:
+        if data_type != "boolean" and not isinstance(expr.type, Boolean):
+            return None
+        truthy = and_(expr.isnot(None), expr == true())
+        return truthy if op == "is_true" else ~truthy
+
+    if data_type == "string":
+        return _compile_text_filter(expr, op, value)
+    if data_type == "number":
+        return _compile_number_filter(expr, op, value, value_to)
+    if data_type == "date":
+        return _compile_date_filter(expr, op, value, value_to)
+    return None
+
+
+def _compile_text_filter(expr, op: str, value: Any):
+    if not _is_text(expr):
+        return None
+    if op == "contains":
+        if value is None:
+            return false()
+        return func.lower(func.coalesce(expr, "")).contains(str(value).lower(), autoescape=True)
+    if op == "starts_with":
+        if value is None:
+            return false()
+        return func.lower(func.coalesce(expr, "")).startswith(str(value).lower(), autoescape=True)
+    if op == "in":
+        options = [str(item) for item in ensure_list(value)]
+        return expr.in_(options) if options else false()
+    if op == "eq":
+        return expr == str(value)
+    if op == "neq":
+        return or_(expr.is_(None), expr != str(value))
+    return None
+
+
+def _compile_number_filter(expr, op: str, value: Any, value_to: Any):
+    if op in {"eq", "neq"}:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if op == "eq":
+            return expr == value
+        return or_(expr.is_(None), expr != value)
+    left = func.coalesce(expr, 0)
+    if op == "gt":
+        return left > to_number(value)
+    if op == "gte":
+        return left >= to_number(value)
+    if op == "lt":
+        return left < to_number(value)
+    if op == "lte":
+        return left <= to_number(value)
+    if op == "between":
+        return and_(left >= to_number(value), left <= to_number(value_to))
+    return None
+
+
+def _compile_date_filter(expr, op: str, value: Any, value_to: Any):
+    # Date fields are exposed as ISO strings, so lexical comparison matches date order.
+    if op == "on":
+        target = parse_date(value)
+        return expr == target.isoformat() if target else false()
+    if op == "before":
+        target = parse_date(value)
+        return expr < target.isoformat() if target else false()
+    if op == "after":
+        target = parse_date(value)
+        return expr > target.isoformat() if target else false()
+    if op == "between":
+        start = parse_date(value)
+        end = parse_date(value_to)
+        if start is None or end is None:
+            return false()
+        return and_(expr >= start.isoformat(), expr <= end.isoformat())
+    if op == "relative_range":
+        bounds = _relative_bounds(str(value))
+        if bounds is None:
+            return false()
+        return and_(expr >= bounds[0].isoformat(), expr <= bounds[1].isoformat())
+    return None
+
+
+def _relative_bounds(range_key: str) -> tuple[date, date] | None:
+    today = date.today()
+    if range_key == "today":
+        return today, today
+    if range_key == "next_7_days":
+        return today, today + timedelta(days=7)
+    if range_key == "next_30_days":
+        return today, today + timedelta(days=30)
+    if range_key == "past_30_days":
+        return today - timedelta(days=30), today
+    if range_key == "this_month":
+        last_day = calendar.monthrange(today.year, today.month)[1]
+        return today.replace(day=1), today.replace(day=last_day)
+    return None
+
@@ -32,6 +32,15 @@ ROW_COUNT_FIELD = SubjectFieldDef(
 )
 
 
+@dataclass(frozen=True)
+class SubjectSqlSource:
+    # Fields missing from `fields` are derived in Python and force the query back onto `load_rows`.
+
+    from_clause: Any
+    id_column: Any
+    fields: dict[str, Any]
+
+
 @dataclass(frozen=True)
 class SubjectDefinition:
     key: str
@@ -43,6 +52,7 @@ class SubjectDefinition:
     default_values: list[dict[str, Any]]
     starter_views: list[dict[str, Any]]
     load_rows: Callable[[Session], list[dict[str, Any]]]
+    sql_source: Callable[[str], SubjectSqlSource] | None = None
 
     @property
     def field_map(self) -> dict[str, SubjectFieldDef]:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from sqlalchemy import Float, cast, func
+
 from models.accounting import Account, JournalEntry, JournalEntryLine
+from models.fund import Fund
 from services.analytics.common import apply_date_buckets
-from services.analytics.subject_types import SubjectDefinition, dimension, measure
+from services.analytics.sql_pushdown import sql_date_buckets
+from services.analytics.subject_types import SubjectDefinition, SubjectSqlSource, dimension, measure
 from services.analytics.subjects.shared import load_reference_maps
 
 
@@ -41,6 +45,30 @@ def load_rows(db):
     return result
 
 
+def sql_source(dialect: str) -> SubjectSqlSource:
+    from_clause = (
+        JournalEntryLine.__table__.join(JournalEntry.__table__, JournalEntry.id == JournalEntryLine.journal_entry_id)
+        .outerjoin(Account.__table__, Account.id == JournalEntryLine.account_id)
+        .outerjoin(Fund.__table__, Fund.id == JournalEntry.fund_id)
+    )
+    debit = cast(func.coalesce(JournalEntryLine.debit, 0), Float)
+    credit = cast(func.coalesce(JournalEntryLine.credit, 0), Float)
+    fields = {
+        "fund.name": Fund.name,
+        "journal.entry_type": JournalEntry.entry_type,
+        "journal.status": JournalEntry.status,
+        "account.code": Account.code,
+        "account.name": Account.name,
+        "account.category": Account.category,
+        "account.sub_category": Account.sub_category,
+        "line.debit": debit,
+        "line.credit": credit,
+        "line.net_amount": debit - credit,
+    }
+    fields.update(sql_date_buckets(JournalEntry.entry_date, "journal.entry_date", dialect))
+    return SubjectSqlSource(from_clause=from_clause, id_column=JournalEntryLine.id, fields=fields)
+
+
 DEFINITION = SubjectDefinition(
     key="journal_entry",
     label="전표 라인",
@@ -73,4 +101,5 @@ DEFINITION = SubjectDefinition(
     default_values=[{"key": "line.net_amount", "aggregate": "sum"}],
     starter_views=[],
     load_rows=load_rows,
+    sql_source=sql_source,
 )
@@ -13,9 +13,9 @@ from models.investment import Investment, InvestmentDocument, PortfolioCompany
 from models.task import Task
 from models.transaction import Transaction
 from models.user import User
-from models.valuation import Valuation
 from models.workflow import Workflow, WorkflowStep
 from models.workflow_instance import WorkflowInstance, WorkflowStepInstance, WorkflowStepInstanceDocument
+from services.latest_valuation import latest_nav_by_fund, latest_valuations
 
 
 def build_name_map(rows: list[Any], value_attr: str = "name") -> dict[int, str | None]:
@@ -83,20 +83,11 @@ def group_distinct_count(rows: list[Any], key_attr: str, distinct_attr: str) ->
 
 
 def latest_valuation_by_investment(db: Session) -> dict[int, Any]:
-    rows = db.query(Valuation).order_by(Valuation.investment_id.asc(), Valuation.as_of_date.desc(), Valuation.id.desc()).all()
-    result: dict[int, Any] = {}
-    for row in rows:
-        if row.investment_id not in result:
-            result[row.investment_id] = row
-    return result
+    return latest_valuations(db)
 
 
 def latest_valuation_totals_by_fund(db: Session) -> dict[int, float]:
-    latest_map = latest_valuation_by_investment(db)
-    totals: dict[int, float] = defaultdict(float)
-    for row in latest_map.values():
-        totals[int(row.fund_id)] += float(row.total_fair_value or row.value or 0)
-    return dict(totals)
+    return latest_nav_by_fund(db)
 
 
 def active_workflow_counts_by_fund(db: Session) -> dict[int, int]:
@@ -1,8 +1,13 @@
 ﻿from __future__ import annotations
 
+from sqlalchemy import Float, cast, func
+
+from models.fund import Fund
+from models.investment import Investment, PortfolioCompany
 from models.transaction import Transaction
 from services.analytics.common import apply_date_buckets
-from services.analytics.subject_types import SubjectDefinition, dimension, measure
+from services.analytics.sql_pushdown import sql_date_buckets
+from services.analytics.subject_types import SubjectDefinition, SubjectSqlSource, dimension, measure
 from services.analytics.subjects.shared import load_reference_maps
 
 
@@ -39,6 +44,33 @@ def load_rows(db):
     return result
 
 
+def sql_source(dialect: str) -> SubjectSqlSource:
+    from_clause = (
+        Transaction.__table__.outerjoin(Fund.__table__, Fund.id == Transaction.fund_id)
+        .outerjoin(PortfolioCompany.__table__, PortfolioCompany.id == Transaction.company_id)
+        .outerjoin(Investment.__table__, Investment.id == Transaction.investment_id)
+    )
+    fields = {
+        "fund.name": Fund.name,
+        "company.name": PortfolioCompany.name,
+        "company.industry": PortfolioCompany.industry,
+        "transaction.type": Transaction.type,
+        "transaction.subtype": Transaction.transaction_subtype,
+        "transaction.counterparty": Transaction.counterparty,
+        "transaction.amount": cast(func.coalesce(Transaction.amount, 0), Float),
+        "transaction.shares_change": cast(func.coalesce(Transaction.shares_change, 0), Float),
+        "transaction.balance_before": cast(func.coalesce(Transaction.balance_before, 0), Float),
+        "transaction.balance_after": cast(func.coalesce(Transaction.balance_after, 0), Float),
+        "transaction.realized_gain": cast(func.coalesce(Transaction.realized_gain, 0), Float),
+        "transaction.cumulative_gain": cast(func.coalesce(Transaction.cumulative_gain, 0), Float),
+        "investment.instrument": Investment.instrument,
+        "investment.status": Investment.status,
+    }
+    fields.update(sql_date_buckets(Transaction.transaction_date, "transaction.date", dialect))
+    fields.update(sql_date_buckets(Transaction.settlement_date, "transaction.settlement_date", dialect))
+    return SubjectSqlSource(from_clause=from_clause, id_column=Transaction.id, fields=fields)
+
+
 DEFINITION = SubjectDefinition(
     key="transaction",
     label="거래",
@@ -90,5 +122,6 @@ DEFINITION = SubjectDefinition(
         }
     ],
     load_rows=load_rows,
+    sql_source=sql_source,
 )
 
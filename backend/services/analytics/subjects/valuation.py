@@ -1,8 +1,13 @@
 ﻿from __future__ import annotations
 
+from sqlalchemy import Float, and_, case, cast, func
+
+from models.fund import Fund
+from models.investment import Investment, PortfolioCompany
 from models.valuation import Valuation
 from services.analytics.common import apply_date_buckets
-from services.analytics.subject_types import SubjectDefinition, dimension, measure
+from services.analytics.sql_pushdown import sql_date_buckets
+from services.analytics.subject_types import SubjectDefinition, SubjectSqlSource, dimension, measure
 from services.analytics.subjects.shared import load_reference_maps
 
 
@@ -38,6 +43,37 @@ def load_rows(db):
     return result
 
 
+def _first_filled(primary, fallback):
+    return case((and_(primary.isnot(None), primary != ""), primary), else_=fallback)
+
+
+def sql_source(dialect: str) -> SubjectSqlSource:
+    from_clause = (
+        Valuation.__table__.outerjoin(Fund.__table__, Fund.id == Valuation.fund_id)
+        .outerjoin(PortfolioCompany.__table__, PortfolioCompany.id == Valuation.company_id)
+        .outerjoin(Investment.__table__, Investment.id == Valuation.investment_id)
+    )
+    fields = {
+        "fund.name": Fund.name,
+        "company.name": PortfolioCompany.name,
+        "company.industry": PortfolioCompany.industry,
+        "valuation.method": _first_filled(Valuation.method, Valuation.valuation_method),
+        "valuation.instrument": _first_filled(Valuation.instrument, Valuation.instrument_type),
+        "valuation.evaluator": Valuation.evaluator,
+        "valuation.value": cast(func.coalesce(Valuation.value, 0), Float),
+        "valuation.prev_value": cast(func.coalesce(Valuation.prev_value, 0), Float),
+        "valuation.change_amount": cast(func.coalesce(Valuation.change_amount, 0), Float),
+        "valuation.change_pct": cast(func.coalesce(Valuation.change_pct, 0), Float),
+        "valuation.total_fair_value": cast(func.coalesce(Valuation.total_fair_value, 0), Float),
+        "valuation.book_value": cast(func.coalesce(Valuation.book_value, 0), Float),
+        "valuation.unrealized_gain_loss": cast(func.coalesce(Valuation.unrealized_gain_loss, 0), Float),
+        "investment.instrument": Investment.instrument,
+        "investment.status": Investment.status,
+    }
+    fields.update(sql_date_buckets(Valuation.as_of_date, "valuation.as_of_date", dialect))
+    return SubjectSqlSource(from_clause=from_clause, id_column=Valuation.id, fields=fields)
+
+
 DEFINITION = SubjectDefinition(
     key="valuation",
     label="평가",
@@ -72,5 +108,6 @@ DEFINITION = SubjectDefinition(
     default_values=[{"key": "valuation.value", "aggregate": "sum"}],
     starter_views=[],
     load_rows=load_rows,
+    sql_source=sql_source,
 )
 
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from database import SessionLocal
+from models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Bounded in-process queue of audit rows, bulk-inserted by a background thread."""
+
+    def __init__(
+        self,
+        *,
+        max_queue: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        session_factory=SessionLocal,
+    ):
+        self.max_queue = max_queue or int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "5000"))
+        self.batch_size = batch_size or int(os.getenv("AUDIT_LOG_BATCH_SIZE", "200"))
+        self.flush_interval = flush_interval or float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "0.5"))
+        self._session_factory = session_factory
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "high_water_mark": 0,
+        }
+        self._last_flush_at: datetime | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._stopped = False
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._thread = None
+        self._stopping.set()
+        if thread is not None:
+            try:
+                self._queue.put_nowait(_STOP)  # type: ignore[arg-type]
+            except queue.Full:
+                pass  # the worker is busy and will notice the stop flag after this batch
+            thread.join(timeout)
+        # Anything enqueued after the worker exited is written inline.
+        self._drain_remaining()
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        """Queue an AuditLog row without blocking; returns False when the row is dropped.
+
+        The worker starts on first use, but after `stop()` rows are dropped until `start()`
+        is called again, so shutdown is final.
+        """
+        with self._lock:
+            if self._stopped:
+                self._metrics["dropped"] += 1
+                return False
+            self._start_locked()
+        row.setdefault("created_at", datetime.utcnow())
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._metrics["dropped"] += 1
+                dropped = self._metrics["dropped"]
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("Audit log queue is full; %s row(s) dropped so far", dropped)
+            return False
+        depth = self._queue.qsize()
+        with self._lock:
+            self._metrics["enqueued"] += 1
+            if depth > self._metrics["high_water_mark"]:
+                self._metrics["high_water_mark"] = depth
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row has been handled; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            if self._thread is None or not self._thread.is_alive():
+                self._drain_remaining()
+                continue
+            time.sleep(0.01)
+        return True
+
+    def get_status(self) -> dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {
+            **metrics,
+            "queued": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "last_flush_at": self._last_flush_at.isoformat() if self._last_flush_at else None,
+        }
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+            elif self._stopping.is_set():
+                return
+
+    def _next_batch(self) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        deadline: float | None = None
+        while len(batch) < self.batch_size:
+            try:
+                if self._stopping.is_set():
+                    item = self._queue.get_nowait()
+                elif deadline is None:
+                    item = self._queue.get(timeout=self.flush_interval)
+                    # Give concurrent requests one flush interval to join the batch.
+                    deadline = time.monotonic() + self.flush_interval
+                else:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch.append(item)
+        return batch
+
+    def _drain_remaining(self) -> None:
+        while True:
+            batch: list[dict[str, Any]] = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    continue
+                batch.append(item)
+            if not batch:
+                return
+            self._write(batch)
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(insert(AuditLog), batch)
+            db.commit()
+            with self._lock:
+                self._metrics["written"] += len(batch)
+                self._metrics["batches"] += 1
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to write %s audit log row(s)", len(batch))
+            with self._lock:
+                self._metrics["failed"] += len(batch)
+        finally:
+            db.close()
+            self._last_flush_at = datetime.utcnow()
+            for _ in batch:
+                self._queue.task_done()
+
+
+_audit_log_writer: AuditLogWriter | None = None
+
+
+def get_audit_log_writer() -> AuditLogWriter:
+    global _audit_log_writer
+    if _audit_log_writer is None:
+        _audit_log_writer = AuditLogWriter()
+    return _audit_log_writer
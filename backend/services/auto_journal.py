@@ -142,7 +142,7 @@ def create_event_journal_entry(
             memo=entry.description,
         )
     )
-    db.flush()
+    post_monthly_balances(db, entry)
     return entry
 
 
@@ -328,6 +328,7 @@ class AutoJournalService:
                 memo=txn.counterparty,
             )
         )
+        post_monthly_balances(db, entry)
 
         txn.journal_entry_id = entry.id
         return entry
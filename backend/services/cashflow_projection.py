@@ -1,14 +1,24 @@
 ﻿from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from datetime import date, timedelta
+from typing import Iterable
 
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from models.fee import ManagementFee
 from models.fund import Fund
-from models.phase3 import CapitalCall, Distribution, ExitTrade
+from models.phase3 import CapitalCall, CapitalCallItem, Distribution, ExitTrade
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional at runtime
+    np = None  # type: ignore
+
+
+MAX_HORIZON_MONTHS = 24
 
 
 @dataclass
@@ -35,6 +45,24 @@ class CashFlowItem:
         }
 
 
+@dataclass(frozen=True)
+class CashflowScenario:
+    """What-if adjustments; only unconfirmed flows dated after today are moved or scaled."""
+
+    call_pacing: float = 1.0
+    call_delay_months: int = 0
+    exit_delay_months: int = 0
+    exit_haircut: float = 0.0
+    # Per fund and per projected month.
+    operating_cost_monthly: float = 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+BASE_SCENARIO = CashflowScenario()
+
+
 def _month_start(value: date) -> date:
     return date(value.year, value.month, 1)
 
@@ -50,196 +78,373 @@ def _end_of_month(value: date) -> date:
     return next_month - timedelta(days=1)
 
 
-def _is_capital_call_confirmed(call: CapitalCall) -> bool:
-    if not call.items:
-        return call.call_date <= date.today()
-    return all(int(item.paid or 0) == 1 for item in call.items)
+def _shift_months(value: date, months: int) -> date:
+    shifted = _add_months(value, months)
+    return shifted.replace(day=min(value.day, _end_of_month(shifted).day))
 
 
-async def project_cashflow(
+def _month_offset(start: date, value: date) -> int:
+    return (value.year - start.year) * 12 + (value.month - start.month)
+
+
+class CashflowBook:
+    """Cashflow items for a set of funds, bucketed by month once and re-projected per scenario."""
+
+    def __init__(
+        self,
+        funds: dict[int, str],
+        items_by_fund: dict[int, list[CashFlowItem]],
+        *,
+        today: date,
+        horizon: int,
+    ):
+        self.funds = funds
+        self.items_by_fund = items_by_fund
+        self.today = today
+        self.horizon = horizon
+        self.months = [_add_months(today, offset) for offset in range(horizon)]
+
+        fund_rows: list[int] = []
+        offsets: list[int] = []
+        inflows: list[float] = []
+        outflows: list[float] = []
+        past: list[bool] = []
+        pending_calls: list[bool] = []
+        pending_exits: list[bool] = []
+        for position, fund_id in enumerate(funds):
+            for row in items_by_fund.get(fund_id, []):
+                pending = not row.is_confirmed and row.date > today
+                fund_rows.append(position)
+                offsets.append(_month_offset(today, row.date))
+                inflows.append(row.inflow)
+                outflows.append(row.outflow)
+                past.append(row.date <= today)
+                pending_calls.append(pending and row.category == "capital_call")
+                pending_exits.append(pending and row.category == "exit")
+
+        if np is not None:
+            self._fund_rows = np.asarray(fund_rows, dtype=np.int64)
+            self._offsets = np.asarray(offsets, dtype=np.int64)
+            self._inflows = np.asarray(inflows, dtype=np.float64)
+            self._outflows = np.asarray(outflows, dtype=np.float64)
+            self._past = np.asarray(past, dtype=bool)
+            self._pending_calls = np.asarray(pending_calls, dtype=bool)
+            self._pending_exits = np.asarray(pending_exits, dtype=bool)
+        else:
+            self._fund_rows = fund_rows
+            self._offsets = offsets
+            self._inflows = inflows
+            self._outflows = outflows
+            self._past = past
+            self._pending_calls = pending_calls
+            self._pending_exits = pending_exits
+
+    def summarize(self, scenario: CashflowScenario = BASE_SCENARIO) -> dict[int, dict]:
+        """Per-fund `current_balance` and `monthly_summary` under `scenario`."""
+        opening, inflow, outflow = self._buckets(scenario)
+        return {
+            fund_id: _summary(opening[position], inflow[position], outflow[position], self.months)
+            for position, fund_id in enumerate(self.funds)
+        }
+
+    def consolidate(self, scenario: CashflowScenario = BASE_SCENARIO) -> dict:
+        """All funds in the book combined into one `current_balance` and `monthly_summary`."""
+        opening, inflow, outflow = self._buckets(scenario)
+        return _summary(
+            sum(opening),
+            [sum(values) for values in zip(*inflow)] if inflow else [0.0] * self.horizon,
+            [sum(values) for values in zip(*outflow)] if outflow else [0.0] * self.horizon,
+            self.months,
+        )
+
+    def project_items(self, fund_id: int, scenario: CashflowScenario = BASE_SCENARIO) -> list[CashFlowItem]:
+        """`fund_id`'s items under `scenario`, matching `summarize`.
+
+        Pending calls and exits are scaled and moved, rows pushed past the horizon are
+        dropped and the projected operating cost is added for every month.
+        """
+        horizon_end = _end_of_month(self.months[-1])
+        items: list[CashFlowItem] = []
+        for row in self.items_by_fund.get(fund_id, []):
+            pending = not row.is_confirmed and row.date > self.today
+            if pending and row.category == "capital_call":
+                row = replace(
+                    row,
+                    date=_shift_months(row.date, scenario.call_delay_months),
+                    inflow=row.inflow * scenario.call_pacing,
+                )
+            elif pending and row.category == "exit":
+                row = replace(
+                    row,
+                    date=_shift_months(row.date, scenario.exit_delay_months),
+                    inflow=row.inflow * (1.0 - scenario.exit_haircut),
+                )
+            if row.date > horizon_end:
+                continue
+            items.append(row)
+
+        operating_cost = float(scenario.operating_cost_monthly or 0)
+        if operating_cost > 0:
+            for month in self.months:
+                items.append(
+                    CashFlowItem(
+                        date=month,
+                        category="operating",
+                        description=f"운영비 ({month.year}-{month.month:02d})",
+                        inflow=0.0,
+                        outflow=operating_cost,
+                        source_id=None,
+                        source_type="projection",
+                        is_confirmed=False,
+                    )
+                )
+        items.sort(key=lambda row: (row.date, row.category, row.source_id or 0))
+        return items
+
+    def _buckets(self, scenario: CashflowScenario) -> tuple[list[float], list[list[float]], list[list[float]]]:
+        """Opening balance per fund and inflow/outflow per (fund, month)."""
+        fund_count = len(self.funds)
+        if np is not None:
+            inflows = self._inflows.copy()
+            offsets = self._offsets.copy()
+            inflows[self._pending_calls] *= scenario.call_pacing
+            offsets[self._pending_calls] += scenario.call_delay_months
+            inflows[self._pending_exits] *= 1.0 - scenario.exit_haircut
+            offsets[self._pending_exits] += scenario.exit_delay_months
+
+            opening = np.bincount(
+                self._fund_rows[self._past],
+                weights=(inflows - self._outflows)[self._past],
+                minlength=fund_count,
+            )
+            visible = (offsets >= 0) & (offsets < self.horizon)
+            cells = self._fund_rows[visible] * self.horizon + offsets[visible]
+            size = fund_count * self.horizon
+            inflow = np.bincount(cells, weights=inflows[visible], minlength=size).reshape(fund_count, self.horizon)
+            outflow = np.bincount(cells, weights=self._outflows[visible], minlength=size).reshape(fund_count, self.horizon)
+            opening, inflow, outflow = opening.tolist(), inflow.tolist(), outflow.tolist()
+        else:
+            opening = [0.0] * fund_count
+            inflow = [[0.0] * self.horizon for _ in range(fund_count)]
+            outflow = [[0.0] * self.horizon for _ in range(fund_count)]
+            for index, position in enumerate(self._fund_rows):
+                amount_in = self._inflows[index]
+                offset = self._offsets[index]
+                if self._pending_calls[index]:
+                    amount_in *= scenario.call_pacing
+                    offset += scenario.call_delay_months
+                elif self._pending_exits[index]:
+                    amount_in *= 1.0 - scenario.exit_haircut
+                    offset += scenario.exit_delay_months
+                if self._past[index]:
+                    opening[position] += amount_in - self._outflows[index]
+                if 0 <= offset < self.horizon:
+                    inflow[position][offset] += amount_in
+                    outflow[position][offset] += self._outflows[index]
+
+        operating_cost = float(scenario.operating_cost_monthly or 0)
+        if operating_cost > 0:
+            # The current month's cost is dated on the 1st, so it is already in the balance.
+            opening = [value - operating_cost for value in opening]
+            outflow = [[value + operating_cost for value in row] for row in outflow]
+        return opening, inflow, outflow
+
+
+def _summary(opening: float, inflow: list[float], outflow: list[float], months: list[date]) -> dict:
+    running_balance = opening
+    monthly_summary = []
+    for month_start, month_inflow, month_outflow in zip(months, inflow, outflow):
+        net = month_inflow - month_outflow
+        running_balance += net
+        monthly_summary.append(
+            {
+                "year_month": f"{month_start.year}-{month_start.month:02d}",
+                "total_inflow": round(month_inflow, 2),
+                "total_outflow": round(month_outflow, 2),
+                "net": round(net, 2),
+                "ending_balance": round(running_balance, 2),
+            }
+        )
+    return {
+        "current_balance": round(opening, 2),
+        "monthly_summary": monthly_summary,
+    }
+
+
+def load_cashflow_book(
     db: Session,
-    fund_id: int,
+    fund_ids: Iterable[int],
     months_ahead: int = 12,
-    operating_cost_monthly: float = 0,
-) -> dict:
-    fund = db.get(Fund, fund_id)
-    if not fund:
-        raise ValueError("fund not found")
-
-    horizon = max(1, min(int(months_ahead or 12), 24))
-    today = date.today()
+    *,
+    today: date | None = None,
+) -> CashflowBook:
+    """Load calls, distributions, fees and exits for all `fund_ids` with one query per source."""
+    fund_ids = list(dict.fromkeys(int(fund_id) for fund_id in fund_ids))
+    horizon = max(1, min(int(months_ahead or 12), MAX_HORIZON_MONTHS))
+    today = today or date.today()
     horizon_end = _end_of_month(_add_months(today, horizon - 1))
 
-    items: list[CashFlowItem] = []
+    funds = {
+        fund_id: name
+        for fund_id, name in (
+            db.query(Fund.id, Fund.name).filter(Fund.id.in_(fund_ids)).all() if fund_ids else []
+        )
+    }
+    funds = {fund_id: funds[fund_id] for fund_id in fund_ids if fund_id in funds}
+    items_by_fund: dict[int, list[CashFlowItem]] = defaultdict(list)
+    if not funds:
+        return CashflowBook(funds, items_by_fund, today=today, horizon=horizon)
+    fund_ids = list(funds)
 
+    item_counts = {
+        call_id: (int(total or 0), int(paid or 0))
+        for call_id, total, paid in (
+            db.query(
+                CapitalCallItem.capital_call_id,
+                func.count(CapitalCallItem.id),
+                func.sum(case((CapitalCallItem.paid == 1, 1), else_=0)),
+            )
+            .join(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id)
+            .filter(CapitalCall.fund_id.in_(fund_ids), CapitalCall.call_date <= horizon_end)
+            .group_by(CapitalCallItem.capital_call_id)
+            .all()
+        )
+    }
     calls = (
-        db.query(CapitalCall)
-        .filter(CapitalCall.fund_id == fund_id, CapitalCall.call_date <= horizon_end)
-        .order_by(CapitalCall.call_date.asc(), CapitalCall.id.asc())
+        db.query(CapitalCall.id, CapitalCall.fund_id, CapitalCall.call_date, CapitalCall.total_amount)
+        .filter(CapitalCall.fund_id.in_(fund_ids), CapitalCall.call_date <= horizon_end)
         .all()
     )
-    for row in calls:
-        amount = float(row.total_amount or 0)
+    for call_id, fund_id, call_date, total_amount in calls:
+        amount = float(total_amount or 0)
         if amount <= 0:
             continue
-        confirmed = _is_capital_call_confirmed(row)
-        items.append(
+        total, paid = item_counts.get(call_id, (0, 0))
+        confirmed = call_date <= today if total == 0 else paid == total
+        items_by_fund[fund_id].append(
             CashFlowItem(
-                date=row.call_date,
+                date=call_date,
                 category="capital_call",
-                description=f"자본금 콜 #{row.id}",
+                description=f"자본금 콜 #{call_id}",
                 inflow=amount,
                 outflow=0.0,
-                source_id=row.id,
+                source_id=call_id,
                 source_type="capital_call",
                 is_confirmed=confirmed,
             )
         )
 
     distributions = (
-        db.query(Distribution)
-        .filter(Distribution.fund_id == fund_id, Distribution.dist_date <= horizon_end)
-        .order_by(Distribution.dist_date.asc(), Distribution.id.asc())
+        db.query(Distribution.id, Distribution.fund_id, Distribution.dist_date, Distribution.principal_total, Distribution.profit_total)
+        .filter(Distribution.fund_id.in_(fund_ids), Distribution.dist_date <= horizon_end)
         .all()
     )
-    for row in distributions:
-        amount = float(row.principal_total or 0) + float(row.profit_total or 0)
+    for distribution_id, fund_id, dist_date, principal_total, profit_total in distributions:
+        amount = float(principal_total or 0) + float(profit_total or 0)
         if amount <= 0:
             continue
-        items.append(
+        items_by_fund[fund_id].append(
             CashFlowItem(
-                date=row.dist_date,
+                date=dist_date,
                 category="distribution",
-                description=f"배분 #{row.id}",
+                description=f"배분 #{distribution_id}",
                 inflow=0.0,
                 outflow=amount,
-                source_id=row.id,
+                source_id=distribution_id,
                 source_type="distribution",
-                is_confirmed=row.dist_date <= today,
+                is_confirmed=dist_date <= today,
             )
         )
 
     fees = (
-        db.query(ManagementFee)
-        .filter(ManagementFee.fund_id == fund_id)
-        .order_by(ManagementFee.year.asc(), ManagementFee.quarter.asc(), ManagementFee.id.asc())
+        db.query(ManagementFee.id, ManagementFee.fund_id, ManagementFee.year, ManagementFee.quarter, ManagementFee.fee_amount, ManagementFee.status)
+        .filter(ManagementFee.fund_id.in_(fund_ids))
         .all()
     )
-    for row in fees:
-        base_month = ((int(row.quarter or 1) - 1) * 3) + 1
-        fee_date = date(int(row.year or today.year), min(max(base_month, 1), 12), 1)
+    for fee_id, fund_id, year, quarter, fee_amount, status in fees:
+        base_month = ((int(quarter or 1) - 1) * 3) + 1
+        fee_date = date(int(year or today.year), min(max(base_month, 1), 12), 1)
         if fee_date > horizon_end:
             continue
-        amount = float(row.fee_amount or 0)
+        amount = float(fee_amount or 0)
         if amount <= 0:
             continue
-        status = (row.status or "").strip().lower()
-        confirmed = status in {"수령", "received", "완료"}
-        items.append(
+        confirmed = (status or "").strip().lower() in {"수령", "received", "완료"}
+        items_by_fund[fund_id].append(
             CashFlowItem(
                 date=fee_date,
                 category="mgmt_fee",
-                description=f"관리보수 {row.year}Q{row.quarter}",
+                description=f"관리보수 {year}Q{quarter}",
                 inflow=0.0,
                 outflow=amount,
-                source_id=row.id,
+                source_id=fee_id,
                 source_type="management_fee",
                 is_confirmed=confirmed,
             )
         )
 
     exits = (
-        db.query(ExitTrade)
-        .filter(ExitTrade.fund_id == fund_id, ExitTrade.trade_date <= horizon_end)
-        .order_by(ExitTrade.trade_date.asc(), ExitTrade.id.asc())
+        db.query(
+            ExitTrade.id,
+            ExitTrade.fund_id,
+            ExitTrade.trade_date,
+            ExitTrade.settlement_date,
+            ExitTrade.settlement_status,
+            ExitTrade.settlement_amount,
+            ExitTrade.net_amount,
+        )
+        .filter(ExitTrade.fund_id.in_(fund_ids), ExitTrade.trade_date <= horizon_end)
         .all()
     )
-    for row in exits:
+    for exit_id, fund_id, trade_date, settlement_date, settlement_status, settlement_amount, net_amount in exits:
         amount = float(
-            row.settlement_amount
-            if row.settlement_status == "정산완료" and row.settlement_amount is not None
-            else row.net_amount if row.net_amount is not None else 0
+            settlement_amount
+            if settlement_status == "정산완료" and settlement_amount is not None
+            else net_amount if net_amount is not None else 0
         )
         if amount <= 0:
             continue
-        occurred_at = row.settlement_date or row.trade_date
+        occurred_at = settlement_date or trade_date
         if occurred_at > horizon_end:
             continue
-        is_settled = (row.settlement_status or "").strip() == "정산완료"
-        items.append(
+        items_by_fund[fund_id].append(
             CashFlowItem(
                 date=occurred_at,
                 category="exit",
-                description=f"엑시트 #{row.id}",
+                description=f"엑시트 #{exit_id}",
                 inflow=amount,
                 outflow=0.0,
-                source_id=row.id,
+                source_id=exit_id,
                 source_type="exit_trade",
-                is_confirmed=is_settled,
+                is_confirmed=(settlement_status or "").strip() == "정산완료",
             )
         )
 
-    operating_cost = float(operating_cost_monthly or 0)
-    if operating_cost > 0:
-        for offset in range(horizon):
-            month = _add_months(today, offset)
-            items.append(
-                CashFlowItem(
-                    date=month,
-                    category="operating",
-                    description=f"운영비 ({month.year}-{month.month:02d})",
-                    inflow=0.0,
-                    outflow=operating_cost,
-                    source_id=None,
-                    source_type="projection",
-                    is_confirmed=False,
-                )
-            )
+    for rows in items_by_fund.values():
+        rows.sort(key=lambda row: (row.date, row.category, row.source_id or 0))
+    return CashflowBook(funds, items_by_fund, today=today, horizon=horizon)
 
-    items.sort(key=lambda row: (row.date, row.category, row.source_id or 0))
-
-    current_balance = 0.0
-    for row in items:
-        if row.date <= today:
-            current_balance += row.inflow - row.outflow
-
-    month_map: dict[str, dict[str, float]] = defaultdict(lambda: {
-        "total_inflow": 0.0,
-        "total_outflow": 0.0,
-        "net": 0.0,
-        "ending_balance": 0.0,
-    })
-
-    running_balance = current_balance
-    for offset in range(horizon):
-        month_start = _add_months(today, offset)
-        month_key = f"{month_start.year}-{month_start.month:02d}"
-        month_end = _end_of_month(month_start)
-        month_items = [row for row in items if month_start <= row.date <= month_end]
-
-        inflow = sum(row.inflow for row in month_items)
-        outflow = sum(row.outflow for row in month_items)
-        net = inflow - outflow
-        running_balance += net
 
-        summary = month_map[month_key]
-        summary["total_inflow"] = round(inflow, 2)
-        summary["total_outflow"] = round(outflow, 2)
-        summary["net"] = round(net, 2)
-        summary["ending_balance"] = round(running_balance, 2)
+async def project_cashflow(
+    db: Session,
+    fund_id: int,
+    months_ahead: int = 12,
+    operating_cost_monthly: float = 0,
+    scenario: CashflowScenario | None = None,
+) -> dict:
+    book = load_cashflow_book(db, [fund_id], months_ahead)
+    if fund_id not in book.funds:
+        raise ValueError("fund not found")
 
-    monthly_summary = [
-        {
-            "year_month": key,
-            **value,
-        }
-        for key, value in sorted(month_map.items())
-    ]
+    operating_cost = float(operating_cost_monthly or 0)
+    scenario = scenario or BASE_SCENARIO
+    if operating_cost > 0:
+        scenario = CashflowScenario(**{**scenario.as_dict(), "operating_cost_monthly": operating_cost})
+    projection = book.summarize(scenario)[fund_id]
 
     return {
-        "fund_id": fund.id,
-        "fund_name": fund.name,
-        "current_balance": round(current_balance, 2),
-        "monthly_summary": monthly_summary,
-        "items": [row.to_dict() for row in items],
+        "fund_id": fund_id,
+        "fund_name": book.funds[fund_id],
+        **projection,
+        "items": [row.to_dict() for row in book.project_items(fund_id, scenario)],
     }
@@ -106,7 +106,7 @@ class ComplianceEvidenceEngine:
         if not normalized_query:
             raise ValueError("query is required")
 
-        evidence_candidates = self._get_vector_db().search_with_scope(
+        evidence_candidates = await self._get_vector_db().asearch_with_scope(
             query=normalized_query,
             fund_id=fund_id,
             fund_type=(fund.type or "").strip() or None,
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
+from functools import cached_property
+
 from sqlalchemy import func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from models.compliance import (
     ComplianceCheck,
@@ -10,11 +12,86 @@ from models.compliance import (
     FundComplianceRule,
 )
 from models.fund import Fund, LP
-from models.investment import Investment, PortfolioCompany
+from models.investment import Investment
 from models.regular_report import RegularReport
 from models.task import Task
 
 
+REMEDIATION_TASK_SOURCE = "compliance_rule_engine"
+_LEAF_RULE_TYPES = {"exists", "range", "deadline", "cross_validate"}
+
+
+class FundEvaluationContext:
+    """Fund data shared by every rule evaluated in one pass; each piece is loaded once, on first use."""
+
+    def __init__(self, db: Session, fund_id: int):
+        self.db = db
+        self.fund_id = fund_id
+        self._document_hits: dict[str, bool] = {}
+        self._rules_by_code: dict[str, FundComplianceRule | None] = {}
+        # Leaf rule results keyed by rule id, so composites reuse rather than re-evaluate children.
+        self.leaf_checks: dict[int, ComplianceCheck] = {}
+
+    @cached_property
+    def fund(self) -> Fund | None:
+        return self.db.get(Fund, self.fund_id)
+
+    @cached_property
+    def investments(self) -> list[Investment]:
+        return (
+            self.db.query(Investment)
+            .options(joinedload(Investment.company))
+            .filter(Investment.fund_id == self.fund_id)
+            .order_by(Investment.id.asc())
+            .all()
+        )
+
+    @cached_property
+    def lp_commitment_sum(self) -> float:
+        return float(
+            self.db.query(func.coalesce(func.sum(LP.commitment), 0))
+            .filter(LP.fund_id == self.fund_id)
+            .scalar()
+            or 0
+        )
+
+    @cached_property
+    def next_report(self) -> RegularReport | None:
+        return (
+            self.db.query(RegularReport)
+            .filter(RegularReport.fund_id == self.fund_id, RegularReport.due_date.isnot(None))
+            .order_by(RegularReport.due_date.asc())
+            .first()
+        )
+
+    def has_document(self, needle: str) -> bool:
+        if needle not in self._document_hits:
+            query = self.db.query(ComplianceDocument.id).filter(ComplianceDocument.is_active == True)
+            if needle:
+                like = f"%{needle}%"
+                query = query.filter(
+                    or_(
+                        ComplianceDocument.title.ilike(like),
+                        ComplianceDocument.document_type.ilike(like),
+                    )
+                )
+            self._document_hits[needle] = query.first() is not None
+        return self._document_hits[needle]
+
+    def active_rules(self, rule_codes: list[str]) -> dict[str, FundComplianceRule]:
+        missing = [code for code in rule_codes if code not in self._rules_by_code]
+        if missing:
+            rows = (
+                self.db.query(FundComplianceRule)
+                .filter(FundComplianceRule.rule_code.in_(missing), FundComplianceRule.is_active == True)
+                .all()
+            )
+            found = {row.rule_code: row for row in rows}
+            for code in missing:
+                self._rules_by_code[code] = found.get(code)
+        return {code: self._rules_by_code[code] for code in rule_codes if self._rules_by_code.get(code) is not None}
+
+
 class ComplianceRuleEngine:
     """L1~L5 compliance rule evaluation engine."""
 
@@ -24,11 +101,21 @@ class ComplianceRuleEngine:
         rule: FundComplianceRule,
         fund_id: int,
         db: Session,
+        context: FundEvaluationContext | None = None,
         _visited: set[str] | None = None,
     ) -> ComplianceCheck:
+        context = context or FundEvaluationContext(db, fund_id)
         condition = self._safe_condition(rule.condition)
         rule_type = str(condition.get("type") or "").strip().lower()
 
+        if rule_type in _LEAF_RULE_TYPES:
+            check = context.leaf_checks.get(rule.id) if rule.id is not None else None
+            if check is None:
+                check = self._evaluate_leaf(rule=rule, fund_id=fund_id, rule_type=rule_type, condition=condition, context=context)
+                if rule.id is not None:
+                    context.leaf_checks[rule.id] = check
+            return check
+
         visited = _visited or set()
         if rule.rule_code:
             if rule.rule_code in visited:
@@ -40,20 +127,13 @@ class ComplianceRuleEngine:
                 )
             visited = {*(visited or set()), rule.rule_code}
 
-        if rule_type == "exists":
-            return self._evaluate_l1_exists(rule=rule, fund_id=fund_id, condition=condition, db=db)
-        if rule_type == "range":
-            return self._evaluate_l2_range(rule=rule, fund_id=fund_id, condition=condition, db=db)
-        if rule_type == "deadline":
-            return self._evaluate_l3_deadline(rule=rule, fund_id=fund_id, condition=condition, db=db)
-        if rule_type == "cross_validate":
-            return self._evaluate_l4_cross(rule=rule, fund_id=fund_id, condition=condition, db=db)
         if rule_type == "composite":
             return self._evaluate_l5_composite(
                 rule=rule,
                 fund_id=fund_id,
                 condition=condition,
                 db=db,
+                context=context,
                 visited=visited,
             )
 
@@ -83,33 +163,105 @@ class ComplianceRuleEngine:
             .all()
         )
 
-        results: list[ComplianceCheck] = []
+        context = FundEvaluationContext(db, fund_id)
+        evaluated: list[tuple[FundComplianceRule, ComplianceCheck]] = []
         try:
             for rule in rules:
-                check = self.evaluate_rule(rule=rule, fund_id=fund_id, db=db)
+                check = self.evaluate_rule(rule=rule, fund_id=fund_id, db=db, context=context)
                 check.trigger_type = trigger_type
                 check.trigger_source = trigger_source
                 check.trigger_source_id = trigger_source_id
-                db.add(check)
-                db.flush()
-
-                if check.result in {"fail", "error"} and bool(rule.auto_task):
-                    self._create_remediation_task(
-                        check=check,
-                        rule=rule,
-                        fund_id=fund_id,
-                        trigger_source=trigger_source,
-                        trigger_source_id=trigger_source_id,
-                        db=db,
-                    )
-                results.append(check)
+                evaluated.append((rule, check))
 
+            self.save_checks(
+                db=db,
+                fund_id=fund_id,
+                evaluated=evaluated,
+                trigger_source=trigger_source,
+                trigger_source_id=trigger_source_id,
+            )
             db.commit()
         except Exception:
             db.rollback()
             raise
 
-        return results
+        return [check for _, check in evaluated]
+
+    def save_checks(
+        self,
+        *,
+        db: Session,
+        fund_id: int,
+        evaluated: list[tuple[FundComplianceRule, ComplianceCheck]],
+        trigger_source: str | None,
+        trigger_source_id: int | None,
+    ) -> None:
+        """Add checks and any remediation tasks for failures with at most two flushes."""
+        failing = [
+            (rule, check)
+            for rule, check in evaluated
+            if check.result in {"fail", "error"} and bool(rule.auto_task)
+        ]
+        if failing:
+            titles = {self._remediation_title(rule) for rule, _ in failing}
+            open_tasks: dict[str, Task] = {}
+            # Ascending scan so the newest open task per title wins.
+            for task in (
+                db.query(Task)
+                .filter(
+                    Task.fund_id == fund_id,
+                    Task.source == REMEDIATION_TASK_SOURCE,
+                    Task.status.in_(["pending", "in_progress"]),
+                    Task.title.in_(titles),
+                )
+                .order_by(Task.id.asc())
+            ):
+                open_tasks[task.title] = task
+
+            assignments: list[tuple[ComplianceCheck, Task]] = []
+            for rule, check in failing:
+                title = self._remediation_title(rule)
+                task = open_tasks.get(title)
+                if task is None:
+                    task = Task(
+                        title=title,
+                        memo=check.detail,
+                        deadline=datetime.utcnow() + timedelta(days=3),
+                        estimated_time="1h",
+                        quadrant="Q1",
+                        status="pending",
+                        category="compliance",
+                        fund_id=fund_id,
+                        investment_id=(trigger_source_id if trigger_source == "investment_create" else None),
+                        auto_generated=True,
+                        source=REMEDIATION_TASK_SOURCE,
+                    )
+                    db.add(task)
+                    open_tasks[title] = task
+                assignments.append((check, task))
+            db.flush()
+            for check, task in assignments:
+                check.remediation_task_id = task.id
+
+        db.add_all([check for _, check in evaluated])
+        db.flush()
+
+    def _evaluate_leaf(
+        self,
+        *,
+        rule: FundComplianceRule,
+        fund_id: int,
+        rule_type: str,
+        condition: dict,
+        context: FundEvaluationContext,
+    ) -> ComplianceCheck:
+        if rule_type == "exists":
+            return self._evaluate_l1_exists(rule=rule, fund_id=fund_id, condition=condition, context=context)
+        if rule_type == "range":
+            return self._evaluate_l2_range(rule=rule, fund_id=fund_id, condition=condition, context=context)
+        if rule_type == "deadline":
+            return self._evaluate_l3_deadline(rule=rule, fund_id=fund_id, condition=condition, context=context)
+        return self._evaluate_l4_cross(rule=rule, fund_id=fund_id, condition=condition, context=context)
 
     def _evaluate_l1_exists(
         self,
@@ -117,21 +269,12 @@ class ComplianceRuleEngine:
         rule: FundComplianceRule,
         fund_id: int,
         condition: dict,
-        db: Session,
+        context: FundEvaluationContext,
     ) -> ComplianceCheck:
         target = str(condition.get("target") or "").strip().lower()
         if target == "document":
             needle = str(condition.get("document_type") or condition.get("document_name") or "").strip()
-            query = db.query(ComplianceDocument).filter(ComplianceDocument.is_active == True)
-            if needle:
-                like = f"%{needle}%"
-                query = query.filter(
-                    or_(
-                        ComplianceDocument.title.ilike(like),
-                        ComplianceDocument.document_type.ilike(like),
-                    )
-                )
-            exists = query.first() is not None
+            exists = context.has_document(needle)
             if exists:
                 return self._result(
                     rule=rule,
@@ -148,12 +291,7 @@ class ComplianceRuleEngine:
             )
 
         if target == "investment":
-            count = (
-                db.query(func.count(Investment.id))
-                .filter(Investment.fund_id == fund_id)
-                .scalar()
-                or 0
-            )
+            count = len(context.investments)
             if int(count) > 0:
                 return self._result(rule=rule, fund_id=fund_id, result="pass", actual_value=str(int(count)))
             return self._violation(
@@ -177,14 +315,14 @@ class ComplianceRuleEngine:
         rule: FundComplianceRule,
         fund_id: int,
         condition: dict,
-        db: Session,
+        context: FundEvaluationContext,
     ) -> ComplianceCheck:
         target = str(condition.get("target") or "").strip().lower()
         max_val = self._to_float(condition.get("max"))
         min_val = self._to_float(condition.get("min"))
 
         if target == "investment_ratio":
-            fund = db.get(Fund, fund_id)
+            fund = context.fund
             commitment_total = float((fund.commitment_total if fund else 0) or 0)
             if commitment_total <= 0:
                 return self._violation(
@@ -195,14 +333,13 @@ class ComplianceRuleEngine:
                     detail="Fund commitment_total is missing or zero.",
                 )
 
-            rows = db.query(Investment).filter(Investment.fund_id == fund_id).all()
             worst_ratio = 0.0
             worst_name = ""
-            for inv in rows:
+            for inv in context.investments:
                 ratio = float(inv.amount or 0) / commitment_total
                 if ratio >= worst_ratio:
                     worst_ratio = ratio
-                    company = db.get(PortfolioCompany, inv.company_id)
+                    company = inv.company
                     worst_name = company.name if company else f"company#{inv.company_id}"
 
             if max_val is not None and worst_ratio > max_val:
@@ -245,19 +382,14 @@ class ComplianceRuleEngine:
         rule: FundComplianceRule,
         fund_id: int,
         condition: dict,
-        db: Session,
+        context: FundEvaluationContext,
     ) -> ComplianceCheck:
         target = str(condition.get("target") or "").strip().lower()
         days_before = int(condition.get("days_before") or 0)
         today = date.today()
 
         if target in {"quarterly_report", "report"}:
-            row = (
-                db.query(RegularReport)
-                .filter(RegularReport.fund_id == fund_id, RegularReport.due_date.isnot(None))
-                .order_by(RegularReport.due_date.asc())
-                .first()
-            )
+            row = context.next_report
             if not row or not row.due_date:
                 return self._result(
                     rule=rule,
@@ -306,20 +438,15 @@ class ComplianceRuleEngine:
         rule: FundComplianceRule,
         fund_id: int,
         condition: dict,
-        db: Session,
+        context: FundEvaluationContext,
     ) -> ComplianceCheck:
         source = str(condition.get("source") or "").strip().lower()
         target = str(condition.get("target") or "").strip().lower()
         tolerance = abs(self._to_float(condition.get("tolerance")) or 0.0)
 
         if source == "lp_commitment_sum" and target == "fund_commitment_total":
-            lp_sum = float(
-                db.query(func.coalesce(func.sum(LP.commitment), 0))
-                .filter(LP.fund_id == fund_id)
-                .scalar()
-                or 0
-            )
-            fund = db.get(Fund, fund_id)
+            lp_sum = context.lp_commitment_sum
+            fund = context.fund
             fund_commitment = float((fund.commitment_total if fund else 0) or 0)
             diff = abs(lp_sum - fund_commitment)
             if diff > tolerance:
@@ -352,6 +479,7 @@ class ComplianceRuleEngine:
         fund_id: int,
         condition: dict,
         db: Session,
+        context: FundEvaluationContext,
         visited: set[str],
     ) -> ComplianceCheck:
         rule_codes = [str(item).strip() for item in (condition.get("rules") or []) if str(item).strip()]
@@ -365,12 +493,7 @@ class ComplianceRuleEngine:
                 detail="Composite rule has no child rules.",
             )
 
-        child_rules = (
-            db.query(FundComplianceRule)
-            .filter(FundComplianceRule.rule_code.in_(rule_codes), FundComplianceRule.is_active == True)
-            .all()
-        )
-        child_map = {row.rule_code: row for row in child_rules}
+        child_map = context.active_rules(rule_codes)
         missing_codes = [code for code in rule_codes if code not in child_map]
         if missing_codes:
             return self._result(
@@ -384,7 +507,7 @@ class ComplianceRuleEngine:
         for code in rule_codes:
             child = child_map[code]
             child_checks.append(
-                self.evaluate_rule(rule=child, fund_id=fund_id, db=db, _visited=visited)
+                self.evaluate_rule(rule=child, fund_id=fund_id, db=db, context=context, _visited=visited)
             )
 
         child_pass = [check.result == "pass" for check in child_checks]
@@ -411,47 +534,9 @@ class ComplianceRuleEngine:
             detail="Composite condition passed.",
         )
 
-    def _create_remediation_task(
-        self,
-        *,
-        check: ComplianceCheck,
-        rule: FundComplianceRule,
-        fund_id: int,
-        trigger_source: str | None,
-        trigger_source_id: int | None,
-        db: Session,
-    ) -> None:
-        existing = (
-            db.query(Task)
-            .filter(
-                Task.fund_id == fund_id,
-                Task.source == "compliance_rule_engine",
-                Task.status.in_(["pending", "in_progress"]),
-                Task.title == f"[Compliance] {rule.rule_name} remediation",
-            )
-            .order_by(Task.id.desc())
-            .first()
-        )
-        if existing:
-            check.remediation_task_id = existing.id
-            return
-
-        task = Task(
-            title=f"[Compliance] {rule.rule_name} remediation",
-            memo=check.detail,
-            deadline=datetime.utcnow() + timedelta(days=3),
-            estimated_time="1h",
-            quadrant="Q1",
-            status="pending",
-            category="compliance",
-            fund_id=fund_id,
-            investment_id=(trigger_source_id if trigger_source == "investment_create" else None),
-            auto_generated=True,
-            source="compliance_rule_engine",
-        )
-        db.add(task)
-        db.flush()
-        check.remediation_task_id = task.id
+    @staticmethod
+    def _remediation_title(rule: FundComplianceRule) -> str:
+        return f"[Compliance] {rule.rule_name} remediation"
 
     @staticmethod
     def _safe_condition(value: object) -> dict:
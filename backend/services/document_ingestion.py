@@ -9,6 +9,7 @@ from typing import Any
 import httpx
 
 from models.compliance import ComplianceDocumentChunk
+from services.lexical_index import mark_lexical_documents
 from services.vector_db import VectorDBService
 
 
@@ -123,7 +124,10 @@ class DocumentIngestionService:
         db=None,
     ) -> dict[str, Any]:
         self.vector_db.delete_chunks_by_document(collection_name, document_id)
-        self.vector_db.add_chunks(collection_name, chunks)
+        # Persisted chunks feed the BM25 index, so without an embedding key they stay searchable.
+        vector_indexed = db is None or self.vector_db.embedding_available
+        if vector_indexed:
+            self.vector_db.add_chunks(collection_name, chunks)
         if db is not None:
             (
                 db.query(ComplianceDocumentChunk)
@@ -144,7 +148,8 @@ class DocumentIngestionService:
                         metadata_json=item["metadata"],
                     )
                 )
-        return {}
+            mark_lexical_documents(db, [document_id])
+        return {} if vector_indexed else {"index_status": "lexical_only"}
 
     @staticmethod
     def _extract_pdf(file_bytes: bytes) -> dict[str, Any]:
@@ -9,25 +9,15 @@ from sqlalchemy.orm import Session
 from models.fee import FeeConfig, ManagementFee
 from models.fund import Fund
 from models.investment import Investment
-from models.valuation import Valuation
 from services.auto_journal import create_event_journal_entry
+from services.latest_valuation import latest_valuations
 
 PRORATION_METHODS = {"equal_quarter", "actual_365", "actual_366", "actual_actual"}
 
 
 def _latest_nav(db: Session, fund_id: int) -> float:
-    rows = (
-        db.query(Valuation)
-        .filter(Valuation.fund_id == fund_id)
-        .order_by(Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    seen: set[int] = set()
     total = 0.0
-    for row in rows:
-        if row.investment_id in seen:
-            continue
-        seen.add(row.investment_id)
+    for row in latest_valuations(db, fund_ids=[fund_id]).values():
         total += float(row.total_fair_value if row.total_fair_value is not None else row.value or 0)
     return total
 
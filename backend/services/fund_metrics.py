@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session
+
+from models.fund import LP
+from models.investment import Investment
+from models.lp_contribution import LPContribution
+from models.phase3 import CapitalCall, CapitalCallItem, Distribution, DistributionDetail, ExitTrade
+from services.latest_valuation import latest_valuations
+
+_SESSION_KEY = "fund_metrics_engine"
+
+
+@dataclass(frozen=True)
+class FundMetrics:
+    fund_id: int
+    as_of: date
+    # Contributions paid by as_of, else paid capital call items, else current LP paid-in.
+    paid_in_total: float
+    # Current LP-level paid-in, the basis used for TVPI/DPI.
+    lp_paid_in_total: float
+    invested_total: float
+    exit_total: float
+    # Distribution detail rows when present, otherwise distribution headers.
+    distributed_total: float
+    # Latest `value` per investment; invested minus exits when nothing is valued yet.
+    nav_total: float
+    # Latest `total_fair_value` per investment, `value` when it is not set.
+    residual_value: float
+
+
+class FundMetricsEngine:
+    """Point-in-time fund metrics for many funds and dates from a few grouped queries.
+
+    Results are memoized per (fund, date); use `for_session` to share one engine per
+    session, which is dropped again on the next flush.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._cache: dict[tuple[int, date], FundMetrics] = {}
+
+    @classmethod
+    def for_session(cls, db: Session) -> "FundMetricsEngine":
+        engine = db.info.get(_SESSION_KEY)
+        if engine is None:
+            engine = cls(db)
+            db.info[_SESSION_KEY] = engine
+        return engine
+
+    def get(self, fund_id: int, as_of: date) -> FundMetrics:
+        return self.load([fund_id], [as_of])[(fund_id, as_of)]
+
+    def load(self, fund_ids: Iterable[int], as_of_dates: Iterable[date]) -> dict[tuple[int, date], FundMetrics]:
+        fund_ids = list(dict.fromkeys(int(fund_id) for fund_id in fund_ids))
+        as_of_dates = list(dict.fromkeys(as_of_dates))
+        missing = [(fund_id, as_of) for fund_id in fund_ids for as_of in as_of_dates if (fund_id, as_of) not in self._cache]
+        if missing:
+            self._cache.update(
+                self._compute(
+                    list(dict.fromkeys(fund_id for fund_id, _ in missing)),
+                    list(dict.fromkeys(as_of for _, as_of in missing)),
+                )
+            )
+        return {(fund_id, as_of): self._cache[(fund_id, as_of)] for fund_id in fund_ids for as_of in as_of_dates}
+
+    def _compute(self, fund_ids: list[int], as_of_dates: list[date]) -> dict[tuple[int, date], FundMetrics]:
+        db = self.db
+
+        # The trailing column counts contribution rows regardless of date.
+        contributions = _sums_by_date(
+            db,
+            fund_column=LPContribution.fund_id,
+            date_column=LPContribution.actual_paid_date,
+            amount=LPContribution.amount,
+            as_of_dates=as_of_dates,
+            filters=[LPContribution.fund_id.in_(fund_ids)],
+            extra_columns=[func.count(LPContribution.id)],
+        )
+        paid_calls = _sums_by_date(
+            db,
+            fund_column=CapitalCall.fund_id,
+            date_column=CapitalCallItem.paid_date,
+            amount=CapitalCallItem.amount,
+            as_of_dates=as_of_dates,
+            filters=[CapitalCall.fund_id.in_(fund_ids), CapitalCallItem.paid == 1],
+            join=(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id),
+            select_from=CapitalCallItem,
+        )
+        invested = _sums_by_date(
+            db,
+            fund_column=Investment.fund_id,
+            date_column=Investment.investment_date,
+            amount=Investment.amount,
+            as_of_dates=as_of_dates,
+            filters=[Investment.fund_id.in_(fund_ids)],
+        )
+        exits = _sums_by_date(
+            db,
+            fund_column=ExitTrade.fund_id,
+            date_column=ExitTrade.trade_date,
+            amount=ExitTrade.amount,
+            as_of_dates=as_of_dates,
+            filters=[ExitTrade.fund_id.in_(fund_ids)],
+        )
+        detail_distributions = _sums_by_date(
+            db,
+            fund_column=Distribution.fund_id,
+            date_column=Distribution.dist_date,
+            amount=DistributionDetail.distribution_amount,
+            as_of_dates=as_of_dates,
+            filters=[Distribution.fund_id.in_(fund_ids)],
+            join=(Distribution, Distribution.id == DistributionDetail.distribution_id),
+            select_from=DistributionDetail,
+        )
+        header_distributions = _sums_by_date(
+            db,
+            fund_column=Distribution.fund_id,
+            date_column=Distribution.dist_date,
+            amount=Distribution.principal_total + Distribution.profit_total,
+            as_of_dates=as_of_dates,
+            filters=[Distribution.fund_id.in_(fund_ids)],
+        )
+        lp_paid_in = {
+            int(fund_id): float(total or 0)
+            for fund_id, total in (
+                db.query(LP.fund_id, func.coalesce(func.sum(LP.paid_in), 0))
+                .filter(LP.fund_id.in_(fund_ids))
+                .group_by(LP.fund_id)
+                .all()
+            )
+        }
+
+        results: dict[tuple[int, date], FundMetrics] = {}
+        for index, as_of in enumerate(as_of_dates):
+            nav_by_fund: dict[int, float] = defaultdict(float)
+            residual_by_fund: dict[int, float] = defaultdict(float)
+            for row in latest_valuations(db, fund_ids=fund_ids, as_of=as_of).values():
+                nav_by_fund[row.fund_id] += float(row.value or 0)
+                residual_by_fund[row.fund_id] += float(
+                    row.total_fair_value if row.total_fair_value is not None else row.value or 0
+                )
+
+            for fund_id in fund_ids:
+                if _at(contributions, fund_id, len(as_of_dates)) > 0:
+                    paid_in_total = _at(contributions, fund_id, index)
+                else:
+                    paid_in_total = _at(paid_calls, fund_id, index) or lp_paid_in.get(fund_id, 0.0)
+                invested_total = _at(invested, fund_id, index)
+                exit_total = _at(exits, fund_id, index)
+                distributed_total = _at(detail_distributions, fund_id, index)
+                if distributed_total <= 0:
+                    distributed_total = _at(header_distributions, fund_id, index)
+                if fund_id in nav_by_fund:
+                    nav_total = nav_by_fund[fund_id]
+                else:
+                    nav_total = max(invested_total - exit_total, 0.0)
+                results[(fund_id, as_of)] = FundMetrics(
+                    fund_id=fund_id,
+                    as_of=as_of,
+                    paid_in_total=paid_in_total,
+                    lp_paid_in_total=lp_paid_in.get(fund_id, 0.0),
+                    invested_total=invested_total,
+                    exit_total=exit_total,
+                    distributed_total=distributed_total,
+                    nav_total=nav_total,
+                    residual_value=residual_by_fund.get(fund_id, 0.0),
+                )
+        return results
+
+
+def _sums_by_date(
+    db: Session,
+    *,
+    fund_column,
+    date_column,
+    amount,
+    as_of_dates: list[date],
+    filters: list,
+    join=None,
+    select_from=None,
+    extra_columns: list | None = None,
+) -> dict[int, list[float]]:
+    """One grouped query summing `amount` per fund up to each as-of date, then `extra_columns`."""
+    sums = [
+        func.coalesce(
+            func.sum(case((date_column.isnot(None) & (date_column <= as_of), amount), else_=0)),
+            0,
+        )
+        for as_of in as_of_dates
+    ]
+    query = db.query(fund_column, *sums, *(extra_columns or []))
+    if select_from is not None:
+        query = query.select_from(select_from)
+    if join is not None:
+        query = query.join(*join)
+    rows = query.filter(*filters).group_by(fund_column).all()
+
+    return {int(fund_id): [float(value or 0) for value in values] for fund_id, *values in rows}
+
+
+def _at(sums: dict[int, list[float]], fund_id: int, index: int) -> float:
+    values = sums.get(fund_id)
+    return values[index] if values else 0.0
+
+
+@event.listens_for(Session, "after_flush")
+def _drop_session_engine(session: Session, flush_context) -> None:
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from models.valuation import Valuation
+
+
+def latest_valuations(
+    db: Session,
+    *,
+    fund_ids: Iterable[int] | None = None,
+    investment_ids: Iterable[int] | None = None,
+    as_of: date | None = None,
+) -> dict[int, Valuation]:
+    """Most recent valuation per investment, keyed by `investment_id`.
+
+    `as_of` restricts the history to valuations dated on or before that day. Ties on
+    `as_of_date` go to the highest id, matching the ordering used across the app.
+    """
+    ranked = _ranked_valuations(fund_ids=fund_ids, investment_ids=investment_ids, as_of=as_of)
+    if ranked is None:
+        return {}
+    rows = (
+        db.query(Valuation)
+        .join(ranked, ranked.c.id == Valuation.id)
+        .filter(ranked.c.position == 1)
+        .order_by(Valuation.investment_id.asc())
+        .all()
+    )
+    return {row.investment_id: row for row in rows}
+
+
+def latest_nav_by_fund(
+    db: Session,
+    *,
+    fund_ids: Iterable[int] | None = None,
+    as_of: date | None = None,
+) -> dict[int, float]:
+    """Sum of each investment's latest fair value per fund.
+
+    An investment's fair value is `total_fair_value`, falling back to `value` when the
+    former is empty or zero.
+    """
+    ranked = _ranked_valuations(fund_ids=fund_ids, as_of=as_of)
+    if ranked is None:
+        return {}
+    fair_value = case(
+        (func.coalesce(ranked.c.total_fair_value, 0) != 0, ranked.c.total_fair_value),
+        else_=func.coalesce(ranked.c.value, 0),
+    )
+    statement = (
+        select(ranked.c.fund_id, func.coalesce(func.sum(fair_value), 0))
+        .where(ranked.c.position == 1)
+        .group_by(ranked.c.fund_id)
+    )
+    return {int(fund_id): float(total or 0) for fund_id, total in db.execute(statement)}
+
+
+def latest_nav(db: Session, fund_id: int, as_of: date | None = None) -> float:
+    return latest_nav_by_fund(db, fund_ids=[fund_id], as_of=as_of).get(fund_id, 0.0)
+
+
+def _ranked_valuations(
+    *,
+    fund_ids: Iterable[int] | None = None,
+    investment_ids: Iterable[int] | None = None,
+    as_of: date | None = None,
+):
+    position = func.row_number().over(
+        partition_by=Valuation.investment_id,
+        order_by=(Valuation.as_of_date.desc(), Valuation.id.desc()),
+    )
+    statement = select(
+        Valuation.id,
+        Valuation.fund_id,
+        Valuation.total_fair_value,
+        Valuation.value,
+        position.label("position"),
+    )
+    if fund_ids is not None:
+        fund_ids = list(dict.fromkeys(fund_ids))
+        if not fund_ids:
+            return None
+        statement = statement.where(Valuation.fund_id.in_(fund_ids))
+    if investment_ids is not None:
+        investment_ids = list(dict.fromkeys(investment_ids))
+        if not investment_ids:
+            return None
+        statement = statement.where(Valuation.investment_id.in_(investment_ids))
+    if as_of is not None:
+        statement = statement.where(Valuation.as_of_date <= as_of)
+    return statement.subquery("ranked_valuations")
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.accounting import JournalEntry, JournalEntryLine, LedgerMonthlyBalance
+
+
+@dataclass
+class LedgerTotals:
+    debit_total: float = 0.0
+    credit_total: float = 0.0
+    debit_period: float = 0.0
+    credit_period: float = 0.0
+
+
+def account_ledger_totals(
+    db: Session,
+    fund_id: int,
+    as_of: date,
+    *,
+    period_start: date | None = None,
+    exclude_statuses: Iterable[str] = (),
+) -> dict[int, LedgerTotals]:
+    """Per-account debit/credit totals for one fund up to `as_of`.
+
+    `debit_period`/`credit_period` cover `period_start..as_of` and stay zero when no
+    period is requested.
+    """
+    totals = fund_account_ledger_totals(
+        db,
+        [fund_id],
+        as_of,
+        period_start=period_start,
+        exclude_statuses=exclude_statuses,
+    )
+    return totals.get(fund_id, {})
+
+
+def fund_account_ledger_totals(
+    db: Session,
+    fund_ids: Iterable[int] | None,
+    as_of: date,
+    *,
+    period_start: date | None = None,
+    exclude_statuses: Iterable[str] = (),
+) -> dict[int, dict[int, LedgerTotals]]:
+    """Same as `account_ledger_totals`, keyed by fund; `fund_ids=None` scans every fund.
+
+    Whole months before the requested window come from `ledger_monthly_balances`;
+    only journal lines from the first affected month onwards are scanned.
+    """
+    if fund_ids is not None:
+        fund_ids = list(dict.fromkeys(fund_ids))
+        if not fund_ids:
+            return {}
+    excluded = list(exclude_statuses)
+
+    line_start = _month_start(as_of)
+    if period_start is not None:
+        line_start = min(line_start, _month_start(period_start))
+
+    results: dict[int, dict[int, LedgerTotals]] = {}
+
+    opening = (
+        select(
+            LedgerMonthlyBalance.fund_id,
+            LedgerMonthlyBalance.account_id,
+            func.coalesce(func.sum(LedgerMonthlyBalance.debit), 0),
+            func.coalesce(func.sum(LedgerMonthlyBalance.credit), 0),
+        )
+        .where(LedgerMonthlyBalance.month_start < line_start)
+        .group_by(LedgerMonthlyBalance.fund_id, LedgerMonthlyBalance.account_id)
+    )
+    if fund_ids is not None:
+        opening = opening.where(LedgerMonthlyBalance.fund_id.in_(fund_ids))
+    if excluded:
+        opening = opening.where(LedgerMonthlyBalance.status.notin_(excluded))
+    for fund_id, account_id, debit, credit in db.execute(opening):
+        totals = results.setdefault(fund_id, {}).setdefault(account_id, LedgerTotals())
+        totals.debit_total += _to_float(debit)
+        totals.credit_total += _to_float(credit)
+
+    columns = [
+        JournalEntry.fund_id,
+        JournalEntryLine.account_id,
+        func.coalesce(func.sum(JournalEntryLine.debit), 0),
+        func.coalesce(func.sum(JournalEntryLine.credit), 0),
+    ]
+    if period_start is not None:
+        in_period = JournalEntry.entry_date >= period_start
+        columns.extend([
+            func.coalesce(func.sum(case((in_period, JournalEntryLine.debit), else_=0)), 0),
+            func.coalesce(func.sum(case((in_period, JournalEntryLine.credit), else_=0)), 0),
+        ])
+
+    statement = (
+        select(*columns)
+        .select_from(JournalEntryLine)
+        .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+        .where(JournalEntry.entry_date >= line_start, JournalEntry.entry_date <= as_of)
+        .group_by(JournalEntry.fund_id, JournalEntryLine.account_id)
+    )
+    if fund_ids is not None:
+        statement = statement.where(JournalEntry.fund_id.in_(fund_ids))
+    if excluded:
+        statement = statement.where(JournalEntry.status.notin_(excluded))
+
+    for fund_id, account_id, debit, credit, *period in db.execute(statement):
+        totals = results.setdefault(fund_id, {}).setdefault(account_id, LedgerTotals())
+        totals.debit_total += _to_float(debit)
+        totals.credit_total += _to_float(credit)
+        if period:
+            totals.debit_period += _to_float(period[0])
+            totals.credit_period += _to_float(period[1])
+    return results
+
+
+def post_monthly_balances(db: Session, entry: JournalEntry, sign: int = 1) -> None:
+    """Add (`sign=1`) or remove (`sign=-1`) an entry's lines from the monthly balances.
+
+    Call with -1 before changing or deleting an entry and with 1 once its new lines
+    are in place; lines are read back from the session after a flush.
+    """
+    db.flush()
+    lines = db.query(JournalEntryLine).filter(JournalEntryLine.journal_entry_id == entry.id).all()
+    movements: dict[int, list[Decimal]] = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for line in lines:
+        movement = movements[line.account_id]
+        movement[0] += _to_decimal(line.debit) * sign
+        movement[1] += _to_decimal(line.credit) * sign
+    if not movements or entry.entry_date is None:
+        return
+
+    month_start = _month_start(entry.entry_date)
+    status = entry.status or ""
+    table = LedgerMonthlyBalance.__table__
+    dialect_insert = _dialect_insert(db)
+    if dialect_insert is None:
+        _increment_monthly_balances(db, entry.fund_id, month_start, status, movements)
+    else:
+        # One atomic upsert per key, so concurrent postings add up instead of overwriting
+        # each other or racing on uq_ledger_monthly_balances_key.
+        insert_statement = dialect_insert(table).values(
+            [
+                {
+                    "fund_id": entry.fund_id,
+                    "account_id": account_id,
+                    "month_start": month_start,
+                    "status": status,
+                    "debit": debit,
+                    "credit": credit,
+                }
+                for account_id, (debit, credit) in movements.items()
+            ]
+        )
+        db.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=[table.c.fund_id, table.c.account_id, table.c.month_start, table.c.status],
+                set_={
+                    "debit": table.c.debit + insert_statement.excluded.debit,
+                    "credit": table.c.credit + insert_statement.excluded.credit,
+                },
+            )
+        )
+    db.execute(
+        delete(table).where(
+            table.c.fund_id == entry.fund_id,
+            table.c.month_start == month_start,
+            table.c.status == status,
+            table.c.account_id.in_(list(movements)),
+            table.c.debit == 0,
+            table.c.credit == 0,
+        )
+    )
+
+
+def _dialect_insert(db: Session):
+    """The dialect's upsert-capable `insert`, or None where the portable path is used."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _increment_monthly_balances(
+    db: Session,
+    fund_id: int,
+    month_start: date,
+    status: str,
+    movements: dict[int, list[Decimal]],
+) -> None:
+    """Portable upsert: a relative UPDATE, else an INSERT in a savepoint.
+
+    A concurrent insert of the same key makes the INSERT fail on the unique key; the
+    savepoint is rolled back and the increment is applied to that row instead.
+    """
+    table = LedgerMonthlyBalance.__table__
+    for account_id, (debit, credit) in movements.items():
+        increment = (
+            update(table)
+            .where(
+                table.c.fund_id == fund_id,
+                table.c.account_id == account_id,
+                table.c.month_start == month_start,
+                table.c.status == status,
+            )
+            .values(debit=table.c.debit + debit, credit=table.c.credit + credit)
+        )
+        if db.execute(increment).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(table).values(
+                        fund_id=fund_id,
+                        account_id=account_id,
+                        month_start=month_start,
+                        status=status,
+                        debit=debit,
+                        credit=credit,
+                    )
+                )
+        except IntegrityError:
+            db.execute(increment)
+
+
+def rebuild_monthly_balances(db: Session, fund_ids: Iterable[int] | None = None) -> int:
+    """Recompute `ledger_monthly_balances` from journal lines. Returns the row count written."""
+    if fund_ids is not None:
+        fund_ids = list(dict.fromkeys(fund_ids))
+        if not fund_ids:
+            return 0
+
+    delete_query = db.query(LedgerMonthlyBalance)
+    if fund_ids is not None:
+        delete_query = delete_query.filter(LedgerMonthlyBalance.fund_id.in_(fund_ids))
+    delete_query.delete(synchronize_session=False)
+
+    statement = (
+        select(
+            JournalEntry.fund_id,
+            JournalEntryLine.account_id,
+            JournalEntry.entry_date,
+            JournalEntry.status,
+            func.coalesce(func.sum(JournalEntryLine.debit), 0),
+            func.coalesce(func.sum(JournalEntryLine.credit), 0),
+        )
+        .select_from(JournalEntryLine)
+        .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+        .group_by(JournalEntry.fund_id, JournalEntryLine.account_id, JournalEntry.entry_date, JournalEntry.status)
+    )
+    if fund_ids is not None:
+        statement = statement.where(JournalEntry.fund_id.in_(fund_ids))
+
+    # Days are folded into months here so the query stays dialect-neutral.
+    buckets: dict[tuple[int, int, date, str], list[Decimal]] = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for fund_id, account_id, entry_date, status, debit, credit in db.execute(statement):
+        bucket = buckets[(fund_id, account_id, _month_start(entry_date), status or "")]
+        bucket[0] += _to_decimal(debit)
+        bucket[1] += _to_decimal(credit)
+
+    rows = [
+        LedgerMonthlyBalance(
+            fund_id=fund_id,
+            account_id=account_id,
+            month_start=month_start,
+            status=status,
+            debit=debit,
+            credit=credit,
+        )
+        for (fund_id, account_id, month_start, status), (debit, credit) in buckets.items()
+        if debit or credit
+    ]
+    db.add_all(rows)
+    db.flush()
+    return len(rows)
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _to_decimal(value) -> Decimal:
+    if value is None:
+        return Decimal(0)
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, Decimal):
+        return float(value)
+    return float(value)
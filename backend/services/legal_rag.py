@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from datetime import datetime, timedelta
 from typing import Any
@@ -10,8 +11,8 @@ from sqlalchemy.orm import Session
 from models.compliance import FundComplianceRule
 from models.fund import Fund
 from models.llm_usage import LLMUsage
-from services.compliance_rule_engine import ComplianceRuleEngine
-from services.vector_db import VectorDBService
+from services.compliance_rule_engine import ComplianceRuleEngine, FundEvaluationContext
+from services.vector_db import HYBRID_RRF_K, VectorDBService
 
 try:
     from openai import AsyncOpenAI
@@ -19,6 +20,15 @@ except Exception:  # pragma: no cover - optional at runtime
     AsyncOpenAI = None  # type: ignore
 
 
+DISTANCE_THRESHOLD = 1.5
+# Hangul bigrams give almost every query weak BM25 hits on common words (투자, 조합), so a
+# lexical-only row needs a distinctive match and a top-3 rank in the search's combined BM25 ranking.
+LEXICAL_MIN_BM25_SCORE = 2.0
+LEXICAL_MIN_HYBRID_SCORE = 1.0 / (HYBRID_RRF_K + 3)
+# A chunk ranked first by both the vector and the BM25 retriever.
+MAX_HYBRID_SCORE = 2.0 / (HYBRID_RRF_K + 1)
+
+
 class MonthlyTokenLimitExceededError(RuntimeError):
     pass
 
@@ -131,8 +141,9 @@ class LegalRAGService:
                 fund_type = (fund.type or "").strip() or None
                 fund_name = fund.name
 
+        vector_db = await asyncio.to_thread(self._get_vector_db)
         if fund_id:
-            search_results = self._get_vector_db().search_with_scope(
+            search_results = await vector_db.asearch_with_scope(
                 query=normalized_query,
                 fund_id=fund_id,
                 fund_type=fund_type,
@@ -140,14 +151,9 @@ class LegalRAGService:
                 n_results=10,
             )
         else:
-            search_results = self._get_vector_db().search_all_collections(normalized_query, n_results=10)
-
-        # Filter out low-relevance results (distance threshold)
-        distance_threshold = 1.5
-        filtered_results = [
-            row for row in search_results
-            if row.get("distance") is not None and float(row["distance"]) < distance_threshold
-        ]
+            search_results = await vector_db.asearch_all_collections(normalized_query, n_results=10)
+
+        filtered_results = [row for row in search_results if self._is_relevant(row)]
         # Fall back to top results if all are filtered out
         if not filtered_results and search_results:
             filtered_results = search_results[:3]
@@ -180,7 +186,7 @@ class LegalRAGService:
                 f"🗂 적용범위: {scope_labels.get(((row.get('metadata') or {}).get('scope') or 'global'), '🌐 공통 법령')}\n"
                 f"📌 제목/조항: {(row.get('metadata') or {}).get('title', '')} "
                 f"{(row.get('metadata') or {}).get('article', '')}\n"
-                f"📊 관련도: {1.0 - min(float(row.get('distance', 0)), 1.0):.0%}\n"
+                f"📊 관련도: {self._relevance(row):.0%}\n"
                 f"\n{row.get('text', '')}"
             )
             for row in filtered_results
@@ -240,7 +246,7 @@ class LegalRAGService:
                     "article": (row.get("metadata") or {}).get("article", ""),
                     "scope": (row.get("metadata") or {}).get("scope") or "global",
                     "distance": row.get("distance"),
-                    "relevance": round(1.0 - min(float(row.get("distance", 0)), 1.0), 2),
+                    "relevance": round(self._relevance(row), 2),
                 }
                 for row in filtered_results
             ],
@@ -248,6 +254,25 @@ class LegalRAGService:
             "tokens_used": total_tokens,
         }
 
+    @staticmethod
+    def _is_relevant(row: dict[str, Any]) -> bool:
+        """Vector hits must pass the distance threshold; lexical-only hits the BM25 and rank floors."""
+        distance = row.get("distance")
+        if distance is not None:
+            return float(distance) < DISTANCE_THRESHOLD
+        return (
+            float(row.get("bm25_score") or 0.0) >= LEXICAL_MIN_BM25_SCORE
+            and float(row.get("hybrid_score") or 0.0) >= LEXICAL_MIN_HYBRID_SCORE
+        )
+
+    @staticmethod
+    def _relevance(row: dict[str, Any]) -> float:
+        # Lexical-only hits have no vector distance, so their fused rank stands in for it.
+        distance = row.get("distance")
+        if distance is not None:
+            return 1.0 - min(float(distance), 1.0)
+        return min(float(row.get("hybrid_score") or 0.0) / MAX_HYBRID_SCORE, 1.0)
+
     def get_usage_summary(self, db: Session, period: str = "month") -> dict[str, Any]:
         normalized = (period or "month").strip().lower()
         now = datetime.now()
@@ -344,7 +369,8 @@ class LegalRAGService:
         if not rules:
             return None
 
-        checks = [self.rule_engine.evaluate_rule(rule=rule, fund_id=fund_id, db=db) for rule in rules]
+        context = FundEvaluationContext(db, fund_id)
+        checks = [self.rule_engine.evaluate_rule(rule=rule, fund_id=fund_id, db=db, context=context) for rule in rules]
         status = "pass" if all(check.result == "pass" for check in checks) else "fail"
         return {
             "matched_keyword": matched_keyword,
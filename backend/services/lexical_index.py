@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.compliance import ComplianceDocument, ComplianceDocumentChunk
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_PENDING_DOCUMENTS_KEY = "lexical_index_document_ids"
+_COMMITTED_CHUNKS_KEY = "lexical_index_committed_chunks"
+
+# 제81조, 제 81 조의2, 제3항, 제12호 are kept whole so exact article lookups match exactly.
+_LEGAL_REFERENCE_PATTERN = re.compile(r"제\s*(\d+)\s*(조)(?:\s*의\s*(\d+))?|제\s*(\d+)\s*(항|호)")
+_WORD_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+_JOSA_SUFFIXES = tuple(
+    sorted(
+        (
+            "으로써", "으로서", "에서는", "에게서", "이라는",
+            "으로", "에서", "에게", "까지", "부터", "보다", "처럼", "이나", "이며",
+            "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "로", "만",
+        ),
+        key=len,
+        reverse=True,
+    )
+)
+
+
+def _strip_josa(word: str) -> str:
+    for suffix in _JOSA_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize_legal_text(text: str) -> list[str]:
+    """Terms for Korean legal text: article references, particle-stripped words and Hangul bigrams.
+
+    Compound nouns are written with and without spaces (투자한도 / 투자 한도), so Hangul
+    words longer than two syllables also contribute their character bigrams.
+    """
+    normalized = (text or "").lower()
+    terms: list[str] = []
+
+    def reference(match: re.Match[str]) -> str:
+        if match.group(2):
+            term = f"제{match.group(1)}조" + (f"의{match.group(3)}" if match.group(3) else "")
+        else:
+            term = f"제{match.group(4)}{match.group(5)}"
+        terms.append(term)
+        return " "
+
+    remainder = _LEGAL_REFERENCE_PATTERN.sub(reference, normalized)
+    for word in _WORD_PATTERN.findall(remainder):
+        if not _HANGUL_PATTERN.fullmatch(word):
+            terms.append(word)
+            continue
+        stem = _strip_josa(word)
+        if len(stem) < 2:
+            # Single syllables are almost always particles or bound nouns (수, 등, 및).
+            continue
+        terms.append(stem)
+        if len(word) > 2:
+            # Bigrams come from the unstripped word: 투자한도 must still yield 한도 when 도 reads as a particle.
+            terms.extend(word[index : index + 2] for index in range(len(word) - 1))
+    return terms
+
+
+def _metadata_matches(metadata: dict[str, Any], where: dict[str, Any] | None) -> bool:
+    """Evaluate the equality / `$and` subset of Chroma `where` filters the scope lookups use."""
+    if not where:
+        return True
+    if "$and" in where:
+        return all(_metadata_matches(metadata, clause) for clause in where["$and"])
+    return all(metadata.get(key) == value for key, value in where.items())
+
+
+@dataclass(frozen=True)
+class _IndexedChunk:
+    chunk_key: str
+    document_id: int
+    collection: str
+    text: str
+    metadata: dict[str, Any]
+    length: int
+    terms: frozenset[str]
+
+
+class LexicalIndex:
+    """In-memory BM25 inverted index over persisted `ComplianceDocumentChunk` rows."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._chunks: dict[str, _IndexedChunk] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._document_chunks: dict[int, set[str]] = {}
+        self._total_length = 0
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, db: Session) -> None:
+        rows = _chunk_rows(db)
+        with self._lock:
+            self._chunks.clear()
+            self._postings.clear()
+            self._document_chunks.clear()
+            self._total_length = 0
+            for row in rows:
+                self._add_chunk(*row)
+            self._loaded = True
+
+    def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        from database import SessionLocal
+
+        with self._lock:
+            if self._loaded:
+                return
+            db = SessionLocal()
+            try:
+                self.load(db)
+            except SQLAlchemyError as exc:
+                logger.warning("Lexical index load failed: %s", exc)
+            finally:
+                db.close()
+
+    def apply_documents(
+        self,
+        document_ids: Iterable[int],
+        rows: Iterable[tuple[str, int, str, str, dict[str, Any] | None]],
+    ) -> None:
+        """Replace the chunks of `document_ids` with `rows`; documents without rows are dropped."""
+        with self._lock:
+            for document_id in document_ids:
+                for chunk_key in self._document_chunks.pop(int(document_id), set()):
+                    self._remove_chunk(chunk_key)
+            for row in rows:
+                self._add_chunk(*row)
+
+    def search(
+        self,
+        query: str,
+        collection: str | None = None,
+        n_results: int = 5,
+        where: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        self.ensure_loaded()
+        terms = Counter(tokenize_legal_text(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            if not self._chunks:
+                return []
+            chunk_count = len(self._chunks)
+            average_length = self._total_length / chunk_count
+            scores: dict[str, float] = {}
+            for term, query_frequency in terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (chunk_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_key, frequency in postings.items():
+                    chunk = self._chunks[chunk_key]
+                    if collection is not None and chunk.collection != collection:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * chunk.length / average_length)
+                    score = idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+                    scores[chunk_key] = scores.get(chunk_key, 0.0) + score * query_frequency
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            rows: list[dict[str, Any]] = []
+            for chunk_key, score in ranked:
+                chunk = self._chunks[chunk_key]
+                if not _metadata_matches(chunk.metadata, where):
+                    continue
+                rows.append(
+                    {
+                        "id": chunk.chunk_key,
+                        "text": chunk.text,
+                        "metadata": dict(chunk.metadata),
+                        "distance": None,
+                        "bm25_score": round(score, 6),
+                    }
+                )
+                if len(rows) >= n_results:
+                    break
+            return rows
+
+    def _add_chunk(
+        self,
+        chunk_key: str,
+        document_id: int,
+        collection: str,
+        text: str,
+        metadata: dict[str, Any] | None,
+    ) -> None:
+        if chunk_key in self._chunks:
+            self._remove_chunk(chunk_key)
+        frequencies = Counter(tokenize_legal_text(text))
+        chunk = _IndexedChunk(
+            chunk_key=chunk_key,
+            document_id=int(document_id),
+            collection=collection,
+            text=text,
+            metadata={"document_id": int(document_id), **(metadata or {})},
+            length=sum(frequencies.values()),
+            terms=frozenset(frequencies),
+        )
+        self._chunks[chunk_key] = chunk
+        self._document_chunks.setdefault(chunk.document_id, set()).add(chunk_key)
+        self._total_length += chunk.length
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[chunk_key] = frequency
+
+    def _remove_chunk(self, chunk_key: str) -> None:
+        chunk = self._chunks.pop(chunk_key, None)
+        if chunk is None:
+            return
+        self._document_chunks.get(chunk.document_id, set()).discard(chunk_key)
+        self._total_length -= chunk.length
+        for term in chunk.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(chunk_key, None)
+            if not postings:
+                del self._postings[term]
+
+
+def _chunk_rows(
+    db: Session,
+    document_ids: Iterable[int] | None = None,
+) -> list[tuple[str, int, str, str, dict[str, Any] | None]]:
+    query = db.query(
+        ComplianceDocumentChunk.chunk_key,
+        ComplianceDocumentChunk.document_id,
+        ComplianceDocument.document_type,
+        ComplianceDocumentChunk.text,
+        ComplianceDocumentChunk.metadata_json,
+    ).join(ComplianceDocument, ComplianceDocument.id == ComplianceDocumentChunk.document_id)
+    if document_ids is not None:
+        query = query.filter(ComplianceDocumentChunk.document_id.in_(list(document_ids)))
+    return [tuple(row) for row in query.order_by(ComplianceDocumentChunk.id).all()]
+
+
+_lexical_index: LexicalIndex | None = None
+
+
+def get_lexical_index() -> LexicalIndex:
+    global _lexical_index
+    if _lexical_index is None:
+        _lexical_index = LexicalIndex()
+    return _lexical_index
+
+
+def mark_lexical_documents(db: Session, document_ids: Iterable[int]) -> None:
+    """Re-read these documents' chunks into the lexical index once `db` commits."""
+    db.info.setdefault(_PENDING_DOCUMENTS_KEY, set()).update(int(value) for value in document_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _snapshot_marked_lexical_documents(session: Session) -> None:
+    document_ids = session.info.pop(_PENDING_DOCUMENTS_KEY, None)
+    if not document_ids or not get_lexical_index().loaded:
+        # An index that has not loaded yet reads every chunk on first use anyway.
+        return
+    session.flush()
+    session.info[_COMMITTED_CHUNKS_KEY] = (document_ids, _chunk_rows(session, document_ids))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_marked_lexical_documents(session: Session) -> None:
+    snapshot = session.info.pop(_COMMITTED_CHUNKS_KEY, None)
+    if snapshot is not None:
+        get_lexical_index().apply_documents(*snapshot)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_marked_lexical_documents(session: Session) -> None:
+    session.info.pop(_PENDING_DOCUMENTS_KEY, None)
+    session.info.pop(_COMMITTED_CHUNKS_KEY, None)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.fund import LP
+from models.lp_contribution import LPContribution
+from models.phase3 import CapitalCall, CapitalCallItem, Distribution, DistributionDetail
+from services.analytics.snapshot_cache import has_uncommitted_writes, table_versions
+from services.fund_metrics import FundMetricsEngine
+from services.performance_calculator import xirr_many
+
+# Every table the accounts read; a write to any of them invalidates cached results.
+SOURCE_TABLES = (
+    "lps",
+    "capital_calls",
+    "capital_call_items",
+    "lp_contributions",
+    "distributions",
+    "distribution_details",
+    "valuations",
+)
+
+_LOCK = threading.Lock()
+# engine -> (fund_id, as_of) -> (table versions, accounts)
+_CACHE: "weakref.WeakKeyDictionary[Any, dict[tuple[int, date], tuple[dict[str, int], list[LPCapitalAccount]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass(frozen=True)
+class LPCapitalAccount:
+    lp_id: int
+    lp_name: str
+    commitment: float
+    contributed: float
+    distributed: float
+    nav_share: float
+    irr: float | None
+    tvpi: float
+    dpi: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "lp_id": self.lp_id,
+            "lp_name": self.lp_name,
+            "commitment": round(self.commitment, 2),
+            "contributed": round(self.contributed, 2),
+            "distributed": round(self.distributed, 2),
+            "nav_share": round(self.nav_share, 2),
+            "irr": round(self.irr, 6) if self.irr is not None else None,
+            "tvpi": round(self.tvpi, 6),
+            "dpi": round(self.dpi, 6),
+        }
+
+
+def get_lp_capital_accounts(db: Session, fund_id: int, as_of: date) -> list[LPCapitalAccount]:
+    """Per-LP capital accounts for one fund, cached per (fund, as_of) until a source table changes."""
+    engine = db.get_bind()
+    versions = table_versions(SOURCE_TABLES)
+    with _LOCK:
+        cached = _CACHE.get(engine, {}).get((fund_id, as_of))
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+    accounts = build_lp_capital_accounts(db, fund_id, as_of)
+    if has_uncommitted_writes(db, SOURCE_TABLES):
+        # Only committed state is shared with other sessions.
+        return accounts
+    with _LOCK:
+        if table_versions(SOURCE_TABLES) == versions:
+            _CACHE.setdefault(engine, {})[(fund_id, as_of)] = (versions, accounts)
+    return accounts
+
+
+def build_lp_capital_accounts(db: Session, fund_id: int, as_of: date) -> list[LPCapitalAccount]:
+    lps = (
+        db.query(LP.id, LP.name, LP.commitment, LP.paid_in)
+        .filter(LP.fund_id == fund_id)
+        .order_by(LP.id.asc())
+        .all()
+    )
+    if not lps:
+        return []
+
+    cashflows: dict[int, list[tuple[date, float]]] = defaultdict(list)
+    contributed: dict[int, float] = defaultdict(float)
+    distributed: dict[int, float] = defaultdict(float)
+
+    # Paid capital call items plus manual contributions that are not tied to a call.
+    paid_items = (
+        db.query(CapitalCallItem.lp_id, CapitalCallItem.paid_date, func.sum(CapitalCallItem.amount))
+        .join(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id)
+        .filter(
+            CapitalCall.fund_id == fund_id,
+            CapitalCallItem.paid == 1,
+            CapitalCallItem.paid_date.isnot(None),
+        )
+        .group_by(CapitalCallItem.lp_id, CapitalCallItem.paid_date)
+        .all()
+    )
+    manual_contributions = (
+        db.query(LPContribution.lp_id, LPContribution.actual_paid_date, func.sum(LPContribution.amount))
+        .filter(
+            LPContribution.fund_id == fund_id,
+            LPContribution.capital_call_id.is_(None),
+            LPContribution.actual_paid_date.isnot(None),
+        )
+        .group_by(LPContribution.lp_id, LPContribution.actual_paid_date)
+        .all()
+    )
+    # Later-dated rows are still read: an LP with any dated history never falls back to paid-in.
+    dated_lp_ids: set[int] = set()
+    for lp_id, paid_date, amount in [*paid_items, *manual_contributions]:
+        dated_lp_ids.add(lp_id)
+        amount = float(amount or 0)
+        if paid_date <= as_of and amount > 0:
+            cashflows[lp_id].append((paid_date, -amount))
+            contributed[lp_id] += amount
+
+    distribution_rows = (
+        db.query(DistributionDetail.lp_id, Distribution.dist_date, func.sum(DistributionDetail.distribution_amount))
+        .join(Distribution, Distribution.id == DistributionDetail.distribution_id)
+        .filter(Distribution.fund_id == fund_id, Distribution.dist_date <= as_of)
+        .group_by(DistributionDetail.lp_id, Distribution.dist_date)
+        .all()
+    )
+    for lp_id, dist_date, amount in distribution_rows:
+        amount = float(amount or 0)
+        if amount > 0:
+            cashflows[lp_id].append((dist_date, amount))
+            distributed[lp_id] += amount
+
+    for lp in lps:
+        if lp.id not in dated_lp_ids:
+            # LPs without dated contribution records only carry LP-level paid-in.
+            contributed[lp.id] = float(lp.paid_in or 0)
+
+    residual_value = FundMetricsEngine.for_session(db).get(fund_id, as_of).residual_value
+    total_contributed = sum(contributed.values())
+    nav_share = {
+        lp.id: (residual_value * contributed.get(lp.id, 0.0) / total_contributed) if total_contributed > 0 else 0.0
+        for lp in lps
+    }
+    for lp in lps:
+        if nav_share[lp.id] > 0:
+            cashflows[lp.id].append((as_of, nav_share[lp.id]))
+
+    irr_values = xirr_many([cashflows.get(lp.id, []) for lp in lps])
+
+    accounts: list[LPCapitalAccount] = []
+    for lp, irr in zip(lps, irr_values):
+        paid = contributed.get(lp.id, 0.0)
+        received = distributed.get(lp.id, 0.0)
+        accounts.append(
+            LPCapitalAccount(
+                lp_id=lp.id,
+                lp_name=lp.name,
+                commitment=float(lp.commitment or 0),
+                contributed=paid,
+                distributed=received,
+                nav_share=nav_share[lp.id],
+                irr=irr,
+                tvpi=((received + nav_share[lp.id]) / paid) if paid > 0 else 0.0,
+                dpi=(received / paid) if paid > 0 else 0.0,
+            )
+        )
+    return accounts
+
+
+def clear_lp_capital_account_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
@@ -10,8 +10,10 @@ from sqlalchemy.orm import Session
 from models.fee import ManagementFee, PerformanceFeeSimulation
 from models.fund import Fund, LP
 from models.investment import Investment, PortfolioCompany
-from models.phase3 import CapitalCall, Distribution, DistributionDetail, ExitTrade
+from models.phase3 import CapitalCall, Distribution, ExitTrade
 from models.valuation import Valuation
+from services.latest_valuation import latest_valuations
+from services.lp_capital_account import get_lp_capital_accounts
 from services.performance_calculator import calculate_fund_performance
 
 
@@ -28,18 +30,7 @@ def _quarter_bounds(year: int, quarter: int) -> tuple[date, date]:
 
 
 def _latest_valuation_map(db: Session, fund_id: int) -> dict[int, Valuation]:
-    rows = (
-        db.query(Valuation)
-        .filter(Valuation.fund_id == fund_id)
-        .order_by(Valuation.investment_id.asc(), Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    mapping: dict[int, Valuation] = {}
-    for row in rows:
-        if row.investment_id in mapping:
-            continue
-        mapping[row.investment_id] = row
-    return mapping
+    return latest_valuations(db, fund_ids=[fund_id])
 
 
 async def collect_lp_report_data(
@@ -176,34 +167,18 @@ async def collect_lp_report_data(
 
     events.sort(key=lambda item: item["date"])
 
-    distribution_by_lp = dict(
-        db.query(
-            DistributionDetail.lp_id,
-            func.coalesce(func.sum(DistributionDetail.distribution_amount), 0),
-        )
-        .join(Distribution, Distribution.id == DistributionDetail.distribution_id)
-        .filter(Distribution.fund_id == fund_id)
-        .group_by(DistributionDetail.lp_id)
-        .all()
-    )
-
     lp_summary: list[dict] = []
-    for lp in sorted(fund.lps, key=lambda row: row.id):
-        commitment = float(lp.commitment or 0)
-        paid_in = float(lp.paid_in or 0)
-        distributions = float(distribution_by_lp.get(lp.id, 0) or 0)
-        nav_share = (
-            (paid_in / total_paid_in) * float(performance.get("residual_value") or 0)
-            if total_paid_in > 0
-            else 0
-        )
+    for account in get_lp_capital_accounts(db, fund_id, period_end):
         lp_summary.append(
             {
-                "lp_name": lp.name,
-                "commitment": commitment,
-                "paid_in": paid_in,
-                "distributions": distributions,
-                "nav_share": round(nav_share, 2),
+                "lp_name": account.lp_name,
+                "commitment": account.commitment,
+                "paid_in": account.contributed,
+                "distributions": account.distributed,
+                "nav_share": round(account.nav_share, 2),
+                "irr": round(account.irr, 6) if account.irr is not None else None,
+                "tvpi": round(account.tvpi, 6),
+                "dpi": round(account.dpi, 6),
             }
         )
 
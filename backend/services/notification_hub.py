@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+@dataclass(eq=False)
+class NotificationSubscription:
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+
+
+class NotificationHub:
+    """In-process unread counters and server-push fan-out for notifications.
+
+    Counters are cached per engine and user. Writers report changes after they commit,
+    and a read only fills the cache when no change landed while it was querying.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # engine -> user_id -> unread count
+        self._counts: "weakref.WeakKeyDictionary[Any, dict[int, int]]" = weakref.WeakKeyDictionary()
+        # engine -> user_id -> change generation
+        self._generations: "weakref.WeakKeyDictionary[Any, dict[int, int]]" = weakref.WeakKeyDictionary()
+        self._subscribers: dict[int, set[NotificationSubscription]] = {}
+
+    def cached_count(self, bind: Any, user_id: int) -> tuple[int | None, int]:
+        """The cached count (or None) plus the generation to pass back to `store_count`."""
+        with self._lock:
+            count = self._counts.get(bind, {}).get(user_id)
+            generation = self._generations.get(bind, {}).get(user_id, 0)
+        return count, generation
+
+    def store_count(self, bind: Any, user_id: int, count: int, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(bind, {}).get(user_id, 0) == generation:
+                self._counts.setdefault(bind, {})[user_id] = count
+
+    def notifications_added(self, bind: Any, payloads: list[dict[str, Any]]) -> None:
+        added: dict[int, list[dict[str, Any]]] = {}
+        for payload in payloads:
+            added.setdefault(int(payload["user_id"]), []).append(payload)
+        for user_id, rows in added.items():
+            count = self._change(bind, user_id, lambda current, delta=len(rows): current + delta)
+            for payload in rows:
+                self.publish(user_id, "notification", payload)
+            if count is not None:
+                self.publish(user_id, "unread_count", {"count": count})
+
+    def notifications_read(self, bind: Any, user_id: int, read_count: int) -> None:
+        count = self._change(bind, user_id, lambda current: max(current - read_count, 0))
+        if count is not None:
+            self.publish(user_id, "unread_count", {"count": count})
+
+    def all_read(self, bind: Any, user_id: int) -> None:
+        self._change(bind, user_id, lambda current: 0, fill=True)
+        self.publish(user_id, "unread_count", {"count": 0})
+
+    def _change(self, bind: Any, user_id: int, update, *, fill: bool = False) -> int | None:
+        with self._lock:
+            generations = self._generations.setdefault(bind, {})
+            generations[user_id] = generations.get(user_id, 0) + 1
+            counts = self._counts.setdefault(bind, {})
+            if user_id in counts:
+                counts[user_id] = update(counts[user_id])
+            elif fill:
+                counts[user_id] = update(0)
+            return counts.get(user_id)
+
+    def subscribe(self, user_id: int) -> NotificationSubscription:
+        subscription = NotificationSubscription(user_id=user_id, loop=asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NotificationSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    self._subscribers.pop(subscription.user_id, None)
+
+    def publish(self, user_id: int, event: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(_offer, subscription.queue, {"event": event, "data": data})
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream cleanup will unsubscribe it.
+                continue
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._generations.clear()
+
+
+def _offer(queue: asyncio.Queue, message: dict[str, Any]) -> None:
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        # A slow client only needs the latest state, which a later count event carries.
+        pass
+
+
+_notification_hub: NotificationHub | None = None
+
+
+def get_notification_hub() -> NotificationHub:
+    global _notification_hub
+    if _notification_hub is None:
+        _notification_hub = NotificationHub()
+    return _notification_hub
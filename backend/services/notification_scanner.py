@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+from collections import Counter
 from datetime import date, datetime, timedelta
 
 from sqlalchemy import func
@@ -12,10 +13,10 @@ from models.fee import ManagementFee
 from models.investment import InvestmentDocument
 from models.phase3 import CapitalCall, CapitalCallDetail, CapitalCallItem, Distribution
 from models.task import Task
-from services.notification_service import create_notifications_for_active_users
+from services.notification_service import NotificationSpec, create_notifications_bulk, fan_out_notifications
 
 
-async def scan_task_deadlines(db: Session) -> int:
+def collect_task_deadline_specs(db: Session) -> list[NotificationSpec]:
     today = date.today()
     tomorrow = today + timedelta(days=1)
 
@@ -29,7 +30,7 @@ async def scan_task_deadlines(db: Session) -> int:
         .all()
     )
 
-    created = 0
+    specs: list[NotificationSpec] = []
     for row in rows:
         deadline = row.deadline.date() if isinstance(row.deadline, datetime) else row.deadline
         if deadline is None:
@@ -50,20 +51,21 @@ async def scan_task_deadlines(db: Session) -> int:
         if not severity or not label:
             continue
 
-        created += await create_notifications_for_active_users(
-            db,
-            category="task",
-            severity=severity,
-            title=f"태스크 마감 {label}: {row.title}",
-            message="마감 태스크를 확인해 주세요.",
-            target_type="task",
-            target_id=row.id,
-            action_url="/tasks",
+        specs.append(
+            NotificationSpec(
+                category="task",
+                severity=severity,
+                title=f"태스크 마감 {label}: {row.title}",
+                message="마감 태스크를 확인해 주세요.",
+                target_type="task",
+                target_id=row.id,
+                action_url="/tasks",
+            )
         )
-    return created
+    return specs
 
 
-async def scan_compliance_deadlines(db: Session) -> int:
+def collect_compliance_deadline_specs(db: Session) -> list[NotificationSpec]:
     today = date.today()
     warning_cutoff = today + timedelta(days=7)
     rows = (
@@ -76,7 +78,7 @@ async def scan_compliance_deadlines(db: Session) -> int:
         .all()
     )
 
-    created = 0
+    specs: list[NotificationSpec] = []
     for row in rows:
         if not row.due_date:
             continue
@@ -96,20 +98,21 @@ async def scan_compliance_deadlines(db: Session) -> int:
         if not severity or not label:
             continue
 
-        created += await create_notifications_for_active_users(
-            db,
-            category="compliance",
-            severity=severity,
-            title=f"의무사항 마감 {label}: #{row.id}",
-            message="컴플라이언스 의무사항 검토가 필요합니다.",
-            target_type="compliance_obligation",
-            target_id=row.id,
-            action_url="/compliance",
+        specs.append(
+            NotificationSpec(
+                category="compliance",
+                severity=severity,
+                title=f"의무사항 마감 {label}: #{row.id}",
+                message="컴플라이언스 의무사항 검토가 필요합니다.",
+                target_type="compliance_obligation",
+                target_id=row.id,
+                action_url="/compliance",
+            )
         )
-    return created
+    return specs
 
 
-async def scan_capital_call_deadlines(db: Session) -> int:
+def collect_capital_call_deadline_specs(db: Session) -> list[NotificationSpec]:
     today = date.today()
     warning_cutoff = today + timedelta(days=5)
     calls = (
@@ -120,7 +123,7 @@ async def scan_capital_call_deadlines(db: Session) -> int:
     )
     call_ids = [int(call.id) for call in calls]
     if not call_ids:
-        return 0
+        return []
 
     detail_rows = (
         db.query(
@@ -151,7 +154,7 @@ async def scan_capital_call_deadlines(db: Session) -> int:
         if int(row.paid or 0) == 0:
             item_unpaid_by_call[int(row.capital_call_id)] = item_unpaid_by_call.get(int(row.capital_call_id), 0) + 1
 
-    created = 0
+    specs: list[NotificationSpec] = []
     for call in calls:
         unpaid_count = detail_unpaid_by_call.get(int(call.id), 0)
         if unpaid_count == 0 and int(call.id) not in detail_unpaid_by_call:
@@ -173,23 +176,24 @@ async def scan_capital_call_deadlines(db: Session) -> int:
         if not severity or not label:
             continue
 
-        created += await create_notifications_for_active_users(
-            db,
-            category="capital",
-            severity=severity,
-            title=f"콜 납입 마감 {label}: {unpaid_count}건 미납",
-            message="미납 LP 납입 내역을 확인해 주세요.",
-            target_type="capital_call",
-            target_id=call.id,
-            action_url=f"/funds/{call.fund_id}",
+        specs.append(
+            NotificationSpec(
+                category="capital",
+                severity=severity,
+                title=f"콜 납입 마감 {label}: {unpaid_count}건 미납",
+                message="미납 LP 납입 내역을 확인해 주세요.",
+                target_type="capital_call",
+                target_id=call.id,
+                action_url=f"/funds/{call.fund_id}",
+            )
         )
-    return created
+    return specs
 
 
-async def scan_document_expiry(db: Session) -> int:
+def collect_document_expiry_specs(db: Session) -> list[NotificationSpec]:
     today = date.today()
     info_cutoff = today + timedelta(days=30)
-    created = 0
+    specs: list[NotificationSpec] = []
 
     docs = (
         db.query(InvestmentDocument)
@@ -219,15 +223,16 @@ async def scan_document_expiry(db: Session) -> int:
         if not severity or not label:
             continue
 
-        created += await create_notifications_for_active_users(
-            db,
-            category="document",
-            severity=severity,
-            title=f"서류 기한 {label}: {doc.name}",
-            message="미수집 서류 기한을 확인해 주세요.",
-            target_type="investment_document",
-            target_id=doc.id,
-            action_url="/documents",
+        specs.append(
+            NotificationSpec(
+                category="document",
+                severity=severity,
+                title=f"서류 기한 {label}: {doc.name}",
+                message="미수집 서류 기한을 확인해 주세요.",
+                target_type="investment_document",
+                target_id=doc.id,
+                action_url="/documents",
+            )
         )
 
     pending_request_count = int(
@@ -237,22 +242,23 @@ async def scan_document_expiry(db: Session) -> int:
         or 0
     )
     if pending_request_count > 0:
-        created += await create_notifications_for_active_users(
-            db,
-            category="document",
-            severity="info",
-            title=f"사업보고 서류 미수신 {pending_request_count}건",
-            message="사업보고 서류 수집 현황을 확인해 주세요.",
-            target_type="biz_report_request",
-            target_id=None,
-            action_url="/biz-reports",
+        specs.append(
+            NotificationSpec(
+                category="document",
+                severity="info",
+                title=f"사업보고 서류 미수신 {pending_request_count}건",
+                message="사업보고 서류 수집 현황을 확인해 주세요.",
+                target_type="biz_report_request",
+                target_id=None,
+                action_url="/biz-reports",
+            )
         )
 
-    return created
+    return specs
 
 
-async def scan_pending_approvals(db: Session) -> int:
-    created = 0
+def collect_pending_approval_specs(db: Session) -> list[NotificationSpec]:
+    specs: list[NotificationSpec] = []
 
     pending_journal = int(
         db.query(func.count(JournalEntry.id))
@@ -261,15 +267,16 @@ async def scan_pending_approvals(db: Session) -> int:
         or 0
     )
     if pending_journal > 0:
-        created += await create_notifications_for_active_users(
-            db,
-            category="approval",
-            severity="warning",
-            title=f"승인 대기: 분개 {pending_journal}건",
-            message="미결재 분개를 확인해 주세요.",
-            target_type="journal_entry",
-            target_id=None,
-            action_url="/accounting",
+        specs.append(
+            NotificationSpec(
+                category="approval",
+                severity="warning",
+                title=f"승인 대기: 분개 {pending_journal}건",
+                message="미결재 분개를 확인해 주세요.",
+                target_type="journal_entry",
+                target_id=None,
+                action_url="/accounting",
+            )
         )
 
     draft_distribution = int(
@@ -284,15 +291,16 @@ async def scan_pending_approvals(db: Session) -> int:
         or 0
     )
     if draft_distribution > 0:
-        created += await create_notifications_for_active_users(
-            db,
-            category="approval",
-            severity="info",
-            title=f"승인 대기: 배분 {draft_distribution}건",
-            message="배분 초안을 확인해 주세요.",
-            target_type="distribution",
-            target_id=None,
-            action_url="/funds",
+        specs.append(
+            NotificationSpec(
+                category="approval",
+                severity="info",
+                title=f"승인 대기: 배분 {draft_distribution}건",
+                message="배분 초안을 확인해 주세요.",
+                target_type="distribution",
+                target_id=None,
+                action_url="/funds",
+            )
         )
 
     pending_fees = int(
@@ -304,27 +312,55 @@ async def scan_pending_approvals(db: Session) -> int:
         or 0
     )
     if pending_fees > 0:
-        created += await create_notifications_for_active_users(
-            db,
-            category="approval",
-            severity="info",
-            title=f"승인 대기: 보수 {pending_fees}건",
-            message="관리/성과보수 항목을 확인해 주세요.",
-            target_type="management_fee",
-            target_id=None,
-            action_url="/fee-management",
+        specs.append(
+            NotificationSpec(
+                category="approval",
+                severity="info",
+                title=f"승인 대기: 보수 {pending_fees}건",
+                message="관리/성과보수 항목을 확인해 주세요.",
+                target_type="management_fee",
+                target_id=None,
+                action_url="/fee-management",
+            )
         )
 
-    return created
+    return specs
+
+
+async def scan_task_deadlines(db: Session) -> int:
+    return await create_notifications_bulk(db, collect_task_deadline_specs(db))
+
+
+async def scan_compliance_deadlines(db: Session) -> int:
+    return await create_notifications_bulk(db, collect_compliance_deadline_specs(db))
+
+
+async def scan_capital_call_deadlines(db: Session) -> int:
+    return await create_notifications_bulk(db, collect_capital_call_deadline_specs(db))
+
+
+async def scan_document_expiry(db: Session) -> int:
+    return await create_notifications_bulk(db, collect_document_expiry_specs(db))
+
+
+async def scan_pending_approvals(db: Session) -> int:
+    return await create_notifications_bulk(db, collect_pending_approval_specs(db))
+
+
+# Each scanner emits a single category, so created rows are tallied back to it by category.
+_SCANNERS = (
+    ("task_alerts", "task", collect_task_deadline_specs),
+    ("compliance_alerts", "compliance", collect_compliance_deadline_specs),
+    ("capital_call_alerts", "capital", collect_capital_call_deadline_specs),
+    ("document_alerts", "document", collect_document_expiry_specs),
+    ("approval_alerts", "approval", collect_pending_approval_specs),
+)
 
 
 async def run_all_scans(db: Session) -> dict:
-    results = {
-        "task_alerts": await scan_task_deadlines(db),
-        "compliance_alerts": await scan_compliance_deadlines(db),
-        "capital_call_alerts": await scan_capital_call_deadlines(db),
-        "document_alerts": await scan_document_expiry(db),
-        "approval_alerts": await scan_pending_approvals(db),
-    }
+    """Collect every scanner's notifications and fan them out in one bulk insert and commit."""
+    specs = [spec for _, _, collect in _SCANNERS for spec in collect(db)]
+    created = Counter(row["category"] for row in await fan_out_notifications(db, specs))
+    results = {key: created.get(category, 0) for key, category, _ in _SCANNERS}
     results["total"] = sum(results.values())
     return results
@@ -1,19 +1,40 @@
 ﻿from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, Iterable
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, insert
 from sqlalchemy.orm import Session
 
 from models.notification import Notification
 from models.user import User
+from services.notification_hub import get_notification_hub
 
 
 def _utcnow_naive() -> datetime:
     return datetime.now(UTC).replace(tzinfo=None)
 
 
+def serialize_notification(row: Notification) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "category": row.category,
+        "severity": row.severity,
+        "title": row.title,
+        "message": row.message,
+        "target_type": row.target_type,
+        "target_id": row.target_id,
+        "action_type": row.action_type,
+        "action_url": row.action_url,
+        "action_payload": row.action_payload,
+        "is_read": bool(row.is_read),
+        "read_at": row.read_at.isoformat() if row.read_at else None,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
 def _normalize_severity(value: str | None) -> str:
     normalized = (value or "info").strip().lower()
     if normalized not in {"info", "warning", "urgent"}:
@@ -74,80 +95,167 @@ async def create_notification(
     db.add(row)
     db.commit()
     db.refresh(row)
+    get_notification_hub().notifications_added(db.get_bind(), [serialize_notification(row)])
     return row
 
 
-async def create_notifications_for_active_users(
-    db: Session,
-    *,
-    category: str,
-    severity: str,
-    title: str,
-    message: str | None = None,
-    target_type: str | None = None,
-    target_id: int | None = None,
-    action_type: str = "navigate",
-    action_url: str | None = None,
-    action_payload: dict[str, Any] | None = None,
-) -> int:
-    normalized_category = _normalize_category(category)
-    normalized_severity = _normalize_severity(severity)
-    normalized_title = (title or "").strip()[:200] or "알림"
-    normalized_message = (message or "").strip() or None
-    normalized_target_type = (target_type or "").strip() or None
-    normalized_action_type = (action_type or "navigate").strip() or "navigate"
-    normalized_action_url = (action_url or "").strip() or None
-    cutoff = _utcnow_naive() - timedelta(hours=24)
+@dataclass
+class NotificationSpec:
+    """One notification to fan out to every active user."""
+
+    category: str
+    severity: str
+    title: str
+    message: str | None = None
+    target_type: str | None = None
+    target_id: int | None = None
+    action_type: str = "navigate"
+    action_url: str | None = None
+    action_payload: dict[str, Any] | None = None
+
+    def normalized(self) -> dict[str, Any]:
+        return {
+            "category": _normalize_category(self.category),
+            "severity": _normalize_severity(self.severity),
+            "title": (self.title or "").strip()[:200] or "알림",
+            "message": (self.message or "").strip() or None,
+            "target_type": (self.target_type or "").strip() or None,
+            "target_id": self.target_id,
+            "action_type": (self.action_type or "navigate").strip() or "navigate",
+            "action_url": (self.action_url or "").strip() or None,
+            "action_payload": self.action_payload,
+        }
+
+
+def _dedupe_key(values: dict[str, Any]) -> tuple:
+    return (values["category"], values["target_type"], values["target_id"], values["title"])
+
+
+async def create_notifications_bulk(db: Session, specs: Iterable[NotificationSpec]) -> int:
+    return len(await fan_out_notifications(db, specs))
+
+
+async def fan_out_notifications(db: Session, specs: Iterable[NotificationSpec]) -> list[dict[str, Any]]:
+    """Fan `specs` out to all active users with one dedupe query and one bulk insert.
+
+    A (user, category, target, title) already notified in the last 24 hours is skipped.
+    Returns the inserted rows' values.
+    """
+    pending_specs: dict[tuple, dict[str, Any]] = {}
+    for spec in specs:
+        values = spec.normalized()
+        pending_specs.setdefault(_dedupe_key(values), values)
+    if not pending_specs:
+        return []
 
     user_ids = [int(row.id) for row in db.query(User.id).filter(User.is_active == True).all()]
     if not user_ids:
-        return 0
+        return []
 
-    existing_user_ids = {
-        int(row.user_id)
-        for row in db.query(Notification.user_id)
+    cutoff = _utcnow_naive() - timedelta(hours=24)
+    titles = list(dict.fromkeys(values["title"] for values in pending_specs.values()))
+    existing = {
+        (int(row.user_id), row.category, row.target_type, row.target_id, row.title)
+        for row in db.query(
+            Notification.user_id,
+            Notification.category,
+            Notification.target_type,
+            Notification.target_id,
+            Notification.title,
+        )
         .filter(
             Notification.user_id.in_(user_ids),
-            Notification.title == normalized_title,
-            Notification.category == normalized_category,
-            Notification.target_type == normalized_target_type,
-            Notification.target_id == target_id,
+            Notification.title.in_(titles),
             Notification.created_at >= cutoff,
         )
         .all()
     }
 
-    pending_rows = [
-        Notification(
-            user_id=user_id,
-            category=normalized_category,
-            severity=normalized_severity,
-            title=normalized_title,
-            message=normalized_message,
-            target_type=normalized_target_type,
-            target_id=target_id,
-            action_type=normalized_action_type,
-            action_url=normalized_action_url,
-            action_payload=action_payload,
-        )
+    now = _utcnow_naive()
+    rows = [
+        {**values, "user_id": user_id, "is_read": False, "created_at": now}
+        for key, values in pending_specs.items()
         for user_id in user_ids
-        if user_id not in existing_user_ids
+        if (user_id, *key) not in existing
     ]
-    if not pending_rows:
-        return 0
+    if not rows:
+        return []
 
-    db.add_all(pending_rows)
+    # RETURNING order is not guaranteed for batched inserts, so ids are matched by key.
+    inserted = db.execute(
+        insert(Notification).returning(
+            Notification.id,
+            Notification.user_id,
+            Notification.category,
+            Notification.target_type,
+            Notification.target_id,
+            Notification.title,
+        ),
+        rows,
+    ).all()
     db.commit()
-    return len(pending_rows)
+    ids = {(int(row.user_id), row.category, row.target_type, row.target_id, row.title): row.id for row in inserted}
+    get_notification_hub().notifications_added(
+        db.get_bind(),
+        [
+            {
+                "id": ids.get((values["user_id"], *_dedupe_key(values))),
+                **values,
+                "read_at": None,
+                "created_at": values["created_at"].isoformat(),
+            }
+            for values in rows
+        ],
+    )
+    return rows
+
+
+async def create_notifications_for_active_users(
+    db: Session,
+    *,
+    category: str,
+    severity: str,
+    title: str,
+    message: str | None = None,
+    target_type: str | None = None,
+    target_id: int | None = None,
+    action_type: str = "navigate",
+    action_url: str | None = None,
+    action_payload: dict[str, Any] | None = None,
+) -> int:
+    return await create_notifications_bulk(
+        db,
+        [
+            NotificationSpec(
+                category=category,
+                severity=severity,
+                title=title,
+                message=message,
+                target_type=target_type,
+                target_id=target_id,
+                action_type=action_type,
+                action_url=action_url,
+                action_payload=action_payload,
+            )
+        ],
+    )
 
 
 async def get_unread_count(db: Session, user_id: int) -> int:
-    return int(
+    """Unread count from the in-process cache, filled from the table on a miss."""
+    hub = get_notification_hub()
+    bind = db.get_bind()
+    cached, generation = hub.cached_count(bind, user_id)
+    if cached is not None:
+        return cached
+    count = int(
         db.query(func.count(Notification.id))
         .filter(Notification.user_id == user_id, Notification.is_read == False)
         .scalar()
         or 0
     )
+    hub.store_count(bind, user_id, count, generation)
+    return count
 
 
 async def get_notifications(
@@ -187,6 +295,7 @@ async def mark_as_read(db: Session, notification_id: int, user_id: int) -> bool:
     row.is_read = True
     row.read_at = datetime.utcnow()
     db.commit()
+    get_notification_hub().notifications_read(db.get_bind(), user_id, 1)
     return True
 
 
@@ -204,6 +313,7 @@ async def mark_all_as_read(db: Session, user_id: int) -> int:
         row.is_read = True
         row.read_at = now
     db.commit()
+    get_notification_hub().all_read(db.get_bind(), user_id)
     return len(target_rows)
 
 
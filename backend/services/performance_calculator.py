@@ -3,36 +3,73 @@
 import math
 from datetime import date
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from models.fund import LP
-from models.phase3 import CapitalCall, Distribution, DistributionDetail
-from models.valuation import Valuation
+from models.phase3 import CapitalCall, Distribution
+from services.fund_metrics import FundMetricsEngine
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional at runtime
+    np = None  # type: ignore
+
+
+_LOW_RATE = -0.9999
+_HIGH_RATE = 10.0
+_NEWTON_ITERATIONS = 50
+_BISECTION_ITERATIONS = 200
 
 
 def _xirr(cashflows: list[tuple[date, float]]) -> float | None:
+    return xirr_many([cashflows])[0]
+
+
+def xirr_many(cashflow_sets: list[list[tuple[date, float]]]) -> list[float | None]:
+    """Solve XIRR for many cashflow series at once.
+
+    Each series is reduced to amounts and year fractions (days / 365) once. With NumPy,
+    all series are solved together by Newton's method on a padded matrix; a series
+    that does not converge inside the [-0.9999, 10] bracket falls back to bisection.
+    """
+    results: list[float | None] = [None] * len(cashflow_sets)
+    prepared: list[tuple[int, list[float], list[float]]] = []
+    for index, cashflows in enumerate(cashflow_sets):
+        series = _prepare_series(cashflows)
+        if series is not None:
+            prepared.append((index, *series))
+    if not prepared:
+        return results
+
+    if np is not None:
+        solved = _newton_batch([years for _, years, _ in prepared], [amounts for _, _, amounts in prepared])
+    else:
+        solved = [None] * len(prepared)
+    for (index, years, amounts), rate in zip(prepared, solved):
+        results[index] = rate if rate is not None else _bisect(years, amounts)
+    return results
+
+
+def _prepare_series(cashflows: list[tuple[date, float]]) -> tuple[list[float], list[float]] | None:
     if len(cashflows) < 2:
         return None
     if not any(amount < 0 for _, amount in cashflows):
         return None
     if not any(amount > 0 for _, amount in cashflows):
         return None
-
     cashflows = sorted(cashflows, key=lambda row: row[0])
     base = cashflows[0][0]
+    return [(dt - base).days / 365.0 for dt, _ in cashflows], [float(amount) for _, amount in cashflows]
+
+
+def _npv(rate: float, years: list[float], amounts: list[float]) -> float:
+    return sum(amount / ((1.0 + rate) ** year) for year, amount in zip(years, amounts))
 
-    def npv(rate: float) -> float:
-        total = 0.0
-        for dt, amount in cashflows:
-            years = (dt - base).days / 365.0
-            total += amount / ((1.0 + rate) ** years)
-        return total
-
-    low = -0.9999
-    high = 10.0
-    f_low = npv(low)
-    f_high = npv(high)
+
+def _bisect(years: list[float], amounts: list[float]) -> float | None:
+    low = _LOW_RATE
+    high = _HIGH_RATE
+    f_low = _npv(low, years, amounts)
+    f_high = _npv(high, years, amounts)
     if f_low == 0:
         return low
     if f_high == 0:
@@ -40,9 +77,9 @@ def _xirr(cashflows: list[tuple[date, float]]) -> float | None:
     if (f_low > 0 and f_high > 0) or (f_low < 0 and f_high < 0):
         return None
 
-    for _ in range(200):
+    for _ in range(_BISECTION_ITERATIONS):
         mid = (low + high) / 2.0
-        value = npv(mid)
+        value = _npv(mid, years, amounts)
         if abs(value) < 1e-8:
             return mid
         if (f_low < 0 < value) or (f_low > 0 > value):
@@ -58,26 +95,37 @@ def _xirr(cashflows: list[tuple[date, float]]) -> float | None:
     return result
 
 
-def _latest_residual_value(db: Session, fund_id: int, as_of_date: date) -> float:
-    rows = (
-        db.query(Valuation)
-        .filter(Valuation.fund_id == fund_id, Valuation.as_of_date <= as_of_date)
-        .order_by(Valuation.investment_id.asc(), Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    latest_by_investment: dict[int, Valuation] = {}
-    for row in rows:
-        if row.investment_id in latest_by_investment:
-            continue
-        latest_by_investment[row.investment_id] = row
-
-    total = 0.0
-    for row in latest_by_investment.values():
-        if row.total_fair_value is not None:
-            total += float(row.total_fair_value)
-        else:
-            total += float(row.value or 0)
-    return total
+def _newton_batch(year_sets: list[list[float]], amount_sets: list[list[float]]) -> list[float | None]:
+    width = max(len(years) for years in year_sets)
+    years = np.zeros((len(year_sets), width))
+    amounts = np.zeros((len(year_sets), width))
+    for row, (series_years, series_amounts) in enumerate(zip(year_sets, amount_sets)):
+        years[row, : len(series_years)] = series_years
+        amounts[row, : len(series_amounts)] = series_amounts
+
+    with np.errstate(all="ignore"):
+        # Series without a sign change across the bracket have no root the bisection
+        # path would find either; leave them to it so both paths agree.
+        f_low = (amounts * (1.0 + _LOW_RATE) ** -years).sum(axis=1)
+        f_high = (amounts * (1.0 + _HIGH_RATE) ** -years).sum(axis=1)
+        bracketed = np.sign(f_low) * np.sign(f_high) < 0
+
+        rates = np.full(len(year_sets), 0.1)
+        converged = np.zeros(len(year_sets), dtype=bool)
+        for _ in range(_NEWTON_ITERATIONS):
+            active = bracketed & ~converged
+            if not active.any():
+                break
+            discount = (1.0 + rates[active, None]) ** -years[active]
+            value = (amounts[active] * discount).sum(axis=1)
+            slope = (-years[active] * amounts[active] * discount / (1.0 + rates[active, None])).sum(axis=1)
+            step = value / slope
+            updated = rates[active] - step
+            rates[active] = updated
+            converged[active] = (np.abs(step) < 1e-12) | (np.abs(value) < 1e-8)
+
+    usable = converged & bracketed & np.isfinite(rates) & (rates >= _LOW_RATE) & (rates <= _HIGH_RATE)
+    return [float(rate) if ok else None for rate, ok in zip(rates, usable)]
 
 
 async def calculate_fund_performance(
@@ -85,71 +133,66 @@ async def calculate_fund_performance(
     fund_id: int,
     as_of_date: date | None = None,
 ) -> dict:
-    cutoff = as_of_date or date.today()
+    return calculate_funds_performance(db, [fund_id], as_of_date=as_of_date)[fund_id]
 
-    paid_in_total = float(
-        db.query(func.coalesce(func.sum(LP.paid_in), 0))
-        .filter(LP.fund_id == fund_id)
-        .scalar()
-        or 0
-    )
 
-    distributed_from_details = float(
-        db.query(func.coalesce(func.sum(DistributionDetail.distribution_amount), 0))
-        .join(Distribution, Distribution.id == DistributionDetail.distribution_id)
-        .filter(Distribution.fund_id == fund_id, Distribution.dist_date <= cutoff)
-        .scalar()
-        or 0
-    )
-    if distributed_from_details > 0:
-        total_distributed = distributed_from_details
-    else:
-        total_distributed = float(
-            db.query(func.coalesce(func.sum(Distribution.principal_total + Distribution.profit_total), 0))
-            .filter(Distribution.fund_id == fund_id, Distribution.dist_date <= cutoff)
-            .scalar()
-            or 0
-        )
-
-    residual_value = _latest_residual_value(db, fund_id, cutoff)
-
-    tvpi = ((total_distributed + residual_value) / paid_in_total) if paid_in_total > 0 else 0.0
-    dpi = (total_distributed / paid_in_total) if paid_in_total > 0 else 0.0
+def calculate_funds_performance(
+    db: Session,
+    fund_ids: list[int],
+    as_of_date: date | None = None,
+) -> dict[int, dict]:
+    """IRR/TVPI/DPI for many funds from grouped loads and one batched XIRR solve."""
+    cutoff = as_of_date or date.today()
+    fund_ids = list(dict.fromkeys(fund_ids))
+    if not fund_ids:
+        return {}
 
-    cashflows: list[tuple[date, float]] = []
+    metrics_by_key = FundMetricsEngine.for_session(db).load(fund_ids, [cutoff])
+    cashflows: dict[int, list[tuple[date, float]]] = {fund_id: [] for fund_id in fund_ids}
     calls = (
-        db.query(CapitalCall)
-        .filter(CapitalCall.fund_id == fund_id, CapitalCall.call_date <= cutoff)
+        db.query(CapitalCall.fund_id, CapitalCall.call_date, CapitalCall.total_amount)
+        .filter(CapitalCall.fund_id.in_(fund_ids), CapitalCall.call_date <= cutoff)
         .order_by(CapitalCall.call_date.asc(), CapitalCall.id.asc())
         .all()
     )
-    for row in calls:
-        amount = float(row.total_amount or 0)
+    for fund_id, call_date, total_amount in calls:
+        amount = float(total_amount or 0)
         if amount > 0:
-            cashflows.append((row.call_date, -amount))
+            cashflows[fund_id].append((call_date, -amount))
 
     distributions = (
-        db.query(Distribution)
-        .filter(Distribution.fund_id == fund_id, Distribution.dist_date <= cutoff)
+        db.query(Distribution.fund_id, Distribution.dist_date, Distribution.principal_total, Distribution.profit_total)
+        .filter(Distribution.fund_id.in_(fund_ids), Distribution.dist_date <= cutoff)
         .order_by(Distribution.dist_date.asc(), Distribution.id.asc())
         .all()
     )
-    for row in distributions:
-        amount = float(row.principal_total or 0) + float(row.profit_total or 0)
+    for fund_id, dist_date, principal_total, profit_total in distributions:
+        amount = float(principal_total or 0) + float(profit_total or 0)
         if amount > 0:
-            cashflows.append((row.dist_date, amount))
-
-    if residual_value > 0:
-        cashflows.append((cutoff, residual_value))
-
-    irr_value = _xirr(cashflows)
-
-    return {
-        "irr": round(float(irr_value), 6) if irr_value is not None else None,
-        "tvpi": round(float(tvpi), 6),
-        "dpi": round(float(dpi), 6),
-        "total_paid_in": round(paid_in_total, 2),
-        "total_distributed": round(total_distributed, 2),
-        "residual_value": round(residual_value, 2),
-        "as_of_date": cutoff.isoformat(),
-    }
+            cashflows[fund_id].append((dist_date, amount))
+
+    for fund_id in fund_ids:
+        residual_value = metrics_by_key[(fund_id, cutoff)].residual_value
+        if residual_value > 0:
+            cashflows[fund_id].append((cutoff, residual_value))
+
+    irr_values = xirr_many([cashflows[fund_id] for fund_id in fund_ids])
+
+    results: dict[int, dict] = {}
+    for fund_id, irr_value in zip(fund_ids, irr_values):
+        metrics = metrics_by_key[(fund_id, cutoff)]
+        paid_in_total = metrics.lp_paid_in_total
+        total_distributed = metrics.distributed_total
+        residual_value = metrics.residual_value
+        tvpi = ((total_distributed + residual_value) / paid_in_total) if paid_in_total > 0 else 0.0
+        dpi = (total_distributed / paid_in_total) if paid_in_total > 0 else 0.0
+        results[fund_id] = {
+            "irr": round(float(irr_value), 6) if irr_value is not None else None,
+            "tvpi": round(float(tvpi), 6),
+            "dpi": round(float(dpi), 6),
+            "total_paid_in": round(paid_in_total, 2),
+            "total_distributed": round(total_distributed, 2),
+            "residual_value": round(residual_value, 2),
+            "as_of_date": cutoff.isoformat(),
+        }
+    return results
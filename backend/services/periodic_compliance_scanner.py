@@ -1,15 +1,68 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from time import monotonic
+from typing import Any, Callable
 
 from sqlalchemy import or_
 
-from database import SessionLocal
-from models.compliance import ComplianceDocument, FundComplianceRule
+from database import SessionLocal, supports_parallel_sessions
+from models.compliance import ComplianceCheck, ComplianceDocument, FundComplianceRule
 from models.fund import Fund
-from services.compliance_rule_engine import ComplianceRuleEngine
+from services.compliance_rule_engine import ComplianceRuleEngine, FundEvaluationContext
+
+logger = logging.getLogger(__name__)
+
+MAX_SCAN_WORKERS = int(os.getenv("COMPLIANCE_SCAN_WORKERS", str(min(8, os.cpu_count() or 1))))
+FUND_SCAN_TIMEOUT_SECONDS = float(os.getenv("COMPLIANCE_SCAN_FUND_TIMEOUT", "120"))
+STRAGGLER_POLL_SECONDS = 1.0
+
+_PROGRESS_LOCK = threading.Lock()
+_LATEST_PROGRESS: "ScanProgress | None" = None
+
+
+class FundScanTimeout(Exception):
+    pass
+
+
+class _FundScanTracker:
+    """Start times of parallel fund scans; scans abandoned past their budget never commit."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: dict[int, float] = {}
+        self._settled: set[int] = set()
+        self._abandoned: set[int] = set()
+
+    def start(self, fund_id: int) -> None:
+        with self._lock:
+            self._started[fund_id] = monotonic()
+
+    def settle(self, fund_id: int) -> bool:
+        """Claim the right to commit; False once the scan has been abandoned."""
+        with self._lock:
+            if fund_id in self._abandoned:
+                return False
+            self._settled.add(fund_id)
+            return True
+
+    def abandon_overdue(self, fund_ids, timeout: float) -> list[int]:
+        now = monotonic()
+        overdue: list[int] = []
+        with self._lock:
+            for fund_id in fund_ids:
+                started = self._started.get(fund_id)
+                if started is None or fund_id in self._settled or now - started <= timeout:
+                    continue
+                self._abandoned.add(fund_id)
+                overdue.append(fund_id)
+        return overdue
 
 
 @dataclass
@@ -21,6 +74,8 @@ class ScanResult:
     failed: int
     warnings: int
     new_violations: list[dict[str, Any]]
+    timed_out: bool = False
+    error: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -31,16 +86,61 @@ class ScanResult:
             "failed": self.failed,
             "warnings": self.warnings,
             "new_violations": self.new_violations,
+            "timed_out": self.timed_out,
+            "error": self.error,
         }
 
 
+@dataclass
+class ScanProgress:
+    trigger_source: str
+    total_funds: int
+    completed_funds: int = 0
+    timed_out_funds: list[int] = field(default_factory=list)
+    errored_funds: list[int] = field(default_factory=list)
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trigger_source": self.trigger_source,
+            "total_funds": self.total_funds,
+            "completed_funds": self.completed_funds,
+            "timed_out_funds": list(self.timed_out_funds),
+            "errored_funds": list(self.errored_funds),
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "running": self.finished_at is None,
+        }
+
+
+def get_scan_progress() -> dict[str, Any] | None:
+    with _PROGRESS_LOCK:
+        return _LATEST_PROGRESS.to_dict() if _LATEST_PROGRESS else None
+
+
 class PeriodicComplianceScanner:
-    """Scheduled compliance scanner across funds."""
+    """Scheduled compliance scanner across funds.
+
+    Scans run in a worker thread so they never block the event loop; multi-fund scans
+    fan funds out to a thread pool with one session per fund.
+    """
 
     OPERATING_STATUSES = {"active", "운용중"}
 
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        session_factory=SessionLocal,
+        max_workers: int | None = None,
+        fund_timeout: float | None = None,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ):
         self.engine = ComplianceRuleEngine()
+        self.session_factory = session_factory
+        self.max_workers = max(1, max_workers or MAX_SCAN_WORKERS)
+        self.fund_timeout = fund_timeout or FUND_SCAN_TIMEOUT_SECONDS
+        self.progress_callback = progress_callback
 
     async def run_daily_scan(
         self,
@@ -48,7 +148,8 @@ class PeriodicComplianceScanner:
         trigger_type: str = "scheduled",
         trigger_source: str = "daily_scan",
     ) -> dict[str, Any]:
-        return self._run_scan(
+        return await asyncio.to_thread(
+            self._run_scan,
             levels=["L1", "L2", "L3"],
             trigger_type=trigger_type,
             trigger_source=trigger_source,
@@ -61,7 +162,8 @@ class PeriodicComplianceScanner:
         trigger_type: str = "scheduled",
         trigger_source: str = "monthly_full_audit",
     ) -> dict[str, Any]:
-        return self._run_scan(
+        return await asyncio.to_thread(
+            self._run_scan,
             levels=None,
             trigger_type=trigger_type,
             trigger_source=trigger_source,
@@ -76,7 +178,23 @@ class PeriodicComplianceScanner:
         trigger_type: str = "manual",
         trigger_source: str = "manual_scan",
     ) -> dict[str, Any]:
-        db = SessionLocal()
+        return await asyncio.to_thread(
+            self._run_fund_scan,
+            fund_id=fund_id,
+            levels=levels,
+            trigger_type=trigger_type,
+            trigger_source=trigger_source,
+        )
+
+    def _run_fund_scan(
+        self,
+        *,
+        fund_id: int,
+        levels: list[str] | None,
+        trigger_type: str,
+        trigger_source: str,
+    ) -> dict[str, Any]:
+        db = self.session_factory()
         try:
             fund = db.get(Fund, fund_id)
             if not fund:
@@ -114,43 +232,132 @@ class PeriodicComplianceScanner:
         trigger_source: str,
         operating_only: bool,
     ) -> dict[str, Any]:
-        db = SessionLocal()
+        db = self.session_factory()
         try:
-            funds_query = db.query(Fund)
+            funds_query = db.query(Fund.id, Fund.name)
             if operating_only:
                 funds_query = funds_query.filter(Fund.status.in_(list(self.OPERATING_STATUSES)))
             funds = funds_query.order_by(Fund.id.asc()).all()
             if not funds and operating_only:
                 # Fallback for environments where status values are not normalized.
-                funds = db.query(Fund).order_by(Fund.id.asc()).all()
-
-            scan_results = [
-                self._scan_fund(
-                    db=db,
-                    fund=fund,
-                    levels=levels,
-                    trigger_type=trigger_type,
-                    trigger_source=trigger_source,
-                )
-                for fund in funds
-            ]
+                funds = db.query(Fund.id, Fund.name).order_by(Fund.id.asc()).all()
+            funds = [(row.id, row.name) for row in funds]
+            parallel = len(funds) > 1 and self.max_workers > 1 and supports_parallel_sessions(db.get_bind())
+        finally:
+            db.close()
+
+        progress = ScanProgress(trigger_source=trigger_source, total_funds=len(funds))
+        self._publish_progress(progress)
 
+        scan_kwargs = {"levels": levels, "trigger_type": trigger_type, "trigger_source": trigger_source}
+        results_by_fund: dict[int, ScanResult] = {}
+        if parallel:
+            # Rule evaluation checks the deadline between rules; a rule or query that hangs is
+            # abandoned here instead, so one fund cannot hold the whole scan.
+            tracker = _FundScanTracker()
+            executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(funds)))
+            try:
+                futures = {
+                    executor.submit(
+                        self._scan_fund_in_session, fund_id, fund_name, tracker=tracker, **scan_kwargs
+                    ): (fund_id, fund_name)
+                    for fund_id, fund_name in funds
+                }
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(
+                        pending,
+                        timeout=min(STRAGGLER_POLL_SECONDS, self.fund_timeout),
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        result = future.result()
+                        results_by_fund[result.fund_id] = result
+                        self._advance_progress(progress, result)
+                    running = {futures[future][0]: future for future in pending}
+                    for fund_id in tracker.abandon_overdue(running, self.fund_timeout):
+                        future = running[fund_id]
+                        pending.discard(future)
+                        logger.warning(
+                            "Compliance scan for fund %s abandoned after %.0fs; its worker is still running",
+                            fund_id,
+                            self.fund_timeout,
+                        )
+                        result = self._empty_result(fund_id, futures[future][1], timed_out=True, error="timeout")
+                        results_by_fund[fund_id] = result
+                        self._advance_progress(progress, result)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            # Single-connection databases scan in this thread, where the budget is only checked between rules.
+            for fund_id, fund_name in funds:
+                result = self._scan_fund_in_session(fund_id, fund_name, **scan_kwargs)
+                results_by_fund[fund_id] = result
+                self._advance_progress(progress, result)
+
+        scan_results = [results_by_fund[fund_id] for fund_id, _ in funds]
+        db = self.session_factory()
+        try:
             self._create_scan_alerts(
                 db=db,
                 trigger_source=trigger_source,
                 scan_results=scan_results,
             )
             db.commit()
-            return self._build_scan_payload(
-                trigger_source=trigger_source,
-                trigger_type=trigger_type,
-                scan_results=scan_results,
-            )
         except Exception:
             db.rollback()
             raise
         finally:
             db.close()
+            progress.finished_at = datetime.utcnow()
+            self._publish_progress(progress)
+
+        return self._build_scan_payload(
+            trigger_source=trigger_source,
+            trigger_type=trigger_type,
+            scan_results=scan_results,
+        )
+
+    def _scan_fund_in_session(
+        self,
+        fund_id: int,
+        fund_name: str,
+        *,
+        levels: list[str] | None,
+        trigger_type: str,
+        trigger_source: str,
+        tracker: _FundScanTracker | None = None,
+    ) -> ScanResult:
+        # Each fund commits on its own so one slow or failing fund does not hold back the rest.
+        if tracker is not None:
+            tracker.start(fund_id)
+        db = self.session_factory()
+        try:
+            fund = db.get(Fund, fund_id)
+            result = self._scan_fund(
+                db=db,
+                fund=fund,
+                levels=levels,
+                trigger_type=trigger_type,
+                trigger_source=trigger_source,
+                deadline=monotonic() + self.fund_timeout,
+            )
+            if tracker is not None and not tracker.settle(fund_id):
+                # Already reported as timed out; a late straggler must not write its checks.
+                db.rollback()
+                return self._empty_result(fund_id, fund_name, timed_out=True, error="timeout")
+            db.commit()
+            return result
+        except FundScanTimeout:
+            db.rollback()
+            logger.warning("Compliance scan for fund %s timed out after %.0fs", fund_id, self.fund_timeout)
+            return self._empty_result(fund_id, fund_name, timed_out=True, error="timeout")
+        except Exception as exc:  # noqa: BLE001
+            db.rollback()
+            logger.exception("Compliance scan for fund %s failed", fund_id)
+            return self._empty_result(fund_id, fund_name, error=str(exc) or exc.__class__.__name__)
+        finally:
+            db.close()
 
     def _scan_fund(
         self,
@@ -160,6 +367,7 @@ class PeriodicComplianceScanner:
         levels: list[str] | None,
         trigger_type: str,
         trigger_source: str,
+        deadline: float | None = None,
     ) -> ScanResult:
         rule_query = (
             db.query(FundComplianceRule)
@@ -178,14 +386,27 @@ class PeriodicComplianceScanner:
         warnings = 0
         violations: list[dict[str, Any]] = []
 
+        context = FundEvaluationContext(db, fund.id)
+        checks: list[tuple[FundComplianceRule, ComplianceCheck]] = []
         for rule in rules:
-            check = self.engine.evaluate_rule(rule=rule, fund_id=fund.id, db=db)
+            if deadline is not None and monotonic() > deadline:
+                raise FundScanTimeout(fund.id)
+            check = self.engine.evaluate_rule(rule=rule, fund_id=fund.id, db=db, context=context)
             check.trigger_type = trigger_type
             check.trigger_source = trigger_source
             check.trigger_source_id = fund.id
-            db.add(check)
-            db.flush()
+            checks.append((rule, check))
 
+        # Evaluation only reads; checks and remediation tasks go out together so write locks stay short.
+        self.engine.save_checks(
+            db=db,
+            fund_id=fund.id,
+            evaluated=checks,
+            trigger_source=trigger_source,
+            trigger_source_id=fund.id,
+        )
+
+        for rule, check in checks:
             if check.result == "pass":
                 passed += 1
             elif check.result in {"fail", "error"}:
@@ -197,16 +418,6 @@ class PeriodicComplianceScanner:
                         "detail": check.detail,
                     }
                 )
-                if bool(rule.auto_task):
-                    # Reuse Phase 49 task creation behavior to preserve consistency.
-                    self.engine._create_remediation_task(
-                        check=check,
-                        rule=rule,
-                        fund_id=fund.id,
-                        trigger_source=trigger_source,
-                        trigger_source_id=fund.id,
-                        db=db,
-                    )
             else:
                 warnings += 1
 
@@ -220,6 +431,37 @@ class PeriodicComplianceScanner:
             new_violations=violations,
         )
 
+    def _advance_progress(self, progress: ScanProgress, result: ScanResult) -> None:
+        with _PROGRESS_LOCK:
+            progress.completed_funds += 1
+            if result.timed_out:
+                progress.timed_out_funds.append(result.fund_id)
+            elif result.error:
+                progress.errored_funds.append(result.fund_id)
+        self._publish_progress(progress)
+
+    def _publish_progress(self, progress: ScanProgress) -> None:
+        global _LATEST_PROGRESS
+        with _PROGRESS_LOCK:
+            _LATEST_PROGRESS = progress
+            snapshot = progress.to_dict()
+        if self.progress_callback is not None:
+            self.progress_callback(snapshot)
+
+    @staticmethod
+    def _empty_result(fund_id: int, fund_name: str, *, timed_out: bool = False, error: str | None = None) -> ScanResult:
+        return ScanResult(
+            fund_id=fund_id,
+            fund_name=fund_name,
+            total_rules=0,
+            passed=0,
+            failed=0,
+            warnings=0,
+            new_violations=[],
+            timed_out=timed_out,
+            error=error,
+        )
+
     def _create_scan_alerts(
         self,
         *,
@@ -263,5 +505,7 @@ class PeriodicComplianceScanner:
             "passed": sum(item.passed for item in scan_results),
             "failed": sum(item.failed for item in scan_results),
             "warnings": sum(item.warnings for item in scan_results),
+            "timed_out_funds": [item.fund_id for item in scan_results if item.timed_out],
+            "errored_funds": [item.fund_id for item in scan_results if item.error and not item.timed_out],
             "results": [item.to_dict() for item in scan_results],
         }
@@ -12,7 +12,7 @@ from models.investment import Investment, PortfolioCompany
 from models.pre_report_check import PreReportCheck
 from models.regular_report import RegularReport
 from models.task import Task
-from services.compliance_rule_engine import ComplianceRuleEngine
+from services.compliance_rule_engine import ComplianceRuleEngine, FundEvaluationContext
 
 
 class PreReportChecker:
@@ -138,8 +138,9 @@ class PreReportChecker:
             .order_by(FundComplianceRule.rule_code.asc())
             .all()
         )
+        context = FundEvaluationContext(db, fund.id)
         for rule in rules:
-            check = self.rule_engine.evaluate_rule(rule=rule, fund_id=fund.id, db=db)
+            check = self.rule_engine.evaluate_rule(rule=rule, fund_id=fund.id, db=db, context=context)
             if check.result == "pass":
                 continue
             severity = "error" if check.result in {"error", "fail"} else "warning"
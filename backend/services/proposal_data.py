@@ -10,14 +10,12 @@ from uuid import uuid4
 
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from sqlalchemy import func, or_
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from models.fund import Fund, LP
 from models.gp_entity import GPEntity
-from models.investment import Investment, PortfolioCompany
-from models.lp_contribution import LPContribution
-from models.phase3 import CapitalCall, CapitalCallItem, Distribution, ExitTrade
+from models.investment import PortfolioCompany
 from models.proposal_data import (
     FundHistory,
     ProposalApplication,
@@ -41,7 +39,7 @@ from models.proposal_data import (
 )
 from models.transaction import Transaction
 from models.user import User
-from models.valuation import Valuation
+from services.fund_metrics import FundMetricsEngine
 from services.lp_types import normalize_lp_type
 
 _BASELINE_DATE = date(1900, 1, 1)
@@ -320,92 +318,6 @@ def _fund_matches_gp(fund: Fund, selected_gp: GPEntity | None) -> bool:
     return any(normalized_gp == target.strip() for target in targets if target)
 
 
-def _calculate_paid_in_as_of(db: Session, fund_id: int, as_of_date: date) -> float:
-    contribution_count = (
-        db.query(func.count(LPContribution.id))
-        .filter(LPContribution.fund_id == fund_id)
-        .scalar()
-    )
-    if int(contribution_count or 0) > 0:
-        paid_in_total = (
-            db.query(func.coalesce(func.sum(LPContribution.amount), 0.0))
-            .filter(
-                LPContribution.fund_id == fund_id,
-                LPContribution.actual_paid_date.isnot(None),
-                LPContribution.actual_paid_date <= as_of_date,
-            )
-            .scalar()
-        )
-        return _to_float(paid_in_total)
-
-    paid_from_calls = (
-        db.query(func.coalesce(func.sum(CapitalCallItem.amount), 0.0))
-        .join(CapitalCall, CapitalCall.id == CapitalCallItem.capital_call_id)
-        .filter(
-            CapitalCall.fund_id == fund_id,
-            CapitalCallItem.paid == 1,
-            CapitalCallItem.paid_date.isnot(None),
-            CapitalCallItem.paid_date <= as_of_date,
-        )
-        .scalar()
-    )
-    if paid_from_calls:
-        return _to_float(paid_from_calls)
-
-    fallback = (
-        db.query(func.coalesce(func.sum(LP.paid_in), 0.0))
-        .filter(LP.fund_id == fund_id)
-        .scalar()
-    )
-    return _to_float(fallback)
-
-
-def _calculate_invested_as_of(db: Session, fund_id: int, as_of_date: date) -> float:
-    total = (
-        db.query(func.coalesce(func.sum(Investment.amount), 0.0))
-        .filter(
-            Investment.fund_id == fund_id,
-            Investment.investment_date.isnot(None),
-            Investment.investment_date <= as_of_date,
-        )
-        .scalar()
-    )
-    return _to_float(total)
-
-
-def _calculate_exit_total_as_of(db: Session, fund_id: int, as_of_date: date) -> float:
-    total = (
-        db.query(func.coalesce(func.sum(ExitTrade.amount), 0.0))
-        .filter(
-            ExitTrade.fund_id == fund_id,
-            ExitTrade.trade_date <= as_of_date,
-        )
-        .scalar()
-    )
-    return _to_float(total)
-
-
-def _calculate_nav_as_of(db: Session, fund_id: int, as_of_date: date) -> float:
-    valuation_rows = (
-        db.query(Valuation)
-        .filter(
-            Valuation.fund_id == fund_id,
-            Valuation.as_of_date <= as_of_date,
-        )
-        .order_by(Valuation.investment_id.asc(), Valuation.as_of_date.desc(), Valuation.id.desc())
-        .all()
-    )
-    if not valuation_rows:
-        return round(max(_calculate_invested_as_of(db, fund_id, as_of_date) - _calculate_exit_total_as_of(db, fund_id, as_of_date), 0.0), 2)
-
-    latest_by_investment: dict[int, float] = {}
-    for row in valuation_rows:
-        if row.investment_id in latest_by_investment:
-            continue
-        latest_by_investment[row.investment_id] = _to_float(row.value)
-    return _to_float(sum(latest_by_investment.values()))
-
-
 def _build_fund_snapshot(db: Session, fund: Fund, as_of_date: date) -> dict[str, Any]:
     fund_snapshot = _resolve_history_snapshot(
         db,
@@ -415,6 +327,7 @@ def _build_fund_snapshot(db: Session, fund: Fund, as_of_date: date) -> dict[str,
         as_of_date=as_of_date,
         fallback_snapshot=_serialize_fund(fund),
     )
+    metrics = FundMetricsEngine.for_session(db).get(fund.id, as_of_date)
     return {
         "id": fund.id,
         "name": fund_snapshot.get("name", fund.name),
@@ -430,10 +343,10 @@ def _build_fund_snapshot(db: Session, fund: Fund, as_of_date: date) -> dict[str,
         "investment_period_end": _safe_date(fund_snapshot.get("investment_period_end")) or fund.investment_period_end,
         "maturity_date": _safe_date(fund_snapshot.get("maturity_date")) or fund.maturity_date,
         "commitment_total": fund_snapshot.get("commitment_total", fund.commitment_total),
-        "paid_in_total": _calculate_paid_in_as_of(db, fund.id, as_of_date),
-        "invested_total": _calculate_invested_as_of(db, fund.id, as_of_date),
-        "exit_total": _calculate_exit_total_as_of(db, fund.id, as_of_date),
-        "nav_total": _calculate_nav_as_of(db, fund.id, as_of_date),
+        "paid_in_total": _to_float(metrics.paid_in_total),
+        "invested_total": _to_float(metrics.invested_total),
+        "exit_total": _to_float(metrics.exit_total),
+        "nav_total": _to_float(metrics.nav_total),
     }
 
 
@@ -548,6 +461,7 @@ def resolve_proposal_workspace(
         selected_fund_ids = [fund.id for fund in candidate_funds]
     selected_fund_id_set = set(selected_fund_ids)
     selected_funds = [fund for fund in candidate_funds if fund.id in selected_fund_id_set]
+    FundMetricsEngine.for_session(db).load([fund.id for fund in candidate_funds], [as_of_date])
     fund_snapshot_by_id = {
         fund.id: _build_fund_snapshot(db, fund, as_of_date)
         for fund in candidate_funds
@@ -1055,6 +969,7 @@ def _proposal_views(workspace: dict[str, Any], db: Session) -> dict[str, Any]:
             .order_by(Fund.id.asc())
             .all()
         )
+        FundMetricsEngine.for_session(db).load([fund.id for fund in extra_funds], [as_of_date])
         for fund in extra_funds:
             all_funds_by_id[fund.id] = _build_fund_snapshot(db, fund, as_of_date)
 
@@ -4,13 +4,15 @@ import calendar
 import json
 from dataclasses import dataclass
 from datetime import date
-from decimal import Decimal
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from models.accounting import Account, JournalEntry, JournalEntryLine
+from models.accounting import Account
 from models.provisional_fs import ProvisionalFS
+from services.ledger_aggregation import LedgerTotals, account_ledger_totals, fund_account_ledger_totals
+
+# Unapproved entries are left out of provisional statements.
+EXCLUDED_ENTRY_STATUSES = ("미결재",)
 
 
 @dataclass
@@ -46,14 +48,66 @@ class ProvisionalFSService:
         month_start, month_end = self._month_range(year_month)
         snapshots = self._load_snapshots(db, fund_id, month_start, month_end)
 
+        fs = self._store(db, fund_id, year_month, snapshots)
+        db.commit()
+        db.refresh(fs)
+        return fs
+
+    def generate_many(self, fund_ids: list[int], year_month: str, db: Session) -> list[ProvisionalFS]:
+        """Month-end close for several funds from a single ledger scan."""
+        month_start, month_end = self._month_range(year_month)
+        fund_ids = list(dict.fromkeys(fund_ids))
+        if not fund_ids:
+            return []
+
+        accounts = (
+            db.query(Account)
+            .filter(Account.fund_id.in_(fund_ids) | Account.fund_id.is_(None))
+            .order_by(Account.display_order.asc(), Account.id.asc())
+            .all()
+        )
+        totals_by_fund = fund_account_ledger_totals(
+            db,
+            fund_ids,
+            month_end,
+            period_start=month_start,
+            exclude_statuses=EXCLUDED_ENTRY_STATUSES,
+        )
+        existing = {
+            row.fund_id: row
+            for row in db.query(ProvisionalFS)
+            .filter(ProvisionalFS.fund_id.in_(fund_ids), ProvisionalFS.year_month == year_month)
+            .all()
+        }
+
+        statements: list[ProvisionalFS] = []
+        for fund_id in fund_ids:
+            fund_accounts = [account for account in accounts if account.fund_id in (None, fund_id)]
+            snapshots = self._build_snapshots(fund_accounts, totals_by_fund.get(fund_id, {}))
+            statements.append(self._store(db, fund_id, year_month, snapshots, existing.get(fund_id)))
+
+        db.commit()
+        for fs in statements:
+            db.refresh(fs)
+        return statements
+
+    def _store(
+        self,
+        db: Session,
+        fund_id: int,
+        year_month: str,
+        snapshots: list[AccountSnapshot],
+        fs: ProvisionalFS | None = None,
+    ) -> ProvisionalFS:
         sfp_data, sfp_summary = self._build_sfp(snapshots)
         is_data = self._build_is(snapshots)
 
-        fs = (
-            db.query(ProvisionalFS)
-            .filter(ProvisionalFS.fund_id == fund_id, ProvisionalFS.year_month == year_month)
-            .first()
-        )
+        if fs is None:
+            fs = (
+                db.query(ProvisionalFS)
+                .filter(ProvisionalFS.fund_id == fund_id, ProvisionalFS.year_month == year_month)
+                .first()
+            )
         if fs is None:
             fs = ProvisionalFS(fund_id=fund_id, year_month=year_month)
             db.add(fs)
@@ -65,9 +119,6 @@ class ProvisionalFSService:
         fs.total_liabilities = sfp_summary["total_liabilities"]
         fs.total_equity = sfp_summary["total_equity"]
         fs.net_income = is_data["net_income"]
-
-        db.commit()
-        db.refresh(fs)
         return fs
 
     def _month_range(self, year_month: str) -> tuple[date, date]:
@@ -97,57 +148,19 @@ class ProvisionalFSService:
             .order_by(Account.display_order.asc(), Account.id.asc())
             .all()
         )
+        totals = account_ledger_totals(
+            db,
+            fund_id,
+            month_end,
+            period_start=month_start,
+            exclude_statuses=EXCLUDED_ENTRY_STATUSES,
+        )
+        return self._build_snapshots(accounts, totals)
 
+    def _build_snapshots(self, accounts: list[Account], totals: dict[int, LedgerTotals]) -> list[AccountSnapshot]:
         snapshots: list[AccountSnapshot] = []
         for account in accounts:
-            debit_total = (
-                db.query(func.coalesce(func.sum(JournalEntryLine.debit), 0))
-                .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
-                .filter(
-                    JournalEntryLine.account_id == account.id,
-                    JournalEntry.fund_id == fund_id,
-                    JournalEntry.entry_date <= month_end,
-                    JournalEntry.status != "미결재",
-                )
-                .scalar()
-            )
-            credit_total = (
-                db.query(func.coalesce(func.sum(JournalEntryLine.credit), 0))
-                .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
-                .filter(
-                    JournalEntryLine.account_id == account.id,
-                    JournalEntry.fund_id == fund_id,
-                    JournalEntry.entry_date <= month_end,
-                    JournalEntry.status != "미결재",
-                )
-                .scalar()
-            )
-
-            debit_month = (
-                db.query(func.coalesce(func.sum(JournalEntryLine.debit), 0))
-                .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
-                .filter(
-                    JournalEntryLine.account_id == account.id,
-                    JournalEntry.fund_id == fund_id,
-                    JournalEntry.entry_date >= month_start,
-                    JournalEntry.entry_date <= month_end,
-                    JournalEntry.status != "미결재",
-                )
-                .scalar()
-            )
-            credit_month = (
-                db.query(func.coalesce(func.sum(JournalEntryLine.credit), 0))
-                .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
-                .filter(
-                    JournalEntryLine.account_id == account.id,
-                    JournalEntry.fund_id == fund_id,
-                    JournalEntry.entry_date >= month_start,
-                    JournalEntry.entry_date <= month_end,
-                    JournalEntry.status != "미결재",
-                )
-                .scalar()
-            )
-
+            account_totals = totals.get(account.id) or LedgerTotals()
             snapshots.append(
                 AccountSnapshot(
                     account_id=account.id,
@@ -156,10 +169,10 @@ class ProvisionalFSService:
                     category=account.category or "",
                     sub_category=account.sub_category,
                     normal_side=account.normal_side,
-                    debit_total=self._to_float(debit_total),
-                    credit_total=self._to_float(credit_total),
-                    debit_month=self._to_float(debit_month),
-                    credit_month=self._to_float(credit_month),
+                    debit_total=account_totals.debit_total,
+                    credit_total=account_totals.credit_total,
+                    debit_month=account_totals.debit_period,
+                    credit_month=account_totals.credit_period,
                 )
             )
 
@@ -291,10 +304,3 @@ class ProvisionalFSService:
             "income_tax": income_tax,
             "net_income": net_income,
         }
-
-    def _to_float(self, value) -> float:
-        if value is None:
-            return 0.0
-        if isinstance(value, Decimal):
-            return float(value)
-        return float(value)
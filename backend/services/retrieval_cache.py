@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRIEVAL_TTL_SECONDS = 300
+MAX_RETRIEVAL_ENTRIES = 1024
+
+
+def normalize_query_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def query_text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_query_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Query embeddings persisted in a local SQLite file, keyed by (model, normalized text hash)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+                """
+            )
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vector FROM query_embeddings WHERE model = ? AND text_hash = ?",
+                    (model, query_text_hash(text)),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache read failed: %s", exc)
+            return None
+        if row is None:
+            return None
+        return array("d", row[0]).tolist()
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        payload = array("d", (float(value) for value in vector)).tobytes()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (model, text_hash, vector, created_at) VALUES (?, ?, ?, ?)",
+                    (model, query_text_hash(text), payload, time.time()),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache write failed: %s", exc)
+
+
+class RetrievalCache:
+    """Short-lived Chroma query results, dropped per collection when that collection changes."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = MAX_RETRIEVAL_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, str, list[dict[str, Any]]]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def generation(self, collection: str) -> int:
+        with self._lock:
+            return self._generations.get(collection, 0)
+
+    def get(self, key: Hashable) -> list[dict[str, Any]] | None:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, rows = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers annotate rows in place, so every hit gets its own copy.
+        return copy.deepcopy(rows)
+
+    def put(self, key: Hashable, collection: str, rows: list[dict[str, Any]], generation: int) -> None:
+        """Store `rows` unless `collection` changed since `generation` was read for this query."""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if self._generations.get(collection, 0) != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, collection, copy.deepcopy(rows))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_collection(self, collection: str) -> None:
+        with self._lock:
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            for key in [key for key, entry in self._entries.items() if entry[1] == collection]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_retrieval_cache: RetrievalCache | None = None
+_embedding_caches: dict[str, EmbeddingCache] = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    global _retrieval_cache
+    if _retrieval_cache is None:
+        ttl = float(os.getenv("LEGAL_RETRIEVAL_CACHE_TTL_SECONDS", str(DEFAULT_RETRIEVAL_TTL_SECONDS)))
+        _retrieval_cache = RetrievalCache(ttl_seconds=ttl)
+    return _retrieval_cache
+
+
+def get_embedding_cache(path: str | Path) -> EmbeddingCache:
+    key = str(Path(path).resolve())
+    with _embedding_caches_lock:
+        cache = _embedding_caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(key)
+            _embedding_caches[key] = cache
+        return cache
@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import os
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -13,6 +14,7 @@ from services.law_amendment_monitor import LawAmendmentMonitor
 from services.notification_scanner import run_all_scans
 from services.notification_service import cleanup_old_notifications
 from services.periodic_compliance_scanner import PeriodicComplianceScanner
+from services.workflow_service import reconcile_all_workflow_instances
 
 
 class SchedulerService:
@@ -29,6 +31,7 @@ class SchedulerService:
             "quarterly_fee_calculation": None,
             "daily_notification_scan": None,
             "notification_cleanup": None,
+            "workflow_reconcile_sweep": None,
         }
 
     def start(self):
@@ -77,6 +80,13 @@ class SchedulerService:
             name="Notification cleanup",
             replace_existing=True,
         )
+        self.scheduler.add_job(
+            self._workflow_reconcile_sweep,
+            CronTrigger(hour=3, minute=0),
+            id="workflow_reconcile_sweep",
+            name="Workflow reconcile sweep",
+            replace_existing=True,
+        )
 
         self.scheduler.start()
         self._is_started = True
@@ -96,6 +106,7 @@ class SchedulerService:
             ("quarterly_fee_calculation", "Quarterly fee calculation", "Jan/Apr/Jul/Oct Day 1 09:00"),
             ("daily_notification_scan", "Daily notification scan", "Every day 09:00"),
             ("notification_cleanup", "Notification cleanup", "Every day 00:00"),
+            ("workflow_reconcile_sweep", "Workflow reconcile sweep", "Every day 03:00"),
         ]:
             job = self.scheduler.get_job(job_id)
             rows.append(
@@ -170,6 +181,20 @@ class SchedulerService:
         finally:
             db.close()
 
+    async def _workflow_reconcile_sweep(self):
+        # Commits reconcile the instances they touch; this only catches historical drift.
+        self._last_run_at["workflow_reconcile_sweep"] = datetime.utcnow()
+        # The sweep reads every active and completed instance, so it runs off the event loop.
+        await asyncio.to_thread(self._run_workflow_reconcile_sweep)
+
+    @staticmethod
+    def _run_workflow_reconcile_sweep() -> int:
+        db = SessionLocal()
+        try:
+            return reconcile_all_workflow_instances(db)
+        finally:
+            db.close()
+
 
 _scheduler_service: SchedulerService | None = None
 
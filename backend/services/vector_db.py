@@ -1,8 +1,46 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from services.lexical_index import get_lexical_index
+from services.retrieval_cache import get_embedding_cache, get_retrieval_cache, normalize_query_text
+
+MAX_SEARCH_WORKERS = 8
+# Reciprocal-rank fusion constant; 60 is the usual value and damps the weight of the top few ranks.
+HYBRID_RRF_K = 60
+SENSITIVE_COLLECTIONS = frozenset({"agreements", "internal", "guidelines"})
+
+
+@dataclass(frozen=True)
+class _ScopeLookup:
+    """One filtered collection query, with the metadata check used when `where` finds nothing."""
+
+    collection: str
+    where: dict[str, Any]
+    legacy_filter: Callable[[dict[str, Any]], bool]
+
+
+class _QueryVector:
+    """Normalized query text whose embedding is computed at most once, on the first cache miss."""
+
+    def __init__(self, service: "VectorDBService", text: str):
+        self.text = normalize_query_text(text)
+        self._service = service
+        self._lock = threading.Lock()
+        self._embedding: Any | None = None
+
+    def embedding(self) -> Any:
+        with self._lock:
+            if self._embedding is None:
+                self._embedding = self._service.embed_query(self.text)
+            return self._embedding
 
 
 class VectorDBService:
@@ -32,7 +70,12 @@ class VectorDBService:
         base_dir.mkdir(parents=True, exist_ok=True)
 
         self._openai_embedding_cls = OpenAIEmbeddingFunction
+        self._embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-large")
         self._embedding_function = self._build_embedding_function()
+        self._embedding_cache = get_embedding_cache(base_dir / "query_embeddings.sqlite3")
+        self._retrieval_cache = get_retrieval_cache()
+        self._cache_namespace = str(base_dir.resolve())
+        self._lexical_index = get_lexical_index()
         self.client = chromadb.PersistentClient(
             path=str(base_dir),
             settings=Settings(anonymized_telemetry=False),
@@ -43,12 +86,15 @@ class VectorDBService:
         api_key = os.getenv("OPENAI_API_KEY", "").strip()
         if not api_key:
             return None
-        model_name = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-large")
         return self._openai_embedding_cls(
             api_key=api_key,
-            model_name=model_name,
+            model_name=self._embedding_model,
         )
 
+    @property
+    def embedding_available(self) -> bool:
+        return self._embedding_function is not None
+
     def _require_embedding(self):
         if self._embedding_function is None:
             raise RuntimeError("OPENAI_API_KEY is required for legal vector indexing/search.")
@@ -93,25 +139,135 @@ class VectorDBService:
             documents=[str(item["text"]) for item in chunks],
             metadatas=[self._sanitize_metadata(item.get("metadata")) for item in chunks],
         )
+        self._retrieval_cache.invalidate_collection(collection_name)
 
-    def search(self, collection_name: str, query: str, n_results: int = 5) -> list[dict[str, Any]]:
+    def embed_query(self, query: str) -> Any:
+        """Embed `query`, reusing the persistent per-model cache of earlier query embeddings."""
         self._require_embedding()
+        cached = self._embedding_cache.get(self._embedding_model, query)
+        if cached is not None:
+            return cached
+        embedding = self._embedding_function([query])[0]
+        self._embedding_cache.put(self._embedding_model, query, embedding)
+        return embedding
+
+    def _query(
+        self,
+        collection_name: str,
+        vector: _QueryVector,
+        n_results: int,
+        where: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        cache_key = (
+            self._cache_namespace,
+            collection_name,
+            vector.text,
+            n_results,
+            json.dumps(where, sort_keys=True, ensure_ascii=False) if where is not None else None,
+        )
+        cached = self._retrieval_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        generation = self._retrieval_cache.generation(collection_name)
         collection = self._get_collection(collection_name)
-        result = collection.query(query_texts=[query], n_results=n_results)
-        return self._parse_query_result(result)
+        kwargs: dict[str, Any] = {"query_embeddings": [vector.embedding()], "n_results": n_results}
+        if where is not None:
+            kwargs["where"] = where
+        rows = self._parse_query_result(collection.query(**kwargs))
+        self._retrieval_cache.put(cache_key, collection_name, rows, generation)
+        return rows
+
+    @classmethod
+    def _fuse_rankings(cls, vector_rows: list[dict[str, Any]], lexical_rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Reciprocal-rank fusion of a vector and a BM25 ranking into `hybrid_score`.
+
+        Distances and BM25 scores live on unrelated scales, so only ranks are combined;
+        chunks found by both retrievers rise above chunks found by one. Searches over
+        several collections or scopes fuse once over their combined rankings, so scores
+        stay comparable across lookups.
+        """
+        fused: dict[tuple[str, str], dict[str, Any]] = {}
+        for rows in (vector_rows, lexical_rows):
+            for rank, row in enumerate(rows, start=1):
+                entry = fused.setdefault(cls._row_key(row), dict(row))
+                entry["hybrid_score"] = entry.get("hybrid_score", 0.0) + 1.0 / (HYBRID_RRF_K + rank)
+                if "bm25_score" in row:
+                    entry["bm25_score"] = row["bm25_score"]
+        return sorted(fused.values(), key=cls._hybrid_sort_key)
+
+    @staticmethod
+    def _row_key(row: dict[str, Any]) -> tuple[str, str]:
+        return (str(row.get("collection", "")), str(row.get("id", "")))
+
+    @classmethod
+    def _combined_ranking(
+        cls,
+        rows: list[dict[str, Any]],
+        key: Callable[[dict[str, Any]], float],
+    ) -> list[dict[str, Any]]:
+        """One retriever's hits from every lookup as a single ranking, keeping each chunk's first hit."""
+        ranking: list[dict[str, Any]] = []
+        seen: set[tuple[str, str]] = set()
+        for row in sorted(rows, key=key):
+            row_key = cls._row_key(row)
+            if row_key in seen:
+                continue
+            seen.add(row_key)
+            ranking.append(row)
+        return ranking
+
+    @staticmethod
+    def _bm25_rank_value(row: dict[str, Any]) -> float:
+        return -float(row.get("bm25_score") or 0.0)
+
+    def _fuse_lookups(self, rankings: list[tuple[list[dict[str, Any]], list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+        vector_rows = self._combined_ranking([row for rows, _ in rankings for row in rows], self._distance_value)
+        lexical_rows = self._combined_ranking([row for _, rows in rankings for row in rows], self._bm25_rank_value)
+        return self._fuse_rankings(vector_rows, lexical_rows)
+
+    def _lookup_rankings(
+        self,
+        collection_name: str,
+        vector: _QueryVector,
+        n_results: int,
+        where: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        # Without an embedding key the BM25 ranking is used on its own.
+        vector_rows = self._query(collection_name, vector, n_results, where=where) if self.embedding_available else []
+        lexical_rows = self._lexical_index.search(vector.text, collection_name, n_results, where=where)
+        return vector_rows, lexical_rows
+
+    @classmethod
+    def _hybrid_sort_key(cls, row: dict[str, Any]) -> tuple[float, float]:
+        return (-float(row.get("hybrid_score") or 0.0), cls._distance_value(row))
+
+    def search(self, collection_name: str, query: str, n_results: int = 5) -> list[dict[str, Any]]:
+        if collection_name not in self.COLLECTIONS:
+            raise ValueError(f"Unknown collection: {collection_name}")
+        vector_rows, lexical_rows = self._lookup_rankings(collection_name, _QueryVector(self, query), n_results)
+        return self._fuse_rankings(vector_rows, lexical_rows)[:n_results]
 
     def search_all_collections(self, query: str, n_results: int = 3) -> list[dict[str, Any]]:
-        all_rows: list[dict[str, Any]] = []
-        for name in self.COLLECTIONS:
-            for row in self.search(name, query, n_results=n_results):
-                row["collection"] = name
-                all_rows.append(row)
+        vector = _QueryVector(self, query)
+        names = list(self.COLLECTIONS)
+        with ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(names))) as executor:
+            results = list(executor.map(lambda name: self._lookup_rankings(name, vector, n_results), names))
+
+        for name, rankings in zip(names, results):
+            for rows in rankings:
+                for row in rows:
+                    row["collection"] = name
 
-        def _distance_value(row: dict[str, Any]) -> float:
-            value = row.get("distance")
-            return float(value) if isinstance(value, (int, float)) else 999999.0
+        return self._fuse_lookups(results)[: n_results * 2]
 
-        return sorted(all_rows, key=_distance_value)[: n_results * 2]
+    async def asearch_all_collections(self, query: str, n_results: int = 3) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.search_all_collections, query, n_results)
+
+    @staticmethod
+    def _distance_value(row: dict[str, Any]) -> float:
+        value = row.get("distance")
+        return float(value) if isinstance(value, (int, float)) else 999999.0
 
     @staticmethod
     def _parse_query_result(result: dict[str, Any]) -> list[dict[str, Any]]:
@@ -185,186 +341,137 @@ class VectorDBService:
             return 3
         return 99
 
-    def search_with_scope(
+    def _scope_lookups(
         self,
-        query: str,
-        fund_id: int | None = None,
-        fund_type: str | None = None,
-        investment_id: int | None = None,
-        n_results: int = 10,
-    ) -> list[dict[str, Any]]:
-        self._require_embedding()
-        all_rows: list[dict[str, Any]] = []
-
-        def add_rows(collection_name: str, rows: list[dict[str, Any]]):
-            for row in rows:
-                row["collection"] = collection_name
-                all_rows.append(row)
+        fund_id: int | None,
+        fund_type: str | None,
+        investment_id: int | None,
+    ) -> list[_ScopeLookup]:
+        lookups: list[_ScopeLookup] = []
 
         # 1) Global scope across all collections
-        for name in self.COLLECTIONS:
-            collection = self._get_collection(name)
-            rows: list[dict[str, Any]] = []
-            try:
-                rows = self._parse_query_result(
-                    collection.query(
-                        query_texts=[query],
-                        n_results=n_results,
-                        where={"scope": "global"},
-                    )
-                )
-            except Exception:
-                rows = []
+        def global_filter(name: str) -> Callable[[dict[str, Any]], bool]:
+            def keep(row: dict[str, Any]) -> bool:
+                if self._metadata_scope(row) not in ("", "global"):
+                    return False
+                # Avoid cross-fund leakage for sensitive collections when metadata is incomplete.
+                if name in SENSITIVE_COLLECTIONS:
+                    return fund_id is not None and self._metadata_fund_id(row) == fund_id
+                return True
 
-            if not rows:
-                # Legacy fallback: scope metadata may be absent.
-                try:
-                    legacy_rows = self._parse_query_result(
-                        collection.query(query_texts=[query], n_results=n_results)
-                    )
-                except Exception:
-                    legacy_rows = []
+            return keep
 
-                filtered_legacy: list[dict[str, Any]] = []
-                for row in legacy_rows:
-                    scope = self._metadata_scope(row)
-                    if scope not in ("", "global"):
-                        continue
-                    # Avoid cross-fund leakage for sensitive collections when metadata is incomplete.
-                    if name in {"agreements", "internal", "guidelines"}:
-                        meta_fund_id = self._metadata_fund_id(row)
-                        if fund_id is None or meta_fund_id != fund_id:
-                            continue
-                    filtered_legacy.append(row)
-                rows = filtered_legacy
-
-            add_rows(name, rows)
+        for name in self.COLLECTIONS:
+            lookups.append(_ScopeLookup(name, {"scope": "global"}, global_filter(name)))
 
         # 2) Fund-type scope (guidelines only)
         normalized_fund_type = (fund_type or "").strip() or None
         if normalized_fund_type:
-            collection = self._get_collection("guidelines")
-            rows = []
-            try:
-                rows = self._parse_query_result(
-                    collection.query(
-                        query_texts=[query],
-                        n_results=n_results,
-                        where={
-                            "$and": [
-                                {"scope": "fund_type"},
-                                {"fund_type_filter": normalized_fund_type},
-                            ]
-                        },
-                    )
+            lookups.append(
+                _ScopeLookup(
+                    "guidelines",
+                    {"$and": [{"scope": "fund_type"}, {"fund_type_filter": normalized_fund_type}]},
+                    lambda row: self._metadata_scope(row) in ("", "fund_type")
+                    and self._metadata_fund_type(row) == normalized_fund_type,
                 )
-            except Exception:
-                rows = []
-
-            if not rows:
-                try:
-                    legacy_rows = self._parse_query_result(
-                        collection.query(query_texts=[query], n_results=n_results)
-                    )
-                except Exception:
-                    legacy_rows = []
-                rows = [
-                    row
-                    for row in legacy_rows
-                    if self._metadata_scope(row) in ("", "fund_type")
-                    and self._metadata_fund_type(row) == normalized_fund_type
-                ]
-
-            add_rows("guidelines", rows)
+            )
 
         # 3) Fund scope (agreements/internal/guidelines for fund-specific docs)
         if fund_id is not None:
             for name in ("agreements", "internal", "guidelines"):
-                collection = self._get_collection(name)
-                rows = []
-                try:
-                    rows = self._parse_query_result(
-                        collection.query(
-                            query_texts=[query],
-                            n_results=n_results,
-                            where={
-                                "$and": [
-                                    {"scope": "fund"},
-                                    {"fund_id": int(fund_id)},
-                                ]
-                            },
-                        )
+                lookups.append(
+                    _ScopeLookup(
+                        name,
+                        {"$and": [{"scope": "fund"}, {"fund_id": int(fund_id)}]},
+                        lambda row: self._metadata_scope(row) in ("", "fund")
+                        and self._metadata_fund_id(row) == int(fund_id),
                     )
-                except Exception:
-                    rows = []
-
-                if not rows:
-                    try:
-                        legacy_rows = self._parse_query_result(
-                            collection.query(query_texts=[query], n_results=n_results)
-                        )
-                    except Exception:
-                        legacy_rows = []
-                    rows = [
-                        row
-                        for row in legacy_rows
-                        if self._metadata_scope(row) in ("", "fund")
-                        and self._metadata_fund_id(row) == int(fund_id)
-                    ]
-
-                add_rows(name, rows)
+                )
 
         # 4) Investment scope (agreements only)
         if investment_id is not None:
-            collection = self._get_collection("agreements")
-            rows = []
-            try:
-                rows = self._parse_query_result(
-                    collection.query(
-                        query_texts=[query],
-                        n_results=n_results,
-                        where={
-                            "$and": [
-                                {"scope": "investment"},
-                                {"investment_id": int(investment_id)},
-                            ]
-                        },
-                    )
+            lookups.append(
+                _ScopeLookup(
+                    "agreements",
+                    {"$and": [{"scope": "investment"}, {"investment_id": int(investment_id)}]},
+                    lambda row: self._metadata_scope(row) == "investment"
+                    and self._metadata_investment_id(row) == int(investment_id),
                 )
+            )
+        return lookups
+
+    def _run_scope_lookup(
+        self,
+        lookup: _ScopeLookup,
+        vector: _QueryVector,
+        n_results: int,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        rows: list[dict[str, Any]] = []
+        if self.embedding_available:
+            try:
+                rows = self._query(lookup.collection, vector, n_results, where=lookup.where)
             except Exception:
                 rows = []
 
             if not rows:
+                # Legacy fallback: scope metadata may be absent.
                 try:
-                    legacy_rows = self._parse_query_result(
-                        collection.query(query_texts=[query], n_results=n_results)
-                    )
+                    legacy_rows = self._query(lookup.collection, vector, n_results)
                 except Exception:
                     legacy_rows = []
-                rows = [
-                    row
-                    for row in legacy_rows
-                    if self._metadata_scope(row) == "investment"
-                    and self._metadata_investment_id(row) == int(investment_id)
-                ]
+                rows = [row for row in legacy_rows if lookup.legacy_filter(row)]
 
-            add_rows("agreements", rows)
+        # Persisted chunks always carry scope metadata, so BM25 needs no legacy pass.
+        lexical_rows = self._lexical_index.search(vector.text, lookup.collection, n_results, where=lookup.where)
+        for row in (*rows, *lexical_rows):
+            row["collection"] = lookup.collection
+        return rows, lexical_rows
 
-        # Dedupe by (collection, chunk id), keep best distance first.
-        def _distance_value(row: dict[str, Any]) -> float:
-            value = row.get("distance")
-            return float(value) if isinstance(value, (int, float)) else 999999.0
+    def _merge_scope_rows(
+        self,
+        rankings: list[tuple[list[dict[str, Any]], list[dict[str, Any]]]],
+        n_results: int,
+    ) -> list[dict[str, Any]]:
+        """Fuse every lookup's rankings at once (deduping by collection and chunk id), then order by tier."""
+        rows = sorted(
+            self._fuse_lookups(rankings),
+            key=lambda item: (self._source_tier_rank(item), *self._hybrid_sort_key(item)),
+        )
+        return rows[: n_results * 2]
 
-        deduped: list[dict[str, Any]] = []
-        seen: set[tuple[str, str]] = set()
-        for row in sorted(all_rows, key=lambda item: (self._source_tier_rank(item), _distance_value(item))):
-            key = (str(row.get("collection", "")), str(row.get("id", "")))
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(row)
+    def search_with_scope(
+        self,
+        query: str,
+        fund_id: int | None = None,
+        fund_type: str | None = None,
+        investment_id: int | None = None,
+        n_results: int = 10,
+    ) -> list[dict[str, Any]]:
+        vector = _QueryVector(self, query)
+        lookups = self._scope_lookups(fund_id, fund_type, investment_id)
+        with ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(lookups))) as executor:
+            results = list(
+                executor.map(lambda lookup: self._run_scope_lookup(lookup, vector, n_results), lookups)
+            )
+        return self._merge_scope_rows(results, n_results)
 
-        return deduped[: n_results * 2]
+    async def asearch_with_scope(
+        self,
+        query: str,
+        fund_id: int | None = None,
+        fund_type: str | None = None,
+        investment_id: int | None = None,
+        n_results: int = 10,
+    ) -> list[dict[str, Any]]:
+        """`search_with_scope` off the event loop; embedding, Chroma and BM25 calls are blocking."""
+        return await asyncio.to_thread(
+            self.search_with_scope,
+            query,
+            fund_id=fund_id,
+            fund_type=fund_type,
+            investment_id=investment_id,
+            n_results=n_results,
+        )
 
     def count_chunks_for_document(self, collection_name: str, document_id: int) -> int:
         if collection_name not in self.COLLECTIONS:
@@ -382,6 +489,7 @@ class VectorDBService:
         ids = result.get("ids") or []
         if ids:
             collection.delete(ids=ids)
+            self._retrieval_cache.invalidate_collection(collection_name)
         return len(ids)
 
     def get_stats(self) -> dict[str, dict[str, Any]]:
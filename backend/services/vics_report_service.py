@@ -13,8 +13,8 @@ from models.fund import Fund, LP, LPTransfer
 from models.investment import Investment, PortfolioCompany
 from models.phase3 import Distribution
 from models.transaction import Transaction
-from models.valuation import Valuation
 from models.vics_report import VicsMonthlyReport
+from services.latest_valuation import latest_nav
 from services.lp_types import normalize_lp_type
 
 
@@ -200,19 +200,7 @@ class VicsReportService:
             .scalar()
             or 0
         )
-        valuations = (
-            self.db.query(Valuation)
-            .filter(Valuation.fund_id == fund_id)
-            .order_by(Valuation.as_of_date.desc(), Valuation.id.desc())
-            .all()
-        )
-        latest_by_investment: dict[int, Valuation] = {}
-        for row in valuations:
-            if row.investment_id not in latest_by_investment:
-                latest_by_investment[row.investment_id] = row
-        investment_fair_value_total = float(
-            sum(float(row.total_fair_value or row.value or 0) for row in latest_by_investment.values())
-        )
+        investment_fair_value_total = latest_nav(self.db, fund_id)
 
         tx_rows = (
             self.db.query(Transaction)
@@ -1,16 +1,20 @@
 import re
 from datetime import date, datetime, timedelta
 
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, selectinload
 
 from models.fund import FundNoticePeriod
-from models.investment import InvestmentDocument
+from models.investment import Investment, InvestmentDocument
 from models.task import Task
 from models.workflow import Workflow, WorkflowStep
 from models.workflow_instance import WorkflowInstance, WorkflowStepInstance, WorkflowStepInstanceDocument
 from services.erp_backbone import backbone_enabled, maybe_emit_mutation, record_snapshot, sync_investment_document_registry, sync_task_graph, sync_workflow_instance_graph, sync_workflow_step_document_registry, sync_workflow_step_graph
 from utils.business_days import is_business_day, shift_to_business_day
 
+_RECONCILE_PENDING_KEY = "workflow_reconcile_instance_ids"
+RECONCILE_BATCH_SIZE = 200
+
 
 def calculate_step_date(trigger_date: date, offset_days: int) -> date:
     result = trigger_date + timedelta(days=offset_days)
@@ -256,6 +260,40 @@ def instantiate_workflow(
     return instance
 
 
+# Everything instance serialization and reconciliation walk, loaded one relationship
+# at a time for the whole batch: template, links, steps with their template step,
+# linked task and documents.
+WORKFLOW_INSTANCE_GRAPH_OPTIONS = (
+    selectinload(WorkflowInstance.workflow),
+    selectinload(WorkflowInstance.investment).selectinload(Investment.company),
+    selectinload(WorkflowInstance.company),
+    selectinload(WorkflowInstance.fund),
+    selectinload(WorkflowInstance.gp_entity),
+    selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.step),
+    selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.task),
+    selectinload(WorkflowInstance.step_instances).selectinload(WorkflowStepInstance.step_documents),
+)
+
+
+def load_workflow_instance_graphs(db: Session, instance_ids) -> list[WorkflowInstance]:
+    """Load instances with their whole step graph in a constant number of queries."""
+    ordered_ids = sorted({int(row) for row in instance_ids if row is not None})
+    if not ordered_ids:
+        return []
+    return (
+        db.query(WorkflowInstance)
+        .options(*WORKFLOW_INSTANCE_GRAPH_OPTIONS)
+        .filter(WorkflowInstance.id.in_(ordered_ids))
+        .order_by(WorkflowInstance.id)
+        .all()
+    )
+
+
+def load_workflow_instance_graph(db: Session, instance_id: int) -> WorkflowInstance | None:
+    instances = load_workflow_instance_graphs(db, [instance_id])
+    return instances[0] if instances else None
+
+
 def _step_sort_key(step_instance: WorkflowStepInstance) -> tuple[int, int]:
     step_order = (
         step_instance.step.order
@@ -280,6 +318,7 @@ def reconcile_workflow_instance_state(db: Session, instance: WorkflowInstance) -
         if step_instance.status == "skipped" or not step_instance.task_id:
             continue
 
+        # Served from the identity map when the instance came from the graph loader.
         task = db.get(Task, step_instance.task_id)
         if not task:
             continue
@@ -328,3 +367,74 @@ def reconcile_workflow_instance_state(db: Session, instance: WorkflowInstance) -
             changed = True
 
     return changed
+
+
+def _reconcile_instance_batch(db: Session, instance_ids: list[int]) -> int:
+    instances = load_workflow_instance_graphs(db, instance_ids)
+    return sum(1 for instance in instances if reconcile_workflow_instance_state(db, instance))
+
+
+def reconcile_workflow_instances(db: Session, instance_ids) -> int:
+    """Reconcile the given instances in batches without committing; returns how many changed."""
+    ordered_ids = sorted({int(row) for row in instance_ids if row is not None})
+    changed = 0
+    for start in range(0, len(ordered_ids), RECONCILE_BATCH_SIZE):
+        changed += _reconcile_instance_batch(db, ordered_ids[start : start + RECONCILE_BATCH_SIZE])
+    return changed
+
+
+def reconcile_all_workflow_instances(db: Session) -> int:
+    """Sweep every active/completed instance for historical drift, committing per batch."""
+    instance_ids = [
+        row_id
+        for (row_id,) in db.query(WorkflowInstance.id)
+        .filter(WorkflowInstance.status.in_(["active", "completed"]))
+        .order_by(WorkflowInstance.id)
+        .all()
+    ]
+    changed = 0
+    for start in range(0, len(instance_ids), RECONCILE_BATCH_SIZE):
+        changed += _reconcile_instance_batch(db, instance_ids[start : start + RECONCILE_BATCH_SIZE])
+        db.commit()
+    return changed
+
+
+def _task_workflow_instance_ids(task: Task, *, is_new: bool) -> set[int]:
+    state = inspect(task)
+    instance_history = state.attrs.workflow_instance_id.history
+    if is_new or instance_history.has_changes():
+        return {row for row in instance_history.sum() if row is not None}
+    if state.attrs.status.history.has_changes() and task.workflow_instance_id is not None:
+        return {task.workflow_instance_id}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_task_workflow_instances(session: Session, flush_context) -> None:
+    instance_ids: set[int] = set()
+    for row in session.new:
+        if isinstance(row, Task):
+            instance_ids |= _task_workflow_instance_ids(row, is_new=True)
+    for row in session.dirty:
+        if isinstance(row, Task):
+            instance_ids |= _task_workflow_instance_ids(row, is_new=False)
+    for row in session.deleted:
+        if isinstance(row, Task) and row.workflow_instance_id is not None:
+            instance_ids.add(row.workflow_instance_id)
+    if instance_ids:
+        session.info.setdefault(_RECONCILE_PENDING_KEY, set()).update(instance_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _reconcile_marked_workflow_instances(session: Session) -> None:
+    # Task status changes are the only source of step drift, so commits that touched
+    # linked tasks reconcile just those instances instead of reads sweeping everything.
+    session.flush()
+    instance_ids = session.info.pop(_RECONCILE_PENDING_KEY, None)
+    if instance_ids:
+        reconcile_workflow_instances(session, instance_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_marked_workflow_instances(session: Session) -> None:
+    session.info.pop(_RECONCILE_PENDING_KEY, None)
@@ -1,3 +1,6 @@
+import pytest
+
+
 def _create_account(
     client,
     *,
@@ -186,3 +189,319 @@ class TestAccountingJournalEntries:
 
         delete_response = client.delete(f"/api/accounts/{account1['id']}")
         assert delete_response.status_code == 409
+
+
+def _post_entry(client, fund_id: int, entry_date: str, debit_id: int, credit_id: int, amount: int, status: str) -> None:
+    response = client.post(
+        "/api/journal-entries",
+        json={
+            "fund_id": fund_id,
+            "entry_date": entry_date,
+            "status": status,
+            "lines": [
+                {"account_id": debit_id, "debit": amount, "credit": 0},
+                {"account_id": credit_id, "debit": 0, "credit": amount},
+            ],
+        },
+    )
+    assert response.status_code == 201
+
+
+class TestLedgerAggregation:
+    def test_single_and_multi_fund_totals(self, client, db_session, sample_fund):
+        from datetime import date
+
+        from services.ledger_aggregation import account_ledger_totals, fund_account_ledger_totals
+
+        other_fund = client.post(
+            "/api/funds",
+            json={"name": "집계 테스트 조합", "type": "투자조합", "status": "active"},
+        ).json()
+        cash = _create_account(client, fund_id=None, code="1110", name="보통예금")
+        payable = _create_account(
+            client, fund_id=None, code="2110", name="미지급금", category="부채", normal_side="대변"
+        )
+
+        _post_entry(client, sample_fund["id"], "2025-09-30", cash["id"], payable["id"], 100, "결재완료")
+        _post_entry(client, sample_fund["id"], "2025-10-05", cash["id"], payable["id"], 20, "결재완료")
+        _post_entry(client, sample_fund["id"], "2025-10-06", cash["id"], payable["id"], 3, "미결재")
+        _post_entry(client, sample_fund["id"], "2025-11-01", cash["id"], payable["id"], 4000, "결재완료")
+        _post_entry(client, other_fund["id"], "2025-10-10", payable["id"], cash["id"], 50, "결재완료")
+
+        totals = account_ledger_totals(
+            db_session,
+            sample_fund["id"],
+            date(2025, 10, 31),
+            period_start=date(2025, 10, 1),
+            exclude_statuses=("미결재",),
+        )
+        assert totals[cash["id"]].debit_total == 120
+        assert totals[cash["id"]].debit_period == 20
+        assert totals[payable["id"]].credit_total == 120
+        assert totals[payable["id"]].debit_total == 0
+
+        by_fund = fund_account_ledger_totals(
+            db_session,
+            None,
+            date(2025, 10, 31),
+            period_start=date(2025, 10, 1),
+            exclude_statuses=("미결재",),
+        )
+        assert by_fund[sample_fund["id"]] == totals
+        assert by_fund[other_fund["id"]][cash["id"]].credit_period == 50
+
+        trial_balance = client.get(
+            "/api/accounts/trial-balance",
+            params={"fund_id": sample_fund["id"], "as_of_date": "2025-10-31"},
+        ).json()
+        cash_row = next(row for row in trial_balance if row["account_id"] == cash["id"])
+        payable_row = next(row for row in trial_balance if row["account_id"] == payable["id"])
+        # The trial balance keeps counting unapproved entries.
+        assert cash_row["debit_total"] == 123
+        assert payable_row["balance"] == 123
+
+    def test_generate_all_matches_per_fund_generation(self, client, sample_fund):
+        other_fund = client.post(
+            "/api/funds",
+            json={"name": "월마감 테스트 조합", "type": "투자조합", "status": "active"},
+        ).json()
+        cash = _create_account(client, fund_id=None, code="1110", name="보통예금")
+        payable = _create_account(
+            client, fund_id=None, code="2110", name="미지급금", category="부채", normal_side="대변"
+        )
+        _post_entry(client, sample_fund["id"], "2025-10-05", cash["id"], payable["id"], 700, "결재완료")
+        _post_entry(client, other_fund["id"], "2025-10-10", cash["id"], payable["id"], 90, "결재완료")
+
+        generated = client.post(
+            "/api/provisional-fs/generate",
+            json={"year_month": "2025-10"},
+        )
+        assert generated.status_code == 200
+        by_fund = {row["fund_id"]: row for row in generated.json()}
+        assert set(by_fund) == {sample_fund["id"], other_fund["id"]}
+
+        for fund_id in by_fund:
+            single = client.post(
+                f"/api/funds/{fund_id}/provisional-fs/generate",
+                json={"year_month": "2025-10"},
+            )
+            assert single.status_code == 200
+            assert single.json()["sfp_data"] == by_fund[fund_id]["sfp_data"]
+            assert single.json()["is_data"] == by_fund[fund_id]["is_data"]
+            assert single.json()["total_assets"] == by_fund[fund_id]["total_assets"]
+        assert by_fund[sample_fund["id"]]["total_assets"] == 700
+
+        missing = client.post(
+            "/api/provisional-fs/generate",
+            json={"year_month": "2025-10", "fund_ids": [sample_fund["id"], 999_999]},
+        )
+        assert missing.status_code == 404
+
+    def test_generate_all_checks_fund_baselines_in_batch(self, client, capture_sql):
+        fund_ids = [
+            client.post("/api/funds", json={"name": f"기준 조합 {index}", "type": "투자조합", "status": "active"}).json()["id"]
+            for index in range(4)
+        ]
+
+        def baseline_selects(count: int) -> int:
+            with capture_sql("SELECT") as statements:
+                response = client.post(
+                    "/api/provisional-fs/generate",
+                    json={"year_month": "2025-10", "fund_ids": fund_ids[:count]},
+                )
+            assert response.status_code == 200
+            return sum(
+                1
+                for statement in statements
+                if "FROM accounts" in statement or "FROM auto_mapping_rules" in statement
+            )
+
+        # The first call seeds every fund's accounts and rules; afterwards the reads do not grow per fund.
+        baseline_selects(4)
+        assert baseline_selects(1) == baseline_selects(4)
+
+    @pytest.mark.parametrize("portable_upsert", [False, True])
+    def test_monthly_balances_follow_entry_changes(self, client, db_session, sample_fund, monkeypatch, portable_upsert):
+        from datetime import date
+
+        from models.accounting import LedgerMonthlyBalance
+        from services import ledger_aggregation
+        from services.ledger_aggregation import account_ledger_totals, rebuild_monthly_balances
+
+        if portable_upsert:
+            # Dialects without ON CONFLICT take the UPDATE-then-INSERT path.
+            monkeypatch.setattr(ledger_aggregation, "_dialect_insert", lambda db: None)
+
+        cash = _create_account(client, fund_id=None, code="1110", name="보통예금")
+        payable = _create_account(
+            client, fund_id=None, code="2110", name="미지급금", category="부채", normal_side="대변"
+        )
+        _post_entry(client, sample_fund["id"], "2024-01-15", cash["id"], payable["id"], 500, "결재완료")
+        _post_entry(client, sample_fund["id"], "2024-03-02", cash["id"], payable["id"], 70, "미결재")
+        entries = client.get("/api/journal-entries", params={"fund_id": sample_fund["id"]}).json()
+        draft = next(row for row in entries if row["entry_date"] == "2024-03-02")
+
+        update_response = client.put(
+            f"/api/journal-entries/{draft['id']}",
+            json={
+                "entry_date": "2024-02-10",
+                "status": "결재완료",
+                "lines": [
+                    {"account_id": cash["id"], "debit": 80, "credit": 0},
+                    {"account_id": payable["id"], "debit": 0, "credit": 80},
+                ],
+            },
+        )
+        assert update_response.status_code == 200
+
+        def snapshot():
+            db_session.expire_all()
+            return sorted(
+                (row.account_id, row.month_start, row.status, float(row.debit), float(row.credit))
+                for row in db_session.query(LedgerMonthlyBalance).all()
+            )
+
+        incremental = snapshot()
+        assert (cash["id"], date(2024, 2, 1), "결재완료", 80.0, 0.0) in incremental
+        assert not any(row[1] == date(2024, 3, 1) for row in incremental)
+
+        rebuild_monthly_balances(db_session)
+        db_session.commit()
+        assert snapshot() == incremental
+
+        totals = account_ledger_totals(
+            db_session,
+            sample_fund["id"],
+            date(2024, 3, 31),
+            period_start=date(2024, 3, 1),
+            exclude_statuses=("미결재",),
+        )
+        assert totals[cash["id"]].debit_total == 580
+        assert totals[cash["id"]].debit_period == 0
+
+        delete_response = client.delete(f"/api/journal-entries/{draft['id']}")
+        assert delete_response.status_code == 200
+        assert not any(row[1] == date(2024, 2, 1) for row in snapshot())
+
+        trial_balance = client.get(
+            "/api/accounts/trial-balance",
+            params={"fund_id": sample_fund["id"], "as_of_date": "2024-12-31"},
+        ).json()
+        cash_row = next(row for row in trial_balance if row["account_id"] == cash["id"])
+        assert cash_row["debit_total"] == 500
+
+    def test_portable_upsert_adds_to_a_row_inserted_concurrently(self, client, db_session, sample_fund, monkeypatch):
+        from datetime import date
+
+        from sqlalchemy import event
+
+        from models.accounting import LedgerMonthlyBalance
+        from services import ledger_aggregation
+
+        monkeypatch.setattr(ledger_aggregation, "_dialect_insert", lambda db: None)
+        cash = _create_account(client, fund_id=None, code="1110", name="보통예금")
+        payable = _create_account(
+            client, fund_id=None, code="2110", name="미지급금", category="부채", normal_side="대변"
+        )
+
+        injected: list[bool] = []
+
+        def insert_after_update(conn, cursor, statement, parameters, context, executemany):
+            # Another writer creates the cash row between this posting's UPDATE and its INSERT.
+            if not injected and statement.startswith("SAVEPOINT"):
+                injected.append(True)
+                cursor.execute(
+                    "INSERT INTO ledger_monthly_balances (fund_id, account_id, month_start, status, debit, credit) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (sample_fund["id"], cash["id"], "2024-01-01", "결재완료", 5, 0),
+                )
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", insert_after_update)
+        try:
+            _post_entry(client, sample_fund["id"], "2024-01-15", cash["id"], payable["id"], 500, "결재완료")
+        finally:
+            event.remove(engine, "before_cursor_execute", insert_after_update)
+
+        db_session.expire_all()
+        balances = {
+            row.account_id: (float(row.debit), float(row.credit))
+            for row in db_session.query(LedgerMonthlyBalance).filter(LedgerMonthlyBalance.month_start == date(2024, 1, 1))
+        }
+        assert injected
+        assert balances == {cash["id"]: (505.0, 0.0), payable["id"]: (0.0, 500.0)}
+
+    def test_concurrent_sessions_accumulate_the_same_monthly_balance(self, tmp_path):
+        import threading
+        from datetime import date
+
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.orm import sessionmaker
+
+        from database import Base
+        from models.accounting import Account, JournalEntry, JournalEntryLine, LedgerMonthlyBalance
+        from models.fund import Fund
+        from services.ledger_aggregation import post_monthly_balances
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'ledger.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as setup:
+            fund = Fund(name="동시 전기 조합", type="투자조합", status="active")
+            cash = Account(code="1110", name="보통예금", category="자산")
+            payable = Account(code="2110", name="미지급금", category="부채")
+            setup.add_all([fund, cash, payable])
+            setup.flush()
+            entries = []
+            for day, amount in ((3, 100), (17, 25)):
+                entry = JournalEntry(fund_id=fund.id, entry_date=date(2025, 5, day), status="결재완료")
+                entry.lines = [
+                    JournalEntryLine(account_id=cash.id, debit=amount, credit=0),
+                    JournalEntryLine(account_id=payable.id, debit=0, credit=amount),
+                ]
+                entries.append(entry)
+            setup.add_all(entries)
+            setup.commit()
+            cash_id, payable_id = cash.id, payable.id
+            entry_ids = [entry.id for entry in entries]
+
+        # Both sessions have read the (empty) balances before either writes its posting.
+        barrier = threading.Barrier(2)
+        waited: set[int] = set()
+
+        def hold_balance_writes(conn, cursor, statement, parameters, context, executemany):
+            if threading.get_ident() in waited:
+                return
+            if statement.lstrip().upper().startswith("INSERT INTO LEDGER_MONTHLY_BALANCES"):
+                waited.add(threading.get_ident())
+                barrier.wait(timeout=10)
+
+        event.listen(engine, "before_cursor_execute", hold_balance_writes)
+        errors: list[BaseException] = []
+
+        def post(entry_id: int) -> None:
+            try:
+                with Session() as db:
+                    post_monthly_balances(db, db.get(JournalEntry, entry_id))
+                    db.commit()
+            except BaseException as exc:  # noqa: BLE001 - surfaced by the assertion below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=post, args=(entry_id,)) for entry_id in entry_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        event.remove(engine, "before_cursor_execute", hold_balance_writes)
+
+        assert errors == []
+        with Session() as db:
+            rows = {
+                row.account_id: (float(row.debit), float(row.credit))
+                for row in db.query(LedgerMonthlyBalance).filter(LedgerMonthlyBalance.month_start == date(2025, 5, 1))
+            }
+        assert rows == {cash_id: (125.0, 0.0), payable_id: (0.0, 125.0)}
+        engine.dispose()
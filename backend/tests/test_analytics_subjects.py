@@ -1,7 +1,205 @@
-from services.analytics.subjects import SUBJECT_DEFINITIONS
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from models.fund import Fund
+from models.investment import Investment, PortfolioCompany
+from models.transaction import Transaction
+from schemas.analytics import AnalyticsQueryRequest
+from services.analytics import aggregation
+from services.analytics.aggregation import AggregationPlan
+from services.analytics.catalog import get_subject_definition
+from services.analytics.query_service import _measure_alias, _run_pivot_in_memory, run_query
+from services.analytics.snapshot_cache import DictionaryColumn, build_subject_snapshot, clear_snapshot_cache, get_subject_snapshot
+from services.analytics.sql_pushdown import run_pivot_query, run_table_query
+from services.analytics.subjects import SUBJECT_DEFINITIONS, SUBJECT_MAP
 
 
 def test_analytics_subjects_load_rows_on_empty_db(db_session):
     for subject in SUBJECT_DEFINITIONS:
         rows = subject.load_rows(db_session)
         assert isinstance(rows, list), subject.key
+
+
+def _seed_transactions(db_session):
+    fund = Fund(name="분석 1호", type="벤처투자조합", status="active")
+    company_a = PortfolioCompany(name="알파", industry="바이오")
+    company_b = PortfolioCompany(name="베타", industry=None)
+    db_session.add_all([fund, company_a, company_b])
+    db_session.flush()
+    investment_a = Investment(fund_id=fund.id, company_id=company_a.id, instrument="보통주", status="active")
+    investment_b = Investment(fund_id=fund.id, company_id=company_b.id, instrument="CB", status="exited")
+    db_session.add_all([investment_a, investment_b])
+    db_session.flush()
+    rows = [
+        (investment_a, company_a, date(2025, 1, 10), "investment", 100.0, None),
+        (investment_a, company_a, date(2025, 1, 20), "follow_on", 50.5, 3.0),
+        (investment_b, company_b, date(2025, 2, 5), "investment", 200.0, None),
+        (investment_b, company_b, date(2025, 5, 1), "exit", 0.0, 42.25),
+    ]
+    for investment, company, tx_date, tx_type, amount, gain in rows:
+        db_session.add(
+            Transaction(
+                investment_id=investment.id,
+                fund_id=fund.id,
+                company_id=company.id,
+                transaction_date=tx_date,
+                type=tx_type,
+                amount=amount,
+                realized_gain=gain,
+            )
+        )
+    db_session.commit()
+
+
+def test_transaction_pivot_sql_pushdown_matches_in_memory(db_session):
+    _seed_transactions(db_session)
+    subject = get_subject_definition("transaction")
+    payload = AnalyticsQueryRequest(
+        subject_key="transaction",
+        mode="pivot",
+        rows=["transaction.date.year_month", "company.industry"],
+        columns=["transaction.type"],
+        values=[
+            {"key": "transaction.amount", "aggregate": "sum"},
+            {"key": "transaction.realized_gain", "aggregate": "max"},
+            {"key": "__row_count", "aggregate": "count"},
+        ],
+        filters=[{"field": "transaction.date.day", "op": "before", "value": "2025-04-01"}],
+        sorts=[{"field": "sum:transaction.amount", "direction": "desc"}],
+        options={"row_limit": 2, "hide_zero": True},
+    )
+    value_specs = list(payload.values)
+
+    compiled = run_pivot_query(db_session, subject, payload, payload.rows, payload.columns, value_specs, _measure_alias)
+    in_memory = _run_pivot_in_memory(
+        build_subject_snapshot(db_session, subject),
+        payload,
+        subject.field_map,
+        payload.rows,
+        payload.columns,
+        value_specs,
+    )
+
+    assert compiled is not None
+    assert compiled == in_memory
+    assert compiled[1] == 3
+    assert compiled[0][0]["sum:transaction.amount"] == 200.0
+
+
+def test_transaction_table_sql_pushdown_and_python_fallback(db_session):
+    _seed_transactions(db_session)
+    subject = get_subject_definition("transaction")
+    payload = AnalyticsQueryRequest(
+        subject_key="transaction",
+        mode="table",
+        selected_fields=["transaction.date.day", "company.name", "transaction.amount"],
+        filters=[{"field": "company.industry", "op": "is_empty"}],
+        sorts=[{"field": "transaction.amount", "direction": "asc"}],
+        options={"row_limit": 1},
+    )
+
+    rows, total = run_table_query(db_session, subject, payload, payload.selected_fields)
+    assert total == 2
+    assert rows == [{"transaction.date.day": "2025-05-01", "company.name": "베타", "transaction.amount": 0.0}]
+
+    response = run_query(db_session, payload)
+    assert response.meta.truncated is True
+    assert response.meta.result_count == 2
+
+    fallback_payload = payload.model_copy(update={"selected_fields": ["transaction.date.week", "transaction.amount"]})
+    assert run_table_query(db_session, subject, fallback_payload, fallback_payload.selected_fields) is None
+
+
+def test_subject_snapshot_is_shared_until_source_tables_change(db_session):
+    _seed_transactions(db_session)
+    subject = get_subject_definition("transaction")
+
+    first = get_subject_snapshot(db_session, subject)
+    assert get_subject_snapshot(db_session, subject) is first
+    assert {"transactions", "funds", "portfolio_companies", "investments"} <= first.tables
+    assert isinstance(first.column("company.name"), DictionaryColumn)
+    assert first.size == 4
+
+    transaction = db_session.query(Transaction).first()
+    transaction.amount = 999.0
+    db_session.commit()
+
+    refreshed = get_subject_snapshot(db_session, subject)
+    assert refreshed is not first
+    assert 999.0 in refreshed.column("transaction.amount").values_at(list(range(refreshed.size)))
+
+
+def test_snapshot_of_rolled_back_writes_is_not_shared(db_session):
+    _seed_transactions(db_session)
+    subject = get_subject_definition("transaction")
+    committed = get_subject_snapshot(db_session, subject)
+
+    transaction = db_session.query(Transaction).first()
+    transaction.amount = 999.0
+    db_session.flush()
+    uncommitted = get_subject_snapshot(db_session, subject)
+    assert 999.0 in uncommitted.column("transaction.amount").values_at(list(range(uncommitted.size)))
+    db_session.rollback()
+
+    rebuilt = get_subject_snapshot(db_session, subject)
+    assert rebuilt is not uncommitted and rebuilt is not committed
+    assert 999.0 not in rebuilt.column("transaction.amount").values_at(list(range(rebuilt.size)))
+
+
+def test_query_batch_shares_subject_scan_and_keeps_item_order(client, db_session, monkeypatch):
+    _seed_transactions(db_session)
+    clear_snapshot_cache()
+    subject = get_subject_definition("transaction")
+    calls = []
+    original_load_rows = subject.load_rows
+
+    def counting_load_rows(db):
+        calls.append(1)
+        return original_load_rows(db)
+
+    monkeypatch.setitem(SUBJECT_MAP, "transaction", replace(subject, load_rows=counting_load_rows, sql_source=None))
+    items = [
+        {
+            "key": "by_type",
+            "query": {"subject_key": "transaction", "mode": "pivot", "rows": ["transaction.type"], "values": [{"key": "transaction.amount", "aggregate": "sum"}]},
+        },
+        {
+            "key": "by_company",
+            "query": {"subject_key": "transaction", "mode": "pivot", "rows": ["company.name"], "values": [{"key": "__row_count", "aggregate": "sum"}]},
+        },
+        {"key": "missing", "query": {"subject_key": "unknown", "mode": "pivot"}},
+    ]
+
+    response = client.post("/api/analytics/query-batch", json={"items": items})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [row["key"] for row in results] == ["by_type", "by_company", "missing"]
+    assert results[0]["response"]["grand_totals"]["sum:transaction.amount"] == 350.5
+    assert {row["company.name"]: row["sum:__row_count"] for row in results[1]["response"]["rows"]} == {"알파": 2.0, "베타": 2.0}
+    assert results[2]["error"]
+    assert len(calls) == 1
+
+
+def test_numpy_aggregation_kernels_match_streaming_accumulators(db_session, monkeypatch):
+    pytest.importorskip("numpy")
+    _seed_transactions(db_session)
+    snapshot = build_subject_snapshot(db_session, get_subject_definition("transaction"))
+    selection = list(range(snapshot.size))
+    plans = [
+        AggregationPlan(
+            group_keys=("company.name", "transaction.date.year_month"),
+            measures=(("transaction.amount", "sum"), ("transaction.realized_gain", "avg"), ("transaction.amount", "max"), ("__row_count", "count")),
+        ),
+        AggregationPlan(group_keys=(), measures=(("transaction.amount", "min"),)),
+    ]
+
+    monkeypatch.setattr(aggregation, "NUMPY_MIN_ROWS", 10**9)
+    streamed = aggregation.aggregate_plans(snapshot, selection, plans)
+    monkeypatch.setattr(aggregation, "NUMPY_MIN_ROWS", 0)
+    vectorized = aggregation.aggregate_plans(snapshot, selection, plans)
+
+    assert vectorized == streamed
+    assert [group.values[0] for group in streamed[plans[0]]] == [150.5, 200.0, 0.0]
@@ -0,0 +1,78 @@
+import threading
+
+from sqlalchemy.orm import Session
+
+from models.audit_log import AuditLog
+from services.audit_log_writer import AuditLogWriter
+
+
+def _row(index: int) -> dict:
+    return {"action": "create", "target_type": "task", "target_id": index, "detail": None}
+
+
+def test_writer_bulk_inserts_queued_rows(db_session):
+    engine = db_session.get_bind()
+    writer = AuditLogWriter(batch_size=50, flush_interval=0.05, session_factory=lambda: Session(bind=engine))
+
+    for index in range(120):
+        assert writer.submit(_row(index)) is True
+    assert writer.flush(timeout=5)
+    writer.stop()
+
+    assert db_session.query(AuditLog).count() == 120
+    status = writer.get_status()
+    assert status["written"] == 120
+    assert status["dropped"] == 0
+    assert 3 <= status["batches"] < 120
+    assert status["running"] is False
+
+
+def test_writer_drops_rows_when_queue_is_full(db_session):
+    engine = db_session.get_bind()
+    release = threading.Event()
+
+    def blocked_session():
+        release.wait(5)
+        return Session(bind=engine)
+
+    writer = AuditLogWriter(max_queue=2, batch_size=1, flush_interval=0.01, session_factory=blocked_session)
+    results = [writer.submit(_row(index)) for index in range(10)]
+    release.set()
+    writer.stop()
+
+    status = writer.get_status()
+    assert results.count(False) == status["dropped"] > 0
+    assert status["written"] == results.count(True)
+    assert db_session.query(AuditLog).count() == status["written"]
+
+
+def test_stop_flushes_pending_rows(db_session):
+    engine = db_session.get_bind()
+    writer = AuditLogWriter(batch_size=500, flush_interval=10, session_factory=lambda: Session(bind=engine))
+    writer.start()
+    for index in range(5):
+        writer.submit(_row(index))
+    writer.stop(timeout=1)
+
+    assert db_session.query(AuditLog).count() == 5
+
+
+def test_submit_after_stop_drops_rows_instead_of_restarting(db_session):
+    engine = db_session.get_bind()
+    writer = AuditLogWriter(batch_size=10, flush_interval=0.05, session_factory=lambda: Session(bind=engine))
+    assert writer.submit(_row(1)) is True
+    writer.stop(timeout=1)
+
+    assert writer.submit(_row(2)) is False
+    status = writer.get_status()
+    assert status["running"] is False
+    assert status["dropped"] == 1
+    assert db_session.query(AuditLog).count() == 1
+
+
+def test_audit_log_health_requires_authentication(client, monkeypatch):
+    monkeypatch.setenv("VON_AUTH_DISABLED", "false")
+    monkeypatch.setenv("AUTH_DISABLED", "false")
+
+    assert client.get("/api/health/audit-log").status_code == 401
+    assert client.get("/api/health").status_code == 200
@@ -0,0 +1,122 @@
+from datetime import date
+
+import services.cashflow_projection as cashflow_projection
+from models.fee import ManagementFee
+from models.fund import LP, Fund
+from models.investment import Investment, PortfolioCompany
+from models.phase3 import CapitalCall, CapitalCallItem, Distribution, ExitTrade
+from services.cashflow_projection import CashflowScenario, load_cashflow_book
+
+TODAY = date(2025, 1, 15)
+
+
+def _seed_fund(db, name: str) -> int:
+    fund = Fund(name=name, type="투자조합", status="active", commitment_total=1000)
+    db.add(fund)
+    db.flush()
+    lp = LP(fund_id=fund.id, name=f"{name} LP", type="법인", commitment=1000)
+    company = PortfolioCompany(name=f"{name} 피투자사")
+    db.add_all([lp, company])
+    db.flush()
+
+    paid_call = CapitalCall(fund_id=fund.id, call_date=date(2025, 1, 5), call_type="정기", total_amount=300)
+    pending_call = CapitalCall(fund_id=fund.id, call_date=date(2025, 3, 10), call_type="정기", total_amount=200)
+    db.add_all([paid_call, pending_call])
+    db.flush()
+    db.add_all(
+        [
+            CapitalCallItem(capital_call_id=paid_call.id, lp_id=lp.id, amount=300, paid=1, paid_date=date(2025, 1, 6)),
+            CapitalCallItem(capital_call_id=pending_call.id, lp_id=lp.id, amount=200, paid=0),
+        ]
+    )
+    investment = Investment(fund_id=fund.id, company_id=company.id, investment_date=date(2024, 6, 1), amount=100)
+    db.add(investment)
+    db.flush()
+    db.add_all(
+        [
+            Distribution(fund_id=fund.id, dist_date=date(2025, 2, 20), dist_type="중간분배", principal_total=40, profit_total=10),
+            ManagementFee(fund_id=fund.id, year=2025, quarter=2, fee_amount=25, status="계산완료"),
+            ExitTrade(
+                investment_id=investment.id,
+                fund_id=fund.id,
+                company_id=company.id,
+                exit_type="매각",
+                trade_date=date(2025, 4, 2),
+                amount=120,
+                net_amount=100,
+            ),
+        ]
+    )
+    db.commit()
+    return fund.id
+
+
+def test_book_buckets_many_funds_from_grouped_queries(db_session, capture_sql):
+    fund_ids = [_seed_fund(db_session, "첫째 조합"), _seed_fund(db_session, "둘째 조합")]
+
+    with capture_sql() as statements:
+        book = load_cashflow_book(db_session, fund_ids, 6, today=TODAY)
+        base = book.summarize()
+        consolidated = book.consolidate()
+        delayed = book.consolidate(CashflowScenario(call_delay_months=1, exit_haircut=0.5))
+
+    # Funds, call item counts, calls, distributions, fees and exits; scenarios reuse the book.
+    assert len(statements) == 6
+
+    summary = base[fund_ids[0]]
+    assert summary["current_balance"] == 300
+    assert [month["net"] for month in summary["monthly_summary"]] == [300, -50, 200, 75, 0, 0]
+    assert summary["monthly_summary"][-1]["ending_balance"] == 825
+    assert consolidated["current_balance"] == 600
+    assert [month["net"] for month in consolidated["monthly_summary"]] == [600, -100, 400, 150, 0, 0]
+
+    # The pending call slips from March to April and pending exits are halved.
+    assert [month["total_inflow"] for month in delayed["monthly_summary"]] == [600, 0, 0, 500, 0, 0]
+    assert delayed["current_balance"] == 600
+
+
+def test_projected_items_follow_the_scenario(db_session):
+    fund_id = _seed_fund(db_session, "시나리오 조합")
+    book = load_cashflow_book(db_session, [fund_id], 6, today=TODAY)
+    scenario = CashflowScenario(call_delay_months=1, exit_haircut=0.5, exit_delay_months=3, operating_cost_monthly=5)
+
+    items = book.project_items(fund_id, scenario)
+    summary = book.summarize(scenario)[fund_id]
+
+    calls = [(item.date, item.inflow) for item in items if item.category == "capital_call"]
+    assert calls == [(date(2025, 1, 5), 300), (date(2025, 4, 10), 200)]
+    # The pending exit slips from April to July, past the six-month horizon.
+    assert not any(item.category == "exit" for item in items)
+    for month in summary["monthly_summary"]:
+        month_items = [item for item in items if item.date.strftime("%Y-%m") == month["year_month"]]
+        assert sum(item.inflow for item in month_items) == month["total_inflow"]
+        assert sum(item.outflow for item in month_items) == month["total_outflow"]
+
+
+def test_book_matches_without_numpy(db_session, monkeypatch):
+    fund_ids = [_seed_fund(db_session, "벡터 조합"), _seed_fund(db_session, "루프 조합")]
+    scenario = CashflowScenario(call_pacing=0.5, exit_delay_months=2, operating_cost_monthly=5)
+    vectorized = load_cashflow_book(db_session, fund_ids, 12, today=TODAY)
+
+    monkeypatch.setattr(cashflow_projection, "np", None)
+    looped = load_cashflow_book(db_session, fund_ids, 12, today=TODAY)
+
+    assert looped.summarize(scenario) == vectorized.summarize(scenario)
+    assert looped.consolidate(scenario) == vectorized.consolidate(scenario)
+
+
+def test_consolidated_endpoint_returns_24_months_per_fund(client, db_session):
+    fund_ids = [_seed_fund(db_session, "연결 조합"), _seed_fund(db_session, "통합 조합")]
+
+    response = client.get("/api/cashflow/consolidated", params={"exit_haircut": 0.25})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["months_ahead"] == 24
+    assert len(data["monthly_summary"]) == 24
+    assert [row["fund_id"] for row in data["funds"]] == fund_ids
+    assert data["current_balance"] == sum(row["current_balance"] for row in data["funds"])
+    assert "baseline" in data
+
+    single = client.get(f"/api/funds/{fund_ids[0]}/cashflow", params={"months_ahead": 24, "exit_haircut": 0.25})
+    assert single.status_code == 200
+    assert single.json()["monthly_summary"] == data["funds"][0]["monthly_summary"]
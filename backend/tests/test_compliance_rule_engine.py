@@ -0,0 +1,90 @@
+from models.compliance import ComplianceCheck, FundComplianceRule
+from models.fund import LP, Fund
+from models.investment import Investment, PortfolioCompany
+from models.task import Task
+from services.compliance_rule_engine import ComplianceRuleEngine
+
+
+def _seed_fund(db) -> Fund:
+    fund = Fund(name="규칙 엔진 조합", type="투자조합", status="active", commitment_total=1000)
+    db.add(fund)
+    db.flush()
+    db.add(LP(fund_id=fund.id, name="LP", type="법인", commitment=10))
+    for index, amount in enumerate([100, 300, 200]):
+        company = PortfolioCompany(name=f"피투자사 {index}")
+        db.add(company)
+        db.flush()
+        db.add(Investment(fund_id=fund.id, company_id=company.id, amount=amount))
+    db.add_all(
+        [
+            FundComplianceRule(
+                rule_code="ENG-L1",
+                rule_name="투자 존재",
+                level="L1",
+                category="test",
+                condition={"type": "exists", "target": "investment"},
+            ),
+            FundComplianceRule(
+                rule_code="ENG-L2",
+                rule_name="단일 투자 한도",
+                level="L2",
+                category="test",
+                condition={"type": "range", "target": "investment_ratio", "max": 0.2},
+                severity="error",
+                auto_task=True,
+            ),
+            FundComplianceRule(
+                rule_code="ENG-L4",
+                rule_name="출자 합계",
+                level="L4",
+                category="test",
+                condition={"type": "cross_validate", "source": "lp_commitment_sum", "target": "fund_commitment_total"},
+                severity="error",
+                auto_task=True,
+            ),
+            FundComplianceRule(
+                rule_code="ENG-L5",
+                rule_name="복합 규칙",
+                level="L5",
+                category="test",
+                condition={"type": "composite", "logic": "AND", "rules": ["ENG-L1", "ENG-L2", "ENG-L4"]},
+                severity="error",
+            ),
+        ]
+    )
+    db.commit()
+    return fund
+
+
+def test_evaluate_all_prefetches_fund_data_once(db_session, capture_sql):
+    fund = _seed_fund(db_session)
+    engine = ComplianceRuleEngine()
+
+    with capture_sql("SELECT") as statements:
+        checks = engine.evaluate_all(fund_id=fund.id, db=db_session, trigger_type="manual")
+
+    results = {check.rule.rule_code: check for check in checks}
+    assert results["ENG-L1"].result == "pass"
+    assert results["ENG-L2"].result == "error"
+    assert "피투자사 1" in results["ENG-L2"].detail
+    assert results["ENG-L4"].result == "error"
+    assert results["ENG-L5"].result == "error"
+    # Rules, fund, investments+companies, LP sum, composite children, open tasks.
+    assert len(statements) <= 6
+    assert not any("portfolio_companies.id = ?" in statement for statement in statements)
+
+    assert db_session.query(ComplianceCheck).count() == 4
+    tasks = db_session.query(Task).filter(Task.source == "compliance_rule_engine").all()
+    assert len(tasks) == 2
+    assert {check.remediation_task_id for check in checks if check.remediation_task_id} == {task.id for task in tasks}
+
+
+def test_evaluate_all_reuses_open_remediation_tasks(db_session):
+    fund = _seed_fund(db_session)
+    engine = ComplianceRuleEngine()
+
+    engine.evaluate_all(fund_id=fund.id, db=db_session, trigger_type="manual")
+    engine.evaluate_all(fund_id=fund.id, db=db_session, trigger_type="manual")
+
+    assert db_session.query(ComplianceCheck).count() == 8
+    assert db_session.query(Task).filter(Task.source == "compliance_rule_engine").count() == 2
@@ -0,0 +1,91 @@
+from datetime import date
+
+from models.fund import LP, Fund
+from models.investment import Investment, PortfolioCompany
+from models.lp_contribution import LPContribution
+from models.phase3 import CapitalCall, CapitalCallItem, Distribution, ExitTrade
+from models.valuation import Valuation
+from services.fund_metrics import FundMetricsEngine
+
+Q1 = date(2025, 3, 31)
+Q2 = date(2025, 6, 30)
+
+
+def _seed_fund(db, name: str, *, with_contributions: bool) -> Fund:
+    fund = Fund(name=name, type="투자조합", status="active", commitment_total=1000)
+    db.add(fund)
+    db.flush()
+    lp = LP(fund_id=fund.id, name=f"{name} LP", type="법인", commitment=1000, paid_in=900)
+    company = PortfolioCompany(name=f"{name} 피투자사")
+    db.add_all([lp, company])
+    db.flush()
+    if with_contributions:
+        db.add_all(
+            [
+                LPContribution(fund_id=fund.id, lp_id=lp.id, due_date=date(2025, 1, 10), amount=300, actual_paid_date=date(2025, 1, 10)),
+                LPContribution(fund_id=fund.id, lp_id=lp.id, due_date=date(2025, 5, 10), amount=200, actual_paid_date=date(2025, 5, 10)),
+            ]
+        )
+    else:
+        call = CapitalCall(fund_id=fund.id, call_date=date(2025, 2, 1), call_type="정기", total_amount=400)
+        db.add(call)
+        db.flush()
+        db.add(CapitalCallItem(capital_call_id=call.id, lp_id=lp.id, amount=400, paid=1, paid_date=date(2025, 4, 1)))
+    investment = Investment(fund_id=fund.id, company_id=company.id, investment_date=date(2025, 2, 15), amount=250)
+    db.add(investment)
+    db.flush()
+    db.add_all(
+        [
+            ExitTrade(investment_id=investment.id, fund_id=fund.id, company_id=company.id, exit_type="매각", trade_date=date(2025, 5, 1), amount=50),
+            Valuation(investment_id=investment.id, fund_id=fund.id, company_id=company.id, as_of_date=date(2025, 6, 1), value=400, total_fair_value=450),
+            Distribution(fund_id=fund.id, dist_date=date(2025, 6, 15), dist_type="수익", principal_total=20, profit_total=10),
+        ]
+    )
+    db.commit()
+    return fund
+
+
+def test_metrics_cover_funds_and_dates_in_grouped_queries(db_session, capture_sql):
+    contribution_fund_id = _seed_fund(db_session, "기여 조합", with_contributions=True).id
+    call_fund_id = _seed_fund(db_session, "캐피탈콜 조합", with_contributions=False).id
+
+    with capture_sql() as statements:
+        engine = FundMetricsEngine(db_session)
+        metrics = engine.load([contribution_fund_id, call_fund_id], [Q1, Q2])
+        first_pass = len(statements)
+        engine.get(call_fund_id, Q2)
+
+    # Seven grouped sums plus one latest-valuation query per date, whatever the fund count.
+    assert first_pass == 9
+    assert len(statements) == first_pass
+
+    q1 = metrics[(contribution_fund_id, Q1)]
+    q2 = metrics[(contribution_fund_id, Q2)]
+    assert (q1.paid_in_total, q2.paid_in_total) == (300, 500)
+    assert (q1.invested_total, q2.invested_total) == (250, 250)
+    assert (q1.exit_total, q2.exit_total) == (0, 50)
+    # No valuation yet at Q1, so NAV falls back to invested minus exits.
+    assert (q1.nav_total, q2.nav_total) == (250, 400)
+    assert (q1.residual_value, q2.residual_value) == (0, 450)
+    assert (q1.distributed_total, q2.distributed_total) == (0, 30)
+    assert q2.lp_paid_in_total == 900
+
+    # Capital call items count once paid; before that the LP-level paid-in is the fallback.
+    assert metrics[(call_fund_id, Q1)].paid_in_total == 900
+    assert metrics[(call_fund_id, Q2)].paid_in_total == 400
+
+
+def test_session_engine_is_dropped_after_flush(db_session):
+    fund = _seed_fund(db_session, "무효화 조합", with_contributions=True)
+    engine = FundMetricsEngine.for_session(db_session)
+    assert FundMetricsEngine.for_session(db_session) is engine
+    assert engine.get(fund.id, Q2).exit_total == 50
+
+    db_session.add(
+        ExitTrade(investment_id=1, fund_id=fund.id, company_id=1, exit_type="매각", trade_date=date(2025, 6, 1), amount=25)
+    )
+    db_session.flush()
+
+    refreshed = FundMetricsEngine.for_session(db_session)
+    assert refreshed is not engine
+    assert refreshed.get(fund.id, Q2).exit_total == 75
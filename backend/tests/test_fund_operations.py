@@ -1,5 +1,8 @@
+import random
 from datetime import date, timedelta
 
+from services.performance_calculator import _bisect, _prepare_series, xirr_many
+
 
 def _latest_lp_id(client, fund_id: int) -> int:
     response = client.get(f"/api/funds/{fund_id}/lps")
@@ -325,3 +328,46 @@ class TestFundPerformance:
     def test_fund_performance_404(self, client):
         response = client.get("/api/funds/99999/performance")
         assert response.status_code == 404
+
+    def test_batch_xirr_matches_bisection(self):
+        rng = random.Random(7)
+        series = []
+        for _ in range(40):
+            start = date(2020, 1, 1) + timedelta(days=rng.randint(0, 400))
+            flows = [(start, -rng.uniform(100, 1000))]
+            for _ in range(rng.randint(1, 8)):
+                flows.append((start + timedelta(days=rng.randint(30, 2500)), rng.uniform(-200, 900)))
+            series.append(flows)
+        # No sign change, too short and a total loss.
+        series.extend([[(date(2021, 1, 1), 100.0), (date(2022, 1, 1), 50.0)], [(date(2021, 1, 1), -100.0)], []])
+
+        solved = xirr_many(series)
+        for flows, rate in zip(series, solved):
+            prepared = _prepare_series(flows)
+            expected = _bisect(*prepared) if prepared else None
+            if expected is None:
+                assert rate is None
+            else:
+                assert rate is not None
+                assert round(rate, 6) == round(expected, 6)
+
+    def test_bulk_performance(self, client, sample_fund_with_lps):
+        fund_id = sample_fund_with_lps["id"]
+        call_response = client.post(
+            "/api/capital-calls",
+            json={"fund_id": fund_id, "call_date": "2024-01-10", "call_type": "최초출자", "total_amount": 1_000_000},
+        )
+        assert call_response.status_code == 201
+        distribution_response = client.post(
+            "/api/distributions",
+            json={"fund_id": fund_id, "dist_date": "2025-01-10", "dist_type": "중간분배", "principal_total": 600_000, "profit_total": 600_000},
+        )
+        assert distribution_response.status_code == 201
+
+        response = client.get("/api/performance/all", params={"fund_ids": [fund_id], "as_of_date": "2025-06-30"})
+        assert response.status_code == 200
+        rows = response.json()
+        assert [row["fund_id"] for row in rows] == [fund_id]
+        single = client.get(f"/api/funds/{fund_id}/performance", params={"as_of_date": "2025-06-30"}).json()
+        assert rows[0]["irr"] == single["irr"]
+        assert rows[0]["irr"] is not None and rows[0]["irr"] > 0
@@ -1,10 +1,12 @@
 from datetime import date, datetime
 
+from models.fund import Fund, LP
 from models.phase3 import CapitalCall, CapitalCallItem
 from models.task import Task
 from models.workflow import Workflow, WorkflowStep
 from models.workflow_instance import WorkflowInstance
 from services.lp_types import LP_TYPE_GP, LP_TYPE_INDIVIDUAL, LP_TYPE_INSTITUTIONAL
+from routers.funds import calculate_paid_in_as_of, calculate_paid_in_as_of_bulk
 from services.workflow_service import instantiate_workflow
 
 
@@ -676,3 +678,40 @@ class TestFundNoticeAndTerms:
         assert response.status_code == 200
         assert "spreadsheetml.sheet" in response.headers.get("content-type", "")
         assert len(response.content) > 0
+
+
+class TestFundPaidInAsOf:
+    def test_bulk_paid_in_matches_per_fund_calculation(self, db_session):
+        called_fund = Fund(name="납입 1호", type="벤처투자조합", status="active")
+        legacy_fund = Fund(name="납입 2호", type="벤처투자조합", status="active", gp_commitment=70)
+        db_session.add_all([called_fund, legacy_fund])
+        db_session.flush()
+        gp_lp = LP(fund_id=called_fund.id, name="GP", type=LP_TYPE_GP, commitment=100, paid_in=100)
+        lp = LP(fund_id=called_fund.id, name="LP", type=LP_TYPE_INSTITUTIONAL, commitment=900, paid_in=900)
+        legacy_lp = LP(fund_id=legacy_fund.id, name="LP", type=LP_TYPE_INDIVIDUAL, commitment=500, paid_in=300)
+        db_session.add_all([gp_lp, lp, legacy_lp])
+        db_session.flush()
+        call = CapitalCall(fund_id=called_fund.id, call_date=date(2025, 1, 1), call_type="regular", total_amount=1000)
+        db_session.add(call)
+        db_session.flush()
+        db_session.add_all(
+            [
+                CapitalCallItem(capital_call_id=call.id, lp_id=gp_lp.id, amount=100, paid=1, paid_date=date(2025, 1, 5)),
+                CapitalCallItem(capital_call_id=call.id, lp_id=lp.id, amount=400, paid=1, paid_date=date(2025, 1, 6)),
+                CapitalCallItem(capital_call_id=call.id, lp_id=lp.id, amount=500, paid=1, paid_date=date(2025, 3, 1)),
+                CapitalCallItem(capital_call_id=call.id, lp_id=lp.id, amount=50, paid=0, paid_date=None),
+            ]
+        )
+        db_session.commit()
+
+        fallbacks = {called_fund.id: None, legacy_fund.id: legacy_fund.gp_commitment}
+        bulk = calculate_paid_in_as_of_bulk(
+            db_session,
+            [called_fund.id, legacy_fund.id],
+            date(2025, 2, 1),
+            fallback_gp_commitments=fallbacks,
+        )
+
+        assert bulk == {called_fund.id: (500.0, 100.0), legacy_fund.id: (300.0, 70.0)}
+        for fund_id, expected in bulk.items():
+            assert calculate_paid_in_as_of(db_session, fund_id, date(2025, 2, 1), fallbacks[fund_id]) == expected
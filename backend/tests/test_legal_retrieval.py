@@ -0,0 +1,306 @@
+import asyncio
+import threading
+
+from models.compliance import ComplianceDocument, ComplianceDocumentChunk
+from services import lexical_index
+from services.document_ingestion import DocumentIngestionService
+from services.legal_rag import LegalRAGService
+from services.lexical_index import LexicalIndex, mark_lexical_documents, tokenize_legal_text
+from services.retrieval_cache import EmbeddingCache, RetrievalCache
+from services.vector_db import VectorDBService
+
+
+class _FakeCollection:
+    def __init__(self, name: str, rows: list[dict], calls: list[dict]):
+        self.name = name
+        self.rows = rows
+        self.calls = calls
+
+    def query(self, query_embeddings, n_results, where=None):
+        self.calls.append({"collection": self.name, "where": where, "thread": threading.get_ident()})
+        matched = [row for row in self.rows if where is None or _matches(row["metadata"], where)][:n_results]
+        return {
+            "ids": [[row["id"] for row in matched]],
+            "documents": [[row["text"] for row in matched]],
+            "metadatas": [[row["metadata"] for row in matched]],
+            "distances": [[row["distance"] for row in matched]],
+        }
+
+    def add(self, ids, documents, metadatas):
+        self.rows.extend(
+            {"id": chunk_id, "text": text, "distance": 0.0, "metadata": metadata}
+            for chunk_id, text, metadata in zip(ids, documents, metadatas)
+        )
+
+    def get(self, where=None):
+        return {"ids": [row["id"] for row in self.rows if where is None or _matches(row["metadata"], where)]}
+
+    def delete(self, ids):
+        self.rows = [row for row in self.rows if row["id"] not in set(ids)]
+
+
+def _matches(metadata: dict, where: dict) -> bool:
+    if "$and" in where:
+        return all(_matches(metadata, clause) for clause in where["$and"])
+    return all(metadata.get(key) == value for key, value in where.items())
+
+
+def _service(
+    rows_by_collection: dict[str, list[dict]],
+    embedding_cache: EmbeddingCache | None = None,
+    lexical: LexicalIndex | None = None,
+    embedding: bool = True,
+) -> tuple[VectorDBService, list[dict], list[str]]:
+    service = VectorDBService.__new__(VectorDBService)
+    calls: list[dict] = []
+    embedded: list[str] = []
+
+    def embed(texts):
+        embedded.extend(texts)
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    collections = {
+        name: _FakeCollection(name, rows_by_collection.get(name, []), calls) for name in VectorDBService.COLLECTIONS
+    }
+    service._embedding_function = embed if embedding else None
+    service._embedding_model = "test-embedding"
+    service._embedding_cache = embedding_cache or _NoEmbeddingCache()
+    service._retrieval_cache = RetrievalCache(ttl_seconds=300)
+    service._cache_namespace = "test"
+    service._lexical_index = lexical or _NoLexicalIndex()
+    service._get_collection = collections.__getitem__
+    return service, calls, embedded
+
+
+class _NoEmbeddingCache:
+    def get(self, model, text):
+        return None
+
+    def put(self, model, text, vector):
+        pass
+
+
+class _NoLexicalIndex:
+    def search(self, query, collection=None, n_results=5, where=None):
+        return []
+
+
+def _row(chunk_id: str, distance: float, **metadata) -> dict:
+    return {"id": chunk_id, "text": chunk_id, "distance": distance, "metadata": metadata}
+
+
+def test_scoped_search_embeds_once_and_merges_by_tier_then_distance():
+    service, calls, embedded = _service(
+        {
+            "laws": [_row("law-1", 0.9, scope="global", source_tier="law")],
+            "guidelines": [
+                _row("type-1", 0.2, scope="fund_type", fund_type_filter="벤처투자조합", source_tier="special_guideline"),
+                _row("other-fund", 0.1, scope="fund", fund_id=99, source_tier="special_guideline"),
+            ],
+            "agreements": [
+                _row("bylaw-1", 0.3, scope="fund", fund_id=7, source_tier="fund_bylaw"),
+                _row("contract-1", 0.05, scope="investment", investment_id=3, source_tier="investment_contract"),
+            ],
+        }
+    )
+
+    rows = service.search_with_scope("투자한도 제한", fund_id=7, fund_type="벤처투자조합", investment_id=3, n_results=5)
+
+    assert embedded == ["투자한도 제한"]
+    assert [row["id"] for row in rows] == ["law-1", "bylaw-1", "type-1", "contract-1"]
+    assert [row["collection"] for row in rows] == ["laws", "agreements", "guidelines", "agreements"]
+    # 5 global + fund type + 3 fund + investment lookups, plus unfiltered legacy retries for empty ones.
+    assert len([call for call in calls if call["where"] is not None]) == 10
+    assert "other-fund" not in {row["id"] for row in rows}
+
+
+def test_async_scoped_search_runs_off_the_event_loop():
+    service, calls, embedded = _service({"laws": [_row("law-1", 0.4, scope="global", source_tier="law")]})
+
+    async def run():
+        return threading.get_ident(), await service.asearch_with_scope("제81조", n_results=3)
+
+    loop_thread, rows = asyncio.run(run())
+    assert [row["id"] for row in rows] == ["law-1"]
+    assert embedded == ["제81조"]
+    assert all(call["thread"] != loop_thread for call in calls)
+
+
+def test_query_embeddings_persist_across_instances(tmp_path):
+    path = tmp_path / "query_embeddings.sqlite3"
+    first, _, first_embedded = _service({}, EmbeddingCache(path))
+    first.search("laws", "투자  한도\n제한")
+    assert first_embedded == ["투자 한도 제한"]
+
+    second, calls, second_embedded = _service({}, EmbeddingCache(path))
+    second.search("laws", " 투자 한도 제한 ")
+    assert second_embedded == []
+    assert len(calls) == 1
+
+
+def test_repeated_scoped_searches_are_served_from_the_retrieval_cache():
+    service, calls, embedded = _service(
+        {
+            "laws": [_row("law-1", 0.4, scope="global", source_tier="law")],
+            "agreements": [_row("bylaw-1", 0.3, scope="fund", fund_id=7, source_tier="fund_bylaw")],
+        }
+    )
+
+    first = service.search_with_scope("투자한도", fund_id=7, n_results=3)
+    issued = len(calls)
+    second = service.search_with_scope("투자한도", fund_id=7, n_results=3)
+    assert second == first
+    assert len(calls) == issued
+    assert embedded == ["투자한도"]
+
+    # Fund-independent global lookups are shared; only the new fund's own lookups hit Chroma.
+    service.search_with_scope("투자한도", fund_id=8, n_results=3)
+    new_calls = calls[issued:]
+    assert new_calls
+    assert all(call["where"] is None or call["where"].get("scope") != "global" for call in new_calls)
+
+
+def test_collection_writes_invalidate_only_that_collection():
+    service, calls, _ = _service({"laws": [_row("law-1", 0.4, scope="global", source_tier="law")]})
+    service.search_all_collections("보고 의무", n_results=3)
+    issued = len(calls)
+
+    service.add_chunks("laws", [{"id": "law-2", "text": "신규 조문", "metadata": {"document_id": 2}}])
+    rows = service.search_all_collections("보고 의무", n_results=3)
+    assert [call["collection"] for call in calls[issued:]] == ["laws"]
+    assert {row["id"] for row in rows} == {"law-1", "law-2"}
+
+    issued = len(calls)
+    assert service.delete_chunks_by_document("laws", 2) == 1
+    rows = service.search_all_collections("보고 의무", n_results=3)
+    assert [call["collection"] for call in calls[issued:]] == ["laws"]
+    assert [row["id"] for row in rows] == ["law-1"]
+
+
+def _legal_document(db_session, document_type: str, chunks: list[tuple[str, str, dict]], **fields) -> ComplianceDocument:
+    document = ComplianceDocument(title=f"{document_type} 문서", document_type=document_type, **fields)
+    db_session.add(document)
+    db_session.flush()
+    db_session.add_all(
+        [
+            ComplianceDocumentChunk(
+                document_id=document.id,
+                chunk_key=chunk_key,
+                chunk_index=index,
+                text=text,
+                metadata_json={"document_id": document.id, **metadata},
+            )
+            for index, (chunk_key, text, metadata) in enumerate(chunks)
+        ]
+    )
+    db_session.commit()
+    return document
+
+
+def test_tokenizer_keeps_article_references_whole():
+    assert tokenize_legal_text("제 81 조의2(투자한도)에 따른 제3항") == ["제81조의2", "제3항", "투자한", "투자", "자한", "한도", "따른"]
+    assert tokenize_legal_text("조합재산을 제81조") == ["제81조", "조합재산", "조합", "합재", "재산", "산을"]
+
+
+def test_scoped_search_falls_back_to_bm25_without_an_embedding_key(db_session):
+    _legal_document(
+        db_session,
+        "laws",
+        [
+            ("law-81", "제81조(투자한도) 조합재산의 100분의 20을 초과하여 투자할 수 없다.", {"scope": "global", "source_tier": "law"}),
+            ("law-82", "제82조(보고) 업무집행조합원은 분기마다 보고한다.", {"scope": "global", "source_tier": "law"}),
+        ],
+    )
+    _legal_document(
+        db_session,
+        "agreements",
+        [
+            ("bylaw-7", "제81조 투자한도는 규약으로 달리 정할 수 있다.", {"scope": "fund", "fund_id": 7, "source_tier": "fund_bylaw"}),
+            ("bylaw-9", "제81조 투자한도 특례", {"scope": "fund", "fund_id": 9, "source_tier": "fund_bylaw"}),
+        ],
+    )
+    index = LexicalIndex()
+    index.load(db_session)
+    service, calls, embedded = _service({}, lexical=index, embedding=False)
+
+    rows = service.search_with_scope("제 81조 투자 한도", fund_id=7, n_results=3)
+
+    assert [row["id"] for row in rows] == ["law-81", "bylaw-7"]
+    assert rows[0]["bm25_score"] > 0 and rows[0]["distance"] is None
+    assert calls == [] and embedded == []
+
+
+def test_hybrid_ranking_promotes_chunks_found_by_both_retrievers(db_session):
+    _legal_document(
+        db_session,
+        "laws",
+        [("law-81", "제81조 투자한도", {"scope": "global"}), ("law-90", "제90조 해산", {"scope": "global"})],
+    )
+    index = LexicalIndex()
+    index.load(db_session)
+    service, _, _ = _service({"laws": [_row("law-90", 0.2), _row("law-81", 0.3)]}, lexical=index)
+
+    rows = service.search("laws", "제81조", n_results=2)
+
+    assert [row["id"] for row in rows] == ["law-81", "law-90"]
+    assert rows[0]["distance"] == 0.3 and rows[0]["bm25_score"] > 0
+    assert rows[0]["hybrid_score"] > rows[1]["hybrid_score"]
+
+
+def test_fused_rankings_stay_comparable_across_collections():
+    service, _, _ = _service(
+        {
+            "laws": [_row(f"law-{index}", 0.10 + index / 100) for index in range(3)],
+            "internal": [_row(f"internal-{index}", 1.20 + index / 100) for index in range(3)],
+        }
+    )
+
+    rows = service.search_all_collections("투자한도", n_results=2)
+
+    assert [row["id"] for row in rows] == ["law-0", "law-1", "internal-0", "internal-1"]
+    assert rows[0]["hybrid_score"] > rows[2]["hybrid_score"]
+
+
+def test_committed_chunk_changes_update_the_loaded_index(db_session, monkeypatch):
+    document = _legal_document(db_session, "laws", [("law-81", "제81조 투자한도", {"scope": "global"})])
+    index = LexicalIndex()
+    index.load(db_session)
+    monkeypatch.setattr(lexical_index, "_lexical_index", index)
+
+    ingestion = DocumentIngestionService.__new__(DocumentIngestionService)
+    ingestion.vector_db, _, _ = _service({}, lexical=index, embedding=False)
+    result = ingestion._index_chunks(
+        collection_name="laws",
+        document_id=document.id,
+        chunks=[{"id": "law-81-v2", "text": "제81조 투자 제한 개정", "metadata": {"scope": "global"}}],
+        db=db_session,
+    )
+    assert result == {"index_status": "lexical_only"}
+    assert [row["id"] for row in index.search("제81조", "laws")] == ["law-81"]
+
+    db_session.commit()
+    assert [row["id"] for row in index.search("제81조", "laws")] == ["law-81-v2"]
+
+    db_session.query(ComplianceDocumentChunk).delete(synchronize_session=False)
+    mark_lexical_documents(db_session, [document.id])
+    db_session.rollback()
+    assert [row["id"] for row in index.search("제81조", "laws")] == ["law-81-v2"]
+
+    db_session.query(ComplianceDocumentChunk).delete(synchronize_session=False)
+    mark_lexical_documents(db_session, [document.id])
+    db_session.commit()
+    assert index.search("제81조", "laws") == []
+
+
+def test_interpretation_context_applies_distance_and_lexical_floors():
+    fused_far = {"id": "fused-far", "distance": 1.8, "bm25_score": 9.0, "hybrid_score": 2.0 / 61}
+    vector_near = {"id": "vector-near", "distance": 0.4, "hybrid_score": 1.0 / 61}
+    lexical_strong = {"id": "lexical-strong", "distance": None, "bm25_score": 6.5, "hybrid_score": 1.0 / 61}
+    lexical_weak = {"id": "lexical-weak", "distance": None, "bm25_score": 0.3, "hybrid_score": 1.0 / 61}
+    lexical_deep = {"id": "lexical-deep", "distance": None, "bm25_score": 4.0, "hybrid_score": 1.0 / 70}
+
+    rows = [fused_far, vector_near, lexical_strong, lexical_weak, lexical_deep]
+    assert [row["id"] for row in rows if LegalRAGService._is_relevant(row)] == ["vector-near", "lexical-strong"]
+    assert LegalRAGService._relevance(vector_near) == 0.6
+    assert LegalRAGService._relevance(lexical_strong) == 0.5
+    assert LegalRAGService._relevance(fused_far) == 0.0
@@ -0,0 +1,103 @@
+from datetime import date
+
+from models.fund import LP, Fund
+from models.investment import Investment, PortfolioCompany
+from models.phase3 import CapitalCall, CapitalCallItem, Distribution, DistributionDetail
+from models.valuation import Valuation
+from services.lp_capital_account import get_lp_capital_accounts
+from services.performance_calculator import _xirr
+
+AS_OF = date(2025, 12, 31)
+
+
+def _seed(db) -> tuple[int, int, int]:
+    fund = Fund(name="LP 계정 조합", type="투자조합", status="active", commitment_total=1000)
+    db.add(fund)
+    db.flush()
+    large = LP(fund_id=fund.id, name="대형 LP", type="법인", commitment=750)
+    small = LP(fund_id=fund.id, name="소형 LP", type="개인", commitment=250)
+    company = PortfolioCompany(name="계정 피투자사")
+    db.add_all([large, small, company])
+    db.flush()
+
+    call = CapitalCall(fund_id=fund.id, call_date=date(2024, 1, 2), call_type="최초출자", total_amount=400)
+    db.add(call)
+    db.flush()
+    db.add_all(
+        [
+            CapitalCallItem(capital_call_id=call.id, lp_id=large.id, amount=300, paid=1, paid_date=date(2024, 1, 10)),
+            CapitalCallItem(capital_call_id=call.id, lp_id=small.id, amount=100, paid=1, paid_date=date(2024, 1, 12)),
+        ]
+    )
+    distribution = Distribution(fund_id=fund.id, dist_date=date(2025, 6, 30), dist_type="중간분배", principal_total=80, profit_total=0)
+    db.add(distribution)
+    db.flush()
+    db.add_all(
+        [
+            DistributionDetail(distribution_id=distribution.id, lp_id=large.id, distribution_amount=60),
+            DistributionDetail(distribution_id=distribution.id, lp_id=small.id, distribution_amount=20),
+        ]
+    )
+    investment = Investment(fund_id=fund.id, company_id=company.id, investment_date=date(2024, 2, 1), amount=400)
+    db.add(investment)
+    db.flush()
+    db.add(Valuation(investment_id=investment.id, fund_id=fund.id, company_id=company.id, as_of_date=date(2025, 12, 1), value=480))
+    db.commit()
+    return fund.id, large.id, small.id
+
+
+def test_capital_accounts_allocate_nav_and_solve_lp_irr(db_session):
+    fund_id, large_id, small_id = _seed(db_session)
+
+    accounts = {account.lp_id: account for account in get_lp_capital_accounts(db_session, fund_id, AS_OF)}
+
+    large = accounts[large_id]
+    assert (large.contributed, large.distributed) == (300, 60)
+    assert large.nav_share == 360
+    assert large.tvpi == (60 + 360) / 300
+    expected = _xirr([(date(2024, 1, 10), -300), (date(2025, 6, 30), 60), (AS_OF, 360)])
+    assert round(large.irr, 6) == round(expected, 6)
+    assert accounts[small_id].nav_share == 120
+
+    # Before the distribution only contributions and NAV count.
+    earlier = {account.lp_id: account for account in get_lp_capital_accounts(db_session, fund_id, date(2025, 3, 31))}
+    assert earlier[large_id].distributed == 0
+    assert earlier[large_id].nav_share == 0
+
+
+def test_lps_without_dated_contributions_fall_back_to_their_own_paid_in(db_session):
+    fund_id, large_id, _ = _seed(db_session)
+    db_session.get(LP, large_id).paid_in = 300
+    legacy = LP(fund_id=fund_id, name="이관 LP", type="법인", commitment=200, paid_in=100)
+    db_session.add(legacy)
+    db_session.commit()
+
+    accounts = {account.lp_id: account for account in get_lp_capital_accounts(db_session, fund_id, AS_OF)}
+    assert accounts[legacy.id].contributed == 100
+    assert accounts[large_id].contributed == 300
+    # Residual value 480 is shared over 500 contributed.
+    assert accounts[legacy.id].nav_share == 96
+    assert accounts[large_id].nav_share == 288
+
+    # Before its first paid call the dated LP has contributed nothing, whatever its current paid-in.
+    before_call = {account.lp_id: account for account in get_lp_capital_accounts(db_session, fund_id, date(2023, 12, 31))}
+    assert before_call[large_id].contributed == 0
+    assert before_call[legacy.id].contributed == 100
+
+
+def test_capital_accounts_are_cached_until_sources_change(db_session, capture_sql):
+    fund_id, large_id, _ = _seed(db_session)
+    first = get_lp_capital_accounts(db_session, fund_id, AS_OF)
+
+    with capture_sql() as statements:
+        assert get_lp_capital_accounts(db_session, fund_id, AS_OF) is first
+    assert statements == []
+
+    distribution = Distribution(fund_id=fund_id, dist_date=date(2025, 9, 30), dist_type="중간분배", principal_total=10, profit_total=0)
+    db_session.add(distribution)
+    db_session.flush()
+    db_session.add(DistributionDetail(distribution_id=distribution.id, lp_id=large_id, distribution_amount=10))
+    db_session.commit()
+
+    refreshed = {account.lp_id: account for account in get_lp_capital_accounts(db_session, fund_id, AS_OF)}
+    assert refreshed[large_id].distributed == 70
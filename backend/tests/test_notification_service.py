@@ -1,8 +1,28 @@
 import asyncio
+from datetime import datetime, timedelta
 
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+import routers.notifications as notifications_router
+from database import Base
+from dependencies.auth import create_access_token, create_stream_token
+from models.compliance import ComplianceObligation
 from models.notification import Notification
+from models.task import Task
 from models.user import User
-from services.notification_service import create_notifications_for_active_users
+from services.notification_hub import get_notification_hub
+from services.notification_scanner import run_all_scans, scan_task_deadlines
+from services.notification_service import (
+    create_notification,
+    create_notifications_for_active_users,
+    get_unread_count,
+    mark_all_as_read,
+    mark_as_read,
+)
 
 
 def test_create_notifications_for_active_users_batches_and_dedupes(db_session):
@@ -44,3 +64,145 @@ def test_create_notifications_for_active_users_batches_and_dedupes(db_session):
     )
     assert created_again == 0
     assert db_session.query(Notification).count() == 2
+
+
+def test_task_deadline_scan_fans_out_in_one_batch(db_session, capture_sql):
+    overdue = datetime.now() - timedelta(days=2)
+    db_session.add_all(
+        [
+            User(username="scan_one", name="Scan One", role="admin", is_active=True),
+            User(username="scan_two", name="Scan Two", role="manager", is_active=True),
+            *[Task(title=f"마감 태스크 {index}", quadrant="Q1", status="pending", deadline=overdue) for index in range(5)],
+        ]
+    )
+    db_session.commit()
+
+    with capture_sql() as statements:
+        created = asyncio.run(scan_task_deadlines(db_session))
+
+    assert created == 10
+    assert db_session.query(Notification).count() == 10
+    # Tasks, active users, one 24h dedupe lookup and one bulk insert.
+    assert len(statements) == 4
+    assert sum(statement.lstrip().upper().startswith("INSERT") for statement in statements) == 1
+
+    assert asyncio.run(scan_task_deadlines(db_session)) == 0
+    assert db_session.query(Notification).count() == 10
+
+
+def test_run_all_scans_fans_out_every_scanner_in_one_batch(db_session, capture_sql):
+    today = datetime.now().date()
+    db_session.add_all(
+        [
+            User(username="all_one", name="All One", role="admin", is_active=True),
+            User(username="all_two", name="All Two", role="manager", is_active=True),
+            Task(title="전체 스캔 태스크", quadrant="Q1", status="pending", deadline=datetime.now() - timedelta(days=1)),
+            ComplianceObligation(rule_id=1, fund_id=1, due_date=today + timedelta(days=2), status="pending"),
+        ]
+    )
+    db_session.commit()
+
+    with capture_sql() as statements:
+        results = asyncio.run(run_all_scans(db_session))
+
+    assert results == {
+        "task_alerts": 2,
+        "compliance_alerts": 2,
+        "capital_call_alerts": 0,
+        "document_alerts": 0,
+        "approval_alerts": 0,
+        "total": 4,
+    }
+    assert sum(statement.lstrip().upper().startswith("INSERT") for statement in statements) == 1
+    assert sum("FROM users" in statement for statement in statements) == 1
+    assert sum("FROM notifications" in statement for statement in statements) == 1
+
+
+def test_unread_count_is_cached_and_kept_in_step_with_writes(db_session, capture_sql):
+    user = User(username="counter", name="Counter", role="admin", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+
+    first = asyncio.run(create_notification(db_session, user_id, "system", "info", "첫 알림"))
+    assert asyncio.run(get_unread_count(db_session, user_id)) == 1
+
+    with capture_sql() as statements:
+        assert asyncio.run(get_unread_count(db_session, user_id)) == 1
+    assert statements == []
+
+    asyncio.run(create_notification(db_session, user_id, "system", "info", "둘째 알림"))
+    asyncio.run(create_notifications_for_active_users(db_session, category="system", severity="info", title="전체 알림"))
+    assert asyncio.run(get_unread_count(db_session, user_id)) == 3
+
+    assert asyncio.run(mark_as_read(db_session, first.id, user_id))
+    assert asyncio.run(mark_as_read(db_session, first.id, user_id))
+    assert asyncio.run(get_unread_count(db_session, user_id)) == 2
+
+    assert asyncio.run(mark_all_as_read(db_session, user_id)) == 2
+    assert asyncio.run(get_unread_count(db_session, user_id)) == 0
+    assert db_session.query(Notification).filter(Notification.is_read == False).count() == 0
+
+
+def test_subscribers_receive_new_notifications_and_counts(db_session):
+    user = User(username="listener", name="Listener", role="admin", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+
+    async def scenario():
+        hub = get_notification_hub()
+        subscription = hub.subscribe(user_id)
+        try:
+            await get_unread_count(db_session, user_id)
+            await create_notifications_for_active_users(
+                db_session,
+                category="task",
+                severity="warning",
+                title="푸시 알림",
+                target_type="task",
+                target_id=7,
+            )
+            return [await asyncio.wait_for(subscription.queue.get(), timeout=1) for _ in range(2)]
+        finally:
+            hub.unsubscribe(subscription)
+
+    created, count = asyncio.run(scenario())
+    row = db_session.query(Notification).one()
+    assert created["event"] == "notification"
+    assert created["data"]["id"] == row.id
+    assert created["data"]["title"] == "푸시 알림"
+    assert count == {"event": "unread_count", "data": {"count": 1}}
+
+
+def test_stream_authenticates_by_token_and_releases_its_connection(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stream.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    StreamSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with StreamSession() as db:
+        user = User(username="streamer", name="Streamer", role="admin", is_active=True)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    monkeypatch.setattr(notifications_router, "SessionLocal", StreamSession)
+    monkeypatch.setenv("VON_AUTH_DISABLED", "false")
+    monkeypatch.setenv("AUTH_DISABLED", "false")
+    request = Request({"type": "http", "method": "GET", "path": "/api/notifications/stream", "headers": []})
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await notifications_router.stream_notifications(request, token=create_access_token(user_id))
+
+        response = await notifications_router.stream_notifications(request, token=create_stream_token(user_id))
+        try:
+            first = await response.body_iterator.__anext__()
+            return first, engine.pool.checkedout()
+        finally:
+            await response.body_iterator.aclose()
+
+    try:
+        first, checked_out = asyncio.run(scenario())
+    finally:
+        engine.dispose()
+    assert first.startswith("event: unread_count")
+    assert checked_out == 0
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+from models.fund import Fund
+from models.phase3 import CapitalCall
+from models.task import Task
+
+
+def _walk(client, url: str, params: dict) -> tuple[list[dict], int]:
+    rows: list[dict] = []
+    pages = 0
+    cursor = None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        rows.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows, pages
+
+
+def test_task_list_keyset_pages_cover_every_row_once(client, db_session):
+    deadlines = [datetime(2025, 3, 1, 9), None, datetime(2025, 1, 1, 9), datetime(2025, 3, 1, 9), None, datetime(2025, 2, 1, 9), datetime(2025, 1, 1, 9)]
+    db_session.add_all(
+        [Task(title=f"페이지 업무 {index}", quadrant="Q2", deadline=deadline) for index, deadline in enumerate(deadlines)]
+    )
+    db_session.commit()
+
+    full = client.get("/api/tasks")
+    assert full.status_code == 200
+    assert "X-Next-Cursor" not in full.headers
+
+    rows, pages = _walk(client, "/api/tasks", {"limit": 2})
+    assert pages == 4
+    assert [row["id"] for row in rows] == [row["id"] for row in full.json()]
+    assert [row["deadline"] for row in rows][-2:] == [None, None]
+
+    counted = client.get("/api/tasks", params={"limit": 2, "include_total": True})
+    assert counted.headers["X-Total-Count"] == "7"
+    assert len(counted.json()) == 2
+
+
+def test_field_projection_and_invalid_input(client, db_session):
+    db_session.add_all([Task(title="투영 업무", quadrant="Q1", deadline=datetime(2025, 5, 1)), Task(title="둘째", quadrant="Q3")])
+    db_session.commit()
+
+    projected = client.get("/api/tasks", params={"fields": "title,quadrant"})
+    assert projected.status_code == 200
+    assert projected.json() == [
+        {"id": 1, "title": "투영 업무", "quadrant": "Q1"},
+        {"id": 2, "title": "둘째", "quadrant": "Q3"},
+    ]
+
+    # Computed fields still load full rows and are trimmed afterwards.
+    computed = client.get("/api/tasks", params={"fields": "fund_name,attachment_count", "limit": 1})
+    assert computed.json() == [{"id": 1, "fund_name": None, "attachment_count": 0}]
+
+    assert client.get("/api/tasks", params={"fields": "password"}).status_code == 400
+    assert client.get("/api/tasks", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_descending_date_keyset_for_capital_calls(client, db_session):
+    fund = Fund(name="페이지 조합", type="투자조합", status="active")
+    db_session.add(fund)
+    db_session.flush()
+    call_dates = [date(2025, 1, 10), date(2025, 3, 10), date(2025, 3, 10), date(2025, 2, 10), date(2025, 4, 10)]
+    db_session.add_all(
+        [CapitalCall(fund_id=fund.id, call_date=call_date, call_type="정기", total_amount=100) for call_date in call_dates]
+    )
+    db_session.commit()
+
+    rows, pages = _walk(client, "/api/capital-calls", {"limit": 2, "fields": "call_date"})
+    assert pages == 3
+    assert [(row["call_date"], row["id"]) for row in rows] == [
+        ("2025-04-10", 5),
+        ("2025-03-10", 3),
+        ("2025-03-10", 2),
+        ("2025-02-10", 4),
+        ("2025-01-10", 1),
+    ]
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models.compliance import ComplianceCheck, ComplianceDocument, FundComplianceRule
+from models.fund import LP, Fund
+from models.task import Task
+from services.periodic_compliance_scanner import PeriodicComplianceScanner, get_scan_progress
+
+
+@pytest.fixture
+def file_session_factory(tmp_path):
+    # A file database so worker threads get real, independent connections.
+    engine = create_engine(f"sqlite:///{tmp_path / 'scan.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield factory
+    engine.dispose()
+
+
+def _seed(factory, fund_count: int) -> None:
+    db = factory()
+    try:
+        for index in range(fund_count):
+            fund = Fund(name=f"스캔 조합 {index}", type="투자조합", status="active", commitment_total=1000)
+            db.add(fund)
+            db.flush()
+            # Every other fund has an LP total that disagrees with the fund commitment.
+            db.add(LP(fund_id=fund.id, name="LP", type="법인", commitment=1000 if index % 2 == 0 else 10))
+        db.add_all(
+            [
+                FundComplianceRule(
+                    rule_code="SCAN-L1",
+                    rule_name="투자 존재",
+                    level="L1",
+                    category="test",
+                    condition={"type": "exists", "target": "investment"},
+                    severity="info",
+                ),
+                FundComplianceRule(
+                    rule_code="SCAN-L4",
+                    rule_name="출자 합계",
+                    level="L4",
+                    category="test",
+                    condition={"type": "cross_validate", "source": "lp_commitment_sum", "target": "fund_commitment_total"},
+                    severity="error",
+                    auto_task=True,
+                ),
+            ]
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_full_audit_fans_out_funds_with_own_sessions(file_session_factory):
+    _seed(file_session_factory, fund_count=5)
+    updates = []
+    scanner = PeriodicComplianceScanner(
+        session_factory=file_session_factory,
+        max_workers=3,
+        progress_callback=updates.append,
+    )
+
+    payload = asyncio.run(scanner.run_full_audit(trigger_type="manual", trigger_source="test_full_audit"))
+
+    assert payload["fund_count"] == 5
+    assert [row["fund_id"] for row in payload["results"]] == sorted(row["fund_id"] for row in payload["results"])
+    assert payload["total_rules"] == 10
+    assert payload["failed"] == 2
+    assert payload["timed_out_funds"] == []
+    assert updates[-1]["completed_funds"] == 5
+    assert updates[-1]["running"] is False
+    assert get_scan_progress()["trigger_source"] == "test_full_audit"
+
+    db = file_session_factory()
+    try:
+        assert db.query(ComplianceCheck).count() == 10
+        assert db.query(Task).filter(Task.source == "compliance_rule_engine").count() == 2
+        assert db.query(ComplianceDocument).filter(ComplianceDocument.document_type == "scan_alert").count() == 2
+    finally:
+        db.close()
+
+
+def test_fund_timeout_rolls_back_that_fund_only(file_session_factory):
+    _seed(file_session_factory, fund_count=2)
+    scanner = PeriodicComplianceScanner(session_factory=file_session_factory, max_workers=2, fund_timeout=1e-9)
+
+    payload = asyncio.run(scanner.run_full_audit(trigger_type="manual", trigger_source="test_timeout"))
+
+    assert len(payload["timed_out_funds"]) == 2
+    assert all(row["timed_out"] for row in payload["results"])
+    db = file_session_factory()
+    try:
+        assert db.query(ComplianceCheck).count() == 0
+    finally:
+        db.close()
+
+
+def test_hung_fund_is_abandoned_and_never_commits(file_session_factory):
+    _seed(file_session_factory, fund_count=2)
+    scanner = PeriodicComplianceScanner(session_factory=file_session_factory, max_workers=2, fund_timeout=0.3)
+    release = threading.Event()
+    finished = threading.Event()
+    evaluate_rule = scanner.engine.evaluate_rule
+    scan_fund_in_session = scanner._scan_fund_in_session
+
+    def hanging_evaluate_rule(*, rule, fund_id, db, context):
+        if fund_id == 1:
+            release.wait(timeout=10)
+        return evaluate_rule(rule=rule, fund_id=fund_id, db=db, context=context)
+
+    def tracked_scan(fund_id, *args, **kwargs):
+        try:
+            return scan_fund_in_session(fund_id, *args, **kwargs)
+        finally:
+            if fund_id == 1:
+                finished.set()
+
+    scanner.engine.evaluate_rule = hanging_evaluate_rule
+    scanner._scan_fund_in_session = tracked_scan
+
+    started = time.monotonic()
+    payload = asyncio.run(scanner.run_full_audit(trigger_type="manual", trigger_source="test_hung_fund"))
+    assert time.monotonic() - started < 5
+    assert payload["timed_out_funds"] == [1]
+    assert [row["timed_out"] for row in payload["results"]] == [True, False]
+
+    release.set()
+    assert finished.wait(timeout=10)
+    db = file_session_factory()
+    try:
+        assert {row.fund_id for row in db.query(ComplianceCheck).all()} == {2}
+    finally:
+        db.close()
@@ -0,0 +1,123 @@
+import asyncio
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+from alembic.config import Config as AlembicConfig
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+
+from database import Base
+from models.fund import Fund
+from models.phase3 import CapitalCall
+from services.latest_valuation import latest_nav_by_fund, latest_valuations
+from services.ledger_aggregation import fund_account_ledger_totals
+from services.notification_hub import get_notification_hub
+from services.notification_scanner import scan_capital_call_deadlines, scan_compliance_deadlines, scan_task_deadlines
+from services.notification_service import get_notifications, get_unread_count
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+MIGRATION_PATH = BACKEND_DIR / "migrations" / "versions" / "f85a1b2c3d4e_add_hot_filter_composite_indexes.py"
+
+
+def _full_scans(db, capture_sql, action, tables: set[str]) -> list[str]:
+    """Plan lines that read one of `tables` without an index, for every query `action` runs."""
+    with capture_sql(("SELECT", "WITH"), with_parameters=True) as statements:
+        action()
+    assert statements
+
+    bind = db.get_bind()
+    offending: list[str] = []
+    with bind.connect() as conn:
+        for statement, parameters in statements:
+            if bind.dialect.name == "postgresql":
+                conn.exec_driver_sql("SET enable_seqscan = off")
+                lines = [row[0] for row in conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)]
+                offending.extend(
+                    line for line in lines for table in tables if f"Seq Scan on {table}" in line
+                )
+            else:
+                lines = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                offending.extend(
+                    line
+                    for line in lines
+                    for table in tables
+                    if line.startswith(f"SCAN {table}") and "INDEX" not in line
+                )
+    return offending
+
+
+def test_task_and_obligation_deadline_scans_use_indexes(db_session, capture_sql):
+    assert _full_scans(db_session, capture_sql, lambda: asyncio.run(scan_task_deadlines(db_session)), {"tasks"}) == []
+    assert (
+        _full_scans(db_session, capture_sql, lambda: asyncio.run(scan_compliance_deadlines(db_session)), {"compliance_obligations"})
+        == []
+    )
+
+
+def test_capital_call_item_lookups_use_indexes(db_session, capture_sql):
+    fund = Fund(name="플랜 조합", type="투자조합", status="active")
+    db_session.add(fund)
+    db_session.flush()
+    db_session.add(CapitalCall(fund_id=fund.id, call_date=date.today(), call_type="정기", total_amount=100))
+    db_session.commit()
+
+    assert (
+        _full_scans(db_session, capture_sql, lambda: asyncio.run(scan_capital_call_deadlines(db_session)), {"capital_call_items"})
+        == []
+    )
+
+
+def test_notification_reads_use_indexes(db_session, capture_sql):
+    get_notification_hub().clear()
+    tables = {"notifications"}
+    assert _full_scans(db_session, capture_sql, lambda: asyncio.run(get_unread_count(db_session, 1)), tables) == []
+    assert _full_scans(db_session, capture_sql, lambda: asyncio.run(get_notifications(db_session, 1, unread_only=True)), tables) == []
+
+
+def test_latest_valuation_queries_use_indexes(db_session, capture_sql):
+    tables = {"valuations"}
+    assert _full_scans(db_session, capture_sql, lambda: latest_valuations(db_session, fund_ids=[1, 2]), tables) == []
+    assert _full_scans(db_session, capture_sql, lambda: latest_valuations(db_session, investment_ids=[3]), tables) == []
+    assert _full_scans(db_session, capture_sql, lambda: latest_nav_by_fund(db_session, fund_ids=[1], as_of=date(2025, 6, 30)), tables) == []
+
+
+def test_fund_ledger_totals_use_indexes(db_session, capture_sql):
+    assert (
+        _full_scans(
+            db_session,
+            capture_sql,
+            lambda: fund_account_ledger_totals(db_session, [1], date(2025, 6, 30), exclude_statuses=["반려"]),
+            {"journal_entries", "journal_entry_lines"},
+        )
+        == []
+    )
+
+
+def test_composite_index_migration_is_on_the_single_head_chain_and_idempotent(tmp_path):
+    config = AlembicConfig(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    script = ScriptDirectory.from_config(config)
+    heads = script.get_heads()
+    assert len(heads) == 1
+    assert "f85a1b2c3d4e" in {revision.revision for revision in script.walk_revisions("base", heads[0])}
+
+    spec = importlib.util.spec_from_file_location("composite_index_migration", MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'indexes.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for index_name, _, _ in migration.INDEXES[:3]:
+            conn.exec_driver_sql(f"DROP INDEX {index_name}")
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+            migration.upgrade()
+        inspector = inspect(conn)
+        for index_name, table_name, columns in migration.INDEXES:
+            indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes(table_name)}
+            assert indexes.get(index_name) == columns
+    engine.dispose()
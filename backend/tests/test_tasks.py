@@ -1,4 +1,10 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+from models.fund import Fund
+from models.gp_entity import GPEntity
+from models.investment import Investment, PortfolioCompany
+from models.task import Task
+from models.workflow_instance import WorkflowInstance
 
 
 def _create_task(client, title: str = "테스트 업무") -> dict:
@@ -416,3 +422,98 @@ class TestTaskBoardAndReminders:
             params={"year_month": "202510"},
         )
         assert response.status_code == 400
+
+
+def _add_linked_tasks(db_session, label: str) -> None:
+    fund = Fund(name=f"{label} 조합", type="투자조합", status="active")
+    gp_entity = GPEntity(name=f"{label} GP", entity_type="vc")
+    company = PortfolioCompany(name=f"{label} 기업")
+    db_session.add_all([fund, gp_entity, company])
+    db_session.flush()
+    investment = Investment(fund_id=fund.id, company_id=company.id)
+    instance = WorkflowInstance(name=f"{label} 절차", trigger_date=date.today(), gp_entity_id=gp_entity.id)
+    db_session.add_all([investment, instance])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Task(title=f"{label} 투자 업무", quadrant="Q1", investment_id=investment.id),
+            Task(title=f"{label} 절차 업무", quadrant="Q2", workflow_instance_id=instance.id, workflow_step_order=1),
+            Task(title=f"{label} 완료 업무", quadrant="Q1", status="completed", completed_at=datetime(2024, 1, 2)),
+        ]
+    )
+    db_session.commit()
+
+
+def _board_statement_count(client, db_session, capture_sql) -> tuple[int, dict]:
+    db_session.expire_all()
+    with capture_sql() as statements:
+        response = client.get("/api/tasks/board")
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+class TestTaskBoardQueries:
+    def test_board_query_count_does_not_grow_with_tasks(self, client, db_session, capture_sql):
+        # The first request also provisions the default user.
+        assert client.get("/api/tasks/board").status_code == 200
+        _add_linked_tasks(db_session, "첫째")
+        baseline_count, board = _board_statement_count(client, db_session, capture_sql)
+        names = {row["title"]: row for row in [*board["Q1"], *board["Q2"]]}
+        assert names["첫째 투자 업무"]["fund_name"] == "첫째 조합"
+        assert names["첫째 투자 업무"]["company_name"] == "첫째 기업"
+        assert names["첫째 절차 업무"]["gp_entity_name"] == "첫째 GP"
+        assert names["첫째 절차 업무"]["workflow_name"] == "첫째 절차"
+
+        for index in range(8):
+            _add_linked_tasks(db_session, f"추가{index}")
+        grown_count, board = _board_statement_count(client, db_session, capture_sql)
+        assert grown_count == baseline_count
+        assert board["summary"]["total_pending_count"] == 18
+        assert board["summary"]["completed_today_count"] == 0
+
+    def test_board_summary_picks_in_progress_representative_and_stale_tasks(self, client, db_session):
+        now = datetime.now()
+        instance = WorkflowInstance(name="대표 업무 절차", trigger_date=date.today())
+        db_session.add(instance)
+        db_session.flush()
+        db_session.add_all(
+            [
+                Task(
+                    title="지연된 1단계",
+                    quadrant="Q1",
+                    workflow_instance_id=instance.id,
+                    workflow_step_order=1,
+                    deadline=now - timedelta(days=2),
+                ),
+                Task(
+                    title="진행 중 2단계",
+                    quadrant="Q1",
+                    status="in_progress",
+                    workflow_instance_id=instance.id,
+                    workflow_step_order=2,
+                    deadline=now + timedelta(days=3),
+                    estimated_time="1h",
+                ),
+                Task(title="방치 업무", quadrant="Q2", updated_at=now - timedelta(days=5), estimated_time="30m", deadline=now),
+                Task(
+                    title="오늘 완료",
+                    quadrant="Q3",
+                    status="completed",
+                    completed_at=now,
+                    deadline=now - timedelta(days=1),
+                    estimated_time="30m",
+                ),
+            ]
+        )
+        db_session.commit()
+
+        summary = client.get("/api/tasks/board").json()["summary"]
+        assert summary["total_pending_count"] == 2
+        assert summary["overdue_count"] == 0
+        assert summary["today_count"] == 1
+        assert summary["this_week_count"] == 1
+        assert summary["stale_count"] == 1
+        assert summary["completed_today_count"] == 1
+        assert summary["total_estimated_minutes"] == 60
+        assert summary["completed_estimated_minutes"] == 30
+        assert summary["progress_count_pct"] == 50
@@ -1,3 +1,8 @@
+from datetime import date
+
+from services.latest_valuation import latest_nav, latest_valuations
+
+
 class TestValuations:
     def test_valuation_crud_and_filters(self, client, sample_investment):
         create_response = client.post(
@@ -53,3 +58,26 @@ class TestValuations:
     def test_valuation_not_found(self, client):
         response = client.get("/api/valuations/99999")
         assert response.status_code == 404
+
+    def test_latest_valuation_per_investment_and_as_of(self, client, db_session, sample_investment):
+        base = {
+            "investment_id": sample_investment["id"],
+            "fund_id": sample_investment["fund_id"],
+            "company_id": sample_investment["company_id"],
+        }
+        for as_of_date, value in [("2025-06-30", 1_000_000_000), ("2025-12-31", 1_200_000_000), ("2025-12-31", 1_300_000_000)]:
+            response = client.post("/api/valuations", json={**base, "as_of_date": as_of_date, "value": value})
+            assert response.status_code == 201
+
+        fund_id = sample_investment["fund_id"]
+        latest = latest_valuations(db_session, fund_ids=[fund_id])
+        # Same-day valuations resolve to the most recently entered row.
+        assert latest[sample_investment["id"]].value == 1_300_000_000
+        assert latest_nav(db_session, fund_id) == 1_300_000_000
+        assert latest_nav(db_session, fund_id, as_of=date(2025, 9, 30)) == 1_000_000_000
+        assert latest_valuations(db_session, fund_ids=[fund_id], as_of=date(2025, 1, 1)) == {}
+
+        dashboard = client.get("/api/valuations/dashboard", params={"fund_id": fund_id})
+        assert dashboard.status_code == 200
+        assert dashboard.json()["total_nav"] == 1_300_000_000
+        assert dashboard.json()["valuation_count"] == 1
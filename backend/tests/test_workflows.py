@@ -1,3 +1,12 @@
+import asyncio
+import threading
+
+import services.scheduler as scheduler_module
+from models.task import Task
+from models.workflow_instance import WorkflowStepInstance
+from services.workflow_service import reconcile_all_workflow_instances, reconcile_workflow_instances
+
+
 def _workflow_payload(name: str = "결성총회 테스트", category: str = "조합결성") -> dict:
     return {
         "name": name,
@@ -351,3 +360,102 @@ class TestWorkflowLifecycle:
             json={"template_id": invalid_target_id},
         )
         assert swap_response.status_code == 400
+
+
+def _instantiate(client, name: str) -> dict:
+    template_response = client.post("/api/workflows", json=_workflow_payload(name=f"{name} 템플릿"))
+    assert template_response.status_code == 201
+    instantiate_response = client.post(
+        f"/api/workflows/{template_response.json()['id']}/instantiate",
+        json={"name": name, "trigger_date": "2025-10-24"},
+    )
+    assert instantiate_response.status_code == 200
+    return instantiate_response.json()
+
+
+def _statement_count(db_session, capture_sql, action) -> int:
+    db_session.expire_all()
+    with capture_sql() as statements:
+        action()
+    return len(statements)
+
+
+class TestWorkflowReconciliation:
+    def test_task_status_commit_reconciles_its_instance(self, client, db_session):
+        instance = _instantiate(client, "커밋 동기화")
+        first_step = instance["step_instances"][0]
+
+        task = db_session.get(Task, first_step["task_id"])
+        task.status = "completed"
+        db_session.commit()
+
+        step = db_session.get(WorkflowStepInstance, first_step["id"])
+        assert step.status == "completed"
+        second_step = db_session.get(WorkflowStepInstance, instance["step_instances"][1]["id"])
+        assert second_step.status == "in_progress"
+
+        task.status = "pending"
+        db_session.commit()
+        assert db_session.get(WorkflowStepInstance, first_step["id"]).status == "in_progress"
+        assert db_session.get(WorkflowStepInstance, second_step.id).status == "pending"
+
+    def test_reads_do_not_write_and_sweep_repairs_drift(self, client, db_session, capture_sql):
+        instance = _instantiate(client, "이력 불일치")
+        first_step = instance["step_instances"][0]
+        # Drift written outside the ORM, as in historical data.
+        db_session.query(Task).filter(Task.id == first_step["task_id"]).update(
+            {Task.status: "completed"}, synchronize_session=False
+        )
+        db_session.commit()
+
+        with capture_sql(("INSERT", "UPDATE", "DELETE")) as writes:
+            for url in ("/api/dashboard/base", "/api/dashboard/workflows", f"/api/workflow-instances/{instance['id']}"):
+                assert client.get(url).status_code == 200
+            listed = client.get("/api/workflow-instances")
+            assert listed.status_code == 200
+        assert writes == []
+        listed_steps = next(row for row in listed.json() if row["id"] == instance["id"])["step_instances"]
+        assert listed_steps[0]["status"] == "in_progress"
+
+        assert reconcile_all_workflow_instances(db_session) == 1
+        db_session.expire_all()
+        assert db_session.get(WorkflowStepInstance, first_step["id"]).status == "completed"
+        assert reconcile_all_workflow_instances(db_session) == 0
+
+    def test_scheduled_sweep_runs_off_the_event_loop(self, monkeypatch):
+        sweep_threads: list[int] = []
+
+        def reconcile_all(db):
+            sweep_threads.append(threading.get_ident())
+            return 0
+
+        monkeypatch.setattr(scheduler_module, "reconcile_all_workflow_instances", reconcile_all)
+
+        async def run():
+            await scheduler_module.SchedulerService()._workflow_reconcile_sweep()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        assert len(sweep_threads) == 1 and sweep_threads[0] != loop_thread
+
+
+class TestWorkflowInstanceGraphLoading:
+    def test_listing_and_reconciling_cost_constant_queries(self, client, db_session, capture_sql):
+        instance_ids = [_instantiate(client, "그래프 0")["id"]]
+
+        def list_all():
+            response = client.get("/api/workflow-instances")
+            assert response.status_code == 200
+            assert len(response.json()) == len(instance_ids)
+
+        def reconcile_all():
+            reconcile_workflow_instances(db_session, instance_ids)
+
+        small_list = _statement_count(db_session, capture_sql, list_all)
+        small_reconcile = _statement_count(db_session, capture_sql, reconcile_all)
+        small_detail = _statement_count(db_session, capture_sql, lambda: client.get(f"/api/workflow-instances/{instance_ids[0]}"))
+
+        instance_ids.extend(_instantiate(client, f"그래프 {index}")["id"] for index in range(1, 6))
+        assert _statement_count(db_session, capture_sql, list_all) == small_list
+        assert _statement_count(db_session, capture_sql, reconcile_all) == small_reconcile
+        assert _statement_count(db_session, capture_sql, lambda: client.get(f"/api/workflow-instances/{instance_ids[-1]}")) == small_detail
@@ -1,6 +1,6 @@
 ﻿import { Suspense, useEffect, useMemo, useRef, useState, type ComponentType } from 'react'
 import { Link, NavLink, Outlet, useLocation, useNavigate } from 'react-router-dom'
-import { useQuery } from '@tanstack/react-query'
+import { useQuery, useQueryClient } from '@tanstack/react-query'
 import {
   Bell,
   BookOpen,
@@ -30,7 +30,7 @@ import { ErrorBoundary } from './ErrorBoundary'
 import { PageSkeleton } from './ui/PageSkeleton'
 import { useAuth } from '../contexts/AuthContext'
 import { AUTH_DISABLED } from '../lib/authMode'
-import { getUnreadCount } from '../lib/api/notifications'
+import { getNotificationStreamToken, getUnreadCount, openNotificationStream } from '../lib/api/notifications'
 import { queryKeys } from '../lib/queryKeys'
 
 type NavItem = {
@@ -167,13 +167,56 @@ export default function Layout() {
     [location.pathname, visibleDropdownGroups],
   )
 
+  const queryClient = useQueryClient()
   const { data: unreadCount = 0 } = useQuery({
     queryKey: queryKeys.notifications.unreadCount,
     queryFn: getUnreadCount,
-    staleTime: 60_000,
-    refetchInterval: () => (document.visibilityState === 'visible' ? 60_000 : false),
+    staleTime: Infinity,
   })
 
+  useEffect(() => {
+    let source: EventSource | null = null
+    let retryTimer: number | undefined
+    let cancelled = false
+
+    const scheduleReconnect = (delay: number) => {
+      if (!cancelled) retryTimer = window.setTimeout(connect, delay)
+    }
+
+    async function connect() {
+      let token: string
+      try {
+        token = await getNotificationStreamToken()
+      } catch {
+        scheduleReconnect(30_000)
+        return
+      }
+      if (cancelled) return
+      const stream = openNotificationStream(token)
+      source = stream
+      stream.addEventListener('unread_count', (event) => {
+        const { count } = JSON.parse((event as MessageEvent<string>).data) as { count: number }
+        queryClient.setQueryData(queryKeys.notifications.unreadCount, count)
+      })
+      stream.addEventListener('notification', () => {
+        queryClient.invalidateQueries({ queryKey: ['notifications', 'list'] })
+      })
+      stream.onerror = () => {
+        // The stream token has expired by the time EventSource retries, so reconnect with a fresh one.
+        stream.close()
+        source = null
+        scheduleReconnect(5_000)
+      }
+    }
+
+    void connect()
+    return () => {
+      cancelled = true
+      window.clearTimeout(retryTimer)
+      source?.close()
+    }
+  }, [queryClient])
+
 
   useEffect(() => {
     const onKeyDown = (event: KeyboardEvent) => {
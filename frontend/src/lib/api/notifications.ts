@@ -37,6 +37,16 @@ export async function getUnreadCount() {
   return data.count
 }
 
+export async function getNotificationStreamToken() {
+  const { data } = await api.post<{ token: string; expires_in: number }>('/notifications/stream-token')
+  return data.token
+}
+
+// EventSource cannot send the Bearer header, so the stream authenticates with a short-lived token.
+export function openNotificationStream(token: string) {
+  return new EventSource(`/api/notifications/stream?token=${encodeURIComponent(token)}`)
+}
+
 export async function markNotificationRead(id: number) {
   const { data } = await api.patch<{ success: boolean }>(`/notifications/${id}/read`)
   return data